@@ -37,6 +37,7 @@ class JobsController {
       completed_at: job.completed_at || null,
       failed_at: job.failed_at || null,
       live_step: job.live_step ?? null,
+      live_steps: job.live_steps ?? null,
       execution_steps_s3_key: job.execution_steps_s3_key || null,
     };
   }
@@ -44,6 +44,11 @@ export interface WorkflowStep {
    * When true, this step's output is treated as the final deliverable source.
    */
   is_deliverable?: boolean;
+  /**
+   * When true, an identical request (same model, instructions, input, tools and
+   * reasoning settings) reuses the stored response instead of calling OpenAI.
+   */
+  cache_response?: boolean;
   instructions: string;
   step_order: number;
   depends_on?: number[];
@@ -62,6 +62,7 @@ export const workflowStepSchema = z
       ])
       .optional(),
     is_deliverable: z.boolean().optional(),
+    cache_response: z.boolean().optional(),
     instructions: z.string().optional().default(""), 
     step_order: z.number().int().min(0).optional(),
     depends_on: z.array(z.number().int().min(0)).optional(), // Array of step indices this step depends on
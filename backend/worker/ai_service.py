@@ -3,7 +3,7 @@ AI Service
 Handles OpenAI API interactions for report generation and HTML rewriting.
 """
 
-from typing import Optional, Dict, Tuple, List, Any
+from typing import Callable, Optional, Dict, Tuple, List, Any
 
 from core.logger import get_logger
 from s3_service import S3Service
@@ -71,6 +71,8 @@ class AIService:
         text_verbosity: Optional[str] = None,
         max_output_tokens: Optional[int] = None,
         shell_settings: Optional[Dict[str, Any]] = None,
+        cache_response: bool = False,
+        on_image: Optional[Callable[[str], None]] = None,
     ) -> Tuple[str, Dict, Dict, Dict]:
         """Delegate report generation to ReportGenerator."""
         return self.report_generator.generate_report(
@@ -90,6 +92,8 @@ class AIService:
             text_verbosity=text_verbosity,
             max_output_tokens=max_output_tokens,
             shell_settings=shell_settings,
+            cache_response=cache_response,
+            on_image=on_image,
         )
     
     def rewrite_html(
@@ -6,14 +6,14 @@ Handles artifact storage in S3 and DynamoDB.
 import logging
 import mimetypes
 import os
-import requests
 from datetime import datetime
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional
 
+from utils import http_client
 from utils.ulid_utils import new_ulid
 
 from db_service import DynamoDBService
-from s3_service import S3Service
+from s3_service import S3Service, StreamableContent
 
 logger = logging.getLogger(__name__)
 
@@ -30,34 +30,40 @@ class ArtifactService:
         tenant_id: str,
         job_id: str,
         artifact_type: str,
-        content: Union[str, bytes],
+        content: StreamableContent,
         filename: str,
-        public: bool = True  # Default to True - all artifacts should be public
+        public: bool = True,  # Default to True - all artifacts should be public
+        background: bool = False,
+        step_index: Optional[int] = None
     ) -> str:
         """
         Store an artifact in S3 and DynamoDB.
         
+        Content is streamed to S3 (multipart for large objects), so strings are not
+        re-encoded in full and file-like/iterator content is never fully buffered.
+        
+        With background=True (str/bytes content only) the S3 upload is handed to the
+        step's upload queue and the record is written right away with the pre-computed
+        key and URLs; the step handler awaits the upload at step end.
+        
         Args:
             tenant_id: Tenant ID
             job_id: Job ID
             artifact_type: Type of artifact (e.g., 'html_final', 'markdown_final')
-            content: Content to store (string or bytes)
+            content: Content to store (string, bytes, binary file-like object or chunk iterable)
             filename: Filename for the artifact
             public: Whether the artifact should be publicly accessible
+            background: Upload through the step's background upload queue
+            step_index: Step that drains the background upload
             
         Returns:
             Artifact ID
         """
-        if isinstance(content, bytes):
-            content_size = len(content)
-        else:
-            content_size = len(content.encode('utf-8'))
         logger.info(f"[ArtifactService] Storing artifact", extra={
             'tenant_id': tenant_id,
             'job_id': job_id,
             'artifact_type': artifact_type,
             'artifact_filename': filename,
-            'content_size_bytes': content_size,
             'public': public
         })
         
@@ -68,16 +74,32 @@ class ArtifactService:
         s3_key = f"{tenant_id}/jobs/{job_id}/{filename}"
         logger.debug(f"[ArtifactService] Uploading to S3", extra={
             'artifact_id': artifact_id,
-            's3_key': s3_key,
-            'content_size_bytes': content_size
+            's3_key': s3_key
         })
         
-        s3_url, public_url = self.s3.upload_artifact(
-            key=s3_key,
-            content=content,
-            content_type=self.get_content_type(filename),
-            public=public
-        )
+        if background and isinstance(content, (str, bytes)):
+            from services.upload_queue import get_job_upload_queues
+            
+            pending = get_job_upload_queues().enqueue(
+                self.s3,
+                tenant_id,
+                job_id,
+                filename=filename,
+                body=content,
+                content_type=self.get_content_type(filename),
+                public=public,
+                label=artifact_type,
+                step_index=step_index
+            )
+            content_size = pending.size_bytes
+            s3_url, public_url = pending.s3_url, pending.public_url
+        else:
+            _, content_size = self.s3.upload_stream(
+                key=s3_key,
+                content=content,
+                content_type=self.get_content_type(filename)
+            )
+            s3_url, public_url = self.s3.get_artifact_urls(s3_key, public=public)
         
         # Create artifact record
         # Always store public_url (either CloudFront URL or presigned URL) so artifacts are accessible
@@ -132,7 +154,7 @@ class ArtifactService:
         try:
             # Call the internal API endpoint to share the artifact
             share_url = f"{api_url.rstrip('/')}/internal/workflow-sharing/share-artifact"
-            response = requests.post(
+            response = http_client.post(
                 share_url,
                 json={
                     'artifact_id': artifact_id,
@@ -202,7 +224,6 @@ class ArtifactService:
         Returns:
             Artifact ID
         """
-        import requests
         from urllib.parse import urlparse
         
         # Check if URL is already in our S3 bucket
@@ -250,7 +271,7 @@ class ArtifactService:
             
             try:
                 # Download image from external URL
-                response = requests.get(image_url, timeout=30)
+                response = http_client.get(image_url, timeout=30)
                 response.raise_for_status()
                 image_data = response.content
                 image_size = len(image_data)
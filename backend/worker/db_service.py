@@ -13,12 +13,14 @@ from boto3.dynamodb.conditions import Key
 from datetime import datetime
 
 from utils.ulid_utils import new_ulid
+from services.execution_steps_store import ExecutionStepsStore
 
 logger = logging.getLogger(__name__)
 
 # Note: Execution steps are always stored in S3 (never in DynamoDB) to ensure
 # complete data storage without size limitations. The MAX_DYNAMODB_ITEM_SIZE
 # constant is kept for reference but is no longer used for execution steps.
+# See services/execution_steps_store.py for the per-entry S3 layout.
 
 
 class DynamoDBService:
@@ -62,13 +64,23 @@ class DynamoDBService:
         self.usage_records_table = self.dynamodb.Table(os.environ.get('USAGE_RECORDS_TABLE', 'leadmagnet-usage-records'))
         self.notifications_table = self.dynamodb.Table(os.environ.get('NOTIFICATIONS_TABLE', 'leadmagnet-notifications'))
         
+        # Incremental execution_steps storage and job_id -> tenant_id lookups (tenant_id
+        # never changes for a job, so one lookup per job is enough).
+        self.execution_steps_store = ExecutionStepsStore()
+        self._job_tenant_ids: Dict[str, Optional[str]] = {}
+        
         logger.info(f"[DynamoDB] DynamoDB service initialized successfully", extra={
             'workflows_table': self.workflows_table.table_name,
             'jobs_table': self.jobs_table.table_name,
             'artifacts_table': self.artifacts_table.table_name
         })
     
-    def get_job(self, job_id: str, s3_service=None) -> Optional[Dict[str, Any]]:
+    def get_job(
+        self,
+        job_id: str,
+        s3_service=None,
+        step_orders: Optional[List[int]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get job by ID.
         
@@ -78,6 +90,10 @@ class DynamoDBService:
         Args:
             job_id: Job ID
             s3_service: Optional S3Service instance to load execution_steps from S3
+            step_orders: Optional step_order values to load; when the job has an
+                execution_steps manifest, only those entries are downloaded and
+                execution_steps is an ExecutionStepsView that update_job merges back
+                into the full list (without a manifest the full list is returned)
         """
         logger.debug(f"[DynamoDB] Getting job", extra={'job_id': job_id})
         try:
@@ -95,6 +111,28 @@ class DynamoDBService:
                 'has_execution_steps_s3_key': bool(job.get('execution_steps_s3_key'))
             })
             
+            if job.get('tenant_id'):
+                self._job_tenant_ids[job_id] = job['tenant_id']
+            
+            # Prefer the per-entry manifest; it only downloads entries not already in memory
+            if s3_service and job.get('execution_steps_manifest_key'):
+                try:
+                    execution_steps = self.execution_steps_store.read(
+                        s3_service,
+                        job['execution_steps_manifest_key'],
+                        step_orders=step_orders,
+                    )
+                    if execution_steps is not None:
+                        job['execution_steps'] = execution_steps
+                        return job
+                except Exception as e:
+                    logger.warning(f"[DynamoDB] Error loading execution_steps manifest, falling back to full blob", extra={
+                        'job_id': job_id,
+                        'manifest_key': job.get('execution_steps_manifest_key'),
+                        'error_type': type(e).__name__,
+                        'error_message': str(e)
+                    })
+            
             # If execution_steps is stored in S3, load it
             if job and s3_service and job.get('execution_steps_s3_key'):
                 try:
@@ -103,8 +141,12 @@ class DynamoDBService:
                         'job_id': job_id,
                         's3_key': s3_key
                     })
-                    execution_steps_json = s3_service.download_artifact(s3_key)
-                    job['execution_steps'] = json.loads(execution_steps_json)
+                    # Parse straight from the response stream (no intermediate str copy)
+                    body = s3_service.open_artifact(s3_key)
+                    try:
+                        job['execution_steps'] = json.load(body)
+                    finally:
+                        body.close()
                     logger.info(f"[DynamoDB] Loaded execution_steps from S3", extra={
                         'job_id': job_id,
                         's3_key': s3_key,
@@ -180,30 +222,21 @@ class DynamoDBService:
                 })
                 
                 # Always store in S3 - single source of truth
-                # Nest under the workflow run folder to keep artifacts organized by run
-                tenant_id_for_key = None
-                try:
-                    job_item = self.jobs_table.get_item(Key={'job_id': job_id}).get('Item')
-                    tenant_id_for_key = job_item.get('tenant_id') if job_item else None
-                except Exception as lookup_error:
-                    logger.warning(
-                        "[DynamoDB] Failed to look up tenant_id for job while building execution_steps S3 key",
-                        extra={
-                            'job_id': job_id,
-                            'error_type': type(lookup_error).__name__,
-                            'error_message': str(lookup_error)
-                        }
-                    )
-                # Fallback to legacy path if tenant_id is unavailable (backward compatible)
-                if tenant_id_for_key:
-                    s3_key = f"{tenant_id_for_key}/jobs/{job_id}/execution_steps.json"
-                else:
-                    s3_key = f"jobs/{job_id}/execution_steps.json"
-                execution_steps_json = json.dumps(execution_steps, default=str)
-                s3_service.upload_artifact(s3_key, execution_steps_json, content_type='application/json', public=True)  # Public so URLs never expire
+                # Nest under the workflow run folder to keep artifacts organized by run.
+                # Only changed entries are uploaded; the compacted execution_steps.json is
+                # refreshed on status changes and at most every compaction interval.
+                tenant_id_for_key = self._resolve_tenant_id(job_id)
+                storage_keys = self.execution_steps_store.write(
+                    s3_service,
+                    job_id,
+                    tenant_id_for_key,
+                    execution_steps,
+                    compact='status' in updates,
+                )
+                s3_key = storage_keys['execution_steps_s3_key']
                 
-                # Store S3 key reference in DynamoDB, remove execution_steps from updates
-                updates['execution_steps_s3_key'] = s3_key
+                # Store S3 key references in DynamoDB, remove execution_steps from updates
+                updates.update(storage_keys)
                 del updates['execution_steps']
                 
                 logger.info(f"[DynamoDB] Stored execution_steps in S3", extra={
@@ -212,6 +245,10 @@ class DynamoDBService:
                     'steps_count': len(execution_steps) if isinstance(execution_steps, list) else 0
                 })
             
+            elif 'status' in updates:
+                # Lifecycle change: make sure external readers see the latest steps
+                self.flush_execution_steps(job_id, s3_service=s3_service)
+            
             if not updates:
                 logger.debug(f"[DynamoDB] No updates to apply", extra={'job_id': job_id})
                 return
@@ -279,6 +316,47 @@ class DynamoDBService:
             }, exc_info=True)
             raise
     
+    def _resolve_tenant_id(self, job_id: str) -> Optional[str]:
+        """Look up (once per job) the tenant_id used to build the run folder S3 prefix."""
+        if job_id in self._job_tenant_ids:
+            return self._job_tenant_ids[job_id]
+        tenant_id = None
+        try:
+            job_item = self.jobs_table.get_item(
+                Key={'job_id': job_id},
+                ProjectionExpression='tenant_id'
+            ).get('Item')
+            tenant_id = job_item.get('tenant_id') if job_item else None
+        except Exception as lookup_error:
+            logger.warning(
+                "[DynamoDB] Failed to look up tenant_id for job while building execution_steps S3 key",
+                extra={
+                    'job_id': job_id,
+                    'error_type': type(lookup_error).__name__,
+                    'error_message': str(lookup_error)
+                }
+            )
+            # Don't cache failures; fall back to the legacy path for this write only
+            return None
+        self._job_tenant_ids[job_id] = tenant_id
+        return tenant_id
+    
+    def flush_execution_steps(self, job_id: str, s3_service=None) -> None:
+        """
+        Ensure the compacted execution_steps.json reflects the latest stored steps.
+        
+        Call at the end of an invocation (or on job status changes) so the API and
+        frontend, which read the compacted blob, see every step.
+        """
+        try:
+            self.execution_steps_store.flush(job_id, s3_service=s3_service)
+        except Exception as e:
+            logger.warning(f"[DynamoDB] Failed to flush execution_steps", extra={
+                'job_id': job_id,
+                'error_type': type(e).__name__,
+                'error_message': str(e)
+            })
+    
     def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
         """Get workflow by ID."""
         try:
@@ -306,6 +384,26 @@ class DynamoDBService:
             logger.error(f"Error getting form {form_id}: {e}")
             raise
     
+    def get_workflow_validator(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Get only the version/updated_at fields of a workflow (for cache revalidation)."""
+        return self._get_validator(self.workflows_table, {'workflow_id': workflow_id})
+    
+    def get_form_validator(self, form_id: str) -> Optional[Dict[str, Any]]:
+        """Get only the version/updated_at fields of a form (for cache revalidation)."""
+        return self._get_validator(self.forms_table, {'form_id': form_id})
+    
+    def _get_validator(self, table: Any, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            response = table.get_item(
+                Key=key,
+                ProjectionExpression='#v, updated_at, deleted_at',
+                ExpressionAttributeNames={'#v': 'version'}
+            )
+            return response.get('Item')
+        except Exception as e:
+            logger.error(f"Error getting validator for {key}: {e}")
+            raise
+    
     def get_template(self, template_id: str, version: int = 0) -> Optional[Dict[str, Any]]:
         """
         Get template by ID and version.
@@ -425,6 +523,20 @@ class DynamoDBService:
             # Don't fail the job if usage tracking fails
             pass
     
+    def put_usage_records(self, usage_records: List[Dict[str, Any]]):
+        """Create usage records with a batch writer (25 items per request, unprocessed items retried)."""
+        if not usage_records:
+            return
+        try:
+            with self.usage_records_table.batch_writer() as batch:
+                for usage_record in usage_records:
+                    batch.put_item(Item=usage_record)
+            logger.debug(f"Created {len(usage_records)} usage records")
+        except Exception as e:
+            logger.error(f"Error creating usage records: {e}")
+            # Don't fail the job if usage tracking fails
+            pass
+    
     def create_notification(
         self,
         tenant_id: str,
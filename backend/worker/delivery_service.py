@@ -9,14 +9,15 @@ import os
 import re
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-import boto3
 import requests
 
+from utils import http_client
 from utils.ulid_utils import new_ulid
 
 from ai_service import AIService
 from db_service import DynamoDBService
 
+from services.secrets_provider import get_secrets_provider
 from services.webhook_helper import WebhookPayloadBuilder
 
 logger = logging.getLogger(__name__)
@@ -87,7 +88,7 @@ class DeliveryService:
                 'webhook_url': webhook_url,
                 'timeout': 30
             })
-            response = requests.post(
+            response = http_client.post(
                 webhook_url,
                 json=payload,
                 headers=headers,
@@ -124,36 +125,25 @@ class DeliveryService:
         # Twilio secret is stored in us-east-1
         region = os.environ.get('AWS_REGION', 'us-east-1')
         
-        # Create a Secrets Manager client
-        session = boto3.session.Session()
-        client = session.client(
-            service_name='secretsmanager',
-            region_name=region
-        )
-        
         try:
-            response = client.get_secret_value(SecretId=secret_name)
+            # Cached process-wide; warm invocations skip the Secrets Manager round trip.
+            secret = get_secrets_provider().get_secret_string(secret_name, region)
             
-            # Parse the secret value
-            if 'SecretString' in response:
-                secret = response['SecretString']
-                # Handle both plain string and JSON format
-                try:
-                    secret_dict = json.loads(secret)
-                    return {
-                        'account_sid': secret_dict.get('TWILIO_ACCOUNT_SID', ''),
-                        'auth_token': secret_dict.get('TWILIO_AUTH_TOKEN', ''),
-                        'from_number': secret_dict.get('TWILIO_FROM_NUMBER', '')
-                    }
-                except json.JSONDecodeError:
-                    # If not JSON, try to parse as plain string (fallback)
-                    return {
-                        'account_sid': '',
-                        'auth_token': '',
-                        'from_number': ''
-                    }
-            else:
-                raise ValueError("Secret binary format not supported")
+            # Handle both plain string and JSON format
+            try:
+                secret_dict = json.loads(secret)
+                return {
+                    'account_sid': secret_dict.get('TWILIO_ACCOUNT_SID', ''),
+                    'auth_token': secret_dict.get('TWILIO_AUTH_TOKEN', ''),
+                    'from_number': secret_dict.get('TWILIO_FROM_NUMBER', '')
+                }
+            except json.JSONDecodeError:
+                # If not JSON, try to parse as plain string (fallback)
+                return {
+                    'account_sid': '',
+                    'auth_token': '',
+                    'from_number': ''
+                }
                 
         except Exception as e:
             logger.error(f"Failed to retrieve Twilio credentials: {e}")
@@ -269,7 +259,7 @@ class DeliveryService:
         try:
             # Send SMS via Twilio API
             logger.info(f"SMS Notification: Sending SMS to {phone_number} via Twilio...")
-            response = requests.post(
+            response = http_client.post(
                 f'https://api.twilio.com/2010-04-01/Accounts/{twilio_account_sid}/Messages.json',
                 auth=(twilio_account_sid, twilio_auth_token),
                 data={
@@ -497,7 +497,7 @@ class JobProcessor:
             step = steps[step_index]
             
             # Process the step using step processor
-            return self.step_processor.process_single_step(
+            result = self.step_processor.process_single_step(
                 step=step,
                 step_index=step_index,
                 steps=steps,
@@ -507,6 +507,10 @@ class JobProcessor:
                 execution_steps=execution_steps
             )
             
+            # This invocation ends here; publish the compacted execution_steps for the UI
+            self.db.flush_execution_steps(job_id, s3_service=self.s3)
+            return result
+            
         except Exception as e:
             logger.exception(f"Error processing step {step_index} for job {job_id}")
             
@@ -5,12 +5,47 @@ Handles all S3 operations for the worker.
 
 import os
 import logging
-from typing import Tuple, Union
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Tuple, Union
 import boto3
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
 
+# Objects larger than one part are uploaded with multipart upload, so at most one
+# part is buffered in memory (S3 requires parts of at least 5MB except the last).
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Content accepted by the streaming upload path
+StreamableContent = Union[str, bytes, bytearray, BinaryIO, Iterable[Union[str, bytes]]]
+
+
+def iter_content_chunks(content: Any, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield content as UTF-8 byte chunks without materializing a full encoded copy.
+
+    Accepts str, bytes, a binary file-like object (anything with read()), or an
+    iterable of str/bytes chunks.
+    """
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        view = memoryview(content)
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start:start + chunk_size])
+        return
+    if isinstance(content, str):
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size].encode('utf-8')
+        return
+    if hasattr(content, 'read'):
+        while True:
+            chunk = content.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+    for chunk in content:
+        if chunk:
+            yield chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+
 
 class S3Service:
     """Service for S3 operations."""
@@ -58,98 +93,281 @@ class S3Service:
     def upload_artifact(
         self,
         key: str,
-        content: Union[str, bytes],
+        content: StreamableContent,
         content_type: str = 'text/html',
         public: bool = False
     ) -> Tuple[str, str]:
         """
         Upload artifact to S3.
         
+        Bytes are sent as-is; strings, file-like objects and chunk iterables are
+        streamed (multipart for large objects) so they are never fully re-encoded in memory.
+        
         Args:
             key: S3 object key
-            content: Content to upload (string or bytes)
+            content: Content to upload (string, bytes, binary file-like object or chunk iterable)
             content_type: MIME type
             public: Whether to make object publicly accessible
             
         Returns:
             Tuple of (s3_url, public_url)
         """
-        if isinstance(content, bytes):
-            body = content
-            content_size = len(content)
+        _, content_size = self.upload_stream(key, content, content_type=content_type)
+        s3_url, public_url = self.get_artifact_urls(key, public=public)
+        logger.info(f"[S3] Artifact uploaded successfully", extra={
+            'key': key,
+            's3_url': s3_url,
+            'public_url_preview': public_url[:80] + '...' if len(public_url) > 80 else public_url,
+            'content_size_bytes': content_size,
+            'content_type': content_type
+        })
+        return s3_url, public_url
+    
+    def get_artifact_urls(self, key: str, public: bool = False) -> Tuple[str, str]:
+        """
+        Build the s3:// URL and the shareable URL for a stored artifact.
+        
+        Args:
+            key: S3 object key
+            public: Whether the object is publicly accessible via CloudFront
+            
+        Returns:
+            Tuple of (s3_url, public_url)
+        """
+        s3_url = f"s3://{self.bucket_name}/{key}"
+        
+        if public and self.cloudfront_domain:
+            # Use CloudFront URL for public access (recommended)
+            public_url = f"https://{self.cloudfront_domain}/{key}"
+            logger.info(f"[S3] Using CloudFront URL for public artifact", extra={
+                'key': key,
+                'public_url': public_url,
+                'cloudfront_domain': self.cloudfront_domain
+            })
         else:
-            body = content.encode('utf-8')
-            content_size = len(body)
+            # Generate presigned URL as fallback (max 7 days per AWS limits)
+            # Note: CloudFront URLs should be preferred as they don't expire
+            # Presigned URLs work regardless of ACL settings but will expire
+            logger.debug(f"[S3] Generating presigned URL", extra={'key': key, 'expires_in': 604800})
+            public_url = self.s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': self.bucket_name, 'Key': key},
+                ExpiresIn=604800  # Maximum allowed: 7 days (604800 seconds)
+            )
+            if public:
+                logger.warning(f"[S3] CloudFront domain not configured, using presigned URL instead", extra={
+                    'key': key,
+                    'public_url_length': len(public_url)
+                })
+        return s3_url, public_url
+    
+    def upload_stream(
+        self,
+        key: str,
+        content: StreamableContent,
+        content_type: str = 'application/octet-stream',
+        part_size: int = MULTIPART_PART_SIZE
+    ) -> Tuple[str, int]:
+        """
+        Upload content to S3 holding at most one part in memory.
+        
+        Content that fits in a single part is sent with put_object; larger content is
+        sent as a multipart upload (aborted on failure).
+        
+        Args:
+            key: S3 object key
+            content: String, bytes, binary file-like object or iterable of chunks
+            content_type: MIME type
+            part_size: Multipart part size in bytes (minimum 5MB)
+            
+        Returns:
+            Tuple of (ETag, bytes uploaded)
+        """
+        part_size = max(int(part_size), 5 * 1024 * 1024)
+        # Bytes already in memory go straight to put_object without copying.
+        if isinstance(content, (bytes, bytearray)) and len(content) <= part_size:
+            return self._put_object(key, bytes(content), content_type), len(content)
+        
         logger.info(f"[S3] Uploading artifact", extra={
             'key': key,
             'content_type': content_type,
-            'content_size_bytes': content_size,
-            'public': public,
             'bucket': self.bucket_name
         })
+        chunks = iter_content_chunks(content)
+        buffer = bytearray()
+        for chunk in chunks:
+            buffer.extend(chunk)
+            if len(buffer) >= part_size:
+                break
+        if len(buffer) < part_size:
+            # Everything fits in one part
+            return self._put_object(key, bytes(buffer), content_type), len(buffer)
         
-        try:
-            # Prepare upload parameters
-            put_params = {
-                'Bucket': self.bucket_name,
-                'Key': key,
-                'Body': body,
-                'ContentType': content_type,
-            }
-            
-            # Note: We don't set ACL='public-read' because the bucket blocks public ACLs.
-            # Public access is handled via CloudFront distribution.
-            
-            # Upload to S3
-            logger.debug(f"[S3] Calling put_object", extra={'key': key, 'bucket': self.bucket_name})
-            self.s3_client.put_object(**put_params)
-            
-            # Generate URLs
-            s3_url = f"s3://{self.bucket_name}/{key}"
+        def _remaining() -> Iterator[bytes]:
+            yield bytes(buffer)
+            yield from chunks
+        
+        return self._multipart_upload(key, content_type, _remaining(), part_size)
+    
+    def upload_with_copied_prefix(
+        self,
+        key: str,
+        source_key: str,
+        prefix_length: int,
+        tail: StreamableContent,
+        content_type: str = 'application/octet-stream',
+        part_size: int = MULTIPART_PART_SIZE
+    ) -> Tuple[str, int]:
+        """
+        Write key as the first prefix_length bytes of source_key followed by tail.
+        
+        The prefix is copied server-side (UploadPartCopy), so appending to a large
+        object never downloads it. source_key may equal key.
+        
+        Args:
+            key: Destination S3 object key
+            source_key: Object whose leading bytes are reused
+            prefix_length: Number of leading bytes to copy (at least 5MB)
+            tail: Content appended after the prefix
+            content_type: MIME type
+            part_size: Multipart part size in bytes for the tail
             
-            if public and self.cloudfront_domain:
-                # Use CloudFront URL for public access (recommended)
-                public_url = f"https://{self.cloudfront_domain}/{key}"
-                logger.info(f"[S3] Using CloudFront URL for public artifact", extra={
-                    'key': key,
-                    'public_url': public_url,
-                    'cloudfront_domain': self.cloudfront_domain
-                })
-            else:
-                # Generate presigned URL as fallback (max 7 days per AWS limits)
-                # Note: CloudFront URLs should be preferred as they don't expire
-                # Presigned URLs work regardless of ACL settings but will expire
-                logger.debug(f"[S3] Generating presigned URL", extra={'key': key, 'expires_in': 604800})
-                public_url = self.s3_client.generate_presigned_url(
-                    'get_object',
-                    Params={'Bucket': self.bucket_name, 'Key': key},
-                    ExpiresIn=604800  # Maximum allowed: 7 days (604800 seconds)
+        Returns:
+            Tuple of (ETag, total object size in bytes)
+        """
+        copy_part = {
+            'CopySource': {'Bucket': self.bucket_name, 'Key': source_key},
+            'CopySourceRange': f"bytes=0-{prefix_length - 1}",
+        }
+        etag, tail_size = self._multipart_upload(
+            key, content_type, iter_content_chunks(tail), part_size, copy_part=copy_part
+        )
+        return etag, prefix_length + tail_size
+    
+    def _multipart_upload(
+        self,
+        key: str,
+        content_type: str,
+        chunks: Iterator[bytes],
+        part_size: int,
+        copy_part: Optional[dict] = None
+    ) -> Tuple[str, int]:
+        """Multipart upload of streamed chunks (optionally after a server-side copied first part)."""
+        part_size = max(int(part_size), 5 * 1024 * 1024)
+        upload_id = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=key,
+            ContentType=content_type,
+        )['UploadId']
+        parts = []
+        total = 0
+        
+        def _upload_part(body: bytes) -> None:
+            part_number = len(parts) + 1
+            response = self.s3_client.upload_part(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )
+            parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+        
+        try:
+            if copy_part is not None:
+                response = self.s3_client.upload_part_copy(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=1,
+                    **copy_part,
                 )
-                if public:
-                    logger.warning(f"[S3] CloudFront domain not configured, using presigned URL instead", extra={
-                        'key': key,
-                        'public_url_length': len(public_url)
-                    })
+                parts.append({'ETag': response['CopyPartResult']['ETag'], 'PartNumber': 1})
+            
+            buffer = bytearray()
+            for chunk in chunks:
+                buffer.extend(chunk)
+                total += len(chunk)
+                while len(buffer) >= part_size:
+                    _upload_part(bytes(buffer[:part_size]))
+                    del buffer[:part_size]
+            if buffer or not parts:
+                _upload_part(bytes(buffer))
             
-            logger.info(f"[S3] Artifact uploaded successfully", extra={
+            response = self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts},
+            )
+            logger.debug(f"[S3] Completed multipart upload", extra={
                 'key': key,
-                's3_url': s3_url,
-                'public_url_preview': public_url[:80] + '...' if len(public_url) > 80 else public_url,
-                'content_size_bytes': content_size,
-                'content_type': content_type
+                'parts': len(parts),
+                'content_size_bytes': total
             })
-            return s3_url, public_url
-            
-        except ClientError as e:
+            return str(response.get('ETag') or ''), total
+        except Exception as e:
+            try:
+                self.s3_client.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+            except Exception:
+                logger.debug(f"[S3] Failed to abort multipart upload", extra={'key': key}, exc_info=True)
+            error_code = e.response.get('Error', {}).get('Code', 'Unknown') if isinstance(e, ClientError) else type(e).__name__
             logger.error(f"[S3] Error uploading artifact to S3", extra={
                 'key': key,
                 'bucket': self.bucket_name,
-                'error_code': e.response.get('Error', {}).get('Code', 'Unknown'),
+                'error_code': error_code,
                 'error_message': str(e),
-                'content_size_bytes': content_size
+                'content_size_bytes': total
             }, exc_info=True)
             raise
     
+    def _put_object(self, key: str, body: bytes, content_type: str) -> str:
+        try:
+            logger.debug(f"[S3] Calling put_object", extra={'key': key, 'bucket': self.bucket_name})
+            response = self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=body,
+                ContentType=content_type,
+            )
+            return str(response.get('ETag') or '')
+        except ClientError as e:
+            logger.error(f"[S3] Error uploading object to S3", extra={
+                'key': key,
+                'bucket': self.bucket_name,
+                'error_code': e.response.get('Error', {}).get('Code', 'Unknown'),
+                'content_size_bytes': len(body)
+            }, exc_info=True)
+            raise
+    
+    def get_image_urls(self, key: str, public: bool = True) -> Tuple[str, str]:
+        """
+        Build the s3:// URL and the public URL of an image uploaded with upload_image.
+        
+        Needs no S3 call, so callers can hand out the URL before the upload finishes.
+        
+        Args:
+            key: S3 object key
+            public: Whether the image is served publicly (always True for images)
+            
+        Returns:
+            Tuple of (s3_url, public_url)
+        """
+        s3_url = f"s3://{self.bucket_name}/{key}"
+
+        # Prefer CloudFront (or custom CDN hostname) when configured so customer-facing
+        # URLs live on your branded assets domain (e.g. assets.mycoursecreator360.com).
+        if public and self.cloudfront_domain:
+            public_url = f"https://{self.cloudfront_domain}/{key}"
+        else:
+            # Fallback: direct S3 public URL
+            # Format: https://{bucket}.s3.{region}.amazonaws.com/{key}
+            # Determine correct region for bucket (cc360-pages is in us-west-2)
+            region = os.environ.get('AWS_REGION', 'us-east-1')
+            bucket_region = "us-west-2" if self.bucket_name == "cc360-pages" else region
+            public_url = f"https://{self.bucket_name}.s3.{bucket_region}.amazonaws.com/{key}"
+        return s3_url, public_url
+    
     def upload_image(
         self,
         key: str,
@@ -189,18 +407,7 @@ class S3Service:
             self.s3_client.put_object(**put_params)
             
             # Generate URLs
-            s3_url = f"s3://{self.bucket_name}/{key}"
-
-            # Prefer CloudFront (or custom CDN hostname) when configured so customer-facing
-            # URLs live on your branded assets domain (e.g. assets.mycoursecreator360.com).
-            if public and self.cloudfront_domain:
-                public_url = f"https://{self.cloudfront_domain}/{key}"
-            else:
-                # Fallback: direct S3 public URL
-                # Format: https://{bucket}.s3.{region}.amazonaws.com/{key}
-                # Determine correct region for bucket (cc360-pages is in us-west-2)
-                bucket_region = "us-west-2" if self.bucket_name == "cc360-pages" else region
-                public_url = f"https://{self.bucket_name}.s3.{bucket_region}.amazonaws.com/{key}"
+            s3_url, public_url = self.get_image_urls(key, public=public)
             
             logger.info(f"[S3] Uploaded image to S3 with public access", extra={
                 'key': key,
@@ -234,3 +441,163 @@ class S3Service:
             logger.error(f"Error downloading from S3: {e}")
             raise
 
+    def open_artifact(self, key: str, byte_range: Optional[Tuple[int, Optional[int]]] = None) -> BinaryIO:
+        """
+        Open an S3 object as a streaming, file-like body.
+        
+        Args:
+            key: S3 object key
+            byte_range: Optional (start, end) inclusive byte range; end None reads to the end
+            
+        Returns:
+            Readable binary stream (botocore StreamingBody)
+        """
+        params = {'Bucket': self.bucket_name, 'Key': key}
+        if byte_range is not None:
+            start, end = byte_range
+            params['Range'] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            return self.s3_client.get_object(**params)['Body']
+        except ClientError as e:
+            logger.error(f"Error downloading from S3: {e}")
+            raise
+    
+    def iter_artifact(
+        self,
+        key: str,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        byte_range: Optional[Tuple[int, Optional[int]]] = None
+    ) -> Iterator[bytes]:
+        """
+        Stream an S3 object in chunks without buffering it whole.
+        
+        Args:
+            key: S3 object key
+            chunk_size: Chunk size in bytes
+            byte_range: Optional (start, end) inclusive byte range
+            
+        Yields:
+            Byte chunks
+        """
+        body = self.open_artifact(key, byte_range=byte_range)
+        try:
+            for chunk in body.iter_chunks(chunk_size):
+                yield chunk
+        finally:
+            body.close()
+    
+    def download_range(self, key: str, start: int, end: Optional[int] = None) -> bytes:
+        """
+        Download a byte range of an S3 object (ranged GET).
+        
+        Args:
+            key: S3 object key
+            start: First byte offset
+            end: Last byte offset, inclusive (None = end of object)
+            
+        Returns:
+            Bytes in the range
+        """
+        body = self.open_artifact(key, byte_range=(start, end))
+        try:
+            return body.read()
+        finally:
+            body.close()
+    
+    def download_artifact_to_file(self, key: str, fileobj: BinaryIO) -> None:
+        """
+        Download an S3 object into a writable binary file object (e.g. a temp file).
+        
+        Args:
+            key: S3 object key
+            fileobj: Destination opened in binary write mode
+        """
+        try:
+            self.s3_client.download_fileobj(self.bucket_name, key, fileobj)
+        except ClientError as e:
+            logger.error(f"Error downloading from S3: {e}")
+            raise
+    
+    def put_bytes(
+        self,
+        key: str,
+        body: Union[str, bytes],
+        content_type: str = 'application/json'
+    ) -> str:
+        """
+        Upload a small object without generating URLs.
+        
+        Used for internal bookkeeping objects (e.g. execution_steps entries and
+        manifests) where the caller only needs the stored version.
+        
+        Args:
+            key: S3 object key
+            body: Content to upload (string or bytes)
+            content_type: MIME type
+            
+        Returns:
+            ETag of the stored object
+        """
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return self._put_object(key, body, content_type)
+    
+    def download_bytes(self, key: str) -> Optional[bytes]:
+        """
+        Download raw object bytes from S3.
+        
+        Args:
+            key: S3 object key
+            
+        Returns:
+            Object bytes, or None if the object does not exist
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+            return response['Body'].read()
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return None
+            logger.error(f"Error downloading from S3: {e}")
+            raise
+    
+    def head_object(self, key: str) -> Optional[dict]:
+        """
+        Get an S3 object's ETag and size without downloading it.
+        
+        Args:
+            key: S3 object key
+            
+        Returns:
+            Dict with etag and size, or None if the object does not exist
+        """
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+            return {
+                'etag': str(response.get('ETag') or ''),
+                'size': int(response.get('ContentLength') or 0),
+            }
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404', 'NotFound'):
+                return None
+            logger.error(f"Error reading S3 object metadata: {e}")
+            raise
+    
+    def get_etag(self, key: str) -> Optional[str]:
+        """
+        Get the ETag of an S3 object without downloading it.
+        
+        Args:
+            key: S3 object key
+            
+        Returns:
+            ETag string, or None if the object does not exist
+        """
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+            return str(response.get('ETag') or '')
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404', 'NotFound'):
+                return None
+            logger.error(f"Error reading S3 object metadata: {e}")
+            raise
@@ -1,5 +1,9 @@
 import logging
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import Callable, Dict, Any, List, Optional, Tuple
 
@@ -7,6 +11,7 @@ from services.openai_client import OpenAIClient
 from services.image_handler import ImageHandler
 from services.prompt_overrides import resolve_prompt_override
 from core.prompts import PROMPT_CONFIGS, IMAGE_PROMPT_PLANNER_INSTRUCTIONS, IMAGE_PROMPT_PLANNER_INPUT_TEMPLATE
+from utils.images.payload import ImagePayload
 
 logger = logging.getLogger(__name__)
 
@@ -223,10 +228,65 @@ class ImagePromptPlanner:
         return {}
 
 
+def _read_concurrency(name: str, default: int) -> int:
+    value = (os.environ.get(name) or "").strip()
+    if not value:
+        return default
+    try:
+        parsed = int(value)
+    except Exception:
+        return default
+    return parsed if parsed > 0 else default
+
+
+# Plan items generated at once for one step.
+IMAGE_GENERATION_CONCURRENCY = _read_concurrency("IMAGE_GENERATION_CONCURRENCY", 6)
+# Images API requests in flight per tenant across all steps/jobs in this process.
+IMAGE_GENERATION_TENANT_CONCURRENCY = _read_concurrency("IMAGE_GENERATION_TENANT_CONCURRENCY", 6)
+
+
+class TenantConcurrencyLimiter:
+    """Bounds in-flight requests per tenant so one tenant's plans cannot monopolize the Images API quota."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, tenant_id: Optional[str]) -> threading.BoundedSemaphore:
+        key = tenant_id or ""
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.limit)
+                self._semaphores[key] = semaphore
+            return semaphore
+
+    @contextmanager
+    def acquire(self, tenant_id: Optional[str]):
+        semaphore = self._semaphore(tenant_id)
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+_tenant_limiter = TenantConcurrencyLimiter(IMAGE_GENERATION_TENANT_CONCURRENCY)
+
+
 class ImagesApiRunner:
-    def __init__(self, openai_client: OpenAIClient, image_handler: ImageHandler):
+    def __init__(
+        self,
+        openai_client: OpenAIClient,
+        image_handler: ImageHandler,
+        max_concurrency: int = IMAGE_GENERATION_CONCURRENCY,
+        tenant_limiter: Optional[TenantConcurrencyLimiter] = None,
+    ):
         self.openai_client = openai_client
         self.image_handler = image_handler
+        self.max_concurrency = max_concurrency
+        self.tenant_limiter = tenant_limiter or _tenant_limiter
 
     def generate_images(
         self,
@@ -240,7 +300,16 @@ class ImagesApiRunner:
         step_name: Optional[str],
         step_instructions: str,
         progress_callback: Optional[Callable[[str, str], None]] = None,
+        on_image: Optional[Callable[[str], None]] = None,
     ) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Generate one image per plan item.
+
+        Images API calls run concurrently (bounded by max_concurrency and the per-tenant
+        limiter). Results are uploaded and reported in plan order as soon as each item and
+        every item before it has finished, so image numbering stays stable while uploads
+        overlap with the remaining generations.
+        """
         image_urls: List[str] = []
         images_output: List[Dict[str, Any]] = []
         valid_plan = [
@@ -249,72 +318,94 @@ class ImagesApiRunner:
             if isinstance(item.prompt, str) and item.prompt.strip()
         ]
         total_images = len(valid_plan)
+        if total_images == 0:
+            return image_urls, images_output
 
-        for image_index, plan_item in enumerate(valid_plan, start=1):
-            prompt = plan_item.prompt.strip()
-            label = plan_item.label
+        progress_lock = threading.Lock()
 
+        def report_progress(message: str) -> None:
             if progress_callback:
-                progress_callback(
-                    f"Generating image {image_index}/{total_images}: {label}",
-                    "generating",
+                with progress_lock:
+                    progress_callback(message, "generating")
+
+        def generate(image_index: int, plan_item: ImagePlanItem) -> List[Any]:
+            with self.tenant_limiter.acquire(tenant_id):
+                report_progress(f"Generating image {image_index}/{total_images}: {plan_item.label}")
+                img_resp = self.openai_client.generate_images(
+                    model=image_model,
+                    prompt=plan_item.prompt.strip(),
+                    n=1,
+                    size=config.size,
+                    quality=config.quality,
+                    background=config.background,
+                    output_format=config.output_format,
+                    output_compression=config.output_compression,
+                    response_format="b64_json",
                 )
+            # Decode here so only raw bytes (not the larger base64 response) wait for upload
+            return [self._decode_item(data_item, can_upload) for data_item in (getattr(img_resp, "data", None) or [])]
+
+        can_upload = bool(tenant_id and job_id)
+        workers = max(1, min(self.max_concurrency, total_images))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-gen") as executor:
+            futures = [
+                executor.submit(generate, image_index, plan_item)
+                for image_index, plan_item in enumerate(valid_plan, start=1)
+            ]
+            try:
+                for image_index, (plan_item, future) in enumerate(zip(valid_plan, futures), start=1):
+                    decoded_items = future.result()
+                    prompt = plan_item.prompt.strip()
+                    label = plan_item.label
+
+                    for decoded in decoded_items:
+                        url = None
+                        if isinstance(decoded, ImagePayload):
+                            url = self.image_handler.upload_image_payload(
+                                decoded,
+                                tenant_id=tenant_id,
+                                job_id=job_id,
+                                filename=None,
+                                context=full_context,
+                                step_name=step_name,
+                                step_instructions=step_instructions,
+                                image_index=len(image_urls),
+                            )
+                        else:
+                            url = decoded
+
+                        if url:
+                            image_urls.append(url)
+                            images_output.append(
+                                {
+                                    "label": label,
+                                    "prompt": prompt,
+                                    "url": url,
+                                }
+                            )
+                            if on_image:
+                                on_image(url)
+                            report_progress(f"Generated image {image_index}/{total_images}: {label}")
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
 
-            img_resp = self.openai_client.generate_images(
-                model=image_model,
-                prompt=prompt,
-                n=1,
-                size=config.size,
-                quality=config.quality,
-                background=config.background,
-                output_format=config.output_format,
-                output_compression=config.output_compression,
-                response_format="b64_json",
-            )
+        return image_urls, images_output
 
-            data_items = getattr(img_resp, "data", None) or []
-            for data_item in data_items:
-                b64 = None
-                if isinstance(data_item, dict):
-                    b64 = data_item.get("b64_json")
-                else:
-                    b64 = getattr(data_item, "b64_json", None)
-
-                url = None
-                if b64 and tenant_id and job_id:
-                    url = self.image_handler.upload_base64_image_to_s3(
-                        image_b64=b64,
-                        content_type="image/png",
-                        tenant_id=tenant_id,
-                        job_id=job_id,
-                        filename=None,
-                        context=full_context,
-                        step_name=step_name,
-                        step_instructions=step_instructions,
-                        image_index=len(image_urls),
-                    )
-                else:
-                    if isinstance(data_item, dict):
-                        url = data_item.get("url")
-                    else:
-                        url = getattr(data_item, "url", None)
-
-                if url:
-                    image_urls.append(url)
-                    images_output.append(
-                        {
-                            "label": label,
-                            "prompt": prompt,
-                            "url": url,
-                        }
-                    )
-                    if progress_callback:
-                        progress_callback(
-                            f"Generated image {image_index}/{total_images}: {label}",
-                            "generating",
-                        )
+    @staticmethod
+    def _decode_item(data_item: Any, can_upload: bool) -> Any:
+        """ImagePayload for base64 results we will upload, otherwise the item's URL (or None)."""
+        if isinstance(data_item, dict):
+            b64 = data_item.get("b64_json")
+            url = data_item.get("url")
+        else:
+            b64 = getattr(data_item, "b64_json", None)
+            url = getattr(data_item, "url", None)
+        if b64 and can_upload:
+            return ImagePayload.from_base64(b64, "image/png")
+        return url
 
-        return image_urls, images_output
 
 class ImageGenerator:
     """
@@ -347,13 +438,15 @@ class ImageGenerator:
         step_instructions: str,
         prompt_overrides: Optional[Dict[str, Any]] = None,
         progress_callback: Optional[Callable[[str, str], None]] = None,
+        on_image: Optional[Callable[[str], None]] = None,
     ) -> Tuple[str, Dict, Dict, Dict]:
         """
         Image-generation path using the Images API.
 
         We first ask the step's main model to produce a JSON "image plan" (prompts + labels),
         optionally using non-image tools like web_search. Then we call Images API for each prompt
-        using the configured gpt-image* model, upload results to S3, and return image URLs.
+        (concurrently) using the configured gpt-image* model, upload results to S3, and return
+        image URLs. on_image receives each URL as soon as it is uploaded.
         """
         logger.info("[ImageGenerator] Using Images API for image_generation", extra={
             'job_id': job_id,
@@ -405,6 +498,7 @@ class ImageGenerator:
             step_name=step_name,
             step_instructions=step_instructions,
             progress_callback=progress_callback,
+            on_image=on_image,
         )
 
         output_obj = {
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
+from typing import Callable, Optional, Dict, Any, List
 
 
 @dataclass(frozen=True)
@@ -30,3 +30,5 @@ class ReportContext:
     full_context: str
     step_name: Optional[str]
     step_instructions: str
+    cache_response: bool = False
+    on_image: Optional[Callable[[str], None]] = None
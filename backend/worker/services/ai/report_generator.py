@@ -4,7 +4,7 @@ Handles the core logic for generating AI reports, including tool validation,
 CUA loops, Shell loops, and standard OpenAI API interactions.
 """
 
-from typing import Optional, Dict, Tuple, List, Any
+from typing import Callable, Optional, Dict, Tuple, List, Any
 
 from core.logger import get_logger
 from services.tools import ToolBuilder, ToolValidator
@@ -89,6 +89,8 @@ class ReportGenerator:
         text_verbosity: Optional[str] = None,
         max_output_tokens: Optional[int] = None,
         shell_settings: Optional[Dict[str, Any]] = None,
+        cache_response: bool = False,
+        on_image: Optional[Callable[[str], None]] = None,
     ) -> Tuple[str, Dict, Dict, Dict]:
         """
         Generate a report using OpenAI with configurable tools.
@@ -103,6 +105,8 @@ class ReportGenerator:
             tenant_id: Optional tenant ID for image storage context
             job_id: Optional job ID for image storage context
             previous_image_urls: Optional list of image URLs from previous steps to include in input
+            cache_response: Reuse a stored result for an identical request (standard strategy only)
+            on_image: Called with each generated image URL as soon as it is stored (Images API path)
             
         Returns:
             Tuple of (generated report content, usage info dict, request details dict, response details dict)
@@ -227,6 +231,8 @@ class ReportGenerator:
             full_context=full_context,
             step_name=self._current_step_name,
             step_instructions=self._current_step_instructions or instructions,
+            cache_response=cache_response,
+            on_image=on_image,
         )
 
         for strategy in (
@@ -59,6 +59,7 @@ class CUALoopStrategy:
             max_duration_seconds=900,
             tenant_id=ctx.tenant_id,
             job_id=ctx.job_id,
+            step_index=ctx.step_index,
         )
 
         cost_data = calculate_openai_cost(
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Optional, Dict, Any, Tuple, List
 from services.ai.image_generator import ImageGenerator
 from services.ai.report_context import ReportContext
+from services.live_step_writer import get_live_step_writer
 from services.prompt_overrides import get_prompt_overrides
 
 logger = logging.getLogger(__name__)
@@ -40,7 +41,7 @@ class ImageGenerationStrategy:
             live_step["error"] = error
 
         try:
-            self.db_service.update_job(job_id, {"live_step": live_step})
+            get_live_step_writer().submit(self.db_service, job_id, live_step)
         except Exception:
             logger.debug(
                 "[ImageGenerationStrategy] Failed to persist live_step",
@@ -86,6 +87,7 @@ class ImageGenerationStrategy:
                     step_instructions=ctx.step_instructions,
                     prompt_overrides=prompt_overrides,
                     progress_callback=record_progress,
+                    on_image=ctx.on_image,
                 )
             )
             self._persist_live_step(
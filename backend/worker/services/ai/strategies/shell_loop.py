@@ -6,6 +6,7 @@ from typing import Optional, Dict, Any, List, Tuple
 from core.logger import get_logger
 from services.ai.report_context import ReportContext
 from services.image_handler import ImageHandler
+from services.live_step_writer import get_live_step_writer
 from services.openai_client import OpenAIClient
 from services.tools.execution import ShellLoopService
 
@@ -68,7 +69,7 @@ class ShellLoopStrategy:
                     live_step["truncated"] = True
                 if payload.get("error"):
                     live_step["error"] = payload.get("error")
-                self.db_service.update_job(ctx.job_id, {"live_step": live_step})
+                get_live_step_writer().submit(self.db_service, ctx.job_id, live_step)
             except Exception:
                 logger.debug("[ReportGenerator] Failed to persist shell live_step", exc_info=True)
 
@@ -6,7 +6,9 @@ from typing import Optional, Dict, Any, Tuple
 from core.logger import get_logger
 from services.ai.report_context import ReportContext
 from services.image_handler import ImageHandler
+from services.live_step_writer import get_live_step_writer
 from services.openai_client import OpenAIClient
+from services.response_cache import ResponseCache, get_response_cache
 
 logger = get_logger(__name__)
 
@@ -26,51 +28,13 @@ class StandardReportStrategy:
 
     def execute(self, ctx: ReportContext) -> Tuple[str, Dict, Dict, Dict]:
         try:
-            logger.debug("[ReportGenerator] About to build API params", extra={
-                "model": ctx.model,
-                "normalized_tool_choice": ctx.normalized_tool_choice,
-                "validated_tools_count": len(ctx.validated_tools) if ctx.validated_tools else 0,
-            })
-
-            params = self.openai_client.build_api_params(
-                model=ctx.model,
-                instructions=ctx.instructions,
-                input_text=ctx.input_text,
-                tools=ctx.validated_tools,
-                tool_choice=ctx.normalized_tool_choice,
-                has_computer_use=ctx.has_computer_use,
-                reasoning_level=None,
-                previous_image_urls=ctx.previous_image_urls if ctx.has_image_generation else None,
-                job_id=ctx.job_id,
-                tenant_id=ctx.tenant_id,
-                reasoning_effort=ctx.reasoning_effort,
-                text_verbosity=ctx.text_verbosity,
-                max_output_tokens=ctx.max_output_tokens,
-                service_tier=ctx.service_tier,
-                output_format=ctx.output_format,
-            )
-
-            logger.info("[ReportGenerator] Making OpenAI API call", extra={
-                "model": ctx.model,
-                "has_tools": "tools" in params,
-                "tools_count": len(params.get("tools", [])) if "tools" in params else 0,
-                "has_tool_choice": "tool_choice" in params,
-                "tool_choice": params.get("tool_choice"),
-            })
-
-            step_order = (ctx.step_index + 1) if isinstance(ctx.step_index, int) else None
-            should_stream_live = (
-                self.db_service is not None
-                and isinstance(ctx.job_id, str)
-                and ctx.job_id.strip() != ""
-                and isinstance(step_order, int)
-                and step_order > 0
-                and not ctx.has_computer_use
-                and not ctx.has_shell
-                and self.openai_client.supports_responses()
-            )
+            params = self._build_params(ctx)
+            response_cache, s3_service, cached = self._lookup_cached(ctx, params)
+            if cached is not None:
+                return cached
 
-            if should_stream_live:
+            step_order = self._live_step_order(ctx)
+            if step_order is not None:
                 logger.info("[ReportGenerator] Using streamed Responses API call", extra={
                     "job_id": ctx.job_id,
                     "tenant_id": ctx.tenant_id,
@@ -80,35 +44,118 @@ class StandardReportStrategy:
             else:
                 response = self.openai_client.make_api_call(params)
 
-            return self.openai_client.process_api_response(
-                response=response,
-                model=ctx.model,
-                instructions=ctx.instructions,
-                input_text=ctx.input_text,
-                previous_context=ctx.previous_context,
-                context=ctx.context,
-                tools=ctx.validated_tools,
-                tool_choice=ctx.normalized_tool_choice,
-                params=params,
-                image_handler=self.image_handler,
-                tenant_id=ctx.tenant_id,
-                job_id=ctx.job_id,
-                step_name=ctx.step_name,
-                step_instructions=ctx.step_instructions,
-            )
+            return self._process_response(ctx, params, response, response_cache, s3_service)
 
         except Exception as e:
-            return self.openai_client.handle_openai_error(
-                error=e,
-                model=ctx.model,
-                tools=ctx.validated_tools,
-                tool_choice=ctx.normalized_tool_choice,
-                instructions=ctx.instructions,
-                context=ctx.context,
-                full_context=ctx.full_context,
-                previous_context=ctx.previous_context,
-                image_handler=self.image_handler,
-            )
+            return self._handle_error(ctx, e)
+
+    def _build_params(self, ctx: ReportContext) -> Dict[str, Any]:
+        logger.debug("[ReportGenerator] About to build API params", extra={
+            "model": ctx.model,
+            "normalized_tool_choice": ctx.normalized_tool_choice,
+            "validated_tools_count": len(ctx.validated_tools) if ctx.validated_tools else 0,
+        })
+
+        params = self.openai_client.build_api_params(
+            model=ctx.model,
+            instructions=ctx.instructions,
+            input_text=ctx.input_text,
+            tools=ctx.validated_tools,
+            tool_choice=ctx.normalized_tool_choice,
+            has_computer_use=ctx.has_computer_use,
+            reasoning_level=None,
+            previous_image_urls=ctx.previous_image_urls if ctx.has_image_generation else None,
+            job_id=ctx.job_id,
+            tenant_id=ctx.tenant_id,
+            reasoning_effort=ctx.reasoning_effort,
+            text_verbosity=ctx.text_verbosity,
+            max_output_tokens=ctx.max_output_tokens,
+            service_tier=ctx.service_tier,
+            output_format=ctx.output_format,
+        )
+
+        logger.info("[ReportGenerator] Making OpenAI API call", extra={
+            "model": ctx.model,
+            "has_tools": "tools" in params,
+            "tools_count": len(params.get("tools", [])) if "tools" in params else 0,
+            "has_tool_choice": "tool_choice" in params,
+            "tool_choice": params.get("tool_choice"),
+        })
+        return params
+
+    def _lookup_cached(
+        self, ctx: ReportContext, params: Dict[str, Any]
+    ) -> Tuple[Optional[ResponseCache], Any, Optional[Tuple[str, Dict, Dict, Dict]]]:
+        response_cache = get_response_cache() if ctx.cache_response else None
+        s3_service = getattr(self.image_handler, "s3_service", None)
+        if response_cache is None:
+            return None, s3_service, None
+        cached = response_cache.get(s3_service, ctx.tenant_id, params)
+        if cached is not None:
+            logger.info("[ReportGenerator] Response cache hit; skipping OpenAI call", extra={
+                "job_id": ctx.job_id,
+                "tenant_id": ctx.tenant_id,
+                "step_index": ctx.step_index,
+                "fingerprint": cached[3]["response_cache"]["fingerprint"],
+                "cache_stats": response_cache.get_stats(),
+            })
+        return response_cache, s3_service, cached
+
+    def _live_step_order(self, ctx: ReportContext) -> Optional[int]:
+        """Step order to stream live output for, or None for a plain call."""
+        step_order = (ctx.step_index + 1) if isinstance(ctx.step_index, int) else None
+        should_stream_live = (
+            self.db_service is not None
+            and isinstance(ctx.job_id, str)
+            and ctx.job_id.strip() != ""
+            and isinstance(step_order, int)
+            and step_order > 0
+            and not ctx.has_computer_use
+            and not ctx.has_shell
+            and self.openai_client.supports_responses()
+        )
+        return step_order if should_stream_live else None
+
+    def _process_response(
+        self,
+        ctx: ReportContext,
+        params: Dict[str, Any],
+        response: Any,
+        response_cache: Optional[ResponseCache],
+        s3_service: Any,
+    ) -> Tuple[str, Dict, Dict, Dict]:
+        result = self.openai_client.process_api_response(
+            response=response,
+            model=ctx.model,
+            instructions=ctx.instructions,
+            input_text=ctx.input_text,
+            previous_context=ctx.previous_context,
+            context=ctx.context,
+            tools=ctx.validated_tools,
+            tool_choice=ctx.normalized_tool_choice,
+            params=params,
+            image_handler=self.image_handler,
+            tenant_id=ctx.tenant_id,
+            job_id=ctx.job_id,
+            step_name=ctx.step_name,
+            step_instructions=ctx.step_instructions,
+        )
+        if response_cache is not None and result[0]:
+            response_cache.put(s3_service, ctx.tenant_id, params, result)
+        return result
+
+    def _handle_error(self, ctx: ReportContext, error: Exception) -> Tuple[str, Dict, Dict, Dict]:
+        return self.openai_client.handle_openai_error(
+            error=error,
+            model=ctx.model,
+            tools=ctx.validated_tools,
+            tool_choice=ctx.normalized_tool_choice,
+            instructions=ctx.instructions,
+            context=ctx.context,
+            full_context=ctx.full_context,
+            previous_context=ctx.previous_context,
+            image_handler=self.image_handler,
+        )
 
     def _make_streamed_call(self, job_id: str, step_order: int, params: Dict[str, Any]) -> Any:
         logger.info("[ReportGenerator] Streaming Responses API output_text deltas", extra={
@@ -127,12 +174,12 @@ class StandardReportStrategy:
                 output_text = response.choices[0].message.content or ""
             if self.db_service:
                 try:
-                    self.db_service.update_job(job_id, {"live_step": {
+                    get_live_step_writer().submit(self.db_service, job_id, {
                         "step_order": step_order,
                         "output_text": output_text,
                         "updated_at": datetime.utcnow().isoformat(),
                         "status": "final",
-                    }})
+                    })
                 except Exception as persist_err:
                     logger.debug("[ReportGenerator] Failed to persist live_step (fallback)", extra={
                         "job_id": job_id,
@@ -237,15 +284,8 @@ class StandardReportStrategy:
                 live_step["truncated"] = True
             if error:
                 live_step["error"] = error
-            try:
-                self.db_service.update_job(job_id, {"live_step": live_step})
-            except Exception as persist_err:
-                logger.debug("[ReportGenerator] Failed to persist live_step", extra={
-                    "job_id": job_id,
-                    "step_order": step_order,
-                    "error_type": type(persist_err).__name__,
-                    "error_message": str(persist_err),
-                })
+            # Buffered: streaming snapshots are coalesced and written in the background
+            get_live_step_writer().submit(self.db_service, job_id, live_step)
 
         def _extract_tool_label(item: Any) -> Optional[str]:
             tool_name = (
@@ -117,6 +117,7 @@ class AIStepProcessor:
         step_shell_settings = step.get("shell_settings")
         if not isinstance(step_shell_settings, dict):
             step_shell_settings = None
+        step_cache_response = step.get('cache_response') is True
         
         logger.info(f"[AIStepProcessor] Processing AI step {step_index + 1}", extra={
             'job_id': job_id,
@@ -133,6 +134,16 @@ class AIStepProcessor:
         # Set step context for AI naming
         self.ai_service.set_step_context(step_name, step_instructions)
         
+        # Image artifacts are stored as images arrive (Images API path) and completed below
+        image_artifact_stream = self.image_artifact_service.open_stream(
+            tenant_id=tenant_id,
+            job_id=job_id,
+            step_index=step_index,
+            step_name=step_name,
+            step_instructions=step_instructions,
+            context=current_step_context
+        )
+        
         try:
             # Generate step output
             step_output, usage_info, request_details, response_details = self.ai_service.generate_report(
@@ -152,7 +163,12 @@ class AIStepProcessor:
                 text_verbosity=step_text_verbosity,
                 max_output_tokens=step_max_output_tokens,
                 shell_settings=step_shell_settings,
+                cache_response=step_cache_response,
+                on_image=image_artifact_stream.add,
             )
+        except Exception:
+            image_artifact_stream.close()
+            raise
         finally:
             # Clean up step context
             self.ai_service.set_step_context(None, None)
@@ -282,6 +298,8 @@ class AIStepProcessor:
                     artifact_type="shell_executor_logs",
                     content=log_content,
                     filename=f"step_{step_index + 1}_{safe_step_name}_shell_executor_logs.json",
+                    background=True,
+                    step_index=step_index,
                 )
                 response_details["shell_logs_artifact_id"] = log_artifact_id
             except Exception as log_error:
@@ -314,6 +332,8 @@ class AIStepProcessor:
                     artifact_type="code_executor_logs",
                     content=log_content,
                     filename=f"step_{step_index + 1}_{safe_step_name}_code_executor_logs.json",
+                    background=True,
+                    step_index=step_index,
                 )
                 response_details["code_executor_logs_artifact_id"] = log_artifact_id
             except Exception as log_error:
@@ -351,15 +371,7 @@ class AIStepProcessor:
             'image_urls_type': type(image_urls).__name__
         })
         
-        image_artifact_ids = self.image_artifact_service.store_image_artifacts(
-            image_urls=image_urls,
-            tenant_id=tenant_id,
-            job_id=job_id,
-            step_index=step_index,
-            step_name=step_name,
-            step_instructions=step_instructions,
-            context=current_step_context
-        )
+        image_artifact_ids = image_artifact_stream.finish(image_urls)
         
         logger.info("[AIStepProcessor] Image artifacts stored", extra={
             'job_id': job_id,
@@ -6,11 +6,11 @@ Handles retrieval of OpenAI API key from AWS Secrets Manager.
 import logging
 import os
 import json
-import boto3
 from typing import Optional
 
 from core.config import settings
 from core.logger import get_logger
+from services.secrets_provider import get_secrets_provider
 
 logger = get_logger(__name__)
 
@@ -49,34 +49,20 @@ class APIKeyManager:
             'region': region
         })
         
-        # Create a Secrets Manager client
-        session = boto3.session.Session()
-        client = session.client(
-            service_name='secretsmanager',
-            region_name=region
-        )
-        
         try:
-            logger.debug(f"[APIKeyManager] Calling get_secret_value for secret: {secret_name}")
-            response = client.get_secret_value(SecretId=secret_name)
-            
-            # Parse the secret value
-            if 'SecretString' in response:
-                secret = response['SecretString']
-                logger.debug(f"[APIKeyManager] Secret retrieved successfully, length: {len(secret)}")
-                # Handle both plain string and JSON format
-                try:
-                    secret_dict = json.loads(secret)
-                    api_key = secret_dict.get('api_key', secret_dict.get('OPENAI_API_KEY', secret))
-                    logger.info(f"[APIKeyManager] Successfully parsed JSON secret, API key length: {len(api_key) if api_key else 0}")
-                    return api_key
-                except json.JSONDecodeError:
-                    logger.debug(f"[APIKeyManager] Secret is plain string format, using directly")
-                    return secret
-            else:
-                logger.error(f"[APIKeyManager] Secret binary format not supported")
-                raise ValueError("Secret binary format not supported")
-                
+            logger.debug(f"[APIKeyManager] Getting secret value for secret: {secret_name}")
+            # Cached process-wide; warm invocations reuse the key without calling Secrets Manager.
+            secret = get_secrets_provider().get_secret_string(secret_name, region)
+            logger.debug(f"[APIKeyManager] Secret retrieved successfully, length: {len(secret)}")
+            # Handle both plain string and JSON format
+            try:
+                secret_dict = json.loads(secret)
+                api_key = secret_dict.get('api_key', secret_dict.get('OPENAI_API_KEY', secret))
+                logger.info(f"[APIKeyManager] Successfully parsed JSON secret, API key length: {len(api_key) if api_key else 0}")
+                return api_key
+            except json.JSONDecodeError:
+                logger.debug(f"[APIKeyManager] Secret is plain string format, using directly")
+                return secret
         except Exception as e:
             logger.error(f"[APIKeyManager] Failed to retrieve OpenAI API key from Secrets Manager", extra={
                 'secret_name': secret_name,
@@ -0,0 +1,476 @@
+"""
+Browser Pool
+Warm Chromium instances shared by CUA loops, browser automation and PDF generation.
+
+Launching the Playwright driver and Chromium is the largest fixed cost of a CUA or PDF
+step. The pool keeps the browser running between uses and hands out a fresh
+BrowserContext per lease, so cookies, storage and pages never carry over between jobs.
+
+Playwright objects are bound to the thread (sync API) or event loop (async API) that
+created them, so BrowserPool keeps one warm browser per thread and AsyncBrowserPool one
+per event loop. A browser is replaced when its health check fails and recycled after
+BROWSER_POOL_MAX_USES leases.
+
+Only long-lived threads keep a browser warm between leases: the main thread and threads
+marked with keep_browsers_warm_on_current_thread() (the process-wide step scheduler
+workers). Other threads come and go, and a browser left on an exited thread can no
+longer be closed, so there the browser is closed with its last lease.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from services.browser_config import env_flag_is_false, should_disable_sandbox, should_use_single_process
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_USES = 25
+
+# Threads that live for the whole process and may keep a browser between leases.
+_warm_threads = threading.local()
+
+
+def _read_max_uses() -> int:
+    value = (os.environ.get("BROWSER_POOL_MAX_USES") or "").strip()
+    if not value:
+        return DEFAULT_MAX_USES
+    try:
+        parsed = int(value)
+    except Exception:
+        return DEFAULT_MAX_USES
+    return parsed if parsed > 0 else DEFAULT_MAX_USES
+
+
+def _read_enabled() -> bool:
+    return not env_flag_is_false(os.environ.get("BROWSER_POOL_ENABLED"))
+
+
+def keep_browsers_warm_on_current_thread() -> None:
+    """Mark the calling thread as long-lived, so its browser stays warm between leases."""
+    _warm_threads.enabled = True
+
+
+def chromium_launch_args() -> List[str]:
+    """Chromium flags used for every headless launch in the worker."""
+    launch_args = [
+        "--disable-gpu",
+        "--disable-dev-shm-usage",
+        "--disable-accelerated-2d-canvas",
+        "--disable-web-security",
+    ]
+    if should_disable_sandbox():
+        launch_args += ["--no-sandbox", "--disable-setuid-sandbox"]
+    if should_use_single_process():
+        launch_args += ["--single-process"]  # Useful in Lambda; can crash locally
+    return launch_args
+
+
+class _WarmBrowser:
+    """A launched browser plus its lease bookkeeping."""
+
+    __slots__ = ("playwright", "browser", "launch_ms", "uses", "active", "retired")
+
+    def __init__(self, playwright: Any, browser: Any, launch_ms: float):
+        self.playwright = playwright
+        self.browser = browser
+        self.launch_ms = launch_ms
+        self.uses = 0
+        self.active = 0
+        self.retired = False
+
+
+class _BrowserPoolBase:
+    """Lease accounting and metrics shared by the sync and async pools."""
+
+    def __init__(self, max_uses: Optional[int] = None, enabled: Optional[bool] = None):
+        self.max_uses = max_uses if max_uses is not None else _read_max_uses()
+        self.enabled = enabled if enabled is not None else _read_enabled()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            'launches': 0,
+            'leases': 0,
+            'reuses': 0,
+            'recycled': 0,
+            'unhealthy': 0,
+            'closed': 0,
+            'launch_ms_total': 0.0,
+            'last_launch_ms': None,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _record_launch(self, launch_ms: float) -> None:
+        with self._stats_lock:
+            self._stats['launches'] += 1
+            self._stats['launch_ms_total'] += launch_ms
+            self._stats['last_launch_ms'] = launch_ms
+        logger.info("[BrowserPool] Launched Chromium", extra={
+            'launch_ms': round(launch_ms, 1),
+            'pooled': self.enabled,
+            'max_uses': self.max_uses,
+        })
+
+    @staticmethod
+    def keeps_warm() -> bool:
+        """True when the current thread is long-lived enough to keep a browser between leases."""
+        if threading.current_thread() is threading.main_thread():
+            return True
+        return getattr(_warm_threads, 'enabled', False)
+
+    @staticmethod
+    def is_healthy(warm: _WarmBrowser) -> bool:
+        """True while the browser process is connected."""
+        try:
+            return bool(warm.browser.is_connected())
+        except Exception:
+            return False
+
+    def _retire(self, warm: _WarmBrowser, unhealthy: bool = False) -> None:
+        if not warm.retired:
+            warm.retired = True
+            self._count('unhealthy' if unhealthy else 'recycled')
+
+    def _on_lease(self, warm: _WarmBrowser, reused: bool) -> None:
+        warm.uses += 1
+        warm.active += 1
+        self._count('leases')
+        if reused:
+            self._count('reuses')
+        if not self.enabled:
+            # Unpooled: close the browser with its only lease
+            warm.retired = True
+        elif warm.uses >= self.max_uses:
+            self._retire(warm)
+
+    def _on_release(self, warm: _WarmBrowser, healthy: bool) -> bool:
+        """Record a release; returns True when the browser should be closed now."""
+        warm.active -= 1
+        if not healthy or not self.is_healthy(warm):
+            self._retire(warm, unhealthy=True)
+        if warm.active > 0:
+            return False
+        if not warm.retired and not self.keeps_warm():
+            # Short-lived thread: nothing would close the browser after the thread exits
+            warm.retired = True
+        return warm.retired
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool metrics.
+
+        Returns:
+            Dict with launch/lease/reuse counts, recycled, unhealthy and closed browsers,
+            and launch times in milliseconds
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['avg_launch_ms'] = (stats['launch_ms_total'] / stats['launches']) if stats['launches'] else 0.0
+        stats['enabled'] = self.enabled
+        stats['max_uses'] = self.max_uses
+        return stats
+
+
+class BrowserLease:
+    """A fresh BrowserContext on a pooled browser (sync API)."""
+
+    def __init__(self, pool: "BrowserPool", warm: _WarmBrowser, context: Any, reused: bool):
+        self._pool = pool
+        self._warm = warm
+        self.browser = warm.browser
+        self.context = context
+        self.reused = reused
+        self.launch_ms = 0.0 if reused else warm.launch_ms
+        self._released = False
+
+    def close(self, healthy: bool = True) -> None:
+        """Close the context and return the browser to the pool."""
+        if not self._released:
+            self._released = True
+            self._pool.release(self, healthy=healthy)
+
+    def __enter__(self) -> "BrowserLease":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class BrowserPool(_BrowserPoolBase):
+    """Warm Chromium per thread for the Playwright sync API."""
+
+    def __init__(
+        self,
+        max_uses: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        playwright_factory: Optional[Callable[[], Any]] = None,
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            max_uses: Leases per browser before it is recycled (defaults to BROWSER_POOL_MAX_USES)
+            enabled: Keep browsers warm between leases (defaults to BROWSER_POOL_ENABLED)
+            playwright_factory: Returns an unstarted Playwright context manager (defaults to sync_playwright)
+        """
+        super().__init__(max_uses=max_uses, enabled=enabled)
+        self._playwright_factory = playwright_factory
+        self._local = threading.local()
+
+    def _launch(self) -> _WarmBrowser:
+        factory = self._playwright_factory
+        if factory is None:
+            from playwright.sync_api import sync_playwright  # type: ignore
+            factory = sync_playwright
+
+        started = time.perf_counter()
+        playwright = factory().start()
+        try:
+            browser = playwright.chromium.launch(headless=True, args=chromium_launch_args())
+        except Exception:
+            playwright.stop()
+            raise
+        launch_ms = (time.perf_counter() - started) * 1000
+        self._record_launch(launch_ms)
+        return _WarmBrowser(playwright, browser, launch_ms)
+
+    def _close(self, warm: _WarmBrowser) -> None:
+        if getattr(self._local, 'warm', None) is warm:
+            self._local.warm = None
+        self._count('closed')
+        try:
+            warm.browser.close()
+        except Exception as e:
+            logger.debug(f"[BrowserPool] Browser already closed ({e})")
+        try:
+            warm.playwright.stop()
+        except Exception as e:
+            logger.debug(f"[BrowserPool] Playwright already stopped ({e})")
+
+    def _checkout(self) -> _WarmBrowser:
+        warm = getattr(self._local, 'warm', None)
+        if warm is not None and not warm.retired:
+            if self.is_healthy(warm):
+                return warm
+            self._retire(warm, unhealthy=True)
+            if warm.active <= 0:
+                self._close(warm)
+        warm = self._launch()
+        self._local.warm = warm
+        return warm
+
+    def lease(self, **context_options: Any) -> BrowserLease:
+        """
+        Open a fresh context on this thread's warm browser (launching one if needed).
+
+        Args:
+            **context_options: Browser.new_context options (viewport, user_agent, storage_state, ...)
+
+        Returns:
+            BrowserLease; close it (or use it as a context manager) when done
+        """
+        warm = self._checkout()
+        reused = warm.uses > 0
+        try:
+            context = warm.browser.new_context(**context_options)
+        except Exception:
+            if not reused:
+                raise
+            # The warm browser died between uses; replace it once
+            self._retire(warm, unhealthy=True)
+            if warm.active <= 0:
+                self._close(warm)
+            warm = self._checkout()
+            reused = False
+            context = warm.browser.new_context(**context_options)
+        self._on_lease(warm, reused)
+        return BrowserLease(self, warm, context, reused)
+
+    def release(self, lease: BrowserLease, healthy: bool = True) -> None:
+        """Close a lease's context; recycle the browser if it is unhealthy or used up."""
+        try:
+            lease.context.close()
+        except Exception as e:
+            logger.debug(f"[BrowserPool] Context already closed ({e})")
+        if self._on_release(lease._warm, healthy):
+            self._close(lease._warm)
+
+
+class AsyncBrowserLease:
+    """A fresh BrowserContext on a pooled browser (async API)."""
+
+    def __init__(self, pool: "AsyncBrowserPool", warm: _WarmBrowser, context: Any, reused: bool):
+        self._pool = pool
+        self._warm = warm
+        self.browser = warm.browser
+        self.context = context
+        self.reused = reused
+        self.launch_ms = 0.0 if reused else warm.launch_ms
+        self._released = False
+
+    async def close(self, healthy: bool = True) -> None:
+        """Close the context and return the browser to the pool."""
+        if not self._released:
+            self._released = True
+            await self._pool.release(self, healthy=healthy)
+
+    async def __aenter__(self) -> "AsyncBrowserLease":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+class _LoopSlot:
+    __slots__ = ("loop", "lock", "warm")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.lock = asyncio.Lock()
+        self.warm: Optional[_WarmBrowser] = None
+
+
+class AsyncBrowserPool(_BrowserPoolBase):
+    """Warm Chromium per event loop for the Playwright async API."""
+
+    def __init__(
+        self,
+        max_uses: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        playwright_factory: Optional[Callable[[], Any]] = None,
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            max_uses: Leases per browser before it is recycled (defaults to BROWSER_POOL_MAX_USES)
+            enabled: Keep browsers warm between leases (defaults to BROWSER_POOL_ENABLED)
+            playwright_factory: Returns an unstarted Playwright context manager (defaults to async_playwright)
+        """
+        super().__init__(max_uses=max_uses, enabled=enabled)
+        self._playwright_factory = playwright_factory
+        self._slots: Dict[int, _LoopSlot] = {}
+        self._slots_lock = threading.Lock()
+
+    def _slot(self) -> _LoopSlot:
+        loop = asyncio.get_running_loop()
+        with self._slots_lock:
+            # Browsers of closed loops cannot be driven any more; forget them
+            for key in [key for key, slot in self._slots.items() if slot.loop.is_closed()]:
+                del self._slots[key]
+            slot = self._slots.get(id(loop))
+            if slot is None or slot.loop is not loop:
+                slot = _LoopSlot(loop)
+                self._slots[id(loop)] = slot
+            return slot
+
+    async def _launch(self) -> _WarmBrowser:
+        factory = self._playwright_factory
+        if factory is None:
+            from playwright.async_api import async_playwright  # type: ignore
+            factory = async_playwright
+
+        started = time.perf_counter()
+        playwright = await factory().start()
+        try:
+            browser = await playwright.chromium.launch(headless=True, args=chromium_launch_args())
+        except Exception:
+            await playwright.stop()
+            raise
+        launch_ms = (time.perf_counter() - started) * 1000
+        self._record_launch(launch_ms)
+        return _WarmBrowser(playwright, browser, launch_ms)
+
+    async def _close(self, warm: _WarmBrowser) -> None:
+        slot = self._slot()
+        if slot.warm is warm:
+            slot.warm = None
+        self._count('closed')
+        try:
+            await warm.browser.close()
+        except Exception as e:
+            logger.debug(f"[BrowserPool] Browser already closed ({e})")
+        try:
+            await warm.playwright.stop()
+        except Exception as e:
+            logger.debug(f"[BrowserPool] Playwright already stopped ({e})")
+
+    async def _checkout(self) -> _WarmBrowser:
+        slot = self._slot()
+        async with slot.lock:
+            warm = slot.warm
+            if warm is not None and not warm.retired:
+                if self.is_healthy(warm):
+                    return warm
+                self._retire(warm, unhealthy=True)
+                if warm.active <= 0:
+                    await self._close(warm)
+            warm = await self._launch()
+            slot.warm = warm
+            return warm
+
+    async def lease(self, **context_options: Any) -> AsyncBrowserLease:
+        """
+        Open a fresh context on this event loop's warm browser (launching one if needed).
+
+        Args:
+            **context_options: Browser.new_context options (viewport, user_agent, ...)
+
+        Returns:
+            AsyncBrowserLease; close it (or use it with `async with`) when done
+        """
+        warm = await self._checkout()
+        reused = warm.uses > 0
+        try:
+            context = await warm.browser.new_context(**context_options)
+        except Exception:
+            if not reused:
+                raise
+            # The warm browser died between uses; replace it once
+            self._retire(warm, unhealthy=True)
+            if warm.active <= 0:
+                await self._close(warm)
+            warm = await self._checkout()
+            reused = False
+            context = await warm.browser.new_context(**context_options)
+        self._on_lease(warm, reused)
+        return AsyncBrowserLease(self, warm, context, reused)
+
+    async def release(self, lease: AsyncBrowserLease, healthy: bool = True) -> None:
+        """Close a lease's context; recycle the browser if it is unhealthy or used up."""
+        try:
+            await lease.context.close()
+        except Exception as e:
+            logger.debug(f"[BrowserPool] Context already closed ({e})")
+        if self._on_release(lease._warm, healthy):
+            await self._close(lease._warm)
+
+
+_browser_pool: Optional[BrowserPool] = None
+_async_browser_pool: Optional[AsyncBrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide sync browser pool (created on first use)."""
+    global _browser_pool
+    if _browser_pool is None:
+        with _pool_lock:
+            if _browser_pool is None:
+                _browser_pool = BrowserPool()
+    return _browser_pool
+
+
+def get_async_browser_pool() -> AsyncBrowserPool:
+    """Get the process-wide async browser pool (created on first use)."""
+    global _async_browser_pool
+    if _async_browser_pool is None:
+        with _pool_lock:
+            if _async_browser_pool is None:
+                _async_browser_pool = AsyncBrowserPool()
+    return _async_browser_pool
@@ -3,14 +3,19 @@ import logging
 import base64
 import time
 from typing import Optional, Dict, Any
-from playwright.sync_api import sync_playwright, Browser, Page, BrowserContext  # type: ignore
+from playwright.sync_api import Browser, Page, BrowserContext  # type: ignore
 from utils.decimal_utils import convert_decimals_to_float
 
-from .browser_config import (
-    should_disable_sandbox,
-    should_use_single_process
-)
 from .browser_action_handler import BrowserActionHandler
+from .browser_pool import BrowserLease, get_browser_pool
+from .cua.settle import (
+    MUTATION_TRACKER_JS,
+    QUIET_FOR_JS,
+    SETTLE_POLL_MS,
+    NetworkActivity,
+    PageQuiescence,
+    SettleResult,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +30,8 @@ class BrowserService:
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.action_handler: Optional[BrowserActionHandler] = None
+        self._lease: Optional[BrowserLease] = None
+        self._network = NetworkActivity()
         self.display_width = 1024
         self.display_height = 768
     
@@ -46,22 +53,6 @@ class BrowserService:
         self.display_height = display_height
         
         try:
-            self.playwright = sync_playwright().start()
-            launch_args = [
-                '--disable-gpu',
-                '--disable-dev-shm-usage',
-                '--disable-accelerated-2d-canvas',
-                '--disable-web-security',
-            ]
-            if should_disable_sandbox():
-                launch_args += ['--no-sandbox', '--disable-setuid-sandbox']
-            if should_use_single_process():
-                launch_args += ['--single-process']  # Useful in Lambda; can crash locally
-            self.browser = self.playwright.chromium.launch(
-                headless=True,
-                args=launch_args
-            )
-            
             context_options = {
                 "viewport": {"width": display_width, "height": display_height},
                 "user_agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
@@ -71,11 +62,20 @@ class BrowserService:
                 storage_state = convert_decimals_to_float(storage_state)
                 context_options["storage_state"] = storage_state
             
-            self.context = self.browser.new_context(**context_options)
+            # Fresh isolated context on a warm pooled browser
+            self._lease = get_browser_pool().lease(**context_options)
+            self.browser = self._lease.browser
+            self.context = self._lease.context
+            self.context.add_init_script(MUTATION_TRACKER_JS)
             self.page = self.context.new_page()
+            self._network = NetworkActivity()
+            self._network.attach(self.page)
             self.action_handler = BrowserActionHandler(self.page)
             
-            logger.info(f"Browser initialized with viewport {display_width}x{display_height}")
+            logger.info(f"Browser initialized with viewport {display_width}x{display_height}", extra={
+                'browser_reused': self._lease.reused,
+                'browser_launch_ms': round(self._lease.launch_ms, 1),
+            })
             
         except Exception as e:
             logger.error(f"Failed to initialize browser: {e}", exc_info=True)
@@ -167,21 +167,60 @@ class BrowserService:
         
         self.action_handler.execute_action(action)
     
+    def wait_for_settle(self, action_type: Optional[str], budget_ms: int) -> SettleResult:
+        """
+        Wait until the page has no DOM mutations or in-flight requests for a quiet window.
+        
+        Args:
+            action_type: Action that was just executed (for logging)
+            budget_ms: Maximum wait in milliseconds
+            
+        Returns:
+            SettleResult (settled=False when the budget ran out)
+        """
+        if not self.page:
+            raise RuntimeError("Browser not initialized. Call initialize() first.")
+        
+        quiescence = PageQuiescence(self._network, budget_ms)
+        while not quiescence.timed_out() and not self.page.is_closed():
+            try:
+                quiet_for = self.page.evaluate(QUIET_FOR_JS)
+            except Exception:
+                # Navigation in progress (execution context destroyed)
+                quiet_for = None
+            if quiescence.poll(quiet_for):
+                return quiescence.result(True)
+            # Playwright dispatches page events (requests) while waiting
+            self.page.wait_for_timeout(SETTLE_POLL_MS)
+        return quiescence.result(False)
+    
+    def is_healthy(self) -> bool:
+        """True while the page is open and the browser process is connected."""
+        try:
+            return bool(
+                self.page is not None
+                and not self.page.is_closed()
+                and self.browser is not None
+                and self.browser.is_connected()
+            )
+        except Exception:
+            return False
+
     def cleanup(self):
-        """Clean up browser resources."""
+        """Close the page and context; the browser stays warm in the pool."""
         try:
+            healthy = self.is_healthy()
             if self.page:
-                self.page.close()
+                try:
+                    self.page.close()
+                except Exception as e:
+                    logger.debug(f"Page already closed: {e}")
                 self.page = None
-            if self.context:
-                self.context.close()
-                self.context = None
-            if self.browser:
-                self.browser.close()
-                self.browser = None
-            if self.playwright:
-                self.playwright.stop()
-                self.playwright = None
+            if self._lease:
+                self._lease.close(healthy=healthy)
+                self._lease = None
+            self.context = None
+            self.browser = None
             self.action_handler = None
             logger.info("Browser cleanup completed")
         except Exception as e:
@@ -4,29 +4,64 @@ Provides in-memory caching for frequently accessed data like workflows and forms
 """
 
 import logging
-from functools import lru_cache
-from typing import Dict, Any, Optional, Callable
-from datetime import datetime, timedelta
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the in-memory payload size of a cached value in bytes.
+
+    Strings and byte payloads (e.g. image data URLs) are measured by length; other
+    values fall back to sys.getsizeof, which is shallow but cheap.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value)
+    try:
+        return sys.getsizeof(value)
+    except Exception:
+        return 0
+
+
 class CacheService:
-    """Service for caching frequently accessed data."""
+    """
+    Thread-safe LRU cache with TTL expiry and an optional byte budget.
+
+    Entries live in an OrderedDict in recency order, so get/set/evict are O(1).
+    TTLs use the monotonic clock, so wall-clock adjustments cannot expire or revive entries.
+    """
     
-    def __init__(self, max_size: int = 128, ttl_seconds: int = 300):
+    def __init__(self, max_size: int = 128, ttl_seconds: int = 300, max_bytes: Optional[int] = None):
         """
         Initialize cache service.
         
         Args:
             max_size: Maximum number of items to cache (default: 128)
             ttl_seconds: Time-to-live for cache entries in seconds (default: 300 = 5 minutes)
+            max_bytes: Maximum total estimated payload size in bytes (default: unbounded)
         """
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self._cache: Dict[str, Tuple[Any, datetime]] = {}
+        self.max_bytes = max_bytes
+        # key -> (value, expires_at (monotonic), size_bytes); most recently used last
+        self._cache: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+    
+    def _remove(self, key: str) -> None:
+        _, _, size = self._cache.pop(key)
+        self._bytes -= size
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -38,42 +73,76 @@ class CacheService:
         Returns:
             Cached value or None if not found or expired
         """
-        if key not in self._cache:
-            self._misses += 1
-            return None
-        
-        value, timestamp = self._cache[key]
-        
-        # Check if expired
-        if datetime.utcnow() - timestamp > timedelta(seconds=self.ttl_seconds):
-            del self._cache[key]
-            self._misses += 1
-            return None
-        
-        self._hits += 1
-        return value
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            
+            value, expires_at, _ = entry
+            
+            # Check if expired
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return value
     
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, size_bytes: Optional[int] = None) -> None:
         """
         Set value in cache.
         
         Args:
             key: Cache key
             value: Value to cache
+            size_bytes: Payload size used for the byte budget (default: estimated)
         """
-        # Evict oldest entry if cache is full
-        if len(self._cache) >= self.max_size and key not in self._cache:
-            # Remove oldest entry
-            oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k][1])
-            del self._cache[oldest_key]
+        size = estimate_size(value) if size_bytes is None else max(0, int(size_bytes))
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Never cache a single entry larger than the whole budget
+            with self._lock:
+                if key in self._cache:
+                    self._remove(key)
+            logger.debug("Skipping cache entry larger than byte budget", extra={
+                'size_bytes': size,
+                'max_bytes': self.max_bytes
+            })
+            return
         
-        self._cache[key] = (value, datetime.utcnow())
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            self._cache[key] = (value, time.monotonic() + self.ttl_seconds, size)
+            self._bytes += size
+            
+            # Evict least recently used entries until within both limits
+            while self._cache and (
+                len(self._cache) > self.max_size
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                oldest_key = next(iter(self._cache))
+                self._remove(oldest_key)
+                self._evictions += 1
+    
+    def delete(self, key: str) -> None:
+        """Remove a cache entry if present."""
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
     
     def clear(self) -> None:
         """Clear all cache entries."""
-        self._cache.clear()
-        self._hits = 0
-        self._misses = 0
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._expirations = 0
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -82,17 +151,22 @@ class CacheService:
         Returns:
             Dictionary with cache statistics
         """
-        total_requests = self._hits + self._misses
-        hit_rate = self._hits / total_requests if total_requests > 0 else 0.0
-        
-        return {
-            'size': len(self._cache),
-            'max_size': self.max_size,
-            'hits': self._hits,
-            'misses': self._misses,
-            'hit_rate': hit_rate,
-            'ttl_seconds': self.ttl_seconds
-        }
+        with self._lock:
+            total_requests = self._hits + self._misses
+            hit_rate = self._hits / total_requests if total_requests > 0 else 0.0
+            
+            return {
+                'size': len(self._cache),
+                'max_size': self.max_size,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': hit_rate,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'ttl_seconds': self.ttl_seconds
+            }
     
     def cached_workflow(self, workflow_id: str, loader_func: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
         """
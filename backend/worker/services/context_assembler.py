@@ -0,0 +1,152 @@
+"""
+Context Assembler
+Renders each step's context segment once and reuses it across later steps.
+
+Every step rebuilds its context from earlier step outputs. Rendering a segment means
+stringifying the output (json.dumps for structured outputs), extracting and sorting
+image URLs and formatting the block, so without a cache a workflow with N steps renders
+O(N^2) segments. Segments are cached by output (string content, or object identity for
+structured outputs, which are never mutated once their step has completed) and joined
+only for the selected dependencies.
+"""
+
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SEGMENTS = 2048
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Rough characters-per-token ratio for English prose and JSON with OpenAI tokenizers.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for a rendered segment (no tokenizer dependency)."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True)
+class ContextSegment:
+    """One rendered step block plus its size."""
+    step_number: int
+    step_name: str
+    text: str
+    byte_size: int
+    token_estimate: int
+
+
+def normalize_image_urls(image_urls: Any) -> Tuple[str, ...]:
+    """Normalize an image_urls field (None, list or scalar) to a tuple of non-empty URLs."""
+    if image_urls is None:
+        return ()
+    if isinstance(image_urls, list):
+        return tuple(url for url in image_urls if url)
+    return (str(image_urls),) if image_urls else ()
+
+
+class ContextAssembler:
+    """Cache of rendered context segments shared by ContextBuilder and WorkflowOrchestrator."""
+
+    def __init__(self, max_segments: int = DEFAULT_MAX_SEGMENTS, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize assembler.
+
+        Args:
+            max_segments: Maximum number of cached segments
+            max_bytes: Byte budget for cached segment text
+        """
+        self._cache = CacheService(max_size=max_segments, ttl_seconds=3600, max_bytes=max_bytes)
+        self._lock = threading.Lock()
+        self._renders = 0
+
+    def segment(
+        self,
+        style: str,
+        step_number: int,
+        step_name: str,
+        output: Any,
+        image_urls: Any,
+        render: Callable[[], str]
+    ) -> ContextSegment:
+        """
+        Get the rendered segment for a step, rendering it on first use.
+
+        Args:
+            style: Segment format name (part of the cache key)
+            step_number: Step number shown in the segment header
+            step_name: Step name shown in the segment header
+            output: Raw step output the segment is rendered from
+            image_urls: Raw image_urls field of the step
+            render: Zero-argument callable producing the segment text
+
+        Returns:
+            ContextSegment with text, byte size and token estimate
+        """
+        image_key = normalize_image_urls(image_urls)
+        # Strings are matched by content so equal outputs reloaded from S3 still hit;
+        # structured outputs are matched by identity to avoid re-serializing them.
+        by_content = isinstance(output, str)
+        output_key = hash(output) if by_content else id(output)
+        key = f"{style}:{step_number}:{output_key}:{hash((step_name, image_key))}"
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            cached_output, cached_name, cached_images, segment = cached
+            same_output = cached_output == output if by_content else cached_output is output
+            if same_output and cached_name == step_name and cached_images == image_key:
+                return segment
+
+        text = render()
+        segment = ContextSegment(
+            step_number=step_number,
+            step_name=step_name,
+            text=text,
+            byte_size=len(text.encode("utf-8")),
+            token_estimate=estimate_tokens(text),
+        )
+        # Hold a reference to the output so its identity cannot be reused while cached.
+        self._cache.set(key, (output, step_name, image_key, segment), size_bytes=segment.byte_size)
+        with self._lock:
+            self._renders += 1
+        return segment
+
+    @staticmethod
+    def join(segments: Iterable[ContextSegment], prefix: Optional[str] = None, separator: str = "\n\n") -> str:
+        """Join segment texts (after an optional prefix block) in one pass."""
+        parts: List[str] = [prefix] if prefix is not None else []
+        parts.extend(segment.text for segment in segments)
+        return separator.join(parts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get assembler counters.
+
+        Returns:
+            Dict with renders plus the underlying cache stats
+        """
+        stats = self._cache.get_stats()
+        with self._lock:
+            stats['renders'] = self._renders
+        return stats
+
+
+_context_assembler: Optional[ContextAssembler] = None
+_context_assembler_lock = threading.Lock()
+
+
+def get_context_assembler() -> ContextAssembler:
+    """Get the process-wide context assembler (created on first use)."""
+    global _context_assembler
+    if _context_assembler is None:
+        with _context_assembler_lock:
+            if _context_assembler is None:
+                _context_assembler = ContextAssembler()
+    return _context_assembler
@@ -6,6 +6,8 @@ Handles building context for workflow steps from submission data and previous st
 import json
 import logging
 from typing import Dict, Any, List, Set, Optional
+from services.context_assembler import ContextSegment, get_context_assembler, normalize_image_urls
+from services.context_packer import pack_previous_context
 from utils.image_utils import extract_image_urls, extract_image_urls_from_object
 
 logger = logging.getLogger(__name__)
@@ -26,6 +28,36 @@ class ContextBuilder:
                 return str(output)
         return str(output)
 
+    @staticmethod
+    def _collect_step_image_urls(output: Any, image_urls: Any) -> List[str]:
+        """Sorted, de-duplicated image URLs from a step's image_urls field and its output."""
+        # 1. From image_urls array in step output
+        image_urls_from_array = normalize_image_urls(image_urls)
+        
+        # 2. Extract image URLs from the output text itself
+        image_urls_from_text = []
+        if isinstance(output, str):
+            image_urls_from_text = extract_image_urls(output)
+        elif isinstance(output, (dict, list)):
+            image_urls_from_text = extract_image_urls_from_object(output)
+        
+        # Combine and deduplicate all image URLs
+        all_image_urls: Set[str] = set(image_urls_from_array) | set(image_urls_from_text)
+        return sorted(all_image_urls)  # Sort for consistent output
+
+    @staticmethod
+    def _previous_step_segment(step_number: int, step_name: str, output: Any, image_urls: Any) -> ContextSegment:
+        """Rendered "=== Step N: name ===" block for a previous step (cached across steps)."""
+        def _render() -> str:
+            output_text = ContextBuilder._stringify_step_output(output)
+            step_image_urls = ContextBuilder._collect_step_image_urls(output, image_urls)
+            step_context = f"\n=== Step {step_number}: {step_name} ===\n{output_text}"
+            if step_image_urls:
+                step_context += f"\n\nGenerated Images:\n" + "\n".join([f"- {url}" for url in step_image_urls])
+            return step_context
+
+        return get_context_assembler().segment("previous", step_number, step_name, output, image_urls, _render)
+
     @staticmethod
     def _index_step_outputs(step_outputs: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
         indexed_outputs: Dict[int, Dict[str, Any]] = {}
@@ -106,31 +138,23 @@ class ContextBuilder:
         return "\n".join(lines)
     
     @staticmethod
-    def build_previous_context_from_step_outputs(
-        initial_context: str,
+    def previous_segments_from_step_outputs(
         step_outputs: List[Dict[str, Any]],
         sorted_steps: List[Dict[str, Any]],
-        dependency_indices: Optional[List[int]] = None,
-        include_form_submission: bool = True
-    ) -> str:
+        dependency_indices: Optional[List[int]] = None
+    ) -> List[ContextSegment]:
         """
-        Build previous context string from step outputs.
+        Rendered previous-step segments from step outputs (batch mode).
         
         Args:
-            initial_context: Formatted submission context
             step_outputs: List of step output dictionaries
             sorted_steps: List of step configurations sorted by order
             dependency_indices: Optional list of step indices to include
-            include_form_submission: Whether to include form submission (only True for first step)
             
         Returns:
-            Combined previous context string
+            Segments in step_outputs order, each with its byte size and token estimate
         """
-        all_previous_outputs = []
-        if include_form_submission:
-            all_previous_outputs.append(f"=== Form Submission ===\n{initial_context}")
-        
-        # Include dependency step outputs explicitly (with image URLs if present)
+        segments = []
         for prev_idx, prev_step_output in enumerate(step_outputs):
             step_index = prev_step_output.get("step_index", prev_idx)
             if dependency_indices is not None and step_index not in dependency_indices:
@@ -141,71 +165,65 @@ class ContextBuilder:
             if not prev_step_name and 0 <= step_index < len(sorted_steps):
                 prev_step_name = sorted_steps[step_index].get("step_name")
             prev_step_name = prev_step_name or f"Step {step_number}"
-            prev_output_raw = prev_step_output.get('output', '')
-            prev_output_text = ContextBuilder._stringify_step_output(prev_output_raw)
-            
-            # Extract image URLs from multiple sources:
-            # 1. From image_urls array in step output
-            prev_image_urls_raw = prev_step_output.get('image_urls', [])
-            # Normalize to list: handle None, empty list, or already a list
-            if prev_image_urls_raw is None:
-                image_urls_from_array = []
-            elif isinstance(prev_image_urls_raw, list):
-                image_urls_from_array = [url for url in prev_image_urls_raw if url]  # Filter out None/empty strings
-            else:
-                # If it's not a list, try to convert (shouldn't happen, but be safe)
-                image_urls_from_array = [str(prev_image_urls_raw)] if prev_image_urls_raw else []
-            
-            # 2. Extract image URLs from the output text itself
-            image_urls_from_text = []
-            if isinstance(prev_output_raw, str):
-                image_urls_from_text = extract_image_urls(prev_output_raw)
-            elif isinstance(prev_output_raw, (dict, list)):
-                image_urls_from_text = extract_image_urls_from_object(prev_output_raw)
-            
-            # Combine and deduplicate all image URLs
-            all_image_urls: Set[str] = set(image_urls_from_array) | set(image_urls_from_text)
-            prev_image_urls = sorted(list(all_image_urls))  # Sort for consistent output
-            
-            step_context = f"\n=== Step {step_number}: {prev_step_name} ===\n{prev_output_text}"
-            if prev_image_urls:
-                step_context += f"\n\nGenerated Images:\n" + "\n".join([f"- {url}" for url in prev_image_urls])
-            all_previous_outputs.append(step_context)
-        
-        # Combine all previous outputs into context
-        return "\n\n".join(all_previous_outputs)
+            segments.append(ContextBuilder._previous_step_segment(
+                step_number,
+                prev_step_name,
+                prev_step_output.get('output', ''),
+                prev_step_output.get('image_urls', []),
+            ))
+        return segments
     
     @staticmethod
-    def build_previous_context_from_execution_steps(
+    def build_previous_context_from_step_outputs(
         initial_context: str,
-        execution_steps: List[Dict[str, Any]],
-        current_step_order: int,
+        step_outputs: List[Dict[str, Any]],
+        sorted_steps: List[Dict[str, Any]],
         dependency_indices: Optional[List[int]] = None,
-        include_form_submission: bool = True
+        include_form_submission: bool = True,
+        token_budget: Optional[int] = None
     ) -> str:
         """
-        Build previous context from execution_steps.
-        
-        Note: Execution steps are stored in S3 (not DynamoDB), but are loaded into memory
-        by db_service.get_job() when s3_service is provided.
+        Build previous context string from step outputs.
         
         Args:
             initial_context: Formatted submission context
-            execution_steps: List of execution step dictionaries (loaded from S3)
-            current_step_order: Order of current step (1-indexed)
+            step_outputs: List of step output dictionaries
+            sorted_steps: List of step configurations sorted by order
             dependency_indices: Optional list of step indices to include
             include_form_submission: Whether to include form submission (only True for first step)
+            token_budget: Optional token budget; when exceeded, low-priority content is packed down
             
         Returns:
             Combined previous context string
         """
-        from utils.step_utils import normalize_step_order
+        # Include dependency step outputs explicitly (with image URLs if present)
+        segments = ContextBuilder.previous_segments_from_step_outputs(
+            step_outputs, sorted_steps, dependency_indices
+        )
+        prefix = f"=== Form Submission ===\n{initial_context}" if include_form_submission else None
+        if token_budget:
+            return pack_previous_context(prefix, segments, token_budget).text
+        return get_context_assembler().join(segments, prefix=prefix)
+    
+    @staticmethod
+    def previous_segments_from_execution_steps(
+        execution_steps: List[Dict[str, Any]],
+        current_step_order: int,
+        dependency_indices: Optional[List[int]] = None
+    ) -> List[ContextSegment]:
+        """
+        Rendered previous-step segments from execution_steps (single-step mode).
         
-        all_previous_outputs = []
-        if include_form_submission:
-            all_previous_outputs.append(f"=== Form Submission ===\n{initial_context}")
+        Args:
+            execution_steps: List of execution step dictionaries (loaded from S3)
+            current_step_order: Order of current step (1-indexed)
+            dependency_indices: Optional list of step indices to include
+            
+        Returns:
+            Segments in step_order order, each with its byte size and token estimate
+        """
+        from utils.step_utils import normalize_step_order
         
-        # Load previous step outputs from execution_steps
         # Filter to only include workflow-relevant steps (exclude internal/system steps)
         def _is_context_step(step_data: Dict[str, Any]) -> bool:
             step_type = step_data.get("step_type")
@@ -218,11 +236,11 @@ class ContextBuilder:
             key=normalize_step_order,
         )
         
+        segments = []
         for prev_step_data in sorted_execution_steps:
             prev_step_order = normalize_step_order(prev_step_data)
             
             # Determine if this step should be included
-            should_include = False
             if dependency_indices is not None:
                 # Include if workflow step index matches a dependency index
                 should_include = (prev_step_order - 1) in dependency_indices
@@ -231,40 +249,47 @@ class ContextBuilder:
                 should_include = prev_step_order < current_step_order
             
             if should_include:
-                prev_step_name = prev_step_data.get('step_name', 'Unknown Step')
-                prev_output_raw = prev_step_data.get('output', '')
-                prev_output_text = ContextBuilder._stringify_step_output(prev_output_raw)
-                
-                # Extract image URLs from multiple sources:
-                # 1. From image_urls array in execution step
-                prev_image_urls_raw = prev_step_data.get('image_urls', [])
-                # Normalize to list: handle None, empty list, or already a list
-                if prev_image_urls_raw is None:
-                    image_urls_from_array = []
-                elif isinstance(prev_image_urls_raw, list):
-                    image_urls_from_array = [url for url in prev_image_urls_raw if url]  # Filter out None/empty strings
-                else:
-                    # If it's not a list, try to convert (shouldn't happen, but be safe)
-                    image_urls_from_array = [str(prev_image_urls_raw)] if prev_image_urls_raw else []
-                
-                # 2. Extract image URLs from the output text itself
-                image_urls_from_text = []
-                if isinstance(prev_output_raw, str):
-                    image_urls_from_text = extract_image_urls(prev_output_raw)
-                elif isinstance(prev_output_raw, (dict, list)):
-                    image_urls_from_text = extract_image_urls_from_object(prev_output_raw)
-                
-                # Combine and deduplicate all image URLs
-                all_image_urls: Set[str] = set(image_urls_from_array) | set(image_urls_from_text)
-                prev_image_urls = sorted(list(all_image_urls))  # Sort for consistent output
-                
-                step_context = f"\n=== Step {prev_step_order}: {prev_step_name} ===\n{prev_output_text}"
-                if prev_image_urls:
-                    step_context += f"\n\nGenerated Images:\n" + "\n".join([f"- {url}" for url in prev_image_urls])
-                all_previous_outputs.append(step_context)
+                segments.append(ContextBuilder._previous_step_segment(
+                    prev_step_order,
+                    prev_step_data.get('step_name', 'Unknown Step'),
+                    prev_step_data.get('output', ''),
+                    prev_step_data.get('image_urls', []),
+                ))
+        return segments
+    
+    @staticmethod
+    def build_previous_context_from_execution_steps(
+        initial_context: str,
+        execution_steps: List[Dict[str, Any]],
+        current_step_order: int,
+        dependency_indices: Optional[List[int]] = None,
+        include_form_submission: bool = True,
+        token_budget: Optional[int] = None
+    ) -> str:
+        """
+        Build previous context from execution_steps.
+        
+        Note: Execution steps are stored in S3 (not DynamoDB), but are loaded into memory
+        by db_service.get_job() when s3_service is provided.
         
-        # Combine all previous outputs into context
-        return "\n\n".join(all_previous_outputs)
+        Args:
+            initial_context: Formatted submission context
+            execution_steps: List of execution step dictionaries (loaded from S3)
+            current_step_order: Order of current step (1-indexed)
+            dependency_indices: Optional list of step indices to include
+            include_form_submission: Whether to include form submission (only True for first step)
+            token_budget: Optional token budget; when exceeded, low-priority content is packed down
+            
+        Returns:
+            Combined previous context string
+        """
+        segments = ContextBuilder.previous_segments_from_execution_steps(
+            execution_steps, current_step_order, dependency_indices
+        )
+        prefix = f"=== Form Submission ===\n{initial_context}" if include_form_submission else None
+        if token_budget:
+            return pack_previous_context(prefix, segments, token_budget).text
+        return get_context_assembler().join(segments, prefix=prefix)
     
     @staticmethod
     def build_accumulated_context_for_html(
@@ -281,40 +306,31 @@ class ContextBuilder:
         Returns:
             Accumulated context string
         """
-        accumulated_context = f"=== Form Submission ===\n{initial_context}\n\n"
+        from utils.step_utils import normalize_step_order
+
+        assembler = get_context_assembler()
         internal_types = {'s3_upload', 'form_submission', 'html_generation', 'final_output'}
+        segments = []
         for step_data in execution_steps:
-            if step_data.get('step_type') not in internal_types:
-                step_name = step_data.get('step_name', 'Unknown Step')
-                step_output_raw = step_data.get('output', '')
+            if step_data.get('step_type') in internal_types:
+                continue
+            step_name = step_data.get('step_name', 'Unknown Step')
+            step_output_raw = step_data.get('output', '')
+            image_urls_raw = step_data.get('image_urls', [])
+
+            def _render(step_name=step_name, step_output_raw=step_output_raw, image_urls_raw=image_urls_raw) -> str:
                 step_output_text = ContextBuilder._stringify_step_output(step_output_raw)
-                
-                # Extract image URLs from multiple sources:
-                # 1. From image_urls array
-                image_urls_raw = step_data.get('image_urls', [])
-                if image_urls_raw is None:
-                    image_urls_from_array = []
-                elif isinstance(image_urls_raw, list):
-                    image_urls_from_array = [url for url in image_urls_raw if url]
-                else:
-                    image_urls_from_array = [str(image_urls_raw)] if image_urls_raw else []
-                
-                # 2. Extract image URLs from the output text itself
-                image_urls_from_text = []
-                if isinstance(step_output_raw, str):
-                    image_urls_from_text = extract_image_urls(step_output_raw)
-                elif isinstance(step_output_raw, (dict, list)):
-                    image_urls_from_text = extract_image_urls_from_object(step_output_raw)
-                
-                # Combine and deduplicate all image URLs
-                all_image_urls: Set[str] = set(image_urls_from_array) | set(image_urls_from_text)
-                image_urls = sorted(list(all_image_urls))  # Sort for consistent output
-                
-                accumulated_context += f"--- {step_name} ---\n{step_output_text}\n\n"
+                image_urls = ContextBuilder._collect_step_image_urls(step_output_raw, image_urls_raw)
+                block = f"--- {step_name} ---\n{step_output_text}\n\n"
                 if image_urls:
-                    accumulated_context += f"Generated Images:\n" + "\n".join([f"- {url}" for url in image_urls]) + "\n\n"
+                    block += f"Generated Images:\n" + "\n".join([f"- {url}" for url in image_urls]) + "\n\n"
+                return block
+
+            segments.append(assembler.segment(
+                "html", normalize_step_order(step_data), step_name, step_output_raw, image_urls_raw, _render
+            ))
         
-        return accumulated_context
+        return assembler.join(segments, prefix=f"=== Form Submission ===\n{initial_context}\n\n", separator="")
 
     @staticmethod
     def build_deliverable_context_from_step_outputs(
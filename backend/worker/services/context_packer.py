@@ -0,0 +1,229 @@
+"""
+Context Packer
+Fits a step's assembled context into a token budget.
+
+Context is the form submission echo plus one rendered segment per dependency step.
+When the estimated size exceeds the budget, lower-priority material is reduced first,
+in a fixed order so the same inputs always pack to the same text:
+
+1. Long "Generated Images" lists are cut to their first few URLs.
+2. Tool logs appended to step outputs ([Tool output], [Code interpreter]) are dropped.
+3. The form submission echo is truncated.
+4. Dependency outputs are truncated, keeping their head and tail, with the budget shared
+   so short outputs stay whole and every dependency keeps at least a minimum slice.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from services.context_assembler import CHARS_PER_TOKEN, ContextSegment, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+MAX_IMAGE_URLS_PER_SEGMENT = 10
+FORM_ECHO_MAX_TOKENS = 2_000
+MIN_DEPENDENCY_TOKENS = 500
+# Share of a truncated output kept from its start (the rest comes from its end).
+HEAD_RATIO = 0.7
+
+IMAGES_MARKER = "\n\nGenerated Images:\n"
+_TOOL_LOG_PATTERN = re.compile(r"\n\n\[Tool output\]|\n\[Code interpreter(?: logs| error)?\]")
+_SEGMENT_SEPARATOR = "\n\n"
+
+
+@dataclass
+class PackResult:
+    """Packed context text plus what packing did."""
+    text: str
+    budget_tokens: int
+    tokens_before: int
+    tokens_after: int
+    actions: List[str] = field(default_factory=list)
+
+    @property
+    def packed(self) -> bool:
+        return bool(self.actions)
+
+
+@dataclass
+class _Part:
+    header: str
+    body: str
+    tool_log: str
+    images: str
+
+
+def _split_segment(segment: ContextSegment) -> _Part:
+    text = segment.text
+    header_start = text.find("=== Step")
+    header_end = text.find("===\n", header_start) if header_start != -1 else -1
+    header, rest = (text[:header_end + 4], text[header_end + 4:]) if header_end != -1 else ("", text)
+
+    images = ""
+    images_at = rest.rfind(IMAGES_MARKER)
+    if images_at != -1:
+        rest, images = rest[:images_at], rest[images_at:]
+
+    tool_log = ""
+    match = _TOOL_LOG_PATTERN.search(rest)
+    if match:
+        rest, tool_log = rest[:match.start()], rest[match.start():]
+    return _Part(header=header, body=rest, tool_log=tool_log, images=images)
+
+
+def _truncate_middle(text: str, max_chars: int, label: str) -> str:
+    if len(text) <= max_chars:
+        return text
+    marker = f"\n\n[... {len(text) - max_chars} characters of {label} omitted to fit the context budget ...]\n\n"
+    # The marker counts against the limit so the result stays within max_chars.
+    keep = max(0, max_chars - len(marker))
+    head = int(keep * HEAD_RATIO)
+    tail = keep - head
+    return text[:head] + marker + (text[-tail:] if tail > 0 else "")
+
+
+def _trim_images(images: str) -> str:
+    urls = images[len(IMAGES_MARKER):].split("\n")
+    if len(urls) <= MAX_IMAGE_URLS_PER_SEGMENT:
+        return images
+    kept = urls[:MAX_IMAGE_URLS_PER_SEGMENT]
+    kept.append(f"- ... {len(urls) - MAX_IMAGE_URLS_PER_SEGMENT} more images omitted")
+    return IMAGES_MARKER + "\n".join(kept)
+
+
+def _fair_shares(sizes: List[int], total: int, minimum: int) -> List[int]:
+    """Water-filling: outputs smaller than an equal share keep everything; the rest split what is left."""
+    shares = [0] * len(sizes)
+    remaining = list(range(len(sizes)))
+    budget = max(total, minimum * len(sizes))
+    while remaining:
+        share = budget // len(remaining)
+        small = [i for i in remaining if sizes[i] <= share]
+        if not small:
+            for i in remaining:
+                shares[i] = max(share, minimum)
+            break
+        for i in small:
+            shares[i] = sizes[i]
+            budget -= sizes[i]
+        remaining = [i for i in remaining if i not in small]
+    return shares
+
+
+class ContextPacker:
+    """Pack a form echo plus dependency segments into a token budget."""
+
+    def __init__(self, budget_tokens: int):
+        """
+        Initialize packer.
+
+        Args:
+            budget_tokens: Maximum estimated tokens for the packed context
+        """
+        self.budget_tokens = budget_tokens
+
+    def pack(self, form_context: Optional[str], segments: List[ContextSegment]) -> PackResult:
+        """
+        Join the form echo and segments, reducing low-priority content until it fits.
+
+        Args:
+            form_context: "=== Form Submission ===" block (None when not included)
+            segments: Rendered dependency segments in context order
+
+        Returns:
+            PackResult; text is identical to an unpacked join when already within budget
+        """
+        tokens_before = estimate_tokens(form_context or "") + sum(s.token_estimate for s in segments)
+        tokens_before += estimate_tokens(_SEGMENT_SEPARATOR * len(segments))
+        if tokens_before <= self.budget_tokens:
+            parts = ([form_context] if form_context is not None else []) + [s.text for s in segments]
+            return PackResult(
+                text=_SEGMENT_SEPARATOR.join(parts),
+                budget_tokens=self.budget_tokens,
+                tokens_before=tokens_before,
+                tokens_after=tokens_before,
+            )
+
+        budget_chars = self.budget_tokens * CHARS_PER_TOKEN
+        split = [_split_segment(s) for s in segments]
+        form = form_context
+        actions: List[str] = []
+
+        def _size() -> int:
+            size = len(form or "") + len(_SEGMENT_SEPARATOR) * len(split)
+            return size + sum(len(p.header) + len(p.body) + len(p.tool_log) + len(p.images) for p in split)
+
+        # 1. Image lists
+        trimmed = 0
+        for part in split:
+            new_images = _trim_images(part.images) if part.images else part.images
+            if new_images != part.images:
+                part.images = new_images
+                trimmed += 1
+        if trimmed:
+            actions.append(f"trimmed_image_lists:{trimmed}")
+
+        # 2. Tool logs
+        if _size() > budget_chars:
+            dropped = 0
+            for part in split:
+                if part.tool_log:
+                    part.tool_log = f"\n\n[Tool output omitted to fit the context budget: {len(part.tool_log)} characters]"
+                    dropped += 1
+            if dropped:
+                actions.append(f"dropped_tool_logs:{dropped}")
+
+        # 3. Form echo
+        if form and _size() > budget_chars:
+            max_form_chars = FORM_ECHO_MAX_TOKENS * CHARS_PER_TOKEN
+            if len(form) > max_form_chars:
+                form = _truncate_middle(form, max_form_chars, "the form submission")
+                actions.append("truncated_form_echo")
+
+        # 4. Dependency outputs
+        overflow = _size() - budget_chars
+        if overflow > 0 and split:
+            body_sizes = [len(p.body) for p in split]
+            shares = _fair_shares(
+                body_sizes,
+                sum(body_sizes) - overflow,
+                MIN_DEPENDENCY_TOKENS * CHARS_PER_TOKEN,
+            )
+            truncated = 0
+            for part, share in zip(split, shares):
+                if len(part.body) > share:
+                    part.body = _truncate_middle(part.body, share, "this step's output")
+                    truncated += 1
+            if truncated:
+                actions.append(f"truncated_dependency_outputs:{truncated}")
+
+        parts = [form] if form is not None else []
+        parts.extend(p.header + p.body + p.tool_log + p.images for p in split)
+        text = _SEGMENT_SEPARATOR.join(parts)
+        return PackResult(
+            text=text,
+            budget_tokens=self.budget_tokens,
+            tokens_before=tokens_before,
+            tokens_after=estimate_tokens(text),
+            actions=actions,
+        )
+
+
+def pack_previous_context(
+    form_context: Optional[str],
+    segments: List[ContextSegment],
+    budget_tokens: int
+) -> PackResult:
+    """Pack context and log when anything had to be reduced."""
+    result = ContextPacker(budget_tokens).pack(form_context, segments)
+    if result.packed:
+        logger.info("[ContextPacker] Packed step context to fit token budget", extra={
+            'budget_tokens': result.budget_tokens,
+            'tokens_before': result.tokens_before,
+            'tokens_after': result.tokens_after,
+            'segments': len(segments),
+            'actions': result.actions,
+        })
+    return result
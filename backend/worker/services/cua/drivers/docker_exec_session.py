@@ -0,0 +1,194 @@
+"""
+Persistent `docker exec` session for the Docker VM driver.
+
+Spawning `docker exec` costs tens of milliseconds per call (CLI start, API round trip,
+exec setup in the container). The session keeps a single `docker exec -i <container> sh`
+open and sends each command over its stdin. Responses are framed so stdout stays
+binary-safe (raw PNG bytes for screenshots):
+
+    <token> <exit code> <stdout bytes> <stderr bytes>\\n<stdout><stderr>
+
+Each command runs in a subshell (so `exit`, `cd` or variables behave as in a one-shot
+exec) with stdout/stderr redirected to temp files inside the container, so nothing it
+prints can interleave with the framing.
+"""
+
+import shlex
+import subprocess
+import threading
+import uuid
+from typing import Any, Callable, List, Optional
+
+DEFAULT_TIMEOUT_SECONDS = 60.0
+# Temp files holding one command's output inside the container. They are rewritten
+# for every command; on tmpfs (/dev/shm, always mounted by Docker) that is free,
+# while truncating a non-empty file on ext4/overlay can wait on writeback.
+_SETUP_SCRIPT = (
+    '__cua_d=/dev/shm; [ -d "$__cua_d" ] && [ -w "$__cua_d" ] || __cua_d=${TMPDIR:-/tmp}; '
+    '__cua_o=$(mktemp "$__cua_d/cua.XXXXXX") && __cua_e=$(mktemp "$__cua_d/cua.XXXXXX") || exit 1; '
+    'trap \'rm -f "$__cua_o" "$__cua_e"\' EXIT'
+)
+
+
+class DockerExecSessionError(RuntimeError):
+    """The session could not be started or its stream broke."""
+
+
+class DockerExecSessionLost(DockerExecSessionError):
+    """The command was sent but its response was lost (it may have run)."""
+
+
+class DockerExecSessionTimeout(DockerExecSessionLost):
+    """A command did not answer in time (the session is killed)."""
+
+
+class DockerExecSession:
+    """One long-lived shell in the container, driven over stdin/stdout."""
+
+    def __init__(
+        self,
+        argv: List[str],
+        default_timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        popen: Callable[..., Any] = subprocess.Popen,
+    ):
+        """
+        Initialize session (the process starts on start()).
+
+        Args:
+            argv: Command that opens a shell reading stdin, e.g.
+                [docker, exec, -i, <container>, sh, -l, -s]
+            default_timeout: Seconds to wait for a command's response
+            popen: Process factory (tests)
+        """
+        self.argv = argv
+        self.default_timeout = default_timeout
+        self._popen = popen
+        self._process: Optional[subprocess.Popen] = None
+        self._token = f"__cua_{uuid.uuid4().hex}"
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self, timeout: Optional[float] = None) -> None:
+        """Open the shell and wait until it answers."""
+        try:
+            self._process = self._popen(
+                self.argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
+            )
+        except OSError as exc:
+            raise DockerExecSessionError(f"Failed to start exec session: {exc}") from exc
+        # Login shells may print banners; read up to the first frame.
+        with self._lock:
+            self._write(f"{_SETUP_SCRIPT}\n")
+            self._roundtrip("true", timeout)
+
+    def run(self, command: str, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """
+        Run one shell command in the session.
+
+        Args:
+            command: Shell command (may chain several commands, e.g. with &&)
+            timeout: Seconds to wait (default_timeout when None)
+
+        Returns:
+            CompletedProcess with bytes stdout/stderr
+        """
+        with self._lock:
+            if not self.alive:
+                raise DockerExecSessionError("Exec session is not running")
+            returncode, stdout, stderr = self._roundtrip(command, timeout)
+            self.requests += 1
+        return subprocess.CompletedProcess(command, returncode, stdout, stderr)
+
+    def _write(self, data: str) -> None:
+        try:
+            self._process.stdin.write(data.encode("utf-8"))
+            self._process.stdin.flush()
+        except (OSError, ValueError) as exc:
+            self._kill()
+            raise DockerExecSessionError(f"Exec session closed: {exc}") from exc
+
+    def _roundtrip(self, command: str, timeout: Optional[float]):
+        self._write(
+            f'(eval {shlex.quote(command)}) >"$__cua_o" 2>"$__cua_e" </dev/null; __cua_rc=$?; '
+            f'printf \'%s %s %s %s\\n\' {self._token} "$__cua_rc" '
+            f'"$(wc -c <"$__cua_o")" "$(wc -c <"$__cua_e")"; cat "$__cua_o" "$__cua_e"\n'
+        )
+        # A blocked read is released by killing the process.
+        timed_out = threading.Event()
+
+        def _expire() -> None:
+            timed_out.set()
+            self._kill()
+
+        timer = threading.Timer(timeout if timeout is not None else self.default_timeout, _expire)
+        timer.daemon = True
+        timer.start()
+        try:
+            stdout = self._process.stdout
+            while True:
+                line = stdout.readline()
+                if not line:
+                    raise EOFError("exec session ended")
+                parts = line.split()
+                if parts and parts[0] == self._token.encode("ascii") and len(parts) == 4:
+                    break
+            returncode, out_len, err_len = (int(p) for p in parts[1:])
+            out = self._read_exact(out_len)
+            err = self._read_exact(err_len)
+        except (OSError, ValueError, EOFError) as exc:
+            self._kill()
+            if timed_out.is_set():
+                raise DockerExecSessionTimeout(f"Exec session command timed out: {command[:80]}") from exc
+            raise DockerExecSessionLost(f"Exec session stream broke: {exc}") from exc
+        finally:
+            timer.cancel()
+        return returncode, out, err
+
+    def _read_exact(self, size: int) -> bytes:
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            chunk = self._process.stdout.read(remaining)
+            if not chunk:
+                raise EOFError("exec session ended mid-response")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def _kill(self) -> None:
+        process = self._process
+        if process is None or process.poll() is not None:
+            return
+        try:
+            process.kill()
+            process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    def close(self) -> None:
+        """Exit the shell (killed if it does not exit promptly)."""
+        process = self._process
+        if process is None:
+            return
+        try:
+            if process.poll() is None:
+                process.stdin.write(b"exit\n")
+                process.stdin.close()
+                process.wait(timeout=2)
+        except Exception:
+            self._kill()
+        finally:
+            for stream in (process.stdin, process.stdout):
+                try:
+                    stream.close()
+                except Exception:
+                    pass
+            self._process = None
@@ -7,7 +7,15 @@ import subprocess
 import time
 from typing import Dict, Any, Optional, List
 
+from services.cua.drivers.docker_exec_session import (
+    DEFAULT_TIMEOUT_SECONDS,
+    DockerExecSession,
+    DockerExecSessionError,
+    DockerExecSessionLost,
+    DockerExecSessionTimeout,
+)
 from services.cua.environment import Environment
+from services.cua.settle import SettleResult, wait_for_stable_frame
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +86,11 @@ class DockerVMController:
             os.environ.get("CUA_DOCKER_READY_TIMEOUT_SECONDS", "20"), 20
         )
         self.window_id = os.environ.get("CUA_DOCKER_WINDOW_ID", "").strip()
+        # Run commands through one long-lived `docker exec` shell instead of one exec each
+        self.persistent_exec = _env_flag(
+            os.environ.get("CUA_DOCKER_PERSISTENT_EXEC"), default=True
+        )
+        self._session: Optional[DockerExecSession] = None
         self._is_initialized = False
         self._started_here = False
         self._last_url: Optional[str] = None
@@ -102,6 +115,53 @@ class DockerVMController:
     def _docker(self, args: List[str], **kwargs):
         return self._run([self.docker_bin] + args, **kwargs)
 
+    def _exec_prefix(self) -> List[str]:
+        env_args: List[str] = []
+        if self.vnc_display:
+            env_args += ["-e", f"DISPLAY={self.vnc_display}"]
+        return [self.docker_bin, "exec", "-i"] + env_args + [self.container_name]
+
+    def _session_exec(
+        self, command: str, timeout: Optional[int]
+    ) -> Optional[subprocess.CompletedProcess]:
+        """Run a command in the persistent session; None means use a one-shot exec."""
+        if self._session is None or not self._session.alive:
+            self._close_session()
+            session = DockerExecSession(self._exec_prefix() + ["sh", "-l", "-s"])
+            try:
+                session.start(timeout=self.ready_timeout)
+            except DockerExecSessionError as exc:
+                session.close()
+                if self._is_initialized:
+                    # The container is up, so the session itself does not work here
+                    self.persistent_exec = False
+                    logger.warning(
+                        f"[DockerVM] Persistent exec session unavailable, using one-shot docker exec: {exc}"
+                    )
+                return None
+            self._session = session
+        try:
+            return self._session.run(command, timeout=timeout)
+        except DockerExecSessionTimeout as exc:
+            self._close_session()
+            raise subprocess.TimeoutExpired(command, timeout or DEFAULT_TIMEOUT_SECONDS) from exc
+        except DockerExecSessionLost as exc:
+            # The command may already have run (typing, navigate key sequences), so
+            # re-running it one-shot could repeat it. Reopen the session on the next call.
+            self._close_session()
+            raise subprocess.SubprocessError(f"Exec session lost while running: {command[:80]}") from exc
+        except DockerExecSessionError as exc:
+            # Container restarted and the command was never sent: run it one-shot,
+            # reopen the session on the next call.
+            logger.warning(f"[DockerVM] Exec session lost, retrying with one-shot docker exec: {exc}")
+            self._close_session()
+            return None
+
+    def _close_session(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
     def _docker_exec(
         self,
         command: str,
@@ -111,14 +171,23 @@ class DockerVMController:
         check: bool = True,
         timeout: Optional[int] = None,
     ):
-        env_args: List[str] = []
-        if self.vnc_display:
-            env_args += ["-e", f"DISPLAY={self.vnc_display}"]
-        cmd = (
-            [self.docker_bin, "exec", "-i"]
-            + env_args
-            + [self.container_name, "sh", "-lc", command]
-        )
+        if self.persistent_exec:
+            result = self._session_exec(command, timeout)
+            if result is not None:
+                if text:
+                    result = subprocess.CompletedProcess(
+                        result.args,
+                        result.returncode,
+                        result.stdout.decode("utf-8", errors="replace"),
+                        result.stderr.decode("utf-8", errors="replace"),
+                    )
+                if check and result.returncode != 0:
+                    raise subprocess.CalledProcessError(
+                        result.returncode, result.args, result.stdout, result.stderr
+                    )
+                return result
+
+        cmd = self._exec_prefix() + ["sh", "-lc", command]
         return self._run(
             cmd,
             capture_output=capture_output,
@@ -234,11 +303,15 @@ class DockerVMController:
         return self._xdotool_command(["windowactivate", "--sync", self.window_id])
 
     def _run_xdotool(self, args: List[str]) -> None:
+        self._run_xdotool_batch([args])
+
+    def _run_xdotool_batch(self, batch: List[List[Any]]) -> None:
+        """Run several xdotool invocations (after the optional focus) in one exec round trip."""
         parts: List[str] = []
         focus_cmd = self._maybe_focus_window()
         if focus_cmd:
             parts.append(focus_cmd)
-        parts.append(self._xdotool_command(args))
+        parts += [self._xdotool_command(args) for args in batch]
         command = " && ".join(parts)
         self._docker_exec(command, capture_output=True, text=True, check=True)
 
@@ -398,18 +471,17 @@ class DockerVMController:
         elif action_type in ("scroll", "scroll_to"):
             dx = action.get("scroll_x", action.get("delta_x", 0)) or 0
             dy = action.get("scroll_y", action.get("delta_y", 0)) or 0
+            batch: List[List[Any]] = []
             if dy:
                 button = 5 if dy > 0 else 4
                 repeat = max(1, int(abs(dy) / max(self.scroll_step, 1)))
-                self._run_xdotool(
-                    ["click", "--repeat", repeat, "--delay", 10, button]
-                )
+                batch.append(["click", "--repeat", repeat, "--delay", 10, button])
             if dx:
                 button = 7 if dx > 0 else 6
                 repeat = max(1, int(abs(dx) / max(self.scroll_step, 1)))
-                self._run_xdotool(
-                    ["click", "--repeat", repeat, "--delay", 10, button]
-                )
+                batch.append(["click", "--repeat", repeat, "--delay", 10, button])
+            if batch:
+                self._run_xdotool_batch(batch)
 
         elif action_type in ("keypress", "key_press"):
             keys = action.get("keys")
@@ -433,9 +505,13 @@ class DockerVMController:
             if not url:
                 raise ValueError("Navigate action requires 'url'")
             self._last_url = str(url)
-            self._run_xdotool(["key", "--clearmodifiers", "ctrl+l"])
-            self._run_xdotool(["type", "--clearmodifiers", "--", str(url)])
-            self._run_xdotool(["key", "Return"])
+            self._run_xdotool_batch(
+                [
+                    ["key", "--clearmodifiers", "ctrl+l"],
+                    ["type", "--clearmodifiers", "--", str(url)],
+                    ["key", "Return"],
+                ]
+            )
 
         elif action_type in ("screenshot", "capture_screenshot", "cursor_position"):
             # No-op (screenshots captured separately; cursor position not supported)
@@ -445,6 +521,10 @@ class DockerVMController:
             raise ValueError(f"Unsupported action type: '{action_type}'")
 
     def capture_screenshot(self) -> str:
+        return base64.b64encode(self.capture_screenshot_bytes()).decode("utf-8")
+
+    def capture_screenshot_bytes(self) -> bytes:
+        """Raw screenshot bytes from CUA_DOCKER_SCREENSHOT_CMD."""
         if not self._is_initialized:
             raise RuntimeError("Environment not initialized")
         result = self._docker_exec(
@@ -462,7 +542,13 @@ class DockerVMController:
             raise RuntimeError(
                 f"Docker screenshot command failed: {stderr or 'no output'}"
             )
-        return base64.b64encode(result.stdout).decode("utf-8")
+        return result.stdout
+
+    def wait_for_settle(self, action_type: Optional[str], budget_ms: int) -> SettleResult:
+        """Wait until the screenshot stays unchanged for the quiet window (the last one is returned)."""
+        if not self._is_initialized:
+            raise RuntimeError("Environment not initialized")
+        return wait_for_stable_frame(self.capture_screenshot, budget_ms)
 
     def get_current_url(self) -> Optional[str]:
         return self._last_url
@@ -474,6 +560,7 @@ class DockerVMController:
         self.execute_action({"type": "navigate", "url": url})
 
     def cleanup(self) -> None:
+        self._close_session()
         if self.stop_on_cleanup:
             try:
                 self._docker(
@@ -518,6 +605,9 @@ class DockerVMEnvironment(Environment):
     async def capture_screenshot(self) -> str:
         return await asyncio.to_thread(self.controller.capture_screenshot)
 
+    async def wait_for_settle(self, action_type: Optional[str], budget_ms: int) -> SettleResult:
+        return await asyncio.to_thread(self.controller.wait_for_settle, action_type, budget_ms)
+
     async def get_current_url(self) -> Optional[str]:
         return await asyncio.to_thread(self.controller.get_current_url)
 
@@ -1,64 +1,34 @@
+import asyncio
 import base64
 import json
 import logging
-import os
 import time
 from typing import Any, Dict, Optional
 
-from playwright.async_api import Browser, BrowserContext, Page, async_playwright  # type: ignore
+from playwright.async_api import Browser, BrowserContext, Page  # type: ignore
 
+from services.browser_pool import AsyncBrowserLease, get_async_browser_pool
 from services.cua.environment import Environment
+from services.cua.settle import (
+    MUTATION_TRACKER_JS,
+    QUIET_FOR_JS,
+    SETTLE_POLL_MS,
+    NetworkActivity,
+    PageQuiescence,
+    SettleResult,
+)
 
 logger = logging.getLogger(__name__)
 
-def _env_flag_is_true(value: Optional[str]) -> bool:
-    return str(value or "").strip().lower() in ("1", "true", "yes", "y", "on")
-
-def _env_flag_is_false(value: Optional[str]) -> bool:
-    return str(value or "").strip().lower() in ("0", "false", "no", "n", "off")
-
-def _running_in_lambda() -> bool:
-    # Common env vars in AWS Lambda runtime
-    return bool(
-        os.environ.get("AWS_LAMBDA_FUNCTION_NAME")
-        or os.environ.get("AWS_EXECUTION_ENV")
-        or os.environ.get("LAMBDA_TASK_ROOT")
-    )
-
-def _should_use_single_process() -> bool:
-    """
-    --single-process can improve reliability in some constrained Linux runtimes (e.g. Lambda),
-    but it is known to cause Chromium to crash immediately on some local/dev platforms.
-    Default to Lambda-only; allow override via env var.
-    """
-    override = os.environ.get("CUA_PLAYWRIGHT_SINGLE_PROCESS")
-    if _env_flag_is_true(override):
-        return True
-    if _env_flag_is_false(override):
-        return False
-    return _running_in_lambda()
-
-def _should_disable_sandbox() -> bool:
-    """
-    Chromium sandbox flags are required in some container/root environments.
-    Default to Lambda-only; allow override via env var.
-    """
-    override = os.environ.get("CUA_PLAYWRIGHT_NO_SANDBOX")
-    if _env_flag_is_true(override):
-        return True
-    if _env_flag_is_false(override):
-        return False
-    return _running_in_lambda()
-
-
 class PlaywrightEnvironment(Environment):
     """Playwright async environment for CUA (safe inside asyncio loops)."""
 
     def __init__(self):
-        self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self._lease: Optional[AsyncBrowserLease] = None
+        self._network = NetworkActivity()
         self.display_width = 1024
         self.display_height = 768
 
@@ -67,36 +37,29 @@ class PlaywrightEnvironment(Environment):
         self.display_height = display_height
 
         try:
-            self.playwright = await async_playwright().start()
-            launch_args = [
-                "--disable-gpu",
-                "--disable-dev-shm-usage",
-                "--disable-accelerated-2d-canvas",
-                "--disable-web-security",
-            ]
-            if _should_disable_sandbox():
-                launch_args += ["--no-sandbox", "--disable-setuid-sandbox"]
-            if _should_use_single_process():
-                launch_args += ["--single-process"]
-            self.browser = await self.playwright.chromium.launch(
-                headless=True,
-                args=launch_args,
-            )
-
             context_options: Dict[str, Any] = {
                 "viewport": {"width": display_width, "height": display_height},
                 "user_agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
             }
 
-            self.context = await self.browser.new_context(**context_options)
+            # Fresh isolated context on a warm pooled browser
+            self._lease = await get_async_browser_pool().lease(**context_options)
+            self.browser = self._lease.browser
+            self.context = self._lease.context
+            await self.context.add_init_script(MUTATION_TRACKER_JS)
             self.page = await self.context.new_page()
+            self._network = NetworkActivity()
+            self._network.attach(self.page)
 
             try:
                 await self.page.goto("about:blank", wait_until="domcontentloaded")
             except Exception as e:
                 logger.warning(f"Initial navigation failed: {e}")
 
-            logger.info(f"[PlaywrightEnvironment] Initialized {display_width}x{display_height}")
+            logger.info(f"[PlaywrightEnvironment] Initialized {display_width}x{display_height}", extra={
+                "browser_reused": self._lease.reused,
+                "browser_launch_ms": round(self._lease.launch_ms, 1),
+            })
         except Exception as e:
             logger.error(f"[PlaywrightEnvironment] Failed to initialize: {e}", exc_info=True)
             await self.cleanup()
@@ -291,6 +254,23 @@ class PlaywrightEnvironment(Environment):
         except Exception:
             pass
 
+    async def wait_for_settle(self, action_type: Optional[str], budget_ms: int) -> SettleResult:
+        """Wait until the page has no DOM mutations or in-flight requests for a quiet window."""
+        if not self.page:
+            raise RuntimeError("Browser not initialized. Call initialize() first.")
+
+        quiescence = PageQuiescence(self._network, budget_ms)
+        while not quiescence.timed_out() and not self.page.is_closed():
+            try:
+                quiet_for = await self.page.evaluate(QUIET_FOR_JS)
+            except Exception:
+                # Navigation in progress (execution context destroyed)
+                quiet_for = None
+            if quiescence.poll(quiet_for):
+                return quiescence.result(True)
+            await asyncio.sleep(SETTLE_POLL_MS / 1000)
+        return quiescence.result(False)
+
     async def capture_screenshot(self) -> str:
         if not self.page:
             raise RuntimeError("Browser not initialized. Call initialize() first.")
@@ -344,22 +324,24 @@ class PlaywrightEnvironment(Environment):
                     return
                 logger.error(f"[PlaywrightEnvironment] Cleanup error closing {label}: {e}", exc_info=True)
 
+        healthy = await self.is_healthy()
         if self.page:
             await _close_safely("page", self.page.close)
             self.page = None
-        if self.context:
-            await _close_safely("context", self.context.close)
-            self.context = None
-        if self.browser:
-            await _close_safely("browser", self.browser.close)
-            self.browser = None
-        if self.playwright:
-            try:
-                await self.playwright.stop()
-            except Exception as e:
-                logger.debug(f"[PlaywrightEnvironment] Cleanup: playwright already stopped ({e})")
-            self.playwright = None
+        if self._lease:
+            # Closes the context; the browser stays warm unless it is unhealthy or used up
+            await _close_safely("context", lambda: self._lease.close(healthy=healthy))
+            self._lease = None
+        self.context = None
+        self.browser = None
 
     async def is_healthy(self) -> bool:
-        return self.browser is not None and self.page is not None
-
+        try:
+            return bool(
+                self.page is not None
+                and not self.page.is_closed()
+                and self.browser is not None
+                and self.browser.is_connected()
+            )
+        except Exception:
+            return False
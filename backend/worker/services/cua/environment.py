@@ -1,5 +1,10 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
+
+if TYPE_CHECKING:
+    from services.cua.settle import SettleResult
 
 class Environment(ABC):
     """Abstract base class for CUA environments."""
@@ -34,3 +39,10 @@ class Environment(ABC):
         """Check if environment is healthy."""
         pass
 
+    async def wait_for_settle(self, action_type: Optional[str], budget_ms: int) -> "SettleResult":
+        """Wait until the screen settles after an action (default: fixed wait of budget_ms)."""
+        from services.cua.settle import SettleResult
+
+        started = time.monotonic()
+        await asyncio.sleep(budget_ms / 1000)
+        return SettleResult(False, (time.monotonic() - started) * 1000, 'fixed')
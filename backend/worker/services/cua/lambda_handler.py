@@ -25,9 +25,8 @@ class StreamingHandler:
     def __init__(self):
         self.s3_service = S3Service()
         self.screenshot_service = S3ScreenshotService(self.s3_service)
-        # Note: In Lambda, we might want to reuse the environment if possible, 
-        # but Playwright usually needs fresh start or careful management.
-        # For now, we create fresh per invocation.
+        # The environment is created per invocation; its Chromium comes from the
+        # process-wide browser pool, so warm containers skip the browser launch.
     
     async def process_stream(self, event: Dict[str, Any], context: Any):
         """
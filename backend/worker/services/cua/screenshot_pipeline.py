@@ -0,0 +1,293 @@
+"""
+Screenshot pipeline for the CUA loop.
+
+Every iteration produces one screenshot that is (a) sent back to the model as a data
+URL and (b) uploaded to S3 for the job record. The pipeline:
+
+- re-encodes the model frame (CUA_MODEL_FRAME_FORMAT / _QUALITY) and optionally
+  downscales it (CUA_MODEL_FRAME_MAX_WIDTH). When downscaled, the computer tool is
+  declared at the model frame size and action coordinates are scaled back to the screen.
+- skips the upload and reuses the previous URL when a frame is byte-identical to the
+  previously uploaded frame (no-op actions, waits on a static page). Matching on a
+  perceptual hash instead (CUA_SCREENSHOT_DEDUP_PERCEPTUAL) also folds near-identical
+  frames, but a coarse hash misses small changes such as text typed into a field, so
+  it is opt-in.
+- uploads through the job's background upload queue (services.upload_queue): the URL
+  is known up front and the step handler awaits the upload at step end.
+- counts raw, model-frame and uploaded bytes per iteration.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.images.processing import PIL_AVAILABLE
+
+if PIL_AVAILABLE:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+MODEL_FRAME_FORMATS = {
+    'png': ('PNG', 'image/png'),
+    'jpeg': ('JPEG', 'image/jpeg'),
+    'webp': ('WEBP', 'image/webp'),
+}
+DEFAULT_MODEL_FRAME_FORMAT = 'jpeg'
+DEFAULT_MODEL_FRAME_QUALITY = 80
+# dHash grid: 16x16 = 256-bit hash
+HASH_SIZE = 16
+# Object name prefix below the job's S3 folder
+SCREENSHOT_NAME_PREFIX = 'cua/screenshot'
+
+
+def _read_int(name: str, default: int) -> int:
+    value = (os.environ.get(name) or "").strip()
+    if not value:
+        return default
+    try:
+        parsed = int(value)
+    except Exception:
+        return default
+    return parsed if parsed >= 0 else default
+
+
+def _read_format() -> str:
+    value = (os.environ.get("CUA_MODEL_FRAME_FORMAT") or "").strip().lower()
+    if value == 'jpg':
+        value = 'jpeg'
+    return value if value in MODEL_FRAME_FORMATS else DEFAULT_MODEL_FRAME_FORMAT
+
+
+def _read_dedup() -> bool:
+    return (os.environ.get("CUA_SCREENSHOT_DEDUP") or "").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _read_perceptual() -> bool:
+    return (os.environ.get("CUA_SCREENSHOT_DEDUP_PERCEPTUAL") or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def perceptual_hash(img: "Image.Image", hash_size: int = HASH_SIZE) -> int:
+    """Difference hash (dHash) of an image."""
+    small = img.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+@dataclass
+class ScreenshotFrame:
+    """One processed screenshot."""
+    model_image_url: str
+    url: Optional[str]
+    duplicate: bool
+    raw_bytes: int
+    model_bytes: int
+    uploaded_bytes: int
+
+    def to_log(self) -> Dict[str, Any]:
+        return {
+            'screenshot_raw_bytes': self.raw_bytes,
+            'model_frame_bytes': self.model_bytes,
+            'uploaded_bytes': self.uploaded_bytes,
+            'duplicate_frame': self.duplicate,
+        }
+
+
+class ScreenshotPipeline:
+    """Per-loop screenshot processing (not shared between jobs)."""
+
+    def __init__(
+        self,
+        image_handler: Any,
+        tenant_id: Optional[str],
+        job_id: Optional[str],
+        display_width: int,
+        display_height: int,
+        frame_format: Optional[str] = None,
+        quality: Optional[int] = None,
+        max_width: Optional[int] = None,
+        dedup: Optional[bool] = None,
+        perceptual: Optional[bool] = None,
+        dedup_distance: Optional[int] = None,
+        step_index: Optional[int] = None,
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            image_handler: ImageHandler (enqueue_image_upload)
+            tenant_id: Tenant for S3 keys
+            job_id: Job for S3 keys
+            display_width: Screen width in pixels
+            display_height: Screen height in pixels
+            frame_format: Model frame format: png, jpeg or webp (defaults to CUA_MODEL_FRAME_FORMAT)
+            quality: JPEG/WebP quality (defaults to CUA_MODEL_FRAME_QUALITY)
+            max_width: Downscale model frames wider than this (0 = screen size; CUA_MODEL_FRAME_MAX_WIDTH)
+            dedup: Reuse the previous URL for byte-identical frames (CUA_SCREENSHOT_DEDUP)
+            perceptual: Also reuse it for perceptually identical frames (CUA_SCREENSHOT_DEDUP_PERCEPTUAL)
+            dedup_distance: Max differing hash bits still treated as identical in perceptual
+                mode (CUA_SCREENSHOT_DEDUP_DISTANCE)
+            step_index: Step whose upload queue receives the screenshots
+        """
+        self.image_handler = image_handler
+        self.tenant_id = tenant_id
+        self.job_id = job_id
+        self.step_index = step_index
+        self.frame_format = frame_format if frame_format in MODEL_FRAME_FORMATS else _read_format()
+        self.quality = quality if quality is not None else _read_int("CUA_MODEL_FRAME_QUALITY", DEFAULT_MODEL_FRAME_QUALITY)
+        max_width = max_width if max_width is not None else _read_int("CUA_MODEL_FRAME_MAX_WIDTH", 0)
+        self.dedup = dedup if dedup is not None else _read_dedup()
+        self.perceptual = self.dedup and (perceptual if perceptual is not None else _read_perceptual())
+        self.dedup_distance = dedup_distance if dedup_distance is not None else _read_int("CUA_SCREENSHOT_DEDUP_DISTANCE", 0)
+
+        self.display_width = display_width
+        self.display_height = display_height
+        if PIL_AVAILABLE and max_width and 0 < max_width < display_width:
+            self.model_width = max_width
+            self.model_height = max(1, round(display_height * max_width / display_width))
+        else:
+            self.model_width = display_width
+            self.model_height = display_height
+        self.scale = display_width / self.model_width
+
+        self._lock = threading.Lock()
+        self._last_hash: Optional[int] = None
+        self._last_digest: Optional[bytes] = None
+        self._last_url: Optional[str] = None
+        self._totals = {'frames': 0, 'duplicates': 0, 'raw_bytes': 0, 'model_bytes': 0, 'uploaded_bytes': 0}
+
+    # Model-facing coordinates
+
+    def model_tools(self, tools: List[Any]) -> List[Any]:
+        """Tools with computer_use_preview declared at the model frame size."""
+        if self.scale == 1:
+            return tools
+        adjusted = []
+        for tool in tools or []:
+            if isinstance(tool, dict) and tool.get("type") == "computer_use_preview":
+                tool = {**tool, "display_width": self.model_width, "display_height": self.model_height}
+            adjusted.append(tool)
+        return adjusted
+
+    def scale_action(self, action: Dict[str, Any]) -> Dict[str, Any]:
+        """Map an action's model-frame coordinates to screen coordinates."""
+        if self.scale == 1 or not isinstance(action, dict):
+            return action
+
+        def scaled(value: Any) -> Any:
+            return round(value * self.scale) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+
+        result = dict(action)
+        for key in ("x", "y", "scroll_x", "scroll_y", "source_x", "source_y", "target_x", "target_y"):
+            if key in result:
+                result[key] = scaled(result[key])
+        if isinstance(result.get("path"), list):
+            result["path"] = [
+                {**point, "x": scaled(point.get("x")), "y": scaled(point.get("y"))} if isinstance(point, dict) else point
+                for point in result["path"]
+            ]
+        return result
+
+    # Frames
+
+    def _model_frame(self, raw: bytes, img: Optional["Image.Image"], content_type: str, raw_b64: str) -> Tuple[str, int]:
+        if img is None or (self.frame_format == 'png' and self.scale == 1 and content_type == 'image/png'):
+            return f"data:{content_type};base64,{raw_b64}", len(raw)
+        frame = img
+        if self.scale != 1:
+            frame = frame.resize((self.model_width, self.model_height), Image.Resampling.BILINEAR, reducing_gap=2.0)
+        pil_format, mime = MODEL_FRAME_FORMATS[self.frame_format]
+        if pil_format == 'JPEG' and frame.mode != 'RGB':
+            frame = frame.convert('RGB')
+        output = BytesIO()
+        save_kwargs = {} if pil_format == 'PNG' else {'quality': self.quality}
+        frame.save(output, format=pil_format, **save_kwargs)
+        encoded = output.getbuffer()
+        return f"data:{mime};base64,{base64.b64encode(encoded).decode('ascii')}", len(encoded)
+
+    def _is_duplicate(self, digest: bytes, phash: Optional[int]) -> bool:
+        if not self.dedup or self._last_url is None:
+            return False
+        if digest == self._last_digest:
+            return True
+        if not self.perceptual or phash is None or self._last_hash is None:
+            return False
+        return bin(phash ^ self._last_hash).count("1") <= self.dedup_distance
+
+    def process(self, screenshot_b64: str, content_type: str = "image/png") -> ScreenshotFrame:
+        """
+        Encode the model frame and enqueue (or skip) the upload of one screenshot.
+
+        Args:
+            screenshot_b64: Full-resolution screenshot from the driver
+            content_type: MIME type of the screenshot
+
+        Returns:
+            ScreenshotFrame with the model data URL and the screenshot URL
+        """
+        raw = base64.b64decode(screenshot_b64)
+        digest = hashlib.sha1(raw).digest()
+        img = None
+        phash = None
+        if PIL_AVAILABLE:
+            try:
+                img = Image.open(BytesIO(raw))
+                img.load()
+                if self.perceptual:
+                    phash = perceptual_hash(img)
+            except Exception as e:
+                logger.debug(f"[ScreenshotPipeline] Could not decode screenshot; passing it through ({e})")
+                img = None
+
+        model_image_url, model_bytes = self._model_frame(raw, img, content_type, screenshot_b64)
+
+        with self._lock:
+            duplicate = self._is_duplicate(digest, phash)
+            if duplicate:
+                url = self._last_url
+                uploaded_bytes = 0
+            else:
+                url = self.image_handler.enqueue_image_upload(
+                    screenshot_b64,
+                    content_type,
+                    tenant_id=self.tenant_id,
+                    job_id=self.job_id,
+                    name_prefix=SCREENSHOT_NAME_PREFIX,
+                    step_index=self.step_index,
+                )
+                if url:
+                    self._last_url = url
+                    self._last_digest = digest
+                    self._last_hash = phash
+                uploaded_bytes = len(raw) if url else 0
+            self._totals['frames'] += 1
+            self._totals['duplicates'] += 1 if duplicate else 0
+            self._totals['raw_bytes'] += len(raw)
+            self._totals['model_bytes'] += model_bytes
+            self._totals['uploaded_bytes'] += uploaded_bytes
+
+        return ScreenshotFrame(
+            model_image_url=model_image_url,
+            url=url,
+            duplicate=duplicate,
+            raw_bytes=len(raw),
+            model_bytes=model_bytes,
+            uploaded_bytes=uploaded_bytes,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Frame, duplicate and byte totals for this loop."""
+        with self._lock:
+            stats = dict(self._totals)
+        stats['model_frame'] = f"{self.frame_format}@{self.model_width}x{self.model_height}"
+        return stats
@@ -1,7 +1,7 @@
-import base64
 import logging
-from typing import Optional
+from typing import Optional, Union
 from s3_service import S3Service
+from utils.images.payload import ImagePayload
 import uuid
 import time
 
@@ -11,11 +11,15 @@ class S3ScreenshotService:
     def __init__(self, s3_service: S3Service):
         self.s3_service = s3_service
 
-    def upload_screenshot(self, base64_data: str, content_type: str = "image/jpeg", tenant_id: Optional[str] = None, job_id: Optional[str] = None) -> Optional[str]:
+    def upload_screenshot(self, base64_data: Union[str, ImagePayload], content_type: str = "image/jpeg", tenant_id: Optional[str] = None, job_id: Optional[str] = None) -> Optional[str]:
         try:
-            image_bytes = base64.b64decode(base64_data)
-            # Determine file extension from content type
-            ext = 'jpg' if 'jpeg' in content_type.lower() else 'png'
+            # Already-decoded payloads are uploaded as-is
+            if isinstance(base64_data, ImagePayload):
+                payload = base64_data
+            else:
+                payload = ImagePayload.from_base64(base64_data, content_type)
+            content_type = payload.content_type
+            ext = payload.extension
             filename = f"screenshot-{int(time.time())}-{str(uuid.uuid4())[:8]}.{ext}"
             
             if tenant_id and job_id:
@@ -25,7 +29,7 @@ class S3ScreenshotService:
 
             _, public_url = self.s3_service.upload_image(
                 key=key,
-                image_data=image_bytes,
+                image_data=payload.data,
                 content_type=content_type,
                 public=True
             )
@@ -0,0 +1,266 @@
+"""
+Adaptive settle-wait after CUA actions.
+
+Instead of sleeping a fixed interval before every screenshot, drivers wait until the
+screen stops changing:
+
+- Playwright: no DOM mutations and no in-flight requests for SETTLE_QUIET_MS
+  (mutations are tracked by an init script, requests by page events).
+- Docker VM: the frame stays identical for SETTLE_QUIET_MS across at least
+  SETTLE_MIN_STABLE_POLLS comparisons (the settled frame is reused as the iteration's
+  screenshot). A single repeated pair is not enough: right after a click or navigation
+  the screen often has not started repainting yet.
+
+Every wait is bounded by a per-action-type budget, capped by CUA_SETTLE_MAX_MS.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bound of the settle wait per action type (ms). Actions that wait on their own
+# ("wait") or do nothing visible ("screenshot") get no budget.
+SETTLE_BUDGET_MS = {
+    'click': 1500,
+    'left_click': 1500,
+    'right_click': 1500,
+    'double_click': 1500,
+    'doubleclick': 1500,
+    'type': 1000,
+    'input_text': 1000,
+    'typing': 1000,
+    'keypress': 1500,
+    'key_press': 1500,
+    'drag': 1500,
+    'drag_and_drop': 1500,
+    'navigate': 3000,
+    'scroll': 800,
+    'scroll_to': 800,
+    'move': 300,
+    'hover': 300,
+    'mouse_move': 300,
+    'wait': 0,
+    'screenshot': 0,
+    'capture_screenshot': 0,
+}
+DEFAULT_SETTLE_BUDGET_MS = 1000
+DEFAULT_SETTLE_MAX_MS = 3000
+DEFAULT_SETTLE_QUIET_MS = 300
+SETTLE_POLL_MS = 50
+# Consecutive identical frame comparisons required by the frame-diff check
+SETTLE_MIN_STABLE_POLLS = 2
+
+
+def _read_ms(name: str, default: int) -> int:
+    value = (os.environ.get(name) or "").strip()
+    if not value:
+        return default
+    try:
+        parsed = int(value)
+    except Exception:
+        return default
+    return parsed if parsed >= 0 else default
+
+
+# Hard cap on any settle wait.
+SETTLE_MAX_MS = _read_ms("CUA_SETTLE_MAX_MS", DEFAULT_SETTLE_MAX_MS)
+# How long the page/screen must stay unchanged to count as settled.
+SETTLE_QUIET_MS = _read_ms("CUA_SETTLE_QUIET_MS", DEFAULT_SETTLE_QUIET_MS)
+
+# Installed with add_init_script so it runs in every new document of the context.
+MUTATION_TRACKER_JS = """
+(() => {
+  if (window.__cuaMutationTracker) return;
+  window.__cuaMutationTracker = true;
+  window.__cuaLastMutation = performance.now();
+  const start = () => {
+    new MutationObserver(() => { window.__cuaLastMutation = performance.now(); })
+      .observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+  };
+  if (document.documentElement) start();
+  else document.addEventListener('DOMContentLoaded', start, { once: true });
+})();
+"""
+
+# Milliseconds since the last DOM mutation, or null while the document is still loading.
+QUIET_FOR_JS = """
+() => (document.readyState === 'loading' || window.__cuaLastMutation === undefined)
+  ? null
+  : performance.now() - window.__cuaLastMutation
+"""
+
+
+def settle_budget_ms(action_type: Optional[str]) -> int:
+    """Settle budget for an action type, capped by CUA_SETTLE_MAX_MS."""
+    normalized = str(action_type or "").strip().lower()
+    return min(SETTLE_BUDGET_MS.get(normalized, DEFAULT_SETTLE_BUDGET_MS), SETTLE_MAX_MS)
+
+
+@dataclass
+class SettleResult:
+    """Outcome of one settle wait."""
+    settled: bool
+    elapsed_ms: float
+    method: str
+    # Settled frame (frame-diff drivers), reusable as the iteration's screenshot
+    screenshot_b64: Optional[str] = None
+
+    def to_log(self, action_type: Optional[str]) -> dict:
+        return {
+            'action_type': action_type,
+            'settle_ms': round(self.elapsed_ms, 1),
+            'settled': self.settled,
+            'settle_method': self.method,
+        }
+
+
+class NetworkActivity:
+    """In-flight request counter fed by Playwright page events."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.in_flight = 0
+        self.last_activity = clock()
+
+    def attach(self, page: Any) -> None:
+        page.on("request", self._on_start)
+        page.on("requestfinished", self._on_end)
+        page.on("requestfailed", self._on_end)
+
+    def _on_start(self, _request: Any) -> None:
+        self.in_flight += 1
+        self.last_activity = self._clock()
+
+    def _on_end(self, _request: Any) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        self.last_activity = self._clock()
+
+
+class PageQuiescence:
+    """
+    Step-wise settle check for a Playwright page (shared by the sync and async drivers).
+
+    Each poll takes the page's "ms since last DOM mutation" (None if unknown) and says
+    whether the page has been quiet for SETTLE_QUIET_MS since the action finished.
+    """
+
+    def __init__(self, network: NetworkActivity, budget_ms: int, quiet_ms: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.network = network
+        self.budget_ms = budget_ms
+        self.quiet_ms = SETTLE_QUIET_MS if quiet_ms is None else quiet_ms
+        self._clock = clock
+        self.started = clock()
+        self._last_activity = self.started
+
+    def elapsed_ms(self) -> float:
+        return (self._clock() - self.started) * 1000
+
+    def timed_out(self) -> bool:
+        return self.elapsed_ms() >= self.budget_ms
+
+    def poll(self, quiet_for_ms: Optional[float]) -> bool:
+        now = self._clock()
+        if quiet_for_ms is None or self.network.in_flight > 0:
+            self._last_activity = now
+            return False
+        mutation_at = now - quiet_for_ms / 1000
+        last_activity = max(self._last_activity, mutation_at, self.network.last_activity)
+        return (now - last_activity) * 1000 >= self.quiet_ms
+
+    def result(self, settled: bool) -> SettleResult:
+        return SettleResult(settled=settled, elapsed_ms=self.elapsed_ms(), method='dom_network')
+
+
+def wait_for_stable_frame(
+    capture: Callable[[], str],
+    budget_ms: int,
+    quiet_ms: Optional[int] = None,
+    sleep_fn: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> SettleResult:
+    """
+    Capture frames until the screen has stayed unchanged for the quiet window or the
+    budget runs out.
+
+    Args:
+        capture: Returns a base64 screenshot
+        budget_ms: Maximum wait in milliseconds
+        quiet_ms: How long the frame must stay identical (defaults to SETTLE_QUIET_MS)
+        sleep_fn: Sleep between captures
+        clock: Monotonic clock in seconds
+
+    Returns:
+        SettleResult carrying the last captured frame
+    """
+    quiet_ms = SETTLE_QUIET_MS if quiet_ms is None else quiet_ms
+    started = clock()
+    frame = capture()
+    digest = hashlib.sha1(frame.encode('ascii')).digest()
+    stable_since = clock()
+    stable_polls = 0
+    while (clock() - started) * 1000 < budget_ms:
+        sleep_fn(SETTLE_POLL_MS / 1000)
+        frame = capture()
+        next_digest = hashlib.sha1(frame.encode('ascii')).digest()
+        now = clock()
+        if next_digest != digest:
+            digest = next_digest
+            stable_since = now
+            stable_polls = 0
+            continue
+        stable_polls += 1
+        if stable_polls >= SETTLE_MIN_STABLE_POLLS and (now - stable_since) * 1000 >= quiet_ms:
+            return SettleResult(True, (now - started) * 1000, 'frame_diff', frame)
+    return SettleResult(False, (clock() - started) * 1000, 'frame_diff', frame)
+
+
+def settle_after_action(
+    driver: Any,
+    action_type: Optional[str],
+    sleep_fn: Callable[[float], None] = time.sleep,
+) -> SettleResult:
+    """
+    Wait for a sync driver to settle after an action.
+
+    Drivers without wait_for_settle get a fixed sleep of the action's budget.
+    """
+    budget_ms = settle_budget_ms(action_type)
+    if budget_ms <= 0:
+        return SettleResult(True, 0.0, 'none')
+    started = time.monotonic()
+    if getattr(type(driver), 'wait_for_settle', None) is not None:
+        try:
+            result = driver.wait_for_settle(action_type, budget_ms)
+            if isinstance(result, SettleResult):
+                return result
+        except Exception as e:
+            logger.debug(f"[CUA Settle] Settle detection failed; using fixed wait ({e})")
+    remaining_ms = budget_ms - (time.monotonic() - started) * 1000
+    if remaining_ms > 0:
+        sleep_fn(remaining_ms / 1000)
+    return SettleResult(False, (time.monotonic() - started) * 1000, 'fixed')
+
+
+async def asettle_after_action(env: Any, action_type: Optional[str]) -> SettleResult:
+    """Async counterpart of settle_after_action for Environment drivers."""
+    budget_ms = settle_budget_ms(action_type)
+    if budget_ms <= 0:
+        return SettleResult(True, 0.0, 'none')
+    started = time.monotonic()
+    try:
+        result = await env.wait_for_settle(action_type, budget_ms)
+        if isinstance(result, SettleResult):
+            return result
+    except Exception as e:
+        logger.debug(f"[CUA Settle] Settle detection failed; using fixed wait ({e})")
+    remaining_ms = budget_ms - (time.monotonic() - started) * 1000
+    if remaining_ms > 0:
+        await asyncio.sleep(remaining_ms / 1000)
+    return SettleResult(False, (time.monotonic() - started) * 1000, 'fixed')
@@ -17,6 +17,8 @@ from services.cua.environment_factory import (
     resolve_cua_environment_config,
     create_sync_controller,
 )
+from services.cua.screenshot_pipeline import ScreenshotFrame, ScreenshotPipeline
+from services.cua.settle import settle_after_action
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +37,7 @@ class CUALoopConfig:
     job_id: Optional[str]
     display_width: int
     display_height: int
+    step_index: Optional[int] = None
 
 
 @dataclass
@@ -45,6 +48,7 @@ class CUALoopState:
     last_call_id: Optional[str] = None
     acknowledged_safety_checks: List[Dict[str, Any]] = field(default_factory=list)
     screenshot_urls: List[str] = field(default_factory=list)
+    settle_ms: List[float] = field(default_factory=list)
 
 
 class CUALoopRunner:
@@ -65,12 +69,22 @@ class CUALoopRunner:
     def run(self, config: CUALoopConfig) -> Tuple[str, List[str], Dict]:
         state = CUALoopState(start_time=self.time_provider())
         response = None
+        pipeline = ScreenshotPipeline(
+            self.image_handler,
+            tenant_id=config.tenant_id,
+            job_id=config.job_id,
+            display_width=config.display_width,
+            display_height=config.display_height,
+            step_index=config.step_index,
+        )
 
         try:
             self._initialize_browser(config)
 
             enhanced_instructions = self._ensure_autonomy_instructions(config.instructions)
             initial_params = self._build_initial_params(config, enhanced_instructions)
+            # Model frames may be downscaled; declare the computer tool at that size
+            initial_params["tools"] = pipeline.model_tools(initial_params["tools"])
 
             logger.info("[CUALoopService] Making initial CUA request")
             response = self.openai_client.make_api_call(initial_params)
@@ -102,23 +116,33 @@ class CUALoopRunner:
                         pending_safety_checks
                     )
 
-                execution_error = self._execute_action(action)
+                execution_error = self._execute_action(action, pipeline)
 
-                self.sleep_fn(1)
+                action_type = self._action_type(action)
+                settle = settle_after_action(self.browser, action_type, self.sleep_fn)
+                state.settle_ms.append(settle.elapsed_ms)
+                logger.info("[CUALoopService] Screen settled", extra={
+                    "iteration": state.iteration,
+                    **settle.to_log(action_type),
+                })
 
-                screenshot_b64, screenshot_url, current_url = self._capture_screenshot(
-                    config, state
+                frame, current_url = self._capture_screenshot(
+                    state, pipeline, settled_frame=settle.screenshot_b64
                 )
-                if not screenshot_b64:
+                if not frame:
                     logger.error("[CUALoopService] Screenshot capture failed, cannot continue CUA loop")
                     break
+                logger.info("[CUALoopService] Screenshot processed", extra={
+                    "iteration": state.iteration,
+                    **frame.to_log(),
+                })
 
                 next_input = self._build_next_input(
                     call_id=call_id,
-                    screenshot_b64=screenshot_b64,
+                    image_url=frame.model_image_url,
                     execution_error=execution_error,
                     current_url=current_url,
-                    screenshot_url=screenshot_url,
+                    screenshot_url=frame.url,
                     acknowledged_safety_checks=state.acknowledged_safety_checks,
                 )
                 state.acknowledged_safety_checks = []
@@ -142,7 +166,10 @@ class CUALoopRunner:
 
             logger.info("[CUALoopService] CUA loop complete", extra={
                 "iterations": state.iteration,
+                "settle_ms_total": round(sum(state.settle_ms), 1),
+                "settle_ms_max": round(max(state.settle_ms), 1) if state.settle_ms else 0.0,
                 "screenshots_captured": len(state.screenshot_urls),
+                "screenshot_stats": pipeline.get_stats(),
                 "final_report_length": len(final_report),
                 "total_tokens": usage_info.get("total_tokens", 0),
             })
@@ -249,7 +276,13 @@ class CUALoopRunner:
             for sc in pending_safety_checks
         ]
 
-    def _execute_action(self, action: Any) -> Optional[str]:
+    @staticmethod
+    def _action_type(action: Any) -> Optional[str]:
+        if isinstance(action, dict):
+            return action.get("type")
+        return getattr(action, "type", None)
+
+    def _execute_action(self, action: Any, pipeline: ScreenshotPipeline) -> Optional[str]:
         execution_error = None
         try:
             import warnings
@@ -265,7 +298,7 @@ class CUALoopRunner:
 
             action_type = action_dict.get("type", "unknown")
             logger.info("[CUALoopService] Executing action: %s", action_type, extra={"action": action_dict})
-            self.browser.execute_action(action_dict)
+            self.browser.execute_action(pipeline.scale_action(action_dict))
         except Exception as e:
             logger.error(f"[CUALoopService] Error executing action: {e}", exc_info=True)
             execution_error = str(e)
@@ -273,36 +306,36 @@ class CUALoopRunner:
 
     def _capture_screenshot(
         self,
-        config: CUALoopConfig,
         state: CUALoopState,
-    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
-        screenshot_b64 = None
+        pipeline: ScreenshotPipeline,
+        settled_frame: Optional[str] = None,
+    ) -> Tuple[Optional[ScreenshotFrame], Optional[str]]:
+        frame = None
         current_url = None
-        screenshot_url = None
         try:
-            screenshot_b64 = self.browser.capture_screenshot()
+            # Frame-diff settling already captured the current screen
+            screenshot_b64 = settled_frame or self.browser.capture_screenshot()
             current_url = self.browser.get_current_url()
-
-            screenshot_url = self.image_handler.upload_base64_image_to_s3(
-                screenshot_b64,
-                "image/png",
-                tenant_id=config.tenant_id,
-                job_id=config.job_id,
-            )
-            if screenshot_url:
-                state.screenshot_urls.append(screenshot_url)
-                logger.info(f"[CUALoopService] Screenshot captured and uploaded: {screenshot_url}")
-                print(f"🖼️ Object URL: {screenshot_url}", flush=True)
-            else:
-                logger.warning("[CUALoopService] Failed to upload screenshot")
+            if screenshot_b64:
+                # Encodes the model frame; the S3 upload runs on the job's upload queue
+                # and is awaited when the step ends
+                frame = pipeline.process(screenshot_b64, "image/png")
+                if frame.duplicate:
+                    logger.info("[CUALoopService] Screenshot unchanged, reusing previous upload")
+                elif frame.url:
+                    state.screenshot_urls.append(frame.url)
+                    logger.info(f"[CUALoopService] Screenshot captured, uploading to: {frame.url}")
+                    print(f"🖼️ Object URL: {frame.url}", flush=True)
+                else:
+                    logger.warning("[CUALoopService] Failed to upload screenshot")
         except Exception as e:
             logger.error(f"[CUALoopService] Error capturing screenshot: {e}", exc_info=True)
-        return screenshot_b64, screenshot_url, current_url
+        return frame, current_url
 
     @staticmethod
     def _build_next_input(
         call_id: Optional[str],
-        screenshot_b64: str,
+        image_url: str,
         execution_error: Optional[str],
         current_url: Optional[str],
         screenshot_url: Optional[str],
@@ -313,7 +346,7 @@ class CUALoopRunner:
             "call_id": call_id,
             "output": {
                 "type": "computer_screenshot",
-                "image_url": f"data:image/png;base64,{screenshot_b64}",
+                "image_url": image_url,
             },
         }]
 
@@ -402,6 +435,7 @@ class CUALoopService:
         max_duration_seconds: int = 900,
         tenant_id: Optional[str] = None,
         job_id: Optional[str] = None,
+        step_index: Optional[int] = None,
     ) -> Tuple[str, List[str], Dict]:
         """
         Run the full Computer Use API loop: execute actions → capture screenshots → send back to model.
@@ -458,6 +492,7 @@ class CUALoopService:
             job_id=job_id,
             display_width=display_width,
             display_height=display_height,
+            step_index=step_index,
         )
         runner = CUALoopRunner(
             openai_client=openai_client,
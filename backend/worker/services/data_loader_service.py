@@ -1,28 +1,74 @@
 """
 Data Loader Service
 Handles batch loading of job-related data in parallel for better performance.
+
+Workflows, forms and submissions are cached across invocations of a warm
+Lambda container. A cached workflow/form is always revalidated (a version/updated_at
+projection) the first time a job loads it, so a job started right after an edit sees
+the edit. Per-step execution reloads the same records for every step of a job; those
+repeated loads skip revalidation until the entry is older than
+DATA_LOADER_REVALIDATE_SECONDS.
 """
 
+import copy
 import logging
+import os
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Callable, Optional, Tuple
 
 from db_service import DynamoDBService
+from services.cache_service import CacheService
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_REVALIDATE_SECONDS = 30
+RECORD_CACHE_TTL_SECONDS = 900  # 15 minutes
+RECORD_CACHE_MAX_SIZE = 256
+
+
+def _read_revalidate_seconds() -> float:
+    value = (os.environ.get("DATA_LOADER_REVALIDATE_SECONDS") or "").strip()
+    if not value:
+        return DEFAULT_REVALIDATE_SECONDS
+    try:
+        return max(0.0, float(value))
+    except Exception:
+        return DEFAULT_REVALIDATE_SECONDS
+
+
+# Warm-container cache shared by every DataLoaderService in the process.
+_record_cache = CacheService(max_size=RECORD_CACHE_MAX_SIZE, ttl_seconds=RECORD_CACHE_TTL_SECONDS)
+
+
+def _validator_of(record: Optional[Dict[str, Any]]) -> Tuple[Any, Any, Any]:
+    record = record or {}
+    return record.get('version'), record.get('updated_at'), record.get('deleted_at')
+
 
 class DataLoaderService:
     """Service for loading job-related data in parallel."""
     
-    def __init__(self, db_service: DynamoDBService):
+    def __init__(
+        self,
+        db_service: DynamoDBService,
+        cache: Optional[CacheService] = None,
+        revalidate_seconds: Optional[float] = None
+    ):
         """
         Initialize data loader service.
         
         Args:
             db_service: DynamoDB service instance
+            cache: Record cache (defaults to the process-wide warm-container cache)
+            revalidate_seconds: Age after which a cached workflow/form is revalidated again
+                within the same job (defaults to DATA_LOADER_REVALIDATE_SECONDS)
         """
         self.db = db_service
+        self.cache = cache if cache is not None else _record_cache
+        self.revalidate_seconds = (
+            revalidate_seconds if revalidate_seconds is not None else _read_revalidate_seconds()
+        )
     
     def load_job_data(self, job_id: str) -> Dict[str, Any]:
         """
@@ -60,8 +106,8 @@ class DataLoaderService:
         # Load workflow, submission, and form in parallel
         with ThreadPoolExecutor(max_workers=3) as executor:
             # Submit tasks
-            workflow_future = executor.submit(self.db.get_workflow, workflow_id)
-            submission_future = executor.submit(self.db.get_submission, submission_id)
+            workflow_future = executor.submit(self.get_workflow, workflow_id, job_id)
+            submission_future = executor.submit(self.get_submission, submission_id)
             
             # Get form_id from submission if available
             submission = submission_future.result()
@@ -69,7 +115,7 @@ class DataLoaderService:
                 raise ValueError(f"Submission {submission_id} not found")
             
             form_id = submission.get('form_id')
-            form_future = executor.submit(self._get_form_safe, form_id) if form_id else None
+            form_future = executor.submit(self._get_form_safe, form_id, job_id) if form_id else None
             
             # Get results
             workflow = workflow_future.result()
@@ -85,19 +131,102 @@ class DataLoaderService:
             'form': form
         }
     
-    def _get_form_safe(self, form_id: str) -> Optional[Dict[str, Any]]:
+    def _get_form_safe(self, form_id: str, job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Safely get form, returning None if not found instead of raising.
         
         Args:
             form_id: Form ID
+            job_id: Job loading the form (see get_form)
             
         Returns:
             Form dictionary or None if not found
         """
         try:
-            return self.db.get_form(form_id)
+            return self.get_form(form_id, job_id)
         except Exception as e:
             logger.warning(f"Could not retrieve form {form_id}: {e}")
             return None
+    
+    def get_workflow(self, workflow_id: str, job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get workflow by ID, reusing a cached copy while its version/updated_at is unchanged.
+        
+        Repeated loads by the same job_id within revalidate_seconds skip the check.
+        """
+        return self._get_revalidated(
+            f"workflow:{workflow_id}",
+            lambda: self.db.get_workflow(workflow_id),
+            lambda: self.db.get_workflow_validator(workflow_id),
+            job_id,
+        )
+    
+    def get_form(self, form_id: str, job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get form by ID, reusing a cached copy while its version/updated_at is unchanged.
+        
+        Repeated loads by the same job_id within revalidate_seconds skip the check.
+        """
+        return self._get_revalidated(
+            f"form:{form_id}",
+            lambda: self.db.get_form(form_id),
+            lambda: self.db.get_form_validator(form_id),
+            job_id,
+        )
+    
+    def get_submission(self, submission_id: str) -> Optional[Dict[str, Any]]:
+        """Get submission by ID. Submissions are immutable once created, so they are never revalidated."""
+        cache_key = f"submission:{submission_id}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        submission = self.db.get_submission(submission_id)
+        if submission is not None:
+            self.cache.set(cache_key, copy.deepcopy(submission))
+        return submission
+    
+    def _get_revalidated(
+        self,
+        cache_key: str,
+        loader: Callable[[], Optional[Dict[str, Any]]],
+        validator_loader: Callable[[], Optional[Dict[str, Any]]],
+        job_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Serve a mutable record from cache. It is revalidated on a job's first load (and
+        whenever no job is given); later loads by the same job revalidate only once the
+        entry is older than revalidate_seconds. Callers get a private copy so cached
+        records are never mutated.
+        """
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            record = cached['record']
+            age = time.monotonic() - cached['validated_at']
+            if job_id is not None and cached.get('validated_job') == job_id and age < self.revalidate_seconds:
+                return copy.deepcopy(record)
+            try:
+                current = validator_loader()
+            except Exception as e:
+                logger.warning(f"Could not revalidate cached {cache_key}, reloading: {e}")
+                current = None
+            cached_validator = _validator_of(record)
+            if (
+                current is not None
+                and cached_validator != (None, None, None)
+                and _validator_of(current) == cached_validator
+            ):
+                cached['validated_at'] = time.monotonic()
+                cached['validated_job'] = job_id
+                return copy.deepcopy(record)
+        
+        record = loader()
+        if record is not None:
+            self.cache.set(cache_key, {
+                'record': copy.deepcopy(record),
+                'validated_at': time.monotonic(),
+                'validated_job': job_id,
+            })
+        else:
+            self.cache.delete(cache_key)
+        return record
 
@@ -0,0 +1,541 @@
+"""
+Execution Steps Store
+Incremental S3 storage for job execution_steps.
+
+Layout (under the job's run folder):
+    execution_steps/<position>-<sha1>.json   one immutable object per entry
+    execution_steps/manifest.json            ordered entry list + compaction info
+    execution_steps.json                     compacted full list (read by the API/frontend)
+
+Each write uploads only entries whose content changed plus the small manifest. The
+compacted blob is rewritten at most once per EXECUTION_STEPS_COMPACT_INTERVAL_SECONDS,
+and always when a caller forces it (job status changes, end of a step invocation).
+
+Readers that only need some steps (e.g. a step's declared dependencies) get an
+ExecutionStepsView; writing the view back merges it onto the manifest it was read from,
+so entries that were never downloaded are kept as-is.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.step_utils import normalize_step_order
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+DEFAULT_COMPACT_INTERVAL_SECONDS = 15.0
+ENTRY_DOWNLOAD_WORKERS = 8
+# S3 multipart parts (other than the last) must be at least 5MB
+MIN_COPY_PART_BYTES = 5 * 1024 * 1024
+
+
+def _read_compact_interval() -> float:
+    value = (os.environ.get("EXECUTION_STEPS_COMPACT_INTERVAL_SECONDS") or "").strip()
+    if not value:
+        return DEFAULT_COMPACT_INTERVAL_SECONDS
+    try:
+        return max(float(value), 0.0)
+    except Exception:
+        return DEFAULT_COMPACT_INTERVAL_SECONDS
+
+
+@dataclass
+class _JobState:
+    """In-process view of one job's stored execution_steps."""
+    manifest: Dict[str, Any]
+    manifest_key: str
+    compacted_key: str
+    # Serialized entry bodies keyed by sha1, for entries in the current manifest.
+    bodies: Dict[str, str] = field(default_factory=dict)
+    compacted_at: Optional[float] = None
+    s3_service: Any = None
+    # Latest manifest whose entries the compacted blob currently holds (splice base)
+    compacted_manifest: Optional[Dict[str, Any]] = None
+
+
+class ExecutionStepsView(list):
+    """
+    A subset of a job's execution_steps, loaded for specific step_orders.
+
+    Behaves like the usual list (handlers append new entries to it), but remembers the
+    manifest it was read from so ExecutionStepsStore.write can merge it back into the
+    full list instead of replacing it.
+    """
+
+    def __init__(self, steps: List[Dict[str, Any]], manifest: Dict[str, Any], positions: List[int]):
+        super().__init__(steps)
+        # Manifest snapshot the view was read from, and the manifest position of each loaded entry
+        self.manifest = manifest
+        self.positions = positions
+        # Manifest version produced by the last write of this view (for concurrent-write checks)
+        self.written_version: Optional[int] = None
+
+
+class ExecutionStepsStore:
+    """Append-friendly, per-entry S3 storage for execution_steps with a reassembling reader."""
+
+    def __init__(self, compact_interval_seconds: Optional[float] = None):
+        """
+        Initialize store.
+
+        Args:
+            compact_interval_seconds: Minimum seconds between compacted blob rewrites
+                (defaults to EXECUTION_STEPS_COMPACT_INTERVAL_SECONDS; 0 compacts on every write)
+        """
+        if compact_interval_seconds is None:
+            compact_interval_seconds = _read_compact_interval()
+        self.compact_interval_seconds = compact_interval_seconds
+        self._states: Dict[str, _JobState] = {}
+        self._job_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {
+            'writes': 0,
+            'entries_written': 0,
+            'entries_unchanged': 0,
+            'entry_bytes_written': 0,
+            'compactions': 0,
+            'compacted_bytes_written': 0,
+        }
+
+    @staticmethod
+    def job_prefix(job_id: str, tenant_id: Optional[str]) -> str:
+        """Run folder for a job (legacy path when tenant_id is unavailable)."""
+        if tenant_id:
+            return f"{tenant_id}/jobs/{job_id}/"
+        return f"jobs/{job_id}/"
+
+    @classmethod
+    def compacted_key(cls, job_id: str, tenant_id: Optional[str]) -> str:
+        return f"{cls.job_prefix(job_id, tenant_id)}execution_steps.json"
+
+    @classmethod
+    def manifest_key(cls, job_id: str, tenant_id: Optional[str]) -> str:
+        return f"{cls.job_prefix(job_id, tenant_id)}execution_steps/manifest.json"
+
+    def _job_lock(self, job_id: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._job_locks.get(job_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._job_locks[job_id] = lock
+            return lock
+
+    @staticmethod
+    def _serialize(step: Any) -> str:
+        return json.dumps(step, default=str)
+
+    @staticmethod
+    def _iter_joined(bodies: Iterable[str], leading_separator: bool = False) -> Iterator[str]:
+        # Matches json.dumps(list) with default separators, so the compacted blob
+        # is byte-identical to the legacy full-list serialization. Yielded piecewise so
+        # the blob is streamed to S3 rather than built as one string.
+        first = not leading_separator
+        for body in bodies:
+            if not first:
+                yield ", "
+            first = False
+            yield body
+        yield "]"
+
+    def _load_manifest(self, s3_service, manifest_key: str) -> Optional[Dict[str, Any]]:
+        raw = s3_service.download_bytes(manifest_key)
+        if raw is None:
+            return None
+        manifest = json.loads(raw)
+        if not isinstance(manifest, dict) or not isinstance(manifest.get('entries'), list):
+            return None
+        return manifest
+
+    def _get_state(self, s3_service, job_id: str, tenant_id: Optional[str]) -> _JobState:
+        state = self._states.get(job_id)
+        if state is not None:
+            return state
+        manifest = None
+        try:
+            # Seed from a manifest written by an earlier invocation so unchanged entries
+            # aren't re-uploaded (e.g. per-step Lambda invocations of the same job).
+            manifest = self._load_manifest(s3_service, self.manifest_key(job_id, tenant_id))
+        except Exception as e:
+            logger.warning(f"[ExecutionStepsStore] Failed to load existing manifest, starting fresh: {e}", extra={
+                'job_id': job_id
+            })
+        if manifest is None:
+            manifest = {
+                'manifest_version': MANIFEST_VERSION,
+                'job_id': job_id,
+                'version': 0,
+                'entries': [],
+                'compacted': None,
+            }
+        state = _JobState(
+            manifest=manifest,
+            manifest_key=self.manifest_key(job_id, tenant_id),
+            compacted_key=self.compacted_key(job_id, tenant_id),
+            s3_service=s3_service,
+        )
+        if (manifest.get('compacted') or {}).get('version') == manifest.get('version'):
+            state.compacted_manifest = manifest
+        self._states[job_id] = state
+        return state
+
+    def write(
+        self,
+        s3_service,
+        job_id: str,
+        tenant_id: Optional[str],
+        execution_steps: List[Dict[str, Any]],
+        compact: bool = False
+    ) -> Dict[str, str]:
+        """
+        Persist execution_steps, uploading only entries that changed.
+
+        Args:
+            s3_service: S3Service instance
+            job_id: Job ID
+            tenant_id: Tenant ID used for the run folder (None for the legacy path)
+            execution_steps: Full, current list of execution steps
+            compact: Force a rewrite of the compacted execution_steps.json
+
+        Returns:
+            Dict with execution_steps_s3_key and execution_steps_manifest_key
+        """
+        prefix = self.job_prefix(job_id, tenant_id)
+
+        with self._job_lock(job_id):
+            state = self._get_state(s3_service, job_id, tenant_id)
+            state.s3_service = s3_service
+            manifest_key = state.manifest_key
+            compacted_key = state.compacted_key
+            previous_entries = state.manifest.get('entries') or []
+            items = self._merge_items(job_id, state, execution_steps)
+
+            entries: List[Dict[str, Any]] = []
+            bodies: Dict[str, str] = {}
+            for position, (step, kept_entry) in enumerate(items):
+                previous = previous_entries[position] if position < len(previous_entries) else None
+                if kept_entry is not None:
+                    # Entry a view never downloaded: it keeps its position, so the stored
+                    # object is reused as-is.
+                    self.stats['entries_unchanged'] += 1
+                    if kept_entry['sha1'] in state.bodies:
+                        bodies[kept_entry['sha1']] = state.bodies[kept_entry['sha1']]
+                    entries.append(dict(kept_entry))
+                    continue
+
+                body = self._serialize(step)
+                sha1 = hashlib.sha1(body.encode('utf-8')).hexdigest()
+                key = f"{prefix}execution_steps/{position:05d}-{sha1[:16]}.json"
+                if previous and previous.get('sha1') == sha1 and previous.get('key') == key:
+                    self.stats['entries_unchanged'] += 1
+                else:
+                    s3_service.put_bytes(key, body)
+                    self.stats['entries_written'] += 1
+                    self.stats['entry_bytes_written'] += len(body)
+                step_dict = step if isinstance(step, dict) else {}
+                entries.append({
+                    'key': key,
+                    'sha1': sha1,
+                    'step_order': normalize_step_order(step_dict),
+                    'step_type': step_dict.get('step_type'),
+                    'bytes': len(body),
+                })
+                bodies[sha1] = body
+
+            version = int(state.manifest.get('version') or 0) + 1
+            compacted = state.manifest.get('compacted')
+            now = time.monotonic()
+            should_compact = (
+                compact
+                or self.compact_interval_seconds <= 0
+                or state.compacted_at is None
+                or now - state.compacted_at >= self.compact_interval_seconds
+            )
+            if should_compact:
+                base = state.compacted_manifest
+                if base is None and isinstance(execution_steps, ExecutionStepsView):
+                    base = execution_steps.manifest
+                etag, compacted_size = self._write_compacted(s3_service, compacted_key, base, entries, bodies)
+                compacted = {'key': compacted_key, 'version': version, 'etag': etag}
+                state.compacted_at = now
+                self.stats['compactions'] += 1
+                self.stats['compacted_bytes_written'] += compacted_size
+
+            manifest = {
+                'manifest_version': MANIFEST_VERSION,
+                'job_id': job_id,
+                'version': version,
+                'entries': entries,
+                'compacted': compacted,
+                'updated_at': datetime.utcnow().isoformat(),
+            }
+            s3_service.put_bytes(manifest_key, json.dumps(manifest))
+            state.manifest = manifest
+            state.bodies = bodies
+            if should_compact:
+                state.compacted_manifest = manifest
+            if isinstance(execution_steps, ExecutionStepsView):
+                execution_steps.written_version = version
+            self.stats['writes'] += 1
+
+        logger.debug("[ExecutionStepsStore] Stored execution_steps", extra={
+            'job_id': job_id,
+            'manifest_key': manifest_key,
+            'steps_count': len(entries),
+            'version': version,
+            'compacted': should_compact,
+        })
+
+        return {
+            'execution_steps_s3_key': compacted_key,
+            'execution_steps_manifest_key': manifest_key,
+        }
+
+    def _merge_items(
+        self,
+        job_id: str,
+        state: _JobState,
+        execution_steps: List[Dict[str, Any]]
+    ) -> List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """
+        Expand the caller's list into (step, kept_entry) pairs in stored order.
+
+        A plain list is the full list. A view is merged onto the manifest it was read
+        from: loaded entries take their (possibly edited) values, entries that were not
+        loaded are kept by reference, and anything appended to the view goes last.
+        """
+        if not isinstance(execution_steps, ExecutionStepsView):
+            return [(step, None) for step in (execution_steps or [])]
+
+        expected_version = execution_steps.written_version
+        if expected_version is None:
+            expected_version = execution_steps.manifest.get('version')
+        if state.manifest.get('version') != expected_version:
+            logger.warning("[ExecutionStepsStore] execution_steps changed since this view was read; "
+                           "merging onto the version the view was read from", extra={
+                'job_id': job_id,
+                'view_version': expected_version,
+                'stored_version': state.manifest.get('version'),
+            })
+
+        loaded_count = len(execution_steps.positions)
+        loaded_by_position = dict(zip(execution_steps.positions, list(execution_steps)[:loaded_count]))
+        items: List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]] = []
+        for position, entry in enumerate(execution_steps.manifest.get('entries') or []):
+            if position in loaded_by_position:
+                items.append((loaded_by_position[position], None))
+            else:
+                items.append((None, entry))
+        items.extend((step, None) for step in list(execution_steps)[loaded_count:])
+        return items
+
+    def _write_compacted(
+        self,
+        s3_service,
+        compacted_key: str,
+        base: Optional[Dict[str, Any]],
+        entries: List[Dict[str, Any]],
+        bodies: Dict[str, str]
+    ) -> Tuple[str, int]:
+        """
+        Stream the compacted blob to S3, fetching as little as possible for entries not in memory.
+
+        Args:
+            base: Manifest the currently stored compacted blob was built from, if known
+
+        Returns:
+            Tuple of (ETag, bytes written)
+        """
+        missing = [entry for entry in entries if entry['sha1'] not in bodies]
+        if missing and base is not None:
+            spliced = self._write_spliced(s3_service, compacted_key, base, entries, bodies)
+            if spliced is not None:
+                return spliced
+
+        bodies.update(self._download_bodies(s3_service, missing))
+        chunks = itertools.chain(["["], self._iter_joined(bodies[entry['sha1']] for entry in entries))
+        return s3_service.upload_stream(compacted_key, chunks, content_type='application/json')
+
+    def _write_spliced(
+        self,
+        s3_service,
+        compacted_key: str,
+        base: Dict[str, Any],
+        entries: List[Dict[str, Any]],
+        bodies: Dict[str, str]
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Pure append onto a current compacted blob: reuse the stored bytes for the earlier
+        entries (server-side copy when large enough) instead of downloading each entry.
+
+        Returns:
+            (ETag, bytes written), or None if the blob can't be spliced
+        """
+        base_entries = base.get('entries') or []
+        base_compacted = base.get('compacted') or {}
+        source_key = base_compacted.get('key')
+        if not source_key or base_compacted.get('version') != base.get('version'):
+            return None
+        if len(entries) < len(base_entries) or any(
+            entries[i]['sha1'] != base_entries[i].get('sha1') for i in range(len(base_entries))
+        ):
+            return None
+        appended = entries[len(base_entries):]
+        if any(entry['sha1'] not in bodies for entry in appended):
+            return None
+
+        # The stored blob must still be the one the base manifest recorded (no API-side edit)
+        head = s3_service.head_object(source_key)
+        if not head or head.get('etag') != base_compacted.get('etag') or not head.get('size'):
+            return None
+        size = int(head['size'])
+        tail = self._iter_joined(
+            (bodies[entry['sha1']] for entry in appended),
+            leading_separator=bool(base_entries),
+        )
+        prefix_length = size - 1
+        if prefix_length >= MIN_COPY_PART_BYTES:
+            return s3_service.upload_with_copied_prefix(
+                compacted_key, source_key, prefix_length, tail, content_type='application/json'
+            )
+        prefix = s3_service.download_range(source_key, 0, prefix_length - 1)
+        return s3_service.upload_stream(
+            compacted_key, itertools.chain([prefix], tail), content_type='application/json'
+        )
+
+    @staticmethod
+    def _download_bodies(s3_service, entries: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Download entry bodies in parallel, keyed by sha1."""
+        if not entries:
+            return {}
+
+        def _download(entry: Dict[str, Any]) -> str:
+            raw = s3_service.download_bytes(entry['key'])
+            if raw is None:
+                raise ValueError(f"execution_steps entry missing: {entry['key']}")
+            return raw.decode('utf-8')
+
+        downloaded: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=min(ENTRY_DOWNLOAD_WORKERS, len(entries))) as executor:
+            for entry, body in zip(entries, executor.map(_download, entries)):
+                downloaded[entry['sha1']] = body
+        return downloaded
+
+    def flush(self, job_id: str, s3_service=None) -> bool:
+        """
+        Rewrite the compacted blob if the latest manifest version hasn't been compacted.
+
+        Args:
+            job_id: Job ID
+            s3_service: Optional S3Service (defaults to the one used for the last write)
+
+        Returns:
+            True if a compaction was written
+        """
+        with self._job_lock(job_id):
+            state = self._states.get(job_id)
+            if state is None:
+                return False
+            s3_service = s3_service or state.s3_service
+            manifest = state.manifest
+            compacted = manifest.get('compacted') or {}
+            if not s3_service or not manifest.get('entries'):
+                return False
+            if compacted.get('version') == manifest.get('version'):
+                return False
+
+            compacted_key = compacted.get('key') or state.compacted_key
+            try:
+                etag, compacted_size = self._write_compacted(
+                    s3_service, compacted_key, state.compacted_manifest, manifest['entries'], state.bodies
+                )
+            except ValueError as e:
+                logger.warning("[ExecutionStepsStore] Missing entry during flush", extra={
+                    'job_id': job_id,
+                    'error_message': str(e)
+                })
+                return False
+            manifest = dict(manifest)
+            manifest['compacted'] = {'key': compacted_key, 'version': manifest.get('version'), 'etag': etag}
+            manifest['updated_at'] = datetime.utcnow().isoformat()
+            s3_service.put_bytes(state.manifest_key, json.dumps(manifest))
+            state.manifest = manifest
+            state.compacted_manifest = manifest
+            state.compacted_at = time.monotonic()
+            self.stats['compactions'] += 1
+            self.stats['compacted_bytes_written'] += compacted_size
+            return True
+
+    def read(
+        self,
+        s3_service,
+        manifest_key: str,
+        step_orders: Optional[Iterable[int]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Reassemble execution_steps from the manifest.
+
+        Entries already held in memory (written by this process) are not downloaded
+        again. If the compacted blob has been modified outside the worker (e.g. an
+        API-side step edit), None is returned so the caller reads the blob instead.
+
+        Args:
+            s3_service: S3Service instance
+            manifest_key: S3 key of the manifest
+            step_orders: Optional step_order values to load; other entries are skipped
+                and an ExecutionStepsView is returned so the subset can be written back
+
+        Returns:
+            List of execution steps (in stored order), or None if the manifest is
+            missing or the compacted blob is authoritative
+        """
+        manifest = self._load_manifest(s3_service, manifest_key)
+        if manifest is None:
+            return None
+
+        compacted = manifest.get('compacted') or {}
+        if compacted.get('key') and compacted.get('etag'):
+            current_etag = s3_service.get_etag(compacted['key'])
+            if current_etag is not None and current_etag != compacted['etag']:
+                logger.info("[ExecutionStepsStore] Compacted execution_steps changed externally; using it", extra={
+                    'manifest_key': manifest_key,
+                    'compacted_key': compacted['key']
+                })
+                return None
+
+        wanted = set(step_orders) if step_orders is not None else None
+        positions = [
+            position for position, entry in enumerate(manifest['entries'])
+            if wanted is None or entry.get('step_order') in wanted
+        ]
+        entries = [manifest['entries'][position] for position in positions]
+
+        state = self._states.get(str(manifest.get('job_id') or ''))
+        cached_bodies = state.bodies if state is not None else {}
+        missing = [entry for entry in entries if entry.get('sha1') not in cached_bodies]
+
+        compacted_is_current = compacted.get('version') == manifest.get('version')
+        if wanted is None and len(missing) > 1 and compacted_is_current and compacted.get('key'):
+            # One GET of the fresh compacted blob beats many small entry GETs.
+            raw = s3_service.download_bytes(compacted['key'])
+            if raw is not None:
+                return json.loads(raw)
+
+        downloaded = self._download_bodies(s3_service, missing)
+
+        steps: List[Dict[str, Any]] = []
+        for entry in entries:
+            body = cached_bodies.get(entry['sha1']) or downloaded[entry['sha1']]
+            steps.append(json.loads(body))
+        if wanted is not None:
+            return ExecutionStepsView(steps, manifest, positions)
+        return steps
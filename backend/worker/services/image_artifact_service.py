@@ -5,12 +5,17 @@ Handles storage of image artifacts from AI-generated content.
 
 import logging
 import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 
 from artifact_service import ArtifactService
 
 logger = logging.getLogger(__name__)
 
+# Background workers storing streamed image artifacts for one step.
+STREAM_MAX_WORKERS = 4
+
 
 class ImageArtifactService:
     """Service for storing image artifacts."""
@@ -68,141 +73,289 @@ class ImageArtifactService:
             return image_artifact_ids
         
         for idx, image_url in enumerate(image_urls):
-            logger.info(f"[ImageArtifactService] Processing image URL {idx + 1}/{len(image_urls)}", extra={
+            image_artifact_id = self._store_one(
+                idx=idx,
+                image_url=image_url,
+                image_count=len(image_urls),
+                tenant_id=tenant_id,
+                job_id=job_id,
+                step_index=step_index,
+                step_name=step_name,
+                step_instructions=step_instructions,
+                context=context,
+            )
+            if image_artifact_id:
+                image_artifact_ids.append(image_artifact_id)
+        
+        logger.info("[ImageArtifactService] Finished storing image artifacts", extra={
+            'job_id': job_id,
+            'tenant_id': tenant_id,
+            'step_index': step_index,
+            'step_name': step_name,
+            'input_image_urls_count': len(image_urls),
+            'successful_artifact_ids_count': len(image_artifact_ids),
+            'image_artifact_ids': image_artifact_ids
+        })
+        
+        return image_artifact_ids
+
+    def open_stream(
+        self,
+        tenant_id: str,
+        job_id: str,
+        step_index: int,
+        step_name: str = '',
+        step_instructions: Optional[str] = None,
+        context: Optional[str] = None
+    ) -> 'ImageArtifactStream':
+        """
+        Start storing a step's image artifacts as its images arrive.
+        
+        Returns:
+            ImageArtifactStream; call add() per image URL and finish() once the step returns
+        """
+        return ImageArtifactStream(
+            service=self,
+            tenant_id=tenant_id,
+            job_id=job_id,
+            step_index=step_index,
+            step_name=step_name,
+            step_instructions=step_instructions,
+            context=context,
+        )
+
+    def _store_one(
+        self,
+        idx: int,
+        image_url: str,
+        image_count: int,
+        tenant_id: str,
+        job_id: str,
+        step_index: int,
+        step_name: str = '',
+        step_instructions: Optional[str] = None,
+        context: Optional[str] = None
+    ) -> Optional[str]:
+        """Store one image artifact; returns its ID, or None if skipped or failed."""
+        logger.info(f"[ImageArtifactService] Processing image URL {idx + 1}/{image_count}", extra={
+            'job_id': job_id,
+            'step_index': step_index,
+            'step_name': step_name,
+            'image_index': idx,
+            'image_url': image_url,
+            'image_url_length': len(image_url) if image_url else 0,
+            'image_url_is_empty': not image_url or image_url.strip() == ''
+        })
+        
+        if not image_url:
+            logger.warning(f"[ImageArtifactService] Skipping empty image URL at index {idx}", extra={
                 'job_id': job_id,
                 'step_index': step_index,
                 'step_name': step_name,
-                'image_index': idx,
-                'image_url': image_url,
-                'image_url_length': len(image_url) if image_url else 0,
-                'image_url_is_empty': not image_url or image_url.strip() == ''
+                'image_index': idx
             })
+            return None
             
-            if not image_url:
-                logger.warning(f"[ImageArtifactService] Skipping empty image URL at index {idx}", extra={
+        try:
+            # Extract filename from URL or generate one
+            filename_match = re.search(r'/([^/?]+\.(png|jpg|jpeg))', image_url)
+            if filename_match:
+                filename = filename_match.group(1)
+                logger.debug(f"[ImageArtifactService] Extracted filename from URL", extra={
                     'job_id': job_id,
                     'step_index': step_index,
                     'step_name': step_name,
-                    'image_index': idx
+                    'image_index': idx,
+                    'image_filename': filename
                 })
-                continue
+            else:
+                # Try to use AI naming if context is available
+                filename = None
+                if (step_name or step_instructions or context):
+                    try:
+                        import base64
+                        from utils import http_client
+                        from services.image_naming_service import ImageNamingService
+                        
+                        # Download image temporarily for AI naming
+                        response = http_client.get(image_url, timeout=10)
+                        if response.status_code == 200:
+                            image_data = response.content
+                            image_b64 = base64.b64encode(image_data).decode('utf-8')
+                            
+                            naming_service = ImageNamingService()
+                            filename = naming_service.generate_filename_from_image(
+                                image_b64=image_b64,
+                                context=context,
+                                step_name=step_name,
+                                step_instructions=step_instructions,
+                                image_index=idx
+                            )
+                            logger.info(f"[ImageArtifactService] Generated AI filename", extra={
+                                'job_id': job_id,
+                                'step_index': step_index,
+                                'step_name': step_name,
+                                'image_index': idx,
+                                'ai_filename': filename
+                            })
+                    except Exception as e:
+                        logger.warning(f"[ImageArtifactService] AI naming failed, using fallback: {e}", extra={
+                            'error_type': type(e).__name__,
+                            'error_message': str(e),
+                            'job_id': job_id
+                        })
                 
-            try:
-                # Extract filename from URL or generate one
-                filename_match = re.search(r'/([^/?]+\.(png|jpg|jpeg))', image_url)
-                if filename_match:
-                    filename = filename_match.group(1)
-                    logger.debug(f"[ImageArtifactService] Extracted filename from URL", extra={
+                # Fallback to generic filename if AI naming failed or wasn't attempted
+                if not filename:
+                    filename = f"image_{step_index + 1}_{idx + 1}.png"
+                    logger.debug(f"[ImageArtifactService] Generated generic filename", extra={
                         'job_id': job_id,
                         'step_index': step_index,
                         'step_name': step_name,
                         'image_index': idx,
                         'image_filename': filename
                     })
-                else:
-                    # Try to use AI naming if context is available
-                    filename = None
-                    if (step_name or step_instructions or context):
-                        try:
-                            import requests
-                            import base64
-                            from services.image_naming_service import ImageNamingService
-                            
-                            # Download image temporarily for AI naming
-                            response = requests.get(image_url, timeout=10)
-                            if response.status_code == 200:
-                                image_data = response.content
-                                image_b64 = base64.b64encode(image_data).decode('utf-8')
-                                
-                                naming_service = ImageNamingService()
-                                filename = naming_service.generate_filename_from_image(
-                                    image_b64=image_b64,
-                                    context=context,
-                                    step_name=step_name,
-                                    step_instructions=step_instructions,
-                                    image_index=idx
-                                )
-                                logger.info(f"[ImageArtifactService] Generated AI filename", extra={
-                                    'job_id': job_id,
-                                    'step_index': step_index,
-                                    'step_name': step_name,
-                                    'image_index': idx,
-                                    'ai_filename': filename
-                                })
-                        except Exception as e:
-                            logger.warning(f"[ImageArtifactService] AI naming failed, using fallback: {e}", extra={
-                                'error_type': type(e).__name__,
-                                'error_message': str(e),
-                                'job_id': job_id
-                            })
-                    
-                    # Fallback to generic filename if AI naming failed or wasn't attempted
-                    if not filename:
-                        filename = f"image_{step_index + 1}_{idx + 1}.png"
-                        logger.debug(f"[ImageArtifactService] Generated generic filename", extra={
-                            'job_id': job_id,
-                            'step_index': step_index,
-                            'step_name': step_name,
-                            'image_index': idx,
-                            'image_filename': filename
-                        })
-                
-                logger.info(f"[ImageArtifactService] Storing image artifact", extra={
+            
+            logger.info(f"[ImageArtifactService] Storing image artifact", extra={
+                'job_id': job_id,
+                'step_index': step_index,
+                'step_name': step_name,
+                'image_index': idx,
+                'image_url': image_url,
+                'image_filename': filename
+            })
+            
+            image_artifact_id = self.artifact_service.store_image_artifact(
+                tenant_id=tenant_id,
+                job_id=job_id,
+                image_url=image_url,
+                filename=filename
+            )
+            
+            logger.info(
+                f"[ImageArtifactService] Successfully stored image artifact",
+                extra={
                     'job_id': job_id,
+                    'tenant_id': tenant_id,
                     'step_index': step_index,
                     'step_name': step_name,
                     'image_index': idx,
+                    'image_artifact_id': image_artifact_id,
                     'image_url': image_url,
                     'image_filename': filename
-                })
-                
-                image_artifact_id = self.artifact_service.store_image_artifact(
-                    tenant_id=tenant_id,
-                    job_id=job_id,
-                    image_url=image_url,
-                    filename=filename
+                }
+            )
+        except Exception as e:
+            logger.error(
+                f"[ImageArtifactService] Failed to store image artifact",
+                extra={
+                    'job_id': job_id,
+                    'tenant_id': tenant_id,
+                    'step_index': step_index,
+                    'step_name': step_name,
+                    'image_index': idx,
+                    'image_url': image_url,
+                    'error_type': type(e).__name__,
+                    'error_message': str(e)
+                },
+                exc_info=True
+            )
+            return None
+        return image_artifact_id
+
+
+class ImageArtifactStream:
+    """
+    Stores a step's image artifacts in the background as image URLs arrive.
+    
+    The Images API path reports each image as soon as it is uploaded, so artifact
+    records are written while later images are still generating.
+    """
+    
+    def __init__(
+        self,
+        service: ImageArtifactService,
+        tenant_id: str,
+        job_id: str,
+        step_index: int,
+        step_name: str = '',
+        step_instructions: Optional[str] = None,
+        context: Optional[str] = None,
+        max_workers: int = STREAM_MAX_WORKERS
+    ):
+        self.service = service
+        self.tenant_id = tenant_id
+        self.job_id = job_id
+        self.step_index = step_index
+        self.step_name = step_name
+        self.step_instructions = step_instructions
+        self.context = context
+        self.max_workers = max_workers
+        self._futures: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def add(self, image_url: str) -> None:
+        """Queue an image URL for storage (duplicates and empty URLs are ignored)."""
+        if not image_url:
+            return
+        with self._lock:
+            if self._closed or image_url in self._futures:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="image-artifacts",
                 )
-                
+            idx = len(self._futures)
+            self._futures[image_url] = self._executor.submit(
+                self.service._store_one,
+                idx=idx,
+                image_url=image_url,
+                image_count=idx + 1,
+                tenant_id=self.tenant_id,
+                job_id=self.job_id,
+                step_index=self.step_index,
+                step_name=self.step_name,
+                step_instructions=self.step_instructions,
+                context=self.context,
+            )
+    
+    def finish(self, image_urls: Optional[List[str]] = None) -> List[str]:
+        """
+        Store any remaining URLs and wait for all queued artifacts.
+        
+        Args:
+            image_urls: Final image URLs of the step (URLs already streamed are not stored twice)
+            
+        Returns:
+            Artifact IDs of successfully stored images, in arrival order
+        """
+        for image_url in image_urls or []:
+            self.add(image_url)
+        image_artifact_ids = []
+        for future in list(self._futures.values()):
+            image_artifact_id = future.result()
+            if image_artifact_id:
                 image_artifact_ids.append(image_artifact_id)
-                logger.info(
-                    f"[ImageArtifactService] Successfully stored image artifact",
-                    extra={
-                        'job_id': job_id,
-                        'tenant_id': tenant_id,
-                        'step_index': step_index,
-                        'step_name': step_name,
-                        'image_index': idx,
-                        'image_artifact_id': image_artifact_id,
-                        'image_url': image_url,
-                        'image_filename': filename,
-                        'total_stored': len(image_artifact_ids)
-                    }
-                )
-            except Exception as e:
-                logger.error(
-                    f"[ImageArtifactService] Failed to store image artifact",
-                    extra={
-                        'job_id': job_id,
-                        'tenant_id': tenant_id,
-                        'step_index': step_index,
-                        'step_name': step_name,
-                        'image_index': idx,
-                        'image_url': image_url,
-                        'error_type': type(e).__name__,
-                        'error_message': str(e)
-                    },
-                    exc_info=True
-                )
+        self.close()
         
-        logger.info("[ImageArtifactService] Finished storing image artifacts", extra={
-            'job_id': job_id,
-            'tenant_id': tenant_id,
-            'step_index': step_index,
-            'step_name': step_name,
-            'input_image_urls_count': len(image_urls),
+        logger.info("[ImageArtifactService] Finished storing streamed image artifacts", extra={
+            'job_id': self.job_id,
+            'tenant_id': self.tenant_id,
+            'step_index': self.step_index,
+            'step_name': self.step_name,
+            'input_image_urls_count': len(self._futures),
             'successful_artifact_ids_count': len(image_artifact_ids),
             'image_artifact_ids': image_artifact_ids
         })
-        
         return image_artifact_ids
-
+    
+    def close(self) -> None:
+        """Stop accepting URLs and wait for queued artifacts to be written."""
+        with self._lock:
+            self._closed = True
+            executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -1,8 +1,9 @@
 """Image handling and browser automation for Computer Use."""
+import hashlib
 import logging
-import base64
 from typing import Dict, List, Tuple, Optional
 from utils.decimal_utils import convert_decimals_to_float
+from utils.images.payload import ImagePayload
 
 logger = logging.getLogger(__name__)
 
@@ -133,6 +134,8 @@ class ImageHandler:
         """
         Upload base64 image to S3 and return public URL.
         
+        Decodes once and delegates to upload_image_payload.
+        
         Args:
             image_b64: Base64-encoded image data
             content_type: MIME type (e.g., 'image/png', 'image/jpeg')
@@ -144,6 +147,53 @@ class ImageHandler:
             step_instructions: Optional step instructions for AI naming
             image_index: Index of the image if multiple images were generated
             
+        Returns:
+            Public URL string or None if upload fails
+        """
+        try:
+            payload = ImagePayload.from_base64(image_b64, content_type)
+        except Exception as e:
+            logger.error(f"[ImageHandler] Failed to decode base64 image: {e}", exc_info=True, extra={
+                'tenant_id': tenant_id,
+                'job_id': job_id,
+                'image_filename': filename
+            })
+            return None
+        return self.upload_image_payload(
+            payload,
+            tenant_id=tenant_id,
+            job_id=job_id,
+            filename=filename,
+            context=context,
+            step_name=step_name,
+            step_instructions=step_instructions,
+            image_index=image_index
+        )
+    
+    def upload_image_payload(
+        self,
+        payload: ImagePayload,
+        tenant_id: Optional[str] = None,
+        job_id: Optional[str] = None,
+        filename: Optional[str] = None,
+        context: Optional[str] = None,
+        step_name: Optional[str] = None,
+        step_instructions: Optional[str] = None,
+        image_index: int = 0
+    ) -> Optional[str]:
+        """
+        Upload decoded image bytes to S3 and return public URL.
+        
+        Args:
+            payload: Decoded image bytes and content type
+            tenant_id: Optional tenant ID for S3 path structure
+            job_id: Optional job ID for S3 path structure
+            filename: Optional filename (will be generated if not provided)
+            context: Optional context about the workflow/job for AI naming
+            step_name: Optional step name that generated the image for AI naming
+            step_instructions: Optional step instructions for AI naming
+            image_index: Index of the image if multiple images were generated
+            
         Returns:
             Public URL string or None if upload fails
         """
@@ -151,9 +201,10 @@ class ImageHandler:
             import uuid
             import time
             
+            content_type = payload.content_type
             # Generate filename if not provided
             if not filename:
-                ext = 'png' if 'png' in content_type else ('jpg' if 'jpeg' in content_type or 'jpg' in content_type else 'png')
+                ext = payload.extension
                 
                 # Use AI naming if enabled and context is available
                 if self.use_ai_naming and (step_name or step_instructions or context):
@@ -163,7 +214,7 @@ class ImageHandler:
                             self._naming_service = ImageNamingService()
                         
                         filename = self._naming_service.generate_filename_from_image(
-                            image_b64=image_b64,
+                            image_payload=payload,
                             context=context,
                             step_name=step_name,
                             step_instructions=step_instructions,
@@ -188,9 +239,6 @@ class ImageHandler:
                     # Generic filename fallback
                     filename = f"image-{int(time.time())}-{str(uuid.uuid4())[:8]}.{ext}"
             
-            # Decode base64 to bytes
-            image_bytes = base64.b64decode(image_b64)
-            
             # Construct S3 key with tenant/job path if provided
             if tenant_id and job_id:
                 s3_key = f"{tenant_id}/jobs/{job_id}/{filename}"
@@ -205,7 +253,7 @@ class ImageHandler:
             # Upload using upload_image which accepts bytes
             s3_url, public_url = self.s3_service.upload_image(
                 key=s3_key,
-                image_data=image_bytes,
+                image_data=payload.data,
                 content_type=content_type,
                 public=True
             )
@@ -215,7 +263,8 @@ class ImageHandler:
                 'public_url_preview': public_url[:80] + '...' if len(public_url) > 80 else public_url,
                 'tenant_id': tenant_id,
                 'job_id': job_id,
-                'image_filename': filename
+                'image_filename': filename,
+                'image_size_bytes': payload.size
             })
             return public_url
         except Exception as e:
@@ -226,6 +275,59 @@ class ImageHandler:
             })
             return None
     
+    def enqueue_image_upload(
+        self,
+        image_b64: str,
+        content_type: str = 'image/png',
+        tenant_id: Optional[str] = None,
+        job_id: Optional[str] = None,
+        name_prefix: str = 'screenshot',
+        step_index: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Upload an image in the background and return its URL immediately.
+
+        The key is derived from the image content, so it is known up front and
+        re-uploading the same frame is idempotent. Uploads are awaited by the step's
+        step-end drain (see services.upload_queue). Without a job, falls back to a
+        synchronous upload.
+
+        Args:
+            image_b64: Base64-encoded image data
+            content_type: MIME type
+            tenant_id: Tenant ID for S3 path structure
+            job_id: Job ID for S3 path structure
+            name_prefix: Filename prefix (e.g. 'cua/screenshot')
+            step_index: Step that drains the upload
+
+        Returns:
+            Public URL string or None if the image cannot be decoded
+        """
+        if not (tenant_id and job_id):
+            return self.upload_base64_image_to_s3(image_b64, content_type, tenant_id=tenant_id, job_id=job_id)
+        try:
+            payload = ImagePayload.from_base64(image_b64, content_type)
+        except Exception as e:
+            logger.error(f"[ImageHandler] Failed to decode base64 image: {e}", exc_info=True, extra={
+                'tenant_id': tenant_id,
+                'job_id': job_id
+            })
+            return None
+        from services.upload_queue import get_job_upload_queues
+
+        digest = hashlib.sha1(payload.data).hexdigest()[:16]
+        pending = get_job_upload_queues().enqueue(
+            self.s3_service,
+            tenant_id,
+            job_id,
+            filename=f"{name_prefix}-{digest}.{payload.extension}",
+            body=payload.data,
+            content_type=payload.content_type,
+            label=name_prefix,
+            step_index=step_index
+        )
+        return pending.public_url
+
     def _upload_screenshot_to_s3(self, screenshot_b64: str) -> Optional[str]:
         """Upload screenshot to S3 and return URL."""
         return self.upload_base64_image_to_s3(screenshot_b64, 'image/png')
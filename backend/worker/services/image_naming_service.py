@@ -8,6 +8,7 @@ import re
 from typing import Optional
 from services.api_key_manager import APIKeyManager
 from core.prompts import PROMPT_CONFIGS, IMAGE_NAMING_INSTRUCTIONS, IMAGE_NAMING_PROMPT
+from utils.images.payload import ImagePayload
 
 logger = logging.getLogger(__name__)
 
@@ -22,21 +23,23 @@ class ImageNamingService:
     
     def generate_filename_from_image(
         self,
-        image_b64: str,
+        image_b64: Optional[str] = None,
         context: Optional[str] = None,
         step_name: Optional[str] = None,
         step_instructions: Optional[str] = None,
-        image_index: int = 0
+        image_index: int = 0,
+        image_payload: Optional[ImagePayload] = None
     ) -> str:
         """
         Generate a descriptive filename for an image based on its content using AI.
         
         Args:
-            image_b64: Base64-encoded image data
+            image_b64: Base64-encoded image data (ignored when image_payload is given)
             context: Optional context about the workflow/job
             step_name: Optional step name that generated the image
             step_instructions: Optional step instructions that generated the image
             image_index: Index of the image if multiple images were generated
+            image_payload: Decoded image; only a small thumbnail is sent to the model
             
         Returns:
             A sanitized filename string (e.g., "sunset_over_mountains.png")
@@ -62,6 +65,11 @@ class ImageNamingService:
             if context_text:
                 prompt += f"\n\nAdditional context:\n{context_text}"
             
+            if image_payload is not None:
+                image_url = image_payload.naming_data_url()
+            else:
+                image_url = f"data:image/png;base64,{image_b64}"
+            
             config = PROMPT_CONFIGS["image_naming"]
             # Use vision model to analyze the image with Responses API
             response = self.client.responses.create(
@@ -77,7 +85,7 @@ class ImageNamingService:
                             },
                             {
                                 "type": "input_image",
-                                "image_url": f"data:image/png;base64,{image_b64}"
+                                "image_url": image_url
                             }
                         ]
                     }
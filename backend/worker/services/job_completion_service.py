@@ -12,6 +12,7 @@ from db_service import DynamoDBService
 from s3_service import S3Service
 from delivery_service import DeliveryService
 from services.execution_step_manager import ExecutionStepManager
+from services.live_step_writer import get_live_step_writer
 from services.usage_service import UsageService
 from services.artifact_finalizer import ArtifactFinalizer
 from services.context_builder import ContextBuilder
@@ -293,6 +294,8 @@ class JobCompletionService:
         
         # Update job as completed
         logger.info("Finalizing job")
+        get_live_step_writer().discard(job_id)
+        self.usage_service.close_job(job_id)
         self.db.update_job(job_id, {
             'status': 'completed',
             'completed_at': datetime.utcnow().isoformat(),
@@ -300,6 +303,7 @@ class JobCompletionService:
             'output_url': public_url,
             'artifacts': artifacts_list,
             'live_step': None,
+            'live_steps': None,
             'execution_steps': execution_steps
         }, s3_service=self.s3)
         
@@ -8,6 +8,8 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 
 from db_service import DynamoDBService
+from services.live_step_writer import get_live_step_writer
+from services.usage_service import get_usage_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +64,13 @@ class JobErrorHandler:
         
         descriptive_error = f"Fatal error during job processing: {error_message}"
         
+        get_live_step_writer().discard(job_id)
+        # Usage already incurred is still billed when the job fails
+        try:
+            get_usage_buffer().close_job(job_id)
+        except Exception as usage_error:
+            logger.error(f"Failed to flush usage records: {usage_error}")
+
         # Try to update job status to failed
         try:
             self.db.update_job(job_id, {
@@ -70,6 +79,7 @@ class JobErrorHandler:
                 'error_type': error_type,
                 'updated_at': datetime.utcnow().isoformat(),
                 'live_step': None,
+                'live_steps': None,
             })
         except Exception as update_error:
             logger.error(f"Failed to update job status: {update_error}")
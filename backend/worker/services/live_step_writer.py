@@ -0,0 +1,216 @@
+"""
+Live Step Writer
+Coalescing write-behind buffer for `live_step` streaming updates.
+
+Streaming strategies submit the latest live_step snapshot as often as they like; the
+writer keeps only the newest snapshot per (job, step) and persists it from a background
+thread at a fixed cadence. Status transitions (retrying/final/error) are written
+synchronously so the last state a step reports is never lost or overtaken by an older one.
+
+Parallel steps of one job stream at the same time, so every write carries the job's
+`live_steps` map (step_order -> latest snapshot) and one step's write never drops a
+sibling's. `live_step` is still written with the most recently updated step for clients
+that read a single live step.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+# Only plain streaming snapshots are buffered; any other status is written immediately.
+BUFFERED_STATUSES = {"streaming"}
+
+
+def _read_flush_interval() -> float:
+    value = (os.environ.get("LIVE_STEP_FLUSH_INTERVAL_SECONDS") or "").strip()
+    if not value:
+        return DEFAULT_FLUSH_INTERVAL_SECONDS
+    try:
+        parsed = float(value)
+    except Exception:
+        return DEFAULT_FLUSH_INTERVAL_SECONDS
+    return parsed if parsed > 0 else DEFAULT_FLUSH_INTERVAL_SECONDS
+
+
+class LiveStepWriter:
+    """Merge live_step updates per job step and flush them on a background thread."""
+
+    def __init__(self, flush_interval_seconds: Optional[float] = None):
+        """
+        Initialize writer.
+
+        Args:
+            flush_interval_seconds: Background flush cadence
+                (defaults to LIVE_STEP_FLUSH_INTERVAL_SECONDS)
+        """
+        self.flush_interval_seconds = flush_interval_seconds or _read_flush_interval()
+        # job_id -> {step_order: latest live_step}, most recently updated step last
+        self._live: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        # (job_id, step_order) -> db_service, for snapshots not written yet
+        self._pending: Dict[Tuple[str, Any], Any] = {}
+        self._pending_lock = threading.Lock()
+        # Held while a job's snapshot is popped and written, so writes land in order.
+        self._write_locks: Dict[str, threading.Lock] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._stats = {
+            'submitted': 0,
+            'written': 0,
+            'coalesced': 0,
+            'errors': 0,
+        }
+
+    def _write_lock(self, job_id: str) -> threading.Lock:
+        with self._pending_lock:
+            lock = self._write_locks.get(job_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._write_locks[job_id] = lock
+            return lock
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._pending_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="live-step-writer",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def submit(self, db_service: Any, job_id: str, live_step: Dict[str, Any]) -> None:
+        """
+        Queue the latest live_step snapshot for a job step.
+
+        Snapshots are cumulative, so a newer snapshot replaces the step's pending one.
+        Snapshots whose status is not "streaming" are flushed (with the job's other
+        steps) before returning.
+
+        Args:
+            db_service: DynamoDBService used to persist the update
+            job_id: Job ID
+            live_step: live_step payload (step_order, output_text, status, ...)
+        """
+        if not db_service or not job_id:
+            return
+        step_order = live_step.get("step_order")
+        with self._pending_lock:
+            self._stats['submitted'] += 1
+            if self._has_pending(job_id):
+                self._stats['coalesced'] += 1
+            steps = self._live.setdefault(job_id, {})
+            steps.pop(step_order, None)
+            steps[step_order] = live_step
+            self._pending[(job_id, step_order)] = db_service
+
+        if live_step.get("status", "streaming") not in BUFFERED_STATUSES:
+            self.flush(job_id)
+            return
+        self._ensure_thread()
+
+    def discard(self, job_id: str) -> None:
+        """
+        Drop a job's live state and pending snapshots without writing them.
+
+        Called before a job clears live_step on completion/failure so a buffered
+        streaming snapshot cannot land afterwards and resurrect it.
+        """
+        with self._write_lock(job_id):
+            with self._pending_lock:
+                self._pop_pending(job_id)
+                self._live.pop(job_id, None)
+        # The job is done: drop its write lock unless a late submit queued a snapshot
+        with self._pending_lock:
+            if not self._has_pending(job_id) and job_id not in self._live:
+                self._write_locks.pop(job_id, None)
+
+    def _has_pending(self, job_id: str) -> bool:
+        return any(key[0] == job_id for key in self._pending)
+
+    def _pop_pending(self, job_id: str) -> Optional[Any]:
+        """Remove a job's pending entries (caller holds _pending_lock); returns a db_service."""
+        db_service = None
+        for key in [key for key in self._pending if key[0] == job_id]:
+            db_service = self._pending.pop(key)
+        return db_service
+
+    def flush(self, job_id: Optional[str] = None) -> None:
+        """
+        Synchronously write pending snapshots.
+
+        Args:
+            job_id: Flush only this job (default: every pending job)
+        """
+        if job_id is not None:
+            job_ids = [job_id]
+        else:
+            with self._pending_lock:
+                job_ids = list(dict.fromkeys(key[0] for key in self._pending))
+        for pending_job_id in job_ids:
+            self._flush_job(pending_job_id)
+
+    def _flush_job(self, job_id: str) -> None:
+        with self._write_lock(job_id):
+            with self._pending_lock:
+                db_service = self._pop_pending(job_id)
+                steps = self._live.get(job_id)
+                if db_service is None or not steps:
+                    return
+                live_steps = {str(order): step for order, step in steps.items()}
+                live_step = next(reversed(steps.values()))
+            try:
+                db_service.update_job(job_id, {"live_step": live_step, "live_steps": live_steps})
+                with self._pending_lock:
+                    self._stats['written'] += 1
+            except Exception as persist_err:
+                with self._pending_lock:
+                    self._stats['errors'] += 1
+                logger.debug("[LiveStepWriter] Failed to persist live_step", extra={
+                    "job_id": job_id,
+                    "step_order": live_step.get("step_order"),
+                    "error_type": type(persist_err).__name__,
+                    "error_message": str(persist_err),
+                })
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.debug("[LiveStepWriter] Background flush failed", exc_info=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get writer counters.
+
+        Returns:
+            Dict with submitted, written, coalesced (writes saved), errors and pending
+        """
+        with self._pending_lock:
+            stats = dict(self._stats)
+            stats['pending'] = len({key[0] for key in self._pending})
+        stats['writes_saved'] = stats['coalesced']
+        return stats
+
+
+_live_step_writer: Optional[LiveStepWriter] = None
+_live_step_writer_lock = threading.Lock()
+
+
+def get_live_step_writer() -> LiveStepWriter:
+    """Get the process-wide live_step writer (created on first use)."""
+    global _live_step_writer
+    if _live_step_writer is None:
+        with _live_step_writer_lock:
+            if _live_step_writer is None:
+                _live_step_writer = LiveStepWriter()
+    return _live_step_writer
@@ -1,4 +1,5 @@
 import logging
+import os
 from typing import Dict, List, Optional, Any
 from services.tools import ToolBuilder
 from services.tool_secrets import redact_tool_secrets_text, redact_tool_secrets_value
@@ -37,6 +38,60 @@ NO_CONFIRMATION_PREFIX = (
     "If information is missing or ambiguous, make reasonable assumptions and proceed.\n\n"
 )
 
+# Context windows (input + output tokens) by model prefix; longest matching prefix wins.
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-5": 400_000,
+    "gpt-4.1": 1_047_576,
+    "gpt-4o": 128_000,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4": 200_000,
+    "computer-use-preview": 8_192,
+}
+DEFAULT_CONTEXT_WINDOW = 128_000
+DEFAULT_OUTPUT_TOKEN_RESERVE = 16_384
+# Room for instructions, tool definitions and the guardrail prefix.
+INSTRUCTIONS_TOKEN_RESERVE = 8_000
+# Cost/latency cap on step context regardless of how large the model's window is.
+DEFAULT_CONTEXT_TOKEN_BUDGET = 100_000
+
+
+def get_model_context_window(model: str) -> int:
+    """Return the context window (tokens) for a model name."""
+    if not isinstance(model, str):
+        return DEFAULT_CONTEXT_WINDOW
+    normalized = model.strip().lower()
+    best_prefix = ""
+    for prefix in MODEL_CONTEXT_WINDOWS:
+        if normalized.startswith(prefix) and len(prefix) > len(best_prefix):
+            best_prefix = prefix
+    return MODEL_CONTEXT_WINDOWS[best_prefix] if best_prefix else DEFAULT_CONTEXT_WINDOW
+
+
+def get_context_token_budget(model: str, max_output_tokens: Optional[Any] = None) -> int:
+    """
+    Token budget for a step's assembled context (form submission + dependency outputs).
+
+    The budget leaves room in the model's window for instructions and the response,
+    and is capped by CONTEXT_TOKEN_BUDGET (0 disables the cap).
+    """
+    window = get_model_context_window(model)
+    try:
+        output_reserve = int(max_output_tokens) if max_output_tokens else DEFAULT_OUTPUT_TOKEN_RESERVE
+    except (TypeError, ValueError):
+        output_reserve = DEFAULT_OUTPUT_TOKEN_RESERVE
+    available = window - output_reserve - INSTRUCTIONS_TOKEN_RESERVE
+    # Small windows (e.g. computer-use-preview) still get half the window for context.
+    available = max(available, window // 2)
+
+    cap_raw = (os.environ.get("CONTEXT_TOKEN_BUDGET") or "").strip()
+    try:
+        cap = int(cap_raw) if cap_raw else DEFAULT_CONTEXT_TOKEN_BUDGET
+    except ValueError:
+        cap = DEFAULT_CONTEXT_TOKEN_BUDGET
+    return min(available, cap) if cap > 0 else available
+
+
 def model_supports_reasoning(model: str) -> bool:
     """Return True if the model supports the reasoning parameter."""
     if not isinstance(model, str):
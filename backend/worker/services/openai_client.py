@@ -1,9 +1,13 @@
 """OpenAI API client wrapper."""
 
+import asyncio
 import logging
+import os
 import re
+import threading
 from typing import Any, Dict, List, Optional
 
+import httpx
 import openai
 
 from services.api_key_manager import APIKeyManager
@@ -17,6 +21,22 @@ from services.openai_response_service import OpenAIResponseService
 logger = logging.getLogger(__name__)
 
 
+def _read_pool_size(name: str, default: int) -> int:
+    value = (os.environ.get(name) or "").strip()
+    if not value:
+        return default
+    try:
+        parsed = int(value)
+    except Exception:
+        return default
+    return parsed if parsed > 0 else default
+
+
+# Connection limits of the AsyncOpenAI pool shared by concurrent calls on one event loop.
+ASYNC_MAX_CONNECTIONS = _read_pool_size("OPENAI_ASYNC_MAX_CONNECTIONS", 64)
+ASYNC_MAX_KEEPALIVE_CONNECTIONS = _read_pool_size("OPENAI_ASYNC_MAX_KEEPALIVE_CONNECTIONS", 16)
+
+
 class OpenAIClient:
     """Wrapper for OpenAI API calls."""
 
@@ -25,6 +45,9 @@ class OpenAIClient:
         self.openai_api_key = APIKeyManager.get_openai_key()
         self.client = openai.OpenAI(api_key=self.openai_api_key)
         self.image_retry_handler = OpenAIImageRetryHandler(self)
+        self._async_client: Optional[openai.AsyncOpenAI] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_client_lock = threading.Lock()
 
     def supports_responses(self) -> bool:
         """Return True if the client supports Responses API."""
@@ -139,11 +162,58 @@ class OpenAIClient:
                 f"Original error: {error_message}"
             )
 
-    def create_response(self, **params):
+    def get_async_client(self) -> "openai.AsyncOpenAI":
         """
-        Create a response using OpenAI Responses API.
-        Supports code_interpreter and other modern tools natively.
+        Get the AsyncOpenAI client for the running event loop.
+
+        httpx async pools are bound to the loop they were first used on, so the client
+        (and its keep-alive pool) is shared by all calls on one loop and recreated when
+        a new loop is started (e.g. a later asyncio.run in a warm Lambda). The previous
+        loop's client is closed on that loop.
         """
+        loop = asyncio.get_running_loop()
+        with self._async_client_lock:
+            if self._async_client is None or self._async_client_loop is not loop:
+                self._evict_async_client()
+                self._async_client = openai.AsyncOpenAI(
+                    api_key=self.openai_api_key,
+                    http_client=openai.DefaultAsyncHttpxClient(
+                        limits=httpx.Limits(
+                            max_connections=ASYNC_MAX_CONNECTIONS,
+                            max_keepalive_connections=ASYNC_MAX_KEEPALIVE_CONNECTIONS,
+                        ),
+                    ),
+                )
+                self._async_client_loop = loop
+            return self._async_client
+
+    def _evict_async_client(self) -> None:
+        """Forget the current async client, closing it on its own loop (lock held)."""
+        client, loop = self._async_client, self._async_client_loop
+        self._async_client = None
+        self._async_client_loop = None
+        if client is None or loop is None or loop.is_closed():
+            # A closed loop's connections cannot be awaited any more; they go with the client
+            return
+        close = client.close()
+        try:
+            asyncio.run_coroutine_threadsafe(close, loop)
+        except RuntimeError:
+            close.close()
+
+    async def aclose_async_client(self) -> None:
+        """Close the async client (and its connection pool) of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._async_client_lock:
+            if self._async_client is None or self._async_client_loop is not loop:
+                return
+            client = self._async_client
+            self._async_client = None
+            self._async_client_loop = None
+        await client.close()
+
+    def _prepare_response_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Log, sanitize and complete Responses API params for create_response/acreate_response."""
         job_id = params.get("job_id")
         tenant_id = params.get("tenant_id")
 
@@ -176,7 +246,10 @@ class OpenAIClient:
                 },
             )
             api_params["input"] = ""
+        return api_params
 
+    def _fallback_without_responses(self, api_params: Dict[str, Any], job_id: Optional[str], tenant_id: Optional[str]):
+        """Use chat.completions when the SDK has no Responses API (unless a tool requires it)."""
         requested_tool_types: List[str] = []
         tools_param = api_params.get("tools")
         if isinstance(tools_param, list):
@@ -191,59 +264,47 @@ class OpenAIClient:
             if t in {"shell", "code_interpreter", "computer_use_preview"}
         })
 
-        if not self.supports_responses():
-            if response_required_tools:
-                raise RuntimeError(
-                    "Responses API unavailable; tools require Responses API: "
-                    f"{', '.join(response_required_tools)}. "
-                    "Upgrade the OpenAI SDK (openai>=2.7.2) and redeploy, "
-                    "or remove those tools from the step."
-                )
-            logger.warning("[OpenAI Client] Responses API unavailable; using chat.completions fallback", extra={
-                "job_id": job_id,
-                "tenant_id": tenant_id,
-                "model": api_params.get("model"),
-                "has_tools": bool(api_params.get("tools")),
-            })
-            return create_chat_completion_fallback(self.client, api_params)
+        if response_required_tools:
+            raise RuntimeError(
+                "Responses API unavailable; tools require Responses API: "
+                f"{', '.join(response_required_tools)}. "
+                "Upgrade the OpenAI SDK (openai>=2.7.2) and redeploy, "
+                "or remove those tools from the step."
+            )
+        logger.warning("[OpenAI Client] Responses API unavailable; using chat.completions fallback", extra={
+            "job_id": job_id,
+            "tenant_id": tenant_id,
+            "model": api_params.get("model"),
+            "has_tools": bool(api_params.get("tools")),
+        })
+        return create_chat_completion_fallback(self.client, api_params)
 
-        try:
-            try:
-                responses_client = self.client.responses
-            except AttributeError:
-                logger.warning("[OpenAI Client] Responses API missing; using chat.completions fallback", extra={
-                    "job_id": job_id,
-                    "tenant_id": tenant_id,
-                    "model": api_params.get("model"),
-                    "has_tools": bool(api_params.get("tools")),
-                })
-                return create_chat_completion_fallback(self.client, api_params)
+    @staticmethod
+    def _log_response_success(response, job_id: Optional[str], tenant_id: Optional[str]) -> None:
+        logger.info("[OpenAI Client] Responses API call succeeded", extra={
+            "job_id": job_id,
+            "tenant_id": tenant_id,
+            "response_id": getattr(response, "id", None),
+            "response_type": type(response).__name__,
+            "model": getattr(response, "model", None),
+        })
 
-            response = responses_client.create(**api_params)
-            logger.info("[OpenAI Client] Responses API call succeeded", extra={
-                "job_id": job_id,
-                "tenant_id": tenant_id,
-                "response_id": getattr(response, "id", None),
-                "response_type": type(response).__name__,
-                "model": getattr(response, "model", None),
-            })
-            return response
-        except AttributeError:
-            logger.warning("[OpenAI Client] Responses API unavailable at call time; using chat.completions fallback", extra={
-                "job_id": job_id,
-                "tenant_id": tenant_id,
-                "model": api_params.get("model"),
-                "has_tools": bool(api_params.get("tools")),
-            })
-            return create_chat_completion_fallback(self.client, api_params)
-        except openai.BadRequestError as e:
+    def _recover_from_error(self, error: Exception, params: Dict[str, Any]):
+        """
+        Handle a failed Responses API call: raise a clearer error, or retry without
+        unsupported params / undownloadable images. Returns the retried response.
+        """
+        job_id = params.get("job_id")
+        tenant_id = params.get("tenant_id")
+
+        if isinstance(error, openai.BadRequestError):
             # Check for incompatible tool errors (e.g., shell with computer_use_preview)
-            error_message = str(e)
-            error_body = getattr(e, "body", {}) or {}
+            error_message = str(error)
+            error_body = getattr(error, "body", {}) or {}
             error_info = error_body.get("error", {}) if isinstance(error_body, dict) else {}
             
             # Check for MCP authentication errors
-            self._check_mcp_auth_error(e, job_id, tenant_id)
+            self._check_mcp_auth_error(error, job_id, tenant_id)
             
             # Check if error is about incompatible tools
             if "not supported with computer use" in error_message.lower() or \
@@ -260,27 +321,96 @@ class OpenAIClient:
                 raise ValueError(f"Incompatible tool detected: {error_message}. Please remove incompatible tools (like 'shell') when using computer_use_preview.")
             
             # 1) Capability fallback (unsupported reasoning/service_tier)
-            retry_result = self._handle_capability_error(e, params)
+            retry_result = self._handle_capability_error(error, params)
             if retry_result is not None:
                 return retry_result
 
             # 2) Image download recovery (raises if not applicable)
-            return self.image_retry_handler.handle_image_download_error(e, params)
-        except openai.APIError as api_error:
+            return self.image_retry_handler.handle_image_download_error(error, params)
+
+        if isinstance(error, openai.APIError):
             # Check for MCP authentication errors in APIError exceptions
-            self._check_mcp_auth_error(api_error, job_id, tenant_id)
+            self._check_mcp_auth_error(error, job_id, tenant_id)
             # Re-raise if not an MCP auth error
-            raise
+            raise error
+
+        self._check_mcp_auth_error(error, job_id, tenant_id)
+        
+        logger.exception("[OpenAI Client] API call failed", extra={
+            "job_id": job_id,
+            "tenant_id": tenant_id,
+            "error_type": type(error).__name__,
+            "error_message": str(error),
+        })
+        raise error
+
+    def create_response(self, **params):
+        """
+        Create a response using OpenAI Responses API.
+        Supports code_interpreter and other modern tools natively.
+        """
+        job_id = params.get("job_id")
+        tenant_id = params.get("tenant_id")
+        api_params = self._prepare_response_params(params)
+
+        if not self.supports_responses():
+            return self._fallback_without_responses(api_params, job_id, tenant_id)
+
+        try:
+            try:
+                responses_client = self.client.responses
+            except AttributeError:
+                logger.warning("[OpenAI Client] Responses API missing; using chat.completions fallback", extra={
+                    "job_id": job_id,
+                    "tenant_id": tenant_id,
+                    "model": api_params.get("model"),
+                    "has_tools": bool(api_params.get("tools")),
+                })
+                return create_chat_completion_fallback(self.client, api_params)
+
+            response = responses_client.create(**api_params)
+            self._log_response_success(response, job_id, tenant_id)
+            return response
+        except AttributeError:
+            logger.warning("[OpenAI Client] Responses API unavailable at call time; using chat.completions fallback", extra={
+                "job_id": job_id,
+                "tenant_id": tenant_id,
+                "model": api_params.get("model"),
+                "has_tools": bool(api_params.get("tools")),
+            })
+            return create_chat_completion_fallback(self.client, api_params)
         except Exception as api_error:
-            self._check_mcp_auth_error(api_error, job_id, tenant_id)
-            
-            logger.exception("[OpenAI Client] API call failed", extra={
+            return self._recover_from_error(api_error, params)
+
+    async def acreate_response(self, **params):
+        """
+        Async variant of create_response.
+
+        The request itself awaits AsyncOpenAI, so concurrent calls in one process share
+        an event loop and connection pool instead of one thread each. Fallbacks and error
+        recovery (capability and image-download retries) reuse the synchronous path in a
+        worker thread.
+        """
+        job_id = params.get("job_id")
+        tenant_id = params.get("tenant_id")
+        api_params = self._prepare_response_params(params)
+
+        if not self.supports_responses():
+            return await asyncio.to_thread(self._fallback_without_responses, api_params, job_id, tenant_id)
+
+        try:
+            response = await self.get_async_client().responses.create(**api_params)
+            self._log_response_success(response, job_id, tenant_id)
+            return response
+        except AttributeError:
+            logger.warning("[OpenAI Client] Async Responses API unavailable; using synchronous call", extra={
                 "job_id": job_id,
                 "tenant_id": tenant_id,
-                "error_type": type(api_error).__name__,
-                "error_message": str(api_error),
+                "model": api_params.get("model"),
             })
-            raise
+            return await asyncio.to_thread(self.create_response, **params)
+        except Exception as api_error:
+            return await asyncio.to_thread(self._recover_from_error, api_error, params)
 
     def _handle_capability_error(
         self, error: Exception, params: Dict[str, Any]
@@ -395,6 +525,10 @@ class OpenAIClient:
         """Make API call to OpenAI Responses API."""
         return self.create_response(**params)
 
+    async def amake_api_call(self, params: Dict):
+        """Make an async API call to OpenAI Responses API."""
+        return await self.acreate_response(**params)
+
     def handle_openai_error(
         self,
         error: Exception,
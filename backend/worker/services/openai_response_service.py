@@ -5,9 +5,11 @@ Handles processing and serialization of OpenAI API responses.
 import logging
 import json
 import copy
+import os
 from typing import Dict, List, Any, Optional, Tuple
 from services.response_parser import ResponseParser
 from services.tool_secrets import redact_tool_secrets_text, redact_tool_secrets_value
+from utils.images.payload import ImagePayload
 from cost_service import calculate_openai_cost
 
 logger = logging.getLogger(__name__)
@@ -207,10 +209,16 @@ class OpenAIResponseService:
                         # Extract filename from asset only if it has a meaningful name
                         filename = asset.get('name', '') or None
                         
-                        # Upload base64 image to S3 with context for AI naming
-                        image_url = image_handler.upload_base64_image_to_s3(
-                            image_b64=data_field,
-                            content_type=content_type,
+                        # Decode once; optimize_image may resize or re-encode (e.g. PNG -> JPEG)
+                        payload = ImagePayload.from_base64(data_field, content_type).optimized(
+                            job_id=job_id, tenant_id=tenant_id
+                        )
+                        if filename and payload.content_type != content_type:
+                            filename = f"{os.path.splitext(filename)[0]}.{payload.extension}"
+                        
+                        # Upload image to S3 with context for AI naming
+                        image_url = image_handler.upload_image_payload(
+                            payload,
                             tenant_id=tenant_id,
                             job_id=job_id,
                             filename=filename,
@@ -224,6 +232,7 @@ class OpenAIResponseService:
                             # Replace base64 data with URL
                             asset['data'] = image_url
                             asset['encoding'] = 'url'
+                            asset['content_type'] = payload.content_type
                             # Keep original data in a backup field for reference
                             asset['original_data_encoding'] = 'base64'
                             image_urls.append(image_url)
@@ -232,7 +241,7 @@ class OpenAIResponseService:
                             logger.info("[OpenAI Response Service] Converted base64 image to URL", extra={
                                 'asset_id': asset.get('id', 'unknown'),
                                 'image_filename': filename,
-                                'content_type': content_type
+                                'content_type': payload.content_type
                             })
                     except Exception as e:
                         logger.error(f"[OpenAI Response Service] Error converting base64 image: {e}", exc_info=True)
@@ -0,0 +1,251 @@
+"""
+Response Cache
+Opt-in cache of processed Responses API results for deterministic AI steps.
+
+Reruns (single-step reruns, resubmitted jobs, repeated form submissions with identical
+answers) issue exactly the same Responses API request. Steps with `cache_response: true`
+look up a fingerprint of the request fields that determine the model output (model,
+instructions, input, tools, tool choice, reasoning and text settings) before calling
+OpenAI, and store the processed result after a successful call.
+
+Entries are stored in S3 under the tenant's folder with an expiry timestamp and fronted
+by a small in-process cache. Set RESPONSE_CACHE_BYPASS to skip lookups (results are
+still stored, so a bypassed run refreshes the cache).
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from services.cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+KEY_PREFIX = "response-cache"
+MEMORY_MAX_ENTRIES = 256
+MEMORY_MAX_BYTES = 32 * 1024 * 1024
+MEMORY_TTL_SECONDS = 3600
+
+# Request fields that decide the model output. Tracking and routing fields
+# (job_id, tenant_id, user, service_tier, metadata) are not part of the fingerprint.
+FINGERPRINT_FIELDS = (
+    "model",
+    "instructions",
+    "input",
+    "tools",
+    "tool_choice",
+    "reasoning",
+    "text",
+    "max_output_tokens",
+    "truncation",
+    "include",
+    "temperature",
+    "top_p",
+)
+
+ReportResult = Tuple[str, Dict[str, Any], Dict[str, Any], Dict[str, Any]]
+
+
+def _read_ttl() -> int:
+    value = (os.environ.get("RESPONSE_CACHE_TTL_SECONDS") or "").strip()
+    if not value:
+        return DEFAULT_TTL_SECONDS
+    try:
+        parsed = int(value)
+    except Exception:
+        return DEFAULT_TTL_SECONDS
+    return parsed if parsed > 0 else DEFAULT_TTL_SECONDS
+
+
+def _read_bypass() -> bool:
+    return (os.environ.get("RESPONSE_CACHE_BYPASS") or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def fingerprint(params: Dict[str, Any]) -> str:
+    """
+    Canonical hash of the output-determining fields of a Responses API request.
+
+    Args:
+        params: Request params as built by OpenAIClient.build_api_params
+
+    Returns:
+        Hex SHA-256 digest (key order and whitespace do not affect it)
+    """
+    canonical = {name: params[name] for name in FINGERPRINT_FIELDS if params.get(name) is not None}
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Fingerprint-keyed store of (content, usage_info, request_details, response_details)."""
+
+    def __init__(self, ttl_seconds: Optional[int] = None, bypass: Optional[bool] = None):
+        """
+        Initialize cache.
+
+        Args:
+            ttl_seconds: Lifetime of stored results (defaults to RESPONSE_CACHE_TTL_SECONDS)
+            bypass: Skip lookups (defaults to RESPONSE_CACHE_BYPASS)
+        """
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else _read_ttl()
+        self.bypass = bypass if bypass is not None else _read_bypass()
+        self._memory = CacheService(
+            max_size=MEMORY_MAX_ENTRIES,
+            ttl_seconds=min(self.ttl_seconds, MEMORY_TTL_SECONDS),
+            max_bytes=MEMORY_MAX_BYTES,
+        )
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'memory_hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'bypassed': 0,
+            'stores': 0,
+            'errors': 0,
+        }
+
+    @staticmethod
+    def object_key(tenant_id: Optional[str], digest: str) -> str:
+        """S3 key for a fingerprint (scoped to the tenant's folder)."""
+        if tenant_id:
+            return f"{tenant_id}/{KEY_PREFIX}/{digest}.json"
+        return f"{KEY_PREFIX}/{digest}.json"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, s3_service, tenant_id: Optional[str], params: Dict[str, Any]) -> Optional[ReportResult]:
+        """
+        Look up a cached result for a request.
+
+        Args:
+            s3_service: S3Service for the persistent layer (None for memory only)
+            tenant_id: Tenant owning the entry
+            params: Request params
+
+        Returns:
+            Cached result with zeroed usage and a response_cache marker, or None on a miss
+        """
+        if self.bypass:
+            self._count('bypassed')
+            return None
+
+        digest = fingerprint(params)
+        key = self.object_key(tenant_id, digest)
+        entry = self._memory.get(key)
+        from_memory = entry is not None
+        if entry is None and s3_service is not None:
+            try:
+                raw = s3_service.download_bytes(key)
+                entry = json.loads(raw) if raw else None
+            except Exception as e:
+                self._count('errors')
+                logger.warning("[ResponseCache] Lookup failed; calling OpenAI", extra={
+                    'cache_key': key,
+                    'error_type': type(e).__name__,
+                    'error_message': str(e),
+                })
+                entry = None
+
+        if entry is None:
+            self._count('misses')
+            return None
+        if float(entry.get('expires_at') or 0) <= time.time():
+            self._memory.delete(key)
+            self._count('expired')
+            self._count('misses')
+            return None
+
+        if from_memory:
+            self._count('memory_hits')
+        else:
+            self._memory.set(key, entry, size_bytes=int(entry.get('size_bytes') or 0))
+        self._count('hits')
+
+        content, usage_info, request_details, response_details = copy.deepcopy(entry['result'])
+        original_usage = dict(usage_info)
+        usage_info.update({'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0, 'cost_usd': 0.0, 'cache_hit': True})
+        response_details['response_cache'] = {
+            'hit': True,
+            'fingerprint': digest,
+            'created_at': entry.get('created_at'),
+            'original_usage': original_usage,
+        }
+        return content, usage_info, request_details, response_details
+
+    def put(self, s3_service, tenant_id: Optional[str], params: Dict[str, Any], result: ReportResult) -> bool:
+        """
+        Store a processed result.
+
+        Args:
+            s3_service: S3Service for the persistent layer (None for memory only)
+            tenant_id: Tenant owning the entry
+            params: Request params the result was produced from
+            result: (content, usage_info, request_details, response_details)
+
+        Returns:
+            True if stored
+        """
+        digest = fingerprint(params)
+        key = self.object_key(tenant_id, digest)
+        now = time.time()
+        entry = {
+            'fingerprint': digest,
+            'model': params.get('model'),
+            'created_at': now,
+            'expires_at': now + self.ttl_seconds,
+            'result': list(result),
+        }
+        try:
+            body = json.dumps(entry, ensure_ascii=False, default=str)
+            entry = json.loads(body)
+            entry['size_bytes'] = len(body)
+            if s3_service is not None:
+                s3_service.put_bytes(key, body)
+        except Exception as e:
+            self._count('errors')
+            logger.warning("[ResponseCache] Store failed", extra={
+                'cache_key': key,
+                'error_type': type(e).__name__,
+                'error_message': str(e),
+            })
+            return False
+        self._memory.set(key, entry, size_bytes=entry['size_bytes'])
+        self._count('stores')
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters.
+
+        Returns:
+            Dict with counters, hit_rate and the in-process layer's stats
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] / lookups) if lookups else 0.0
+        stats['memory'] = self._memory.get_stats()
+        return stats
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache (created on first use)."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
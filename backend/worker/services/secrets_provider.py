@@ -0,0 +1,265 @@
+"""
+Secrets Provider
+Process-wide cache for Secrets Manager secrets and per-tenant settings.
+
+Values are cached with a TTL and refreshed in the background shortly before they
+expire, so warm invocations never wait on Secrets Manager or DynamoDB. Concurrent
+misses for the same key share a single load (single-flight). Failed loads are never
+cached; an expired value is not served after a failed refresh.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import boto3
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SECRET_TTL_SECONDS = 300.0
+DEFAULT_SETTINGS_TTL_SECONDS = 60.0
+# Fraction of the TTL after which a hit triggers a background refresh.
+REFRESH_AHEAD_RATIO = 0.8
+
+
+def _read_ttl(name: str, default: float) -> float:
+    value = (os.environ.get(name) or "").strip()
+    if not value:
+        return default
+    try:
+        parsed = float(value)
+    except Exception:
+        return default
+    return parsed if parsed >= 0 else default
+
+
+class _Entry:
+    __slots__ = ("value", "loaded_at", "expires_at", "refreshing")
+
+    def __init__(self, value: Any, ttl_seconds: float):
+        self.value = value
+        self.loaded_at = time.monotonic()
+        self.expires_at = self.loaded_at + ttl_seconds
+        self.refreshing = False
+
+
+class RefreshingCache:
+    """TTL cache with refresh-ahead and single-flight loading."""
+
+    def __init__(self, ttl_seconds: float, name: str = "cache"):
+        """
+        Initialize cache.
+
+        Args:
+            ttl_seconds: Lifetime of a loaded value (0 disables caching)
+            name: Label used in logs and thread names
+        """
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self._entries: Dict[Any, _Entry] = {}
+        self._inflight: Dict[Any, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'loads': 0,
+            'refreshes': 0,
+            'load_errors': 0,
+        }
+
+    def get(self, key: Any, loader: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, loading it on a miss.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument callable that fetches the value
+
+        Returns:
+            Cached or freshly loaded value
+
+        Raises:
+            Exception: Whatever the loader raised when no valid value is cached
+        """
+        if self.ttl_seconds <= 0:
+            return loader()
+
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and now < entry.expires_at:
+                    self._stats['hits'] += 1
+                    refresh_at = entry.loaded_at + self.ttl_seconds * REFRESH_AHEAD_RATIO
+                    if now >= refresh_at and not entry.refreshing:
+                        entry.refreshing = True
+                        self._start_refresh(key, loader)
+                    return entry.value
+
+                inflight = self._inflight.get(key)
+                if inflight is None:
+                    self._stats['misses'] += 1
+                    inflight = threading.Event()
+                    self._inflight[key] = inflight
+                    is_owner = True
+                else:
+                    is_owner = False
+
+            if is_owner:
+                return self._load(key, loader, inflight)
+            # Another thread is loading this key; wait for it and re-check. If its load
+            # failed, the loop makes this thread the next owner.
+            inflight.wait()
+
+    def _load(self, key: Any, loader: Callable[[], Any], inflight: threading.Event) -> Any:
+        try:
+            value = loader()
+        except Exception:
+            with self._lock:
+                self._stats['load_errors'] += 1
+            raise
+        else:
+            with self._lock:
+                self._entries[key] = _Entry(value, self.ttl_seconds)
+                self._stats['loads'] += 1
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.set()
+
+    def _start_refresh(self, key: Any, loader: Callable[[], Any]) -> None:
+        def _refresh():
+            try:
+                value = loader()
+            except Exception as e:
+                with self._lock:
+                    self._stats['load_errors'] += 1
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        entry.refreshing = False
+                logger.warning(f"[SecretsProvider] Background refresh failed for {self.name}", extra={
+                    'error_type': type(e).__name__,
+                    'error_message': str(e),
+                })
+                return
+            with self._lock:
+                self._entries[key] = _Entry(value, self.ttl_seconds)
+                self._stats['refreshes'] += 1
+
+        threading.Thread(target=_refresh, name=f"{self.name}-refresh", daemon=True).start()
+
+    def invalidate(self, key: Any = None) -> None:
+        """Drop one key (or every key) so the next get reloads it."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        return stats
+
+
+class SecretsProvider:
+    """Cached access to Secrets Manager secrets and tenant settings."""
+
+    def __init__(
+        self,
+        secret_ttl_seconds: Optional[float] = None,
+        settings_ttl_seconds: Optional[float] = None
+    ):
+        """
+        Initialize provider.
+
+        Args:
+            secret_ttl_seconds: Secret lifetime (defaults to SECRETS_CACHE_TTL_SECONDS)
+            settings_ttl_seconds: Tenant settings lifetime (defaults to TENANT_SETTINGS_CACHE_TTL_SECONDS)
+        """
+        if secret_ttl_seconds is None:
+            secret_ttl_seconds = _read_ttl("SECRETS_CACHE_TTL_SECONDS", DEFAULT_SECRET_TTL_SECONDS)
+        if settings_ttl_seconds is None:
+            settings_ttl_seconds = _read_ttl("TENANT_SETTINGS_CACHE_TTL_SECONDS", DEFAULT_SETTINGS_TTL_SECONDS)
+        self.secrets = RefreshingCache(secret_ttl_seconds, name="secrets")
+        self.tenant_settings = RefreshingCache(settings_ttl_seconds, name="tenant-settings")
+        self._clients: Dict[Any, Any] = {}
+        self._clients_lock = threading.Lock()
+
+    def _client(self, kind: str, region: str) -> Any:
+        key = (kind, region)
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                if kind == "dynamodb":
+                    client = boto3.resource("dynamodb", region_name=region)
+                else:
+                    client = boto3.session.Session().client(service_name=kind, region_name=region)
+                self._clients[key] = client
+            return client
+
+    def get_secret_string(self, secret_name: str, region: str) -> str:
+        """
+        Get a secret's SecretString.
+
+        Args:
+            secret_name: Secret name or ARN
+            region: AWS region of the secret
+
+        Returns:
+            SecretString value
+
+        Raises:
+            ValueError: If the secret is stored in binary format
+            Exception: If secret retrieval fails
+        """
+        def _load() -> str:
+            response = self._client("secretsmanager", region).get_secret_value(SecretId=secret_name)
+            if 'SecretString' not in response:
+                raise ValueError("Secret binary format not supported")
+            return response['SecretString']
+
+        return self.secrets.get((secret_name, region), _load)
+
+    def get_tenant_settings(
+        self,
+        tenant_id: str,
+        loader: Optional[Callable[[], Optional[Dict[str, Any]]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a tenant's settings item.
+
+        Args:
+            tenant_id: Tenant ID
+            loader: Optional callable used on a miss (defaults to a direct read of USER_SETTINGS_TABLE)
+
+        Returns:
+            Settings item, or None if the tenant has no settings
+        """
+        return self.tenant_settings.get(tenant_id, loader or (lambda: self.read_settings(tenant_id)))
+
+    def read_settings(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        table_name = (os.environ.get("USER_SETTINGS_TABLE") or "").strip()
+        if not table_name:
+            return None
+        region = os.environ.get("AWS_REGION", "us-east-1")
+        table = self._client("dynamodb", region).Table(table_name)
+        return table.get_item(Key={"tenant_id": tenant_id}).get("Item")
+
+
+_secrets_provider: Optional[SecretsProvider] = None
+_secrets_provider_lock = threading.Lock()
+
+
+def get_secrets_provider() -> SecretsProvider:
+    """Get the process-wide secrets provider (created on first use)."""
+    global _secrets_provider
+    if _secrets_provider is None:
+        with _secrets_provider_lock:
+            if _secrets_provider is None:
+                _secrets_provider = SecretsProvider()
+    return _secrets_provider
@@ -31,6 +31,13 @@ def read_positive_int_env(name: str, default: int) -> int:
         return default
     return parsed if parsed > 0 else default
 
+# Workspace output upload tuning
+UPLOAD_CONCURRENCY = read_positive_int_env("SHELL_EXECUTOR_UPLOAD_CONCURRENCY", 16)
+# Files at or below this size are uploaded with put_object in batches (one task per batch)
+UPLOAD_SMALL_FILE_BYTES = read_positive_int_env("SHELL_EXECUTOR_UPLOAD_SMALL_FILE_BYTES", 256 * 1024)
+UPLOAD_SMALL_FILE_BATCH_SIZE = read_positive_int_env("SHELL_EXECUTOR_UPLOAD_BATCH_SIZE", 16)
+UPLOAD_MULTIPART_THRESHOLD_BYTES = read_positive_int_env("SHELL_EXECUTOR_UPLOAD_MULTIPART_THRESHOLD_BYTES", 8 * 1024 * 1024)
+
 WORKSPACE_TTL_HOURS = read_positive_int_env("SHELL_EXECUTOR_WORKSPACE_TTL_HOURS", 0)
 WORKSPACE_CLEANUP_LIMIT = read_positive_int_env("SHELL_EXECUTOR_WORKSPACE_CLEANUP_LIMIT", 200)
 _CLEANUP_BUDGET_RAW = (os.environ.get("SHELL_EXECUTOR_WORKSPACE_CLEANUP_BUDGET_SECS") or "1.0").strip()
@@ -7,17 +7,21 @@ import json
 import mimetypes
 import re
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 
 from .config import (
     MOUNT_POINT, FALLBACK_ROOT, DEFAULT_TIMEOUT_MS, DEFAULT_MAX_OUTPUT_LENGTH,
     DEFAULT_WORK_ROOT, REWRITE_WORK_PATHS, UPLOAD_MODE, UPLOAD_BUCKET,
     UPLOAD_PREFIX, UPLOAD_PREFIX_TEMPLATE, UPLOAD_MANIFEST_NAME,
     UPLOAD_MANIFEST_PATH, UPLOAD_DIST_SUBDIR, UPLOAD_BUILD_SUBDIR, UPLOAD_ACL,
-    WORKSPACE_TTL_HOURS, read_positive_int_env
+    UPLOAD_CONCURRENCY, UPLOAD_SMALL_FILE_BYTES, UPLOAD_SMALL_FILE_BATCH_SIZE,
+    UPLOAD_MULTIPART_THRESHOLD_BYTES, WORKSPACE_TTL_HOURS, read_positive_int_env
 )
 from .workspace_manager import cleanup_old_workspaces
 
@@ -255,13 +259,42 @@ def _collect_upload_entries(mode: str, work_root: str, workspace_path: str) -> T
     logger.warning("Unknown upload mode", extra={"mode": mode})
     return [], None, None
 
+# Shared across warm invocations; boto3 clients are thread-safe.
+_s3_clients: Dict[str, Any] = {}
+_s3_clients_lock = threading.Lock()
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=UPLOAD_MULTIPART_THRESHOLD_BYTES,
+    multipart_chunksize=UPLOAD_MULTIPART_THRESHOLD_BYTES,
+    max_concurrency=4,
+    use_threads=True,
+)
+
+
+def _get_s3_client(region: str) -> Any:
+    with _s3_clients_lock:
+        client = _s3_clients.get(region)
+        if client is None:
+            client = boto3.client("s3", region_name=region)
+            _s3_clients[region] = client
+        return client
+
+
 def _upload_files(
     *,
     entries: List[Tuple[str, str]],
     bucket: str,
     prefix: str,
     max_bytes: int,
+    concurrency: int = UPLOAD_CONCURRENCY,
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Upload collected workspace files to S3 concurrently.
+
+    Small files are grouped into batches uploaded with put_object by a single worker;
+    larger files go through upload_file with a shared TransferConfig (multipart above
+    the threshold). Results keep the order of `entries`, and each upload records
+    its duration_ms.
+    """
     uploads: List[Dict[str, Any]] = []
     errors: List[Dict[str, Any]] = []
     if not entries:
@@ -270,30 +303,92 @@ def _upload_files(
     # Initialize S3 client with region from environment or default to us-east-1
     # For cross-region access, boto3 will automatically use the bucket's region
     aws_region = os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION") or "us-east-1"
-    s3 = boto3.client("s3", region_name=aws_region)
-    for abs_path, rel_path in entries:
+    s3 = _get_s3_client(aws_region)
+
+    # (index, abs_path, key, size, content_type)
+    small: List[Tuple[int, str, str, int, str]] = []
+    large: List[Tuple[int, str, str, int, str]] = []
+    results: Dict[int, Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]] = {}
+    for index, (abs_path, rel_path) in enumerate(entries):
         try:
             size = os.path.getsize(abs_path)
-            if max_bytes > 0 and size > max_bytes:
-                errors.append({
-                    "path": abs_path,
-                    "error": f"file too large ({size} bytes > {max_bytes})",
-                })
-                continue
-            key = f"{prefix}{rel_path}".replace("//", "/")
-            content_type = mimetypes.guess_type(abs_path)[0] or "application/octet-stream"
-            extra_args = {"ContentType": content_type}
-            if UPLOAD_ACL:
-                extra_args["ACL"] = UPLOAD_ACL
-            s3.upload_file(abs_path, bucket, key, ExtraArgs=extra_args)
-            uploads.append({
+        except Exception as e:
+            results[index] = (None, {"path": abs_path, "error": str(e)})
+            continue
+        if max_bytes > 0 and size > max_bytes:
+            results[index] = (None, {
                 "path": abs_path,
-                "key": key,
-                "size": size,
-                "content_type": content_type,
+                "error": f"file too large ({size} bytes > {max_bytes})",
             })
+            continue
+        key = f"{prefix}{rel_path}".replace("//", "/")
+        content_type = mimetypes.guess_type(abs_path)[0] or "application/octet-stream"
+        target = small if size <= UPLOAD_SMALL_FILE_BYTES else large
+        target.append((index, abs_path, key, size, content_type))
+
+    def _extra_args(content_type: str) -> Dict[str, Any]:
+        extra_args = {"ContentType": content_type}
+        if UPLOAD_ACL:
+            extra_args["ACL"] = UPLOAD_ACL
+        return extra_args
+
+    def _record(index: int, abs_path: str, key: str, size: int, content_type: str, started: float, error: Optional[Exception]) -> None:
+        if error is not None:
+            results[index] = (None, {"path": abs_path, "error": str(error)})
+            return
+        results[index] = ({
+            "path": abs_path,
+            "key": key,
+            "size": size,
+            "content_type": content_type,
+            "duration_ms": int((time.monotonic() - started) * 1000),
+        }, None)
+
+    def _upload_small_batch(batch: List[Tuple[int, str, str, int, str]]) -> None:
+        for index, abs_path, key, size, content_type in batch:
+            started = time.monotonic()
+            try:
+                with open(abs_path, "rb") as f:
+                    s3.put_object(Bucket=bucket, Key=key, Body=f.read(), **_extra_args(content_type))
+                _record(index, abs_path, key, size, content_type, started, None)
+            except Exception as e:
+                _record(index, abs_path, key, size, content_type, started, e)
+
+    def _upload_large(item: Tuple[int, str, str, int, str]) -> None:
+        index, abs_path, key, size, content_type = item
+        started = time.monotonic()
+        try:
+            s3.upload_file(abs_path, bucket, key, ExtraArgs=_extra_args(content_type), Config=_TRANSFER_CONFIG)
+            _record(index, abs_path, key, size, content_type, started, None)
         except Exception as e:
-            errors.append({"path": abs_path, "error": str(e)})
+            _record(index, abs_path, key, size, content_type, started, e)
+
+    batch_size = max(1, UPLOAD_SMALL_FILE_BATCH_SIZE)
+    small_batches = [small[i:i + batch_size] for i in range(0, len(small), batch_size)]
+    upload_started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="shell-upload") as executor:
+        # Large files first so they are not stuck behind many small batches
+        futures = [executor.submit(_upload_large, item) for item in large]
+        futures += [executor.submit(_upload_small_batch, batch) for batch in small_batches]
+        for future in futures:
+            future.result()
+
+    for index in sorted(results):
+        upload, error = results[index]
+        if upload is not None:
+            uploads.append(upload)
+        if error is not None:
+            errors.append(error)
+
+    logger.info("Uploaded workspace files", extra={
+        "bucket": bucket,
+        "files": len(uploads),
+        "errors": len(errors),
+        "small_batches": len(small_batches),
+        "large_files": len(large),
+        "concurrency": concurrency,
+        "duration_ms": int((time.monotonic() - upload_started) * 1000),
+    })
     return uploads, errors
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -564,12 +659,15 @@ if __name__ == '__main__':
         bucket = bucket_override or UPLOAD_BUCKET
         prefix = _resolve_upload_prefix(env_vars, workspace_id, prefix_override)
         max_bytes = read_positive_int_env("SHELL_EXECUTOR_MAX_UPLOAD_BYTES", 0)
+        upload_started = time.monotonic()
         uploads, upload_errors = _upload_files(entries=entries, bucket=bucket, prefix=prefix, max_bytes=max_bytes)
         upload_meta = {
             "mode": UPLOAD_MODE,
             "bucket": bucket,
             "prefix": prefix,
             "entries": len(entries),
+            "concurrency": UPLOAD_CONCURRENCY,
+            "duration_ms": int((time.monotonic() - upload_started) * 1000),
         }
 
     return {
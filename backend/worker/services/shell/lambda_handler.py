@@ -106,6 +106,9 @@ class StreamingShellHandler:
         except Exception as e:
             logger.error(f"Streaming error: {e}", exc_info=True)
             yield _json.dumps({"type": "error", "message": str(e)}) + "\n"
+        finally:
+            # The client is per invocation while the loop outlives it; release its pool
+            await openai_client.aclose_async_client()
 
 
 # Entry point for Lambda
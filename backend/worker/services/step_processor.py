@@ -16,6 +16,8 @@ from services.context_builder import ContextBuilder
 from utils.step_utils import normalize_step_order
 from services.dependency_resolver import DependencyResolver
 from core import log_context
+from core.prompts import PROMPT_CONFIGS
+from services.openai.request_builder.params_builder import get_context_token_budget
 
 from services.steps.registry import StepRegistry
 from services.steps.handlers.ai_generation import AIStepHandler
@@ -26,6 +28,9 @@ from services.steps.handlers.handoff import HandoffStepHandler
 
 logger = logging.getLogger(__name__)
 
+# Handlers that read every previous step's output (webhook payloads, handoff deliverables)
+FULL_HISTORY_STEP_TYPES = {'webhook', 'workflow_handoff'}
+
 class StepProcessor:
     """Service for processing workflow steps."""
     
@@ -43,6 +48,7 @@ class StepProcessor:
         """
         self.db = db_service
         self.s3 = s3_service
+        self.usage_service = usage_service
         
         # Initialize Step Registry and Handlers
         self.registry = StepRegistry()
@@ -74,11 +80,16 @@ class StepProcessor:
         step_outputs: List[Dict[str, Any]],
         workflow_steps: List[Dict[str, Any]],
         execution_steps: List[Dict[str, Any]],
-        all_image_artifact_ids: List[str]
+        all_image_artifact_ids: List[str],
+        reload_execution_steps: bool = True
     ) -> Tuple[Dict[str, Any], List[str]]:
         """
         Process a step in batch mode (used by process_job).
         Delegates to registered handlers.
+
+        reload_execution_steps=False keeps the caller's execution_steps list instead of
+        re-reading it from S3; parallel step groups rely on this so every member appends
+        to the same shared list.
         """
         step_name = step.get('step_name', f'Step {step_index + 1}')
         step_type = step.get('step_type', 'ai_generation')
@@ -111,12 +122,13 @@ class StepProcessor:
             step_type=step_type
         ):
             # Reload execution_steps from S3 to ensure freshness
-            try:
-                job_with_steps = self.db.get_job(job_id, s3_service=self.s3)
-                if job_with_steps and job_with_steps.get('execution_steps'):
-                    execution_steps = job_with_steps['execution_steps']
-            except Exception as e:
-                logger.warning(f"[StepProcessor] Failed to reload execution_steps, using provided list: {e}")
+            if reload_execution_steps:
+                try:
+                    job_with_steps = self.db.get_job(job_id, s3_service=self.s3)
+                    if job_with_steps and job_with_steps.get('execution_steps'):
+                        execution_steps = job_with_steps['execution_steps']
+                except Exception as e:
+                    logger.warning(f"[StepProcessor] Failed to reload execution_steps, using provided list: {e}")
 
             dependency_indices = self._resolve_dependency_indices(workflow_steps, step_index)
             step["_dependency_indices"] = dependency_indices
@@ -126,20 +138,25 @@ class StepProcessor:
                 step_outputs=step_outputs,
                 sorted_steps=workflow_steps,
                 dependency_indices=dependency_indices,
-                include_form_submission=True
+                include_form_submission=True,
+                token_budget=self._context_token_budget(step, step_type)
             )
             
             # Execute handler
             # Handlers are responsible for updating execution_steps and DB
-            step_output_result, image_artifact_ids = handler.execute(
-                step=step,
-                step_index=step_index,
-                job_id=job_id,
-                tenant_id=tenant_id,
-                context=all_previous_context,
-                step_outputs=step_outputs,
-                execution_steps=execution_steps
-            )
+            try:
+                step_output_result, image_artifact_ids = handler.execute(
+                    step=step,
+                    step_index=step_index,
+                    job_id=job_id,
+                    tenant_id=tenant_id,
+                    context=all_previous_context,
+                    step_outputs=step_outputs,
+                    execution_steps=execution_steps
+                )
+            finally:
+                # Step boundary: write the usage records buffered while the step ran
+                self.usage_service.flush(job_id)
             
             # Update local state if needed (though handlers update DB, we return results)
             all_image_artifact_ids.extend(image_artifact_ids)
@@ -186,10 +203,16 @@ class StepProcessor:
             step_name=step_name,
             step_type=step_type
         ):
-            # Reload execution_steps from DB/S3
+            dependency_indices = self._resolve_dependency_indices(steps, step_index)
+
+            # Reload execution_steps from DB/S3. Most handlers only read their dependencies'
+            # outputs, so only those entries are fetched; webhook/handoff steps see every output.
+            step_orders = None
+            if step_type not in FULL_HISTORY_STEP_TYPES:
+                step_orders = [dep_index + 1 for dep_index in dependency_indices]
             try:
-                job_with_steps = self.db.get_job(job_id, s3_service=self.s3)
-                if job_with_steps and job_with_steps.get('execution_steps'):
+                job_with_steps = self.db.get_job(job_id, s3_service=self.s3, step_orders=step_orders)
+                if job_with_steps and 'execution_steps' in job_with_steps:
                     execution_steps = job_with_steps['execution_steps']
             except Exception as e:
                 logger.warning(f"[StepProcessor] Failed to reload execution_steps: {e}")
@@ -202,7 +225,6 @@ class StepProcessor:
             step_outputs = self._build_step_outputs_from_execution_steps(execution_steps, steps)
             
             # Dependency-aware context building
-            dependency_indices = self._resolve_dependency_indices(steps, step_index)
             step["_dependency_indices"] = dependency_indices
 
             context = ContextBuilder.build_previous_context_from_execution_steps(
@@ -210,19 +232,24 @@ class StepProcessor:
                 execution_steps=execution_steps,
                 current_step_order=step_index + 1,
                 dependency_indices=dependency_indices,
-                include_form_submission=True
+                include_form_submission=True,
+                token_budget=self._context_token_budget(step, step_type)
             )
             
             # Execute handler
-            step_output_result, image_artifact_ids = handler.execute(
-                step=step,
-                step_index=step_index,
-                job_id=job_id,
-                tenant_id=job.get('tenant_id'),
-                context=context,
-                step_outputs=step_outputs,
-                execution_steps=execution_steps
-            )
+            try:
+                step_output_result, image_artifact_ids = handler.execute(
+                    step=step,
+                    step_index=step_index,
+                    job_id=job_id,
+                    tenant_id=job.get('tenant_id'),
+                    context=context,
+                    step_outputs=step_outputs,
+                    execution_steps=execution_steps
+                )
+            finally:
+                # Step boundary: write the usage records buffered while the step ran
+                self.usage_service.flush(job_id)
             
             # Helper to update artifacts list in job (handlers might not do this part fully or might need consolidation)
             # Handlers typically update execution_steps. Artifacts list update is job-level.
@@ -230,6 +257,14 @@ class StepProcessor:
             
             return step_output_result
 
+    @staticmethod
+    def _context_token_budget(step: Dict[str, Any], step_type: str) -> Optional[int]:
+        """Token budget for a model-facing step's context; webhook/handoff payloads are never packed."""
+        if step_type in FULL_HISTORY_STEP_TYPES:
+            return None
+        model = step.get('model') or PROMPT_CONFIGS["ai_generation"]["model"]
+        return get_context_token_budget(model, step.get('max_output_tokens'))
+
     def _check_dependencies(
         self, 
         step: Dict[str, Any], 
@@ -0,0 +1,253 @@
+"""
+Step Scheduler
+Dispatches workflow steps from a ready queue as soon as their own dependencies finish.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from services.browser_pool import keep_browsers_warm_on_current_thread
+from services.dependency_resolver import DependencyResolver
+from utils.step_utils import normalize_step_order
+
+logger = logging.getLogger(__name__)
+
+# Worker pools live for the whole process (one per size), so per-thread state such as
+# the warm browser pool survives from one job to the next.
+_step_executors: Dict[int, ThreadPoolExecutor] = {}
+_step_executors_lock = threading.Lock()
+
+
+def get_step_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Get the process-wide worker pool that runs scheduled steps."""
+    with _step_executors_lock:
+        executor = _step_executors.get(max_workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="workflow-step",
+                initializer=keep_browsers_warm_on_current_thread,
+            )
+            _step_executors[max_workers] = executor
+        return executor
+
+
+@dataclass
+class StepTiming:
+    """Monotonic-clock timestamps for one scheduled step."""
+    step_index: int
+    ready_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def queue_wait_ms(self) -> int:
+        if self.started_at is None:
+            return 0
+        return int((self.started_at - self.ready_at) * 1000)
+
+    @property
+    def duration_ms(self) -> int:
+        if self.started_at is None or self.finished_at is None:
+            return 0
+        return int((self.finished_at - self.started_at) * 1000)
+
+
+@dataclass
+class ScheduleReport:
+    """Summary of a scheduler run, used to see how much wall-clock the workflow shape costs."""
+    timings: Dict[int, StepTiming] = field(default_factory=dict)
+    wall_clock_ms: int = 0
+    critical_path: List[int] = field(default_factory=list)
+    critical_path_ms: int = 0
+
+    @property
+    def serial_ms(self) -> int:
+        """Sum of step durations, i.e. the wall-clock of running every step back to back."""
+        return sum(t.duration_ms for t in self.timings.values())
+
+    @property
+    def total_queue_wait_ms(self) -> int:
+        return sum(t.queue_wait_ms for t in self.timings.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'wall_clock_ms': self.wall_clock_ms,
+            'serial_ms': self.serial_ms,
+            'critical_path': self.critical_path,
+            'critical_path_length': len(self.critical_path),
+            'critical_path_ms': self.critical_path_ms,
+            'total_queue_wait_ms': self.total_queue_wait_ms,
+            'steps': {
+                index: {
+                    'queue_wait_ms': timing.queue_wait_ms,
+                    'duration_ms': timing.duration_ms,
+                }
+                for index, timing in sorted(self.timings.items())
+            },
+        }
+
+
+class ReadyQueueScheduler:
+    """
+    Run workflow steps on a bounded worker pool, starting each step the moment all of
+    its dependencies have completed (rather than waiting for a whole execution group).
+    The pool is process-wide (see get_step_executor), so its threads outlive the job.
+
+    Ready steps are dispatched in (step_order, index) order, so runs with the same
+    timings dispatch identically. If a step raises, no new steps are dispatched; steps
+    already in flight run to completion and the first failure (by step_order) is
+    re-raised.
+    """
+
+    def __init__(self, steps: List[Dict[str, Any]], max_workers: int):
+        """
+        Initialize scheduler.
+
+        Args:
+            steps: Workflow steps (indices are the workflow array indices)
+            max_workers: Maximum number of steps executing at once
+        """
+        self.steps = steps
+        self.max_workers = max(1, int(max_workers))
+        self.dependencies = DependencyResolver.build_dependency_graph(steps)
+
+    def _sort_key(self, step_index: int) -> Tuple[int, int]:
+        return normalize_step_order(self.steps[step_index]), step_index
+
+    def run(
+        self,
+        execute_step: Callable[[int, Dict[str, Any], Dict[int, Any]], Any]
+    ) -> Tuple[Dict[int, Any], ScheduleReport]:
+        """
+        Execute every step.
+
+        Args:
+            execute_step: Callable invoked on a worker thread as
+                execute_step(step_index, step, completed_results), where completed_results
+                is a snapshot of the results of every step finished before dispatch
+
+        Returns:
+            Tuple of (results keyed by step index, ScheduleReport)
+
+        Raises:
+            Exception: The first step failure (by step_order), after in-flight steps finish
+        """
+        report = ScheduleReport()
+        results: Dict[int, Any] = {}
+        errors: Dict[int, Exception] = {}
+        completed: List[int] = []
+        dispatched: Set[int] = set()
+        timings_lock = threading.Lock()
+        run_started_at = time.monotonic()
+
+        def _mark_ready(step_indices: List[int]) -> None:
+            now = time.monotonic()
+            for step_index in step_indices:
+                if step_index not in report.timings:
+                    report.timings[step_index] = StepTiming(step_index=step_index, ready_at=now)
+
+        def _run_step(step_index: int, completed_results: Dict[int, Any]) -> Any:
+            with timings_lock:
+                report.timings[step_index].started_at = time.monotonic()
+            try:
+                return execute_step(step_index, self.steps[step_index], completed_results)
+            finally:
+                with timings_lock:
+                    report.timings[step_index].finished_at = time.monotonic()
+
+        executor = get_step_executor(self.max_workers)
+        in_flight: Dict[Any, int] = {}
+
+        while True:
+            if not errors:
+                ready = [
+                    i for i in DependencyResolver.get_ready_steps(completed, self.steps)
+                    if i not in dispatched
+                ]
+                if not ready and not in_flight and len(completed) < len(self.steps):
+                    # Unsatisfiable dependencies (e.g. a cycle that slipped past validation):
+                    # fall back to step_order so the workflow still makes progress.
+                    remaining = sorted(
+                        (i for i in range(len(self.steps)) if i not in dispatched),
+                        key=self._sort_key,
+                    )
+                    logger.warning(
+                        "[ReadyQueueScheduler] No ready steps but workflow incomplete; "
+                        "dispatching next step by step_order. Possible circular dependency.",
+                        extra={'remaining_steps': remaining}
+                    )
+                    ready = remaining[:1]
+
+                with timings_lock:
+                    _mark_ready(ready)
+                for step_index in sorted(ready, key=self._sort_key):
+                    # Carry bound log context (job_id, tenant_id, ...) into the worker thread
+                    ctx = contextvars.copy_context()
+                    future = executor.submit(ctx.run, _run_step, step_index, dict(results))
+                    in_flight[future] = step_index
+                    dispatched.add(step_index)
+
+            if not in_flight:
+                break
+
+            done, _ = wait(list(in_flight.keys()), return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: self._sort_key(in_flight[f])):
+                step_index = in_flight.pop(future)
+                try:
+                    results[step_index] = future.result()
+                except Exception as e:
+                    logger.error(f"[ReadyQueueScheduler] Step {step_index + 1} failed: {e}", extra={
+                        'step_index': step_index
+                    })
+                    errors[step_index] = e
+                completed.append(step_index)
+
+        report.wall_clock_ms = int((time.monotonic() - run_started_at) * 1000)
+        report.critical_path, report.critical_path_ms = self._critical_path(report.timings, completed)
+
+        if errors:
+            first_failed = min(errors, key=self._sort_key)
+            raise errors[first_failed]
+
+        return results, report
+
+    def _critical_path(
+        self,
+        timings: Dict[int, StepTiming],
+        completion_order: List[int]
+    ) -> Tuple[List[int], int]:
+        """
+        Longest duration-weighted dependency chain among executed steps.
+
+        Completion order is a valid topological order because a step is only
+        dispatched after its dependencies complete.
+        """
+        path_ms: Dict[int, int] = {}
+        predecessor: Dict[int, Optional[int]] = {}
+        for step_index in completion_order:
+            best_dep: Optional[int] = None
+            best_ms = 0
+            for dep_index in self.dependencies.get(step_index, []):
+                if dep_index in path_ms and path_ms[dep_index] > best_ms:
+                    best_dep, best_ms = dep_index, path_ms[dep_index]
+            timing = timings.get(step_index)
+            path_ms[step_index] = best_ms + (timing.duration_ms if timing else 0)
+            predecessor[step_index] = best_dep
+
+        if not path_ms:
+            return [], 0
+
+        tail = max(path_ms, key=lambda i: (path_ms[i], -completion_order.index(i)))
+        path: List[int] = []
+        node: Optional[int] = tail
+        while node is not None:
+            path.append(node)
+            node = predecessor.get(node)
+        path.reverse()
+        return path, path_ms[tail]
@@ -9,6 +9,7 @@ from services.execution_step_manager import ExecutionStepManager
 from services.s3_context_service import S3ContextService
 from services.context_builder import ContextBuilder
 from services.tools import get_image_generation_defaults
+from services.upload_queue import get_job_upload_queues
 from core import log_context
 from core.prompts import PROMPT_CONFIGS
 
@@ -152,6 +153,21 @@ class AIStepHandler(AbstractStepHandler):
         
         return step_model, step_tools, step_tool_choice
 
+    @staticmethod
+    def _drain_uploads(job_id: str, step_index: int, execution_step_data: Dict[str, Any]) -> None:
+        """Step-end barrier for this step's background uploads; failures go on the execution step."""
+        try:
+            report = get_job_upload_queues().drain(job_id, step_index)
+        except Exception as drain_error:
+            logger.warning("[AIStepHandler] Failed to drain background uploads", extra={
+                'job_id': job_id,
+                'step_index': step_index,
+                'error': str(drain_error)
+            }, exc_info=True)
+            return
+        if report and report['failed']:
+            execution_step_data['upload_failures'] = report['failed']
+
     @staticmethod
     def _split_step_context(step_index: int, full_context: str) -> Tuple[str, str]:
         """Return (previous_context, current_step_context).
@@ -264,6 +280,7 @@ class AIStepHandler(AbstractStepHandler):
                     step_duration=step_duration,
                     artifact_id=step_artifact_id
                 )
+                self._drain_uploads(job_id, step_index, execution_step_data)
                 
                 execution_steps.append(execution_step_data)
                 
@@ -301,6 +318,7 @@ class AIStepHandler(AbstractStepHandler):
                     step_start_time=step_start_time,
                     duration_ms=step_duration
                 )
+                self._drain_uploads(job_id, step_index, execution_step_data)
                 
                 execution_steps.append(execution_step_data)
                 self.services['db_service'].update_job(job_id, {'execution_steps': execution_steps}, s3_service=self.services['s3_service'])
@@ -3,10 +3,9 @@ import os
 from datetime import datetime
 from typing import Dict, Any, List, Tuple, Optional
 
-import requests
-
 from services.steps.base import AbstractStepHandler
 from services.context_builder import ContextBuilder
+from utils import http_client
 from utils.decimal_utils import convert_decimals_to_float
 from core import log_context
 
@@ -205,7 +204,7 @@ class HandoffStepHandler(AbstractStepHandler):
             error: Optional[str] = None
 
             try:
-                resp = requests.post(webhook_url, json=request_body, timeout=15)
+                resp = http_client.post(webhook_url, json=request_body, timeout=15)
                 response_status = resp.status_code
                 response_body_text = resp.text[:10000] if resp.text else ""
 
@@ -7,11 +7,10 @@ for secrets configured in tenant settings.
 from __future__ import annotations
 
 import logging
-import os
 import re
 from typing import Any, Dict, Optional
 
-import boto3
+from services.secrets_provider import get_secrets_provider
 
 logger = logging.getLogger(__name__)
 
@@ -93,15 +92,8 @@ def redact_tool_secrets_value(value: Any) -> Any:
 
 
 def _fetch_settings_from_dynamodb(tenant_id: str) -> Optional[Dict[str, Any]]:
-    table_name = (os.environ.get("USER_SETTINGS_TABLE") or "").strip()
-    if not table_name:
-        return None
-    region = os.environ.get("AWS_REGION", "us-east-1")
     try:
-        dynamodb = boto3.resource("dynamodb", region_name=region)
-        table = dynamodb.Table(table_name)
-        response = table.get_item(Key={"tenant_id": tenant_id})
-        return response.get("Item")
+        return get_secrets_provider().read_settings(tenant_id)
     except Exception:
         logger.debug(
             "[ToolSecrets] Failed to fetch settings from DynamoDB",
@@ -111,9 +103,7 @@ def _fetch_settings_from_dynamodb(tenant_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def get_tool_secrets(db_service: Optional[Any], tenant_id: Optional[str]) -> Dict[str, str]:
-    if not tenant_id:
-        return {}
+def _load_settings(db_service: Optional[Any], tenant_id: str) -> Optional[Dict[str, Any]]:
     settings: Optional[Dict[str, Any]] = None
     if db_service is not None:
         try:
@@ -122,4 +112,15 @@ def get_tool_secrets(db_service: Optional[Any], tenant_id: Optional[str]) -> Dic
             settings = None
     if settings is None:
         settings = _fetch_settings_from_dynamodb(tenant_id)
+    return settings
+
+
+def get_tool_secrets(db_service: Optional[Any], tenant_id: Optional[str]) -> Dict[str, str]:
+    if not tenant_id:
+        return {}
+    # Settings are cached per tenant (TENANT_SETTINGS_CACHE_TTL_SECONDS) across steps and invocations.
+    settings = get_secrets_provider().get_tenant_settings(
+        tenant_id,
+        loader=lambda: _load_settings(db_service, tenant_id),
+    )
     return normalize_tool_secrets((settings or {}).get("tool_secrets"))
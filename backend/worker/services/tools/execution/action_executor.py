@@ -8,6 +8,7 @@ from services.cua.types import (
     SafetyCheckEvent, ActionExecutedEvent
 )
 from services.cua.environment import Environment
+from services.cua.settle import asettle_after_action
 from services.shell_executor_service import ShellExecutorService
 from .agent_utils import get_attr_or_key, to_dict
 from utils.image_utils import add_overlay_to_screenshot
@@ -67,6 +68,7 @@ class ActionExecutor:
 
         # Execute Computer Action
         action_error = None
+        settle = None
         
         try:
             await self.env.execute_action(action)
@@ -80,18 +82,12 @@ class ActionExecutor:
             # Track action for loop detection
             self._track_action(action, action_type, recent_actions, max_recent_actions)
             
-            # Wait after action
-            wait_time = 1000
-            if action_type in ['click', 'type', 'keypress', 'drag', 'drag_and_drop']:
-                wait_time = 1500
-            elif action_type == 'navigate':
-                wait_time = 2000
-            elif action_type == 'scroll':
-                wait_time = 800
-            elif action_type == 'screenshot':
-                wait_time = 0
-            
-            await asyncio.sleep(wait_time / 1000.0)
+            # Wait until the screen settles (bounded per action type)
+            settle = await asettle_after_action(self.env, action_type)
+            settle_info = settle.to_log(action_type)
+            logger.info("[ActionExecutor] Screen settled", extra={'iteration': iteration, **settle_info})
+            yield LogEvent(type='log', timestamp=time.time(), level='info',
+                        message=f"Screen {'settled' if settle.settled else 'wait capped'} after {settle_info['settle_ms']:.0f} ms ({settle.method})")
             
         except Exception as e:
             action_error = str(e)
@@ -110,7 +106,8 @@ class ActionExecutor:
         url = None
         
         try:
-            screenshot_b64 = await self.env.capture_screenshot()
+            # Frame-diff settling already captured the current screen
+            screenshot_b64 = (settle.screenshot_b64 if settle else None) or await self.env.capture_screenshot()
             current_url = await self.env.get_current_url()
             
             # Upload (using jpeg for faster uploads)
@@ -58,6 +58,15 @@ def _derive_workspace_id(*, tenant_id: Optional[str], job_id: Optional[str], ste
     return f"w_{digest}"
 
 
+async def _call_model(openai_client: Any, params: Dict[str, Any]) -> Any:
+    """Await the client's async Responses API path, or run the sync call in a thread."""
+    amake_api_call = getattr(openai_client, "amake_api_call", None)
+    if asyncio.iscoroutinefunction(amake_api_call):
+        return await amake_api_call(params)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: openai_client.make_api_call(params))
+
+
 class ShellLoopService:
     """Runs the OpenAI `shell` tool loop using an external executor."""
 
@@ -417,14 +426,14 @@ class ShellLoopService:
         start_time = time.time()
         iteration = 0
 
-        # We need to run synchronous openai calls in a thread executor to avoid blocking the event loop
-        # if this is running in an async context (which it is for streaming).
+        # Model calls are awaited on the async client; shell execution is blocking and
+        # runs in a thread executor so the event loop keeps serving other streams.
         loop = asyncio.get_running_loop()
 
         try:
             yield {"type": "log", "timestamp": time.time(), "level": "info", "message": "Sending initial request to model..."}
             
-            response = await loop.run_in_executor(None, lambda: openai_client.make_api_call(params))
+            response = await _call_model(openai_client, params)
             previous_response_id = getattr(response, "id", None)
             
             # Log initial response content
@@ -568,7 +577,7 @@ class ShellLoopService:
 
                 yield {"type": "log", "timestamp": time.time(), "level": "info", "message": "Sending feedback to model..."}
                 
-                response = await loop.run_in_executor(None, lambda: openai_client.make_api_call(next_params))
+                response = await _call_model(openai_client, next_params)
                 previous_response_id = getattr(response, "id", previous_response_id)
                 
                 # Log response content
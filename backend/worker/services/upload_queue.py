@@ -0,0 +1,276 @@
+"""
+Upload Queue
+Per-job background S3 uploads with pre-computed keys.
+
+Loops that persist artifacts while they run (CUA screenshots, shell/code executor
+logs) enqueue the bytes and immediately get back the object's deterministic key and
+URL; the upload itself runs on a bounded, process-wide thread pool. Queues are kept
+per (job_id, step_index), since the scheduler runs several steps of a job at once.
+The step handler drains its step's queue when the step ends (a barrier, so no upload
+outlives the step or the Lambda invocation) and records failed uploads on the step's
+execution_steps entry.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_DRAIN_TIMEOUT_SECONDS = 120.0
+
+
+def _read_concurrency() -> int:
+    value = (os.environ.get("UPLOAD_QUEUE_CONCURRENCY") or "").strip()
+    if not value:
+        return DEFAULT_CONCURRENCY
+    try:
+        parsed = int(value)
+    except Exception:
+        return DEFAULT_CONCURRENCY
+    return parsed if parsed > 0 else DEFAULT_CONCURRENCY
+
+
+def _read_drain_timeout() -> float:
+    value = (os.environ.get("UPLOAD_QUEUE_DRAIN_TIMEOUT_SECONDS") or "").strip()
+    if not value:
+        return DEFAULT_DRAIN_TIMEOUT_SECONDS
+    try:
+        parsed = float(value)
+    except Exception:
+        return DEFAULT_DRAIN_TIMEOUT_SECONDS
+    return parsed if parsed > 0 else DEFAULT_DRAIN_TIMEOUT_SECONDS
+
+
+@dataclass
+class PendingUpload:
+    """An enqueued upload; key and URLs are valid before the upload completes."""
+    key: str
+    s3_url: str
+    public_url: str
+    content_type: str
+    size_bytes: int
+    label: Optional[str]
+    future: Future
+
+    def to_failure(self, error: str) -> Dict[str, Any]:
+        return {
+            'key': self.key,
+            'url': self.public_url,
+            'label': self.label,
+            'error': error,
+        }
+
+
+class UploadQueue:
+    """Background uploads for one step of a job."""
+
+    def __init__(
+        self,
+        s3_service: Any,
+        tenant_id: Optional[str],
+        job_id: str,
+        executor: ThreadPoolExecutor,
+        step_index: Optional[int] = None,
+    ):
+        """
+        Initialize queue.
+
+        Args:
+            s3_service: S3Service used for uploads and URL construction
+            tenant_id: Tenant ID (keys fall back to images/ without one, like ImageHandler)
+            job_id: Job ID
+            executor: Shared upload thread pool
+            step_index: Step whose uploads this queue holds
+        """
+        self.s3_service = s3_service
+        self.tenant_id = tenant_id
+        self.job_id = job_id
+        self.step_index = step_index
+        self._executor = executor
+        self._pending: List[PendingUpload] = []
+        self._lock = threading.Lock()
+
+    def object_key(self, filename: str) -> str:
+        """S3 key of a job artifact (same layout as ArtifactService / ImageHandler)."""
+        if self.tenant_id and self.job_id:
+            return f"{self.tenant_id}/jobs/{self.job_id}/{filename}"
+        return f"images/{filename}"
+
+    def enqueue(
+        self,
+        filename: str,
+        body: Union[str, bytes],
+        content_type: str,
+        public: bool = True,
+        label: Optional[str] = None,
+    ) -> PendingUpload:
+        """
+        Start a background upload.
+
+        Images go through upload_image (immutable cache headers, public image URL),
+        everything else through upload_stream.
+
+        Args:
+            filename: Deterministic object name below the job prefix
+            body: Content to upload
+            content_type: MIME type
+            public: Whether the object is publicly accessible
+            label: Short description used in failure reports
+
+        Returns:
+            PendingUpload with the final key and URLs
+        """
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        key = self.object_key(filename)
+        if content_type.startswith('image/'):
+            s3_url, public_url = self.s3_service.get_image_urls(key, public=public)
+            future = self._executor.submit(self.s3_service.upload_image, key, data, content_type, public)
+        else:
+            s3_url, public_url = self.s3_service.get_artifact_urls(key, public=public)
+            future = self._executor.submit(self.s3_service.upload_stream, key, data, content_type=content_type)
+        pending = PendingUpload(
+            key=key,
+            s3_url=s3_url,
+            public_url=public_url,
+            content_type=content_type,
+            size_bytes=len(data),
+            label=label,
+            future=future,
+        )
+        with self._lock:
+            self._pending.append(pending)
+        return pending
+
+    def drain(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for every enqueued upload.
+
+        Args:
+            timeout: Seconds to wait (defaults to UPLOAD_QUEUE_DRAIN_TIMEOUT_SECONDS);
+                uploads still running afterwards are reported as failed
+
+        Returns:
+            Dict with uploaded, failed (list of {key, url, label, error}), bytes and wait_ms
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        started = time.monotonic()
+        wait([p.future for p in pending], timeout=timeout if timeout is not None else _read_drain_timeout())
+
+        failed: List[Dict[str, Any]] = []
+        uploaded_bytes = 0
+        for upload in pending:
+            if not upload.future.done():
+                failed.append(upload.to_failure("upload did not finish before the step ended"))
+                continue
+            error = upload.future.exception()
+            if error is not None:
+                failed.append(upload.to_failure(f"{type(error).__name__}: {error}"))
+                continue
+            uploaded_bytes += upload.size_bytes
+
+        report = {
+            'uploaded': len(pending) - len(failed),
+            'failed': failed,
+            'bytes': uploaded_bytes,
+            'wait_ms': int((time.monotonic() - started) * 1000),
+        }
+        if pending:
+            log = logger.warning if failed else logger.info
+            log("[UploadQueue] Drained step uploads", extra={
+                'job_id': self.job_id,
+                'step_index': self.step_index,
+                'uploaded': report['uploaded'],
+                'failed_count': len(failed),
+                'bytes': uploaded_bytes,
+                'wait_ms': report['wait_ms'],
+            })
+        return report
+
+
+class JobUploadQueues:
+    """Process-wide registry of per-step upload queues sharing one bounded pool."""
+
+    def __init__(self, concurrency: Optional[int] = None):
+        """
+        Initialize registry.
+
+        Args:
+            concurrency: Upload threads shared by all jobs (defaults to UPLOAD_QUEUE_CONCURRENCY)
+        """
+        self.concurrency = concurrency or _read_concurrency()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queues: Dict[Tuple[str, Optional[int]], UploadQueue] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(
+        self,
+        s3_service: Any,
+        tenant_id: Optional[str],
+        job_id: str,
+        filename: str,
+        body: Union[str, bytes],
+        content_type: str,
+        public: bool = True,
+        label: Optional[str] = None,
+        step_index: Optional[int] = None,
+    ) -> PendingUpload:
+        """
+        Start a background upload on the step's queue (see UploadQueue.enqueue).
+
+        Enqueue and drain share one lock, so an upload either belongs to the drain in
+        progress or to the step's next queue; none is left behind on a drained queue.
+        """
+        with self._lock:
+            queue = self._queues.get((job_id, step_index))
+            if queue is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.concurrency,
+                        thread_name_prefix="job-upload",
+                    )
+                queue = UploadQueue(s3_service, tenant_id, job_id, self._executor, step_index=step_index)
+                self._queues[(job_id, step_index)] = queue
+            return queue.enqueue(filename, body, content_type, public=public, label=label)
+
+    def drain(
+        self,
+        job_id: Optional[str],
+        step_index: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Step-end barrier: wait for a step's uploads and forget its queue.
+
+        Uploads of other steps of the same job (running in parallel) are left alone.
+
+        Returns:
+            The drain report, or None when the step enqueued nothing
+        """
+        if not job_id:
+            return None
+        with self._lock:
+            queue = self._queues.pop((job_id, step_index), None)
+        if queue is None:
+            return None
+        return queue.drain(timeout=timeout)
+
+
+_job_upload_queues: Optional[JobUploadQueues] = None
+_job_upload_queues_lock = threading.Lock()
+
+
+def get_job_upload_queues() -> JobUploadQueues:
+    """Get the process-wide upload queue registry (created on first use)."""
+    global _job_upload_queues
+    if _job_upload_queues is None:
+        with _job_upload_queues_lock:
+            if _job_upload_queues is None:
+                _job_upload_queues = JobUploadQueues()
+    return _job_upload_queues
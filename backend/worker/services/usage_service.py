@@ -1,12 +1,19 @@
 """
 Usage Service
 Handles usage record storage for billing tracking.
+
+Usage records are buffered per job and written with a DynamoDB batch writer at step
+boundaries, when a job's buffer reaches USAGE_RECORD_BATCH_SIZE records, and when the
+job completes or fails, instead of one synchronous put per model call.
 """
 
 import logging
+import math
+import os
+import threading
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 from utils.ulid_utils import new_ulid
 
@@ -14,18 +21,159 @@ from db_service import DynamoDBService
 
 logger = logging.getLogger(__name__)
 
+# DynamoDB BatchWriteItem accepts at most 25 items per request.
+DYNAMODB_BATCH_LIMIT = 25
+DEFAULT_BATCH_SIZE = DYNAMODB_BATCH_LIMIT
+
+
+def _read_batch_size() -> int:
+    value = (os.environ.get("USAGE_RECORD_BATCH_SIZE") or "").strip()
+    if not value:
+        return DEFAULT_BATCH_SIZE
+    try:
+        parsed = int(value)
+    except Exception:
+        return DEFAULT_BATCH_SIZE
+    return parsed if parsed > 0 else DEFAULT_BATCH_SIZE
+
+
+class UsageRecordBuffer:
+    """Per-job usage accumulator with per-model rollups."""
+
+    def __init__(self, batch_size: Optional[int] = None):
+        """
+        Initialize buffer.
+
+        Args:
+            batch_size: Buffered records per job that trigger a flush
+                (defaults to USAGE_RECORD_BATCH_SIZE)
+        """
+        self.batch_size = batch_size or _read_batch_size()
+        # job_id -> (db_service, buffered records)
+        self._pending: Dict[str, Tuple[Any, List[Dict[str, Any]]]] = {}
+        # job_id -> model -> totals
+        self._rollups: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'records': 0,
+            'flushes': 0,
+            'writes_saved': 0,
+        }
+
+    def add(self, db_service: Any, job_id: str, usage_record: Dict[str, Any]) -> None:
+        """
+        Buffer a usage record, flushing the job's buffer once it reaches batch_size.
+
+        Args:
+            db_service: DynamoDBService used to persist the records
+            job_id: Job ID
+            usage_record: Usage record item
+        """
+        with self._lock:
+            _, records = self._pending.setdefault(job_id, (db_service, []))
+            records.append(usage_record)
+            self._stats['records'] += 1
+
+            model_rollup = self._rollups.setdefault(job_id, {}).setdefault(usage_record['model'], {
+                'calls': 0,
+                'input_tokens': 0,
+                'output_tokens': 0,
+                'cost_usd': Decimal('0'),
+            })
+            model_rollup['calls'] += 1
+            model_rollup['input_tokens'] += usage_record.get('input_tokens') or 0
+            model_rollup['output_tokens'] += usage_record.get('output_tokens') or 0
+            model_rollup['cost_usd'] += usage_record.get('cost_usd') or Decimal('0')
+            should_flush = len(records) >= self.batch_size
+
+        if should_flush:
+            self.flush(job_id)
+
+    def flush(self, job_id: Optional[str] = None) -> int:
+        """
+        Write buffered records with a batch writer.
+
+        Args:
+            job_id: Flush only this job (default: every buffered job)
+
+        Returns:
+            Number of records handed to DynamoDB
+        """
+        with self._lock:
+            if job_id is not None:
+                entry = self._pending.pop(job_id, None)
+                entries = [entry] if entry else []
+            else:
+                entries = list(self._pending.values())
+                self._pending.clear()
+
+        written = 0
+        for db_service, records in entries:
+            if not records:
+                continue
+            db_service.put_usage_records(records)
+            written += len(records)
+            with self._lock:
+                self._stats['flushes'] += 1
+                self._stats['writes_saved'] += len(records) - math.ceil(len(records) / DYNAMODB_BATCH_LIMIT)
+        return written
+
+    def close_job(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Flush a finished job and release its rollup.
+
+        Returns:
+            Per-model rollup: {model: {calls, input_tokens, output_tokens, cost_usd}}
+        """
+        self.flush(job_id)
+        with self._lock:
+            return self._rollups.pop(job_id, {})
+
+    def get_rollup(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get a copy of the per-model rollup for a job."""
+        with self._lock:
+            return {model: dict(totals) for model, totals in self._rollups.get(job_id, {}).items()}
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get buffer counters.
+
+        Returns:
+            Dict with records, flushes, writes_saved and pending
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = sum(len(records) for _, records in self._pending.values())
+        return stats
+
+
+_usage_buffer: Optional[UsageRecordBuffer] = None
+_usage_buffer_lock = threading.Lock()
+
+
+def get_usage_buffer() -> UsageRecordBuffer:
+    """Get the process-wide usage record buffer (created on first use)."""
+    global _usage_buffer
+    if _usage_buffer is None:
+        with _usage_buffer_lock:
+            if _usage_buffer is None:
+                _usage_buffer = UsageRecordBuffer()
+    return _usage_buffer
+
 
 class UsageService:
     """Service for storing usage records."""
     
-    def __init__(self, db_service: DynamoDBService):
+    def __init__(self, db_service: DynamoDBService, buffer: Optional[UsageRecordBuffer] = None):
         """
         Initialize usage service.
         
         Args:
             db_service: DynamoDB service instance
+            buffer: Optional usage buffer (defaults to the process-wide buffer)
         """
         self.db = db_service
+        self.buffer = buffer or get_usage_buffer()
     
     def store_usage_record(
         self,
@@ -35,7 +183,10 @@ class UsageService:
         service_type: str = 'unknown'
     ) -> None:
         """
-        Store usage record for billing tracking.
+        Buffer usage record for billing tracking.
+
+        The record is written at the next flush (step boundary, batch size, or job
+        completion/failure).
         
         Args:
             tenant_id: Tenant ID
@@ -71,10 +222,46 @@ class UsageService:
                 'cost_usd': cost_usd,
                 'created_at': datetime.utcnow().isoformat(),
             }
-            self.db.put_usage_record(usage_record)
-            logger.debug(f"Stored usage record {usage_id} for job {job_id}")
+            self.buffer.add(self.db, job_id, usage_record)
+            logger.debug(f"Buffered usage record {usage_id} for job {job_id}")
         except Exception as e:
             logger.error(f"Failed to store usage record: {e}")
             # Don't fail the job if usage tracking fails
             pass
 
+    def flush(self, job_id: Optional[str] = None) -> None:
+        """
+        Write buffered usage records (called at step boundaries).
+
+        Args:
+            job_id: Flush only this job (default: every buffered job)
+        """
+        try:
+            self.buffer.flush(job_id)
+        except Exception as e:
+            logger.error(f"Failed to flush usage records: {e}")
+
+    def close_job(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Flush a finished job's usage records and return its per-model rollup.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            {model: {calls, input_tokens, output_tokens, cost_usd}}
+        """
+        try:
+            usage_rollup = self.buffer.close_job(job_id)
+        except Exception as e:
+            logger.error(f"Failed to flush usage records: {e}")
+            return {}
+        if usage_rollup:
+            logger.info("[UsageService] Job usage by model", extra={
+                'job_id': job_id,
+                'usage_by_model': {
+                    model: {**totals, 'cost_usd': float(totals['cost_usd'])}
+                    for model, totals in usage_rollup.items()
+                },
+            })
+        return usage_rollup
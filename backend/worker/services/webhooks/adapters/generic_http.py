@@ -1,5 +1,5 @@
 import logging
-import requests
+from utils import http_client
 from typing import Dict, Any
 from services.webhooks.adapters.base import WebhookAdapter
 
@@ -17,7 +17,7 @@ class GenericHttpAdapter(WebhookAdapter):
             return {'success': False, 'error': 'No URL provided'}
             
         try:
-            response = requests.request(
+            response = http_client.request(
                 method=method,
                 url=url,
                 json=payload,
@@ -1,7 +1,7 @@
 import logging
-import requests
 from typing import Dict, Any
 from services.webhooks.adapters.base import WebhookAdapter
+from utils import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +19,7 @@ class SlackAdapter(WebhookAdapter):
         }
         
         try:
-            response = requests.post(url, json=slack_payload, timeout=10)
+            response = http_client.post(url, json=slack_payload, timeout=10)
             return {
                 'success': response.status_code == 200,
                 'response_status': response.status_code,
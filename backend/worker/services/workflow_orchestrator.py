@@ -4,6 +4,7 @@ Handles orchestration of multi-step workflow execution.
 """
 
 import logging
+import os
 from typing import Dict, Any, List, Tuple, Optional
 
 from ai_service import AIService
@@ -11,6 +12,8 @@ from db_service import DynamoDBService
 from s3_service import S3Service
 from services.step_processor import StepProcessor
 from services.context_builder import ContextBuilder
+from services.context_assembler import get_context_assembler
+from services.step_scheduler import ReadyQueueScheduler
 from services.field_label_service import FieldLabelService
 from services.job_completion_service import JobCompletionService
 from utils.content_detector import resolve_artifact_content
@@ -18,6 +21,21 @@ from utils.step_utils import normalize_step_order
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrently executing workflow steps.
+# Set WORKFLOW_MAX_PARALLEL_STEPS=1 to restore strictly sequential execution.
+DEFAULT_MAX_PARALLEL_STEPS = 4
+
+
+def _read_max_parallel_steps() -> int:
+    value = (os.environ.get("WORKFLOW_MAX_PARALLEL_STEPS") or "").strip()
+    if not value:
+        return DEFAULT_MAX_PARALLEL_STEPS
+    try:
+        parsed = int(value)
+    except Exception:
+        return DEFAULT_MAX_PARALLEL_STEPS
+    return parsed if parsed > 0 else DEFAULT_MAX_PARALLEL_STEPS
+
 
 class WorkflowOrchestrator:
     """Service for orchestrating workflow execution."""
@@ -28,7 +46,8 @@ class WorkflowOrchestrator:
         ai_service: AIService,
         db_service: DynamoDBService,
         s3_service: S3Service,
-        job_completion_service: JobCompletionService
+        job_completion_service: JobCompletionService,
+        max_parallel_steps: Optional[int] = None
     ):
         """
         Initialize workflow orchestrator.
@@ -39,12 +58,17 @@ class WorkflowOrchestrator:
             db_service: DynamoDB service instance
             s3_service: S3 service instance
             job_completion_service: Job completion service instance
+            max_parallel_steps: Optional worker pool size for independent steps
+                (defaults to WORKFLOW_MAX_PARALLEL_STEPS; 1 disables parallel execution)
         """
         self.step_processor = step_processor
         self.ai_service = ai_service
         self.db = db_service
         self.s3 = s3_service
         self.job_completion_service = job_completion_service
+        if max_parallel_steps is None or max_parallel_steps < 1:
+            max_parallel_steps = _read_max_parallel_steps()
+        self.max_parallel_steps = max_parallel_steps
     
     def execute_workflow(
         self,
@@ -88,62 +112,35 @@ class WorkflowOrchestrator:
             field_label_map
         )
         
-        # Execute by step_order for legacy compatibility, but keep original workflow
-        # indices so dependencies and reruns stay aligned with the persisted steps array.
-        sorted_step_entries = sorted(
-            enumerate(steps),
-            key=lambda entry: normalize_step_order(entry[1]),
-        )
-        
         # Process each step
-        accumulated_context = ""
-        step_outputs = []
-        all_image_artifact_ids = []
-        
-        for step_index, step in sorted_step_entries:
-            step_output_dict, image_artifact_ids = self.step_processor.process_step_batch_mode(
-                step=step,
-                step_index=step_index,
+        if self.max_parallel_steps > 1:
+            step_results = self._execute_with_scheduler(
                 job_id=job_id,
                 tenant_id=job['tenant_id'],
                 initial_context=initial_context,
-                step_outputs=step_outputs,
                 workflow_steps=steps,
                 execution_steps=execution_steps,
-                all_image_artifact_ids=all_image_artifact_ids
             )
-            
+        else:
+            step_results = self._execute_sequentially(
+                job_id=job_id,
+                tenant_id=job['tenant_id'],
+                initial_context=initial_context,
+                workflow_steps=steps,
+                execution_steps=execution_steps,
+            )
+        
+        context_blocks = []
+        step_outputs = []
+        all_image_artifact_ids = []
+        
+        # Merge results in deterministic (step_order) order
+        for step_index, step_output_dict, image_artifact_ids in step_results:
             step_outputs.append(step_output_dict)
-            
+            all_image_artifact_ids.extend(image_artifact_ids)
             # Accumulate context for next step (include image URLs if present)
-            step_name = step_output_dict['step_name']
-            step_output = step_output_dict['output']
-            
-            # Extract image URLs from multiple sources:
-            # 1. From image_urls array
-            image_urls_from_array = step_output_dict.get('image_urls', [])
-            if image_urls_from_array is None:
-                image_urls_from_array = []
-            elif not isinstance(image_urls_from_array, list):
-                image_urls_from_array = [str(image_urls_from_array)] if image_urls_from_array else []
-            else:
-                image_urls_from_array = [url for url in image_urls_from_array if url]
-            
-            # 2. Extract image URLs from the output text itself
-            from utils.image_utils import extract_image_urls, extract_image_urls_from_object
-            image_urls_from_text = []
-            if isinstance(step_output, str):
-                image_urls_from_text = extract_image_urls(step_output)
-            elif isinstance(step_output, (dict, list)):
-                image_urls_from_text = extract_image_urls_from_object(step_output)
-            
-            # Combine and deduplicate all image URLs
-            all_image_urls = set(image_urls_from_array) | set(image_urls_from_text)
-            image_urls = sorted(list(all_image_urls))  # Sort for consistent output
-            
-            accumulated_context += f"\n\n--- Step {step_index + 1}: {step_name} ---\n{step_output}"
-            if image_urls:
-                accumulated_context += "\n\nGenerated Images:\n" + "\n".join([f"- {url}" for url in image_urls])
+            context_blocks.append(self._format_step_context(step_index, step_output_dict))
+        accumulated_context = "".join(context_blocks)
         
         # Generate final content using job completion service
         final_content, final_artifact_type, final_filename = self._generate_final_content(
@@ -170,6 +167,145 @@ class WorkflowOrchestrator:
         
         return final_content, final_artifact_type, final_filename, report_artifact_id, all_image_artifact_ids
     
+    @staticmethod
+    def _sorted_step_entries(steps: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return (step_index, step) entries ordered by step_order, then workflow index."""
+        return sorted(
+            enumerate(steps),
+            key=lambda entry: (normalize_step_order(entry[1]), entry[0]),
+        )
+    
+    def _execute_sequentially(
+        self,
+        job_id: str,
+        tenant_id: str,
+        initial_context: str,
+        workflow_steps: List[Dict[str, Any]],
+        execution_steps: List[Dict[str, Any]]
+    ) -> List[Tuple[int, Dict[str, Any], List[str]]]:
+        """
+        Execute steps one at a time by step_order (legacy behavior).
+        
+        Returns:
+            List of (step_index, step_output_dict, image_artifact_ids) in step_order
+        """
+        step_outputs: List[Dict[str, Any]] = []
+        step_results = []
+        # Execute by step_order for legacy compatibility, but keep original workflow
+        # indices so dependencies and reruns stay aligned with the persisted steps array.
+        for step_index, step in self._sorted_step_entries(workflow_steps):
+            step_output_dict, image_artifact_ids = self.step_processor.process_step_batch_mode(
+                step=step,
+                step_index=step_index,
+                job_id=job_id,
+                tenant_id=tenant_id,
+                initial_context=initial_context,
+                step_outputs=step_outputs,
+                workflow_steps=workflow_steps,
+                execution_steps=execution_steps,
+                all_image_artifact_ids=[]
+            )
+            step_outputs.append(step_output_dict)
+            step_results.append((step_index, step_output_dict, image_artifact_ids))
+        return step_results
+    
+    def _execute_with_scheduler(
+        self,
+        job_id: str,
+        tenant_id: str,
+        initial_context: str,
+        workflow_steps: List[Dict[str, Any]],
+        execution_steps: List[Dict[str, Any]]
+    ) -> List[Tuple[int, Dict[str, Any], List[str]]]:
+        """
+        Execute steps with the ready-queue scheduler: each step starts as soon as its
+        own dependencies finish, up to max_parallel_steps at a time.
+        
+        All steps share one execution_steps list (no per-step reload) and see the
+        outputs of every step completed before they were dispatched. A failing step
+        does not cancel steps already in flight; execution_steps is persisted once
+        more before the first failure (in step_order) is re-raised.
+        
+        Returns:
+            List of (step_index, step_output_dict, image_artifact_ids) in step_order
+        """
+        # Refresh the shared list in place once; every step appends to it from here on.
+        try:
+            job_with_steps = self.db.get_job(job_id, s3_service=self.s3)
+            if job_with_steps and job_with_steps.get('execution_steps'):
+                execution_steps[:] = job_with_steps['execution_steps']
+        except Exception as e:
+            logger.warning(f"[WorkflowOrchestrator] Failed to reload execution_steps, using provided list: {e}")
+        
+        execution_steps_start = len(execution_steps)
+        
+        def _execute_step(
+            step_index: int,
+            step: Dict[str, Any],
+            completed_results: Dict[int, Tuple[Dict[str, Any], List[str]]]
+        ) -> Tuple[Dict[str, Any], List[str]]:
+            prior_outputs = [
+                completed_results[i][0]
+                for i, _ in self._sorted_step_entries(workflow_steps)
+                if i in completed_results
+            ]
+            return self.step_processor.process_step_batch_mode(
+                step=step,
+                step_index=step_index,
+                job_id=job_id,
+                tenant_id=tenant_id,
+                initial_context=initial_context,
+                step_outputs=prior_outputs,
+                workflow_steps=workflow_steps,
+                execution_steps=execution_steps,
+                all_image_artifact_ids=[],
+                reload_execution_steps=False,
+            )
+        
+        scheduler = ReadyQueueScheduler(workflow_steps, max_workers=self.max_parallel_steps)
+        try:
+            results, schedule_report = scheduler.run(_execute_step)
+        finally:
+            # Steps appended their records in completion order; restore step_order and
+            # persist once so the stored list reflects every executed step.
+            execution_steps[execution_steps_start:] = sorted(
+                execution_steps[execution_steps_start:],
+                key=normalize_step_order,
+            )
+            try:
+                self.db.update_job(job_id, {'execution_steps': execution_steps}, s3_service=self.s3)
+            except Exception as e:
+                logger.warning(f"[WorkflowOrchestrator] Failed to persist execution_steps after scheduling: {e}")
+        
+        logger.info("[WorkflowOrchestrator] Workflow schedule summary", extra={
+            'job_id': job_id,
+            'max_workers': self.max_parallel_steps,
+            **schedule_report.to_dict()
+        })
+        
+        return [
+            (step_index, results[step_index][0], results[step_index][1])
+            for step_index, _ in self._sorted_step_entries(workflow_steps)
+        ]
+    
+    @staticmethod
+    def _format_step_context(step_index: int, step_output_dict: Dict[str, Any]) -> str:
+        """Render one step's output (plus any image URLs) as an accumulated-context block."""
+        step_name = step_output_dict['step_name']
+        step_output = step_output_dict['output']
+        image_urls_raw = step_output_dict.get('image_urls', [])
+
+        def _render() -> str:
+            image_urls = ContextBuilder._collect_step_image_urls(step_output, image_urls_raw)
+            block = f"\n\n--- Step {step_index + 1}: {step_name} ---\n{step_output}"
+            if image_urls:
+                block += "\n\nGenerated Images:\n" + "\n".join([f"- {url}" for url in image_urls])
+            return block
+
+        return get_context_assembler().segment(
+            "accumulated", step_index + 1, step_name, step_output, image_urls_raw, _render
+        ).text
+    
     def _generate_final_content(
         self,
         workflow: Dict[str, Any],
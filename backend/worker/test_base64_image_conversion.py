@@ -69,7 +69,7 @@ def test_base64_image_detection():
         
         # Create mock image handler
         mock_image_handler = Mock()
-        mock_image_handler.upload_base64_image_to_s3 = Mock(return_value="https://example.com/image1.png")
+        mock_image_handler.upload_image_payload = Mock(return_value="https://example.com/image1.png")
         
         client = OpenAIClient()
         
@@ -86,7 +86,7 @@ def test_base64_image_detection():
         
         # Verify images were detected and converted
         assert len(image_urls) == 2, f"Expected 2 image URLs, got {len(image_urls)}"
-        assert mock_image_handler.upload_base64_image_to_s3.call_count == 2, "Expected 2 upload calls"
+        assert mock_image_handler.upload_image_payload.call_count == 2, "Expected 2 upload calls"
         
         # Verify JSON was updated
         updated_data = json.loads(updated_content)
@@ -122,7 +122,7 @@ def test_non_json_content():
         
         assert updated_content == plain_text, "Non-JSON content should be returned unchanged"
         assert len(image_urls) == 0, "No images should be extracted from non-JSON"
-        assert mock_image_handler.upload_base64_image_to_s3.call_count == 0, "No uploads should occur"
+        assert mock_image_handler.upload_image_payload.call_count == 0, "No uploads should occur"
         
         logger.info("✅ Non-JSON content handling test PASSED")
         return True
@@ -150,7 +150,7 @@ def test_json_without_assets():
         )
         
         assert len(image_urls) == 0, "No images should be extracted"
-        assert mock_image_handler.upload_base64_image_to_s3.call_count == 0, "No uploads should occur"
+        assert mock_image_handler.upload_image_payload.call_count == 0, "No uploads should occur"
         
         logger.info("✅ JSON without assets test PASSED")
         return True
@@ -224,7 +224,7 @@ def test_process_api_response_with_base64():
         
         # Create mock image handler
         mock_image_handler = Mock()
-        mock_image_handler.upload_base64_image_to_s3 = Mock(return_value="https://example.com/image.png")
+        mock_image_handler.upload_image_payload = Mock(return_value="https://example.com/image.png")
         
         client = OpenAIClient()
         
@@ -246,7 +246,7 @@ def test_process_api_response_with_base64():
         
         # Verify base64 images were converted
         assert len(response_details["image_urls"]) == 2, "Should have 2 image URLs"
-        assert mock_image_handler.upload_base64_image_to_s3.call_count == 2, "Should upload 2 images"
+        assert mock_image_handler.upload_image_payload.call_count == 2, "Should upload 2 images"
         
         # Verify content was updated
         updated_data = json.loads(content)
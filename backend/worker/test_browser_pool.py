@@ -0,0 +1,204 @@
+"""
+Tests for the warm browser pool shared by CUA and PDF generation.
+"""
+
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.browser_pool import AsyncBrowserPool, BrowserPool  # noqa: E402
+from services.step_scheduler import ReadyQueueScheduler  # noqa: E402
+
+
+class _FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    def new_context(self, **options):
+        if not self.connected:
+            raise RuntimeError("Target page, context or browser has been closed")
+        context = _FakeContext()
+        self.contexts.append(context)
+        return context
+
+    def close(self):
+        self.connected = False
+
+
+class _FakePlaywright:
+    def __init__(self, launched):
+        self.launched = launched
+        self.chromium = self
+
+    def start(self):
+        return self
+
+    def launch(self, **kwargs):
+        browser = _FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+    def stop(self):
+        pass
+
+
+def _pool(launched, **kwargs):
+    return BrowserPool(playwright_factory=lambda: _FakePlaywright(launched), **kwargs)
+
+
+def test_leases_reuse_one_browser_with_fresh_contexts():
+    launched = []
+    pool = _pool(launched, max_uses=10, enabled=True)
+
+    with pool.lease(viewport={"width": 1024, "height": 768}) as first:
+        pass
+    with pool.lease() as second:
+        pass
+
+    assert len(launched) == 1
+    assert (first.reused, second.reused) == (False, True)
+    assert first.context is not second.context and first.context.closed
+    assert launched[0].connected
+    stats = pool.get_stats()
+    assert (stats["launches"], stats["reuses"]) == (1, 1)
+    assert stats["last_launch_ms"] is not None
+
+
+def test_browser_is_recycled_after_max_uses():
+    launched = []
+    pool = _pool(launched, max_uses=2, enabled=True)
+
+    for _ in range(5):
+        pool.lease().close()
+
+    assert len(launched) == 3
+    assert [b.connected for b in launched] == [False, False, True]
+    assert pool.get_stats()["recycled"] == 2
+
+
+def test_crashed_browser_is_replaced():
+    launched = []
+    pool = _pool(launched, max_uses=10, enabled=True)
+    pool.lease().close()
+
+    launched[0].connected = False
+    lease = pool.lease()
+
+    assert len(launched) == 2 and lease.browser is launched[1]
+    assert not lease.reused
+    assert pool.get_stats()["unhealthy"] == 1
+
+
+def test_disabled_pool_launches_per_lease():
+    launched = []
+    pool = _pool(launched, enabled=False)
+
+    pool.lease().close()
+    pool.lease().close()
+
+    assert len(launched) == 2
+    assert not any(b.connected for b in launched)
+
+
+def test_browsers_on_short_lived_threads_close_with_their_lease():
+    launched = []
+    pool = _pool(launched, max_uses=10, enabled=True)
+
+    def _step():
+        with pool.lease():
+            pass
+
+    # Like the step scheduler: a new executor (and new threads) per job
+    for _ in range(3):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda _: _step(), range(2)))
+
+    stats = pool.get_stats()
+    assert stats["launches"] == stats["closed"] == len(launched) == 6
+    assert not any(b.connected for b in launched)
+
+
+def test_scheduled_steps_reuse_browsers_across_jobs():
+    launched = []
+    pool = _pool(launched, max_uses=10, enabled=True)
+    steps = [{"step_name": f"Research {i}", "step_order": i + 1, "depends_on": []} for i in range(2)]
+
+    def _step(step_index, step, completed_results):
+        with pool.lease():
+            pass
+
+    # Each job runs a new scheduler; its worker threads are shared by every job
+    for _ in range(4):
+        ReadyQueueScheduler(steps, max_workers=2).run(_step)
+
+    stats = pool.get_stats()
+    assert stats["leases"] == 8 and stats["launches"] == len(launched) <= 2
+    assert stats["reuses"] == 8 - stats["launches"] and stats["closed"] == 0
+
+
+class _AsyncFakeContext(_FakeContext):
+    async def close(self):
+        _FakeContext.close(self)
+
+
+class _AsyncFakeBrowser(_FakeBrowser):
+    async def new_context(self, **options):
+        context = _AsyncFakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        _FakeBrowser.close(self)
+
+
+class _AsyncFakePlaywright:
+    def __init__(self, launched):
+        self.launched = launched
+        self.chromium = self
+
+    async def start(self):
+        await asyncio.sleep(0.01)
+        return self
+
+    async def launch(self, **kwargs):
+        browser = _AsyncFakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+    async def stop(self):
+        pass
+
+
+def test_async_pool_shares_a_browser_per_event_loop():
+    launched = []
+    pool = AsyncBrowserPool(playwright_factory=lambda: _AsyncFakePlaywright(launched), max_uses=10, enabled=True)
+
+    async def run():
+        leases = await asyncio.gather(*[pool.lease() for _ in range(3)])
+        for lease in leases:
+            await lease.close()
+        return leases
+
+    leases = asyncio.run(run())
+    assert len(launched) == 1
+    assert len({id(lease.context) for lease in leases}) == 3
+
+    # A new event loop cannot drive the old loop's browser
+    asyncio.run(run())
+    assert len(launched) == 2
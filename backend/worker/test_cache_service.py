@@ -0,0 +1,55 @@
+import os
+import sys
+from unittest.mock import patch
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.cache_service import CacheService
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = CacheService(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_byte_budget_evicts_until_within_limit():
+    cache = CacheService(max_size=100, max_bytes=10)
+    cache.set("a", b"1234")
+    cache.set("b", b"5678")
+    cache.set("c", b"90ab")
+
+    stats = cache.get_stats()
+    assert cache.get("a") is None
+    assert stats["bytes"] == 8
+    assert stats["size"] == 2
+
+    # Entries larger than the whole budget are not cached at all
+    cache.set("huge", b"x" * 11)
+    assert cache.get("huge") is None
+    assert cache.get("c") == b"90ab"
+
+
+def test_ttl_uses_monotonic_clock():
+    cache = CacheService(ttl_seconds=10)
+    with patch("services.cache_service.time.monotonic", return_value=100.0):
+        cache.set("a", "value")
+    with patch("services.cache_service.time.monotonic", return_value=109.0):
+        assert cache.get("a") == "value"
+    with patch("services.cache_service.time.monotonic", return_value=110.0):
+        assert cache.get("a") is None
+
+    stats = cache.get_stats()
+    assert stats["expirations"] == 1
+    assert stats["bytes"] == 0
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
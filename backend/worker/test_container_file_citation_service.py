@@ -143,7 +143,7 @@ def test_store_image_artifact_persists_once(monkeypatch):
 
     service = ArtifactService(db_service=db_service, s3_service=s3_service)
 
-    with patch("artifact_service.requests.get", return_value=DummyImageResponse(b"image-bytes")):
+    with patch("artifact_service.http_client.get", return_value=DummyImageResponse(b"image-bytes")):
         artifact_id = service.store_image_artifact(
             tenant_id="tenant",
             job_id="job_123",
@@ -0,0 +1,76 @@
+"""
+Tests for cached context segments used by ContextBuilder.
+"""
+
+import os
+import sys
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.context_assembler import ContextAssembler  # noqa: E402
+from services.context_builder import ContextBuilder  # noqa: E402
+import services.context_builder as context_builder_module  # noqa: E402
+
+
+def _step_outputs(count):
+    return [
+        {
+            "step_index": i,
+            "step_name": f"Step {i + 1}",
+            "output": {"section": i, "body": "research " * 50},
+            "image_urls": [f"https://example.com/{i}.png"],
+        }
+        for i in range(count)
+    ]
+
+
+def test_each_segment_is_rendered_once_across_steps(monkeypatch):
+    assembler = ContextAssembler()
+    monkeypatch.setattr(context_builder_module, "get_context_assembler", lambda: assembler)
+    outputs = _step_outputs(6)
+    steps = [{"step_name": o["step_name"]} for o in outputs]
+
+    # Step k builds its context from every earlier output
+    for k in range(1, len(outputs) + 1):
+        ContextBuilder.build_previous_context_from_step_outputs("form", outputs[:k], steps)
+
+    assert assembler.get_stats()["renders"] == 6
+
+
+def test_segment_text_and_sizes():
+    assembler = ContextAssembler()
+    output = "Summary with chart https://example.com/chart.png"
+    segment = assembler.segment("previous", 2, "Research", output, None, lambda: f"== {output} ==")
+
+    assert segment.text == f"== {output} =="
+    assert segment.byte_size == len(segment.text.encode("utf-8"))
+    assert segment.token_estimate == -(-len(segment.text) // 4)
+
+    # A changed output or step name renders a new segment
+    assert assembler.segment("previous", 2, "Research", output + "!", None, lambda: "new").text == "new"
+    assert assembler.segment("previous", 2, "Renamed", output, None, lambda: "renamed").text == "renamed"
+    assert assembler.segment("previous", 2, "Research", output, None, lambda: "unused").text == f"== {output} =="
+
+
+def test_builders_keep_their_formats():
+    execution_steps = [
+        {"step_order": 1, "step_name": "Research", "step_type": "ai_generation",
+         "output": "Findings https://example.com/a.png", "image_urls": ["https://example.com/b.jpg"]},
+        {"step_order": 2, "step_name": "Report", "step_type": "ai_generation", "output": "Report body"},
+    ]
+
+    previous = ContextBuilder.build_previous_context_from_execution_steps("form", execution_steps, 2)
+    assert previous == (
+        "=== Form Submission ===\nform\n\n"
+        "\n=== Step 1: Research ===\nFindings https://example.com/a.png"
+        "\n\nGenerated Images:\n- https://example.com/a.png\n- https://example.com/b.jpg"
+    )
+
+    html_context = ContextBuilder.build_accumulated_context_for_html("form", execution_steps)
+    assert html_context == (
+        "=== Form Submission ===\nform\n\n"
+        "--- Research ---\nFindings https://example.com/a.png\n\n"
+        "Generated Images:\n- https://example.com/a.png\n- https://example.com/b.jpg\n\n"
+        "--- Report ---\nReport body\n\n"
+    )
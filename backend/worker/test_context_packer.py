@@ -0,0 +1,72 @@
+"""
+Tests for token-budgeted context packing.
+"""
+
+import os
+import sys
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.context_assembler import ContextAssembler  # noqa: E402
+from services.context_packer import ContextPacker  # noqa: E402
+from services.openai.request_builder.params_builder import get_context_token_budget  # noqa: E402
+
+
+def _segment(step_number, body, tool_log="", image_count=0):
+    text = f"\n=== Step {step_number}: Step {step_number} ===\n{body}{tool_log}"
+    if image_count:
+        text += "\n\nGenerated Images:\n" + "\n".join(
+            f"- https://example.com/{step_number}/{i}.png" for i in range(image_count)
+        )
+    return ContextAssembler().segment("previous", step_number, f"Step {step_number}", text, None, lambda: text)
+
+
+def test_within_budget_is_a_plain_join():
+    segments = [_segment(1, "short"), _segment(2, "also short")]
+    result = ContextPacker(budget_tokens=10_000).pack("=== Form Submission ===\nname: Ada", segments)
+
+    assert not result.packed
+    assert result.text == "\n\n".join(["=== Form Submission ===\nname: Ada"] + [s.text for s in segments])
+
+
+def test_low_priority_content_goes_first():
+    segments = [
+        _segment(1, "research " * 200, tool_log="\n\n[Tool output]\n$ ls\n📤 " + "x" * 4000, image_count=30),
+        _segment(2, "report " * 200),
+    ]
+    unpacked_tokens = ContextPacker(budget_tokens=10**9).pack(None, segments).tokens_after
+    # Enough room for both outputs, but not for the tool log or the long image list
+    result = ContextPacker(budget_tokens=unpacked_tokens - 1000).pack(None, segments)
+
+    assert result.actions == ["trimmed_image_lists:1", "dropped_tool_logs:1"]
+    assert "research " * 200 in result.text
+    assert "report " * 200 in result.text
+    assert "20 more images omitted" in result.text
+    assert "$ ls" not in result.text
+    assert result.tokens_after <= result.budget_tokens
+
+
+def test_dependency_outputs_are_shared_fairly_and_never_dropped():
+    small = "summary " * 50
+    segments = [_segment(1, small), _segment(2, "A" * 40_000), _segment(3, "B" * 40_000)]
+    form = "=== Form Submission ===\n" + "answer " * 3000
+
+    result = ContextPacker(budget_tokens=8_000).pack(form, segments)
+
+    assert result.actions == ["truncated_form_echo", "truncated_dependency_outputs:2"]
+    assert small in result.text
+    for step_number in (1, 2, 3):
+        assert f"=== Step {step_number}: Step {step_number} ===" in result.text
+    assert result.text.count("omitted to fit the context budget") == 3
+    assert result.tokens_after <= result.budget_tokens
+    # Deterministic
+    assert ContextPacker(budget_tokens=8_000).pack(form, segments).text == result.text
+
+
+def test_budget_follows_model_window(monkeypatch):
+    monkeypatch.delenv("CONTEXT_TOKEN_BUDGET", raising=False)
+    assert get_context_token_budget("gpt-5.2") == 100_000
+    assert get_context_token_budget("computer-use-preview") == 4_096
+    monkeypatch.setenv("CONTEXT_TOKEN_BUDGET", "0")
+    assert get_context_token_budget("gpt-4o", max_output_tokens=4_000) == 128_000 - 4_000 - 8_000
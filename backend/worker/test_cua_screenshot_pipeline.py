@@ -0,0 +1,107 @@
+"""
+Tests for the CUA screenshot pipeline (dedup, model frames).
+"""
+
+import base64
+import os
+import sys
+from io import BytesIO
+from unittest.mock import Mock
+
+from PIL import Image, ImageDraw
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.cua.screenshot_pipeline import ScreenshotPipeline, perceptual_hash  # noqa: E402
+
+
+def _screenshot(label: str = "", width: int = 320, height: int = 200) -> str:
+    img = Image.new("RGB", (width, height), (240, 240, 240))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((0, 0, width, 30), fill=(30, 60, 120))
+    if label:
+        draw.rectangle((20, 60, 300, 180), fill=(200, 40, 40))
+        draw.text((30, 80), label, fill=(255, 255, 255))
+    output = BytesIO()
+    img.save(output, format="PNG")
+    return base64.b64encode(output.getvalue()).decode("ascii")
+
+
+def _pipeline(handler, **kwargs):
+    options = {"frame_format": "jpeg", "quality": 70, "max_width": 0, "dedup": True, "dedup_distance": 0}
+    options.update(kwargs)
+    return ScreenshotPipeline(handler, "t1", "j1", display_width=320, display_height=200, **options)
+
+
+def test_identical_frames_reuse_the_previous_upload():
+    handler = Mock()
+    handler.enqueue_image_upload.side_effect = ["https://cdn/1.png", "https://cdn/2.png"]
+    pipeline = _pipeline(handler)
+
+    first = pipeline.process(_screenshot())
+    second = pipeline.process(_screenshot())
+    third = pipeline.process(_screenshot("dialog"))
+
+    assert (first.duplicate, second.duplicate, third.duplicate) == (False, True, False)
+    assert second.uploaded_bytes == 0
+    assert [first.url, second.url, third.url] == ["https://cdn/1.png", "https://cdn/1.png", "https://cdn/2.png"]
+    assert handler.enqueue_image_upload.call_count == 2
+    assert pipeline.get_stats()["duplicates"] == 1
+
+
+def _form(typed: str) -> str:
+    img = Image.new("RGB", (1024, 768), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((40, 200, 600, 230), outline=(120, 120, 120))
+    draw.text((48, 210), typed, fill=(0, 0, 0))
+    output = BytesIO()
+    img.save(output, format="PNG")
+    return base64.b64encode(output.getvalue()).decode("ascii")
+
+
+def test_text_typed_into_a_field_is_a_new_frame_by_default():
+    before, after = _form("jane"), _form("janes")
+    hashes = [perceptual_hash(Image.open(BytesIO(base64.b64decode(frame)))) for frame in (before, after)]
+    assert hashes[0] == hashes[1]  # too small a change for the perceptual hash
+
+    handler = Mock()
+    handler.enqueue_image_upload.side_effect = ["https://cdn/1.png", "https://cdn/2.png"]
+    pipeline = ScreenshotPipeline(handler, "t1", "j1", display_width=1024, display_height=768)
+
+    first, second = pipeline.process(before), pipeline.process(after)
+
+    assert first.url == "https://cdn/1.png"
+    assert not second.duplicate and second.url == "https://cdn/2.png"
+    assert handler.enqueue_image_upload.call_count == 2
+
+    # Opt-in perceptual dedup folds it
+    perceptual = ScreenshotPipeline(Mock(), "t1", "j1", display_width=1024, display_height=768, perceptual=True)
+    perceptual.process(before)
+    assert perceptual.process(after).duplicate
+
+
+def test_model_frame_is_reencoded_and_counted():
+    pipeline = _pipeline(Mock(), frame_format="jpeg")
+
+    frame = pipeline.process(_screenshot("hello"))
+
+    assert frame.model_image_url.startswith("data:image/jpeg;base64,")
+    encoded = base64.b64decode(frame.model_image_url.split(",", 1)[1])
+    assert len(encoded) == frame.model_bytes
+    assert frame.raw_bytes > 0 and frame.uploaded_bytes == frame.raw_bytes
+
+
+def test_downscaled_frames_scale_tools_and_actions_back():
+    pipeline = _pipeline(Mock(), max_width=160)
+
+    frame = pipeline.process(_screenshot("x"))
+    tools = pipeline.model_tools([{"type": "computer_use_preview", "display_width": 320, "display_height": 200}])
+    action = pipeline.scale_action({"type": "drag", "path": [{"x": 10, "y": 20}, {"x": 50, "y": 60}]})
+
+    assert Image.open(BytesIO(base64.b64decode(frame.model_image_url.split(",", 1)[1]))).size == (160, 100)
+    assert (tools[0]["display_width"], tools[0]["display_height"]) == (160, 100)
+    assert action["path"] == [{"x": 20, "y": 40}, {"x": 100, "y": 120}]
+    assert pipeline.scale_action({"type": "click", "x": 5, "y": 7, "button": "left"}) == {
+        "type": "click", "x": 10, "y": 14, "button": "left"}
+
@@ -0,0 +1,151 @@
+"""
+Tests for the adaptive settle-wait after CUA actions.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.cua.settle import (  # noqa: E402
+    NetworkActivity,
+    PageQuiescence,
+    SettleResult,
+    settle_after_action,
+    settle_budget_ms,
+    wait_for_stable_frame,
+)
+from services.cua_loop_service import CUALoopConfig, CUALoopRunner  # noqa: E402
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_budgets_follow_action_type_and_cap():
+    assert settle_budget_ms("navigate") == 3000
+    assert settle_budget_ms("scroll") == 800
+    assert settle_budget_ms("wait") == 0
+    assert settle_budget_ms("something_new") == 1000
+
+
+def test_page_settles_after_quiet_window_without_requests():
+    clock = _Clock()
+    network = NetworkActivity(clock)
+    quiescence = PageQuiescence(network, budget_ms=1500, quiet_ms=300, clock=clock)
+
+    network._on_start(None)
+    clock.sleep(0.2)
+    assert not quiescence.poll(5000.0)  # request in flight
+    network._on_end(None)
+    clock.sleep(0.1)
+    assert not quiescence.poll(5000.0)  # network went quiet 100 ms ago
+    clock.sleep(0.1)
+    assert not quiescence.poll(50.0)  # DOM mutated 50 ms ago
+    clock.sleep(0.3)
+    assert quiescence.poll(350.0)
+    assert round(quiescence.result(True).elapsed_ms) == 700
+
+
+def test_frame_diff_waits_for_a_quiet_window():
+    clock = _Clock()
+    # The pre-action frame repeats before the click's repaint shows up
+    frames = iter(["before", "before", "before", "after"] + ["after"] * 100)
+
+    result = wait_for_stable_frame(lambda: next(frames), budget_ms=1000, quiet_ms=180,
+                                   sleep_fn=clock.sleep, clock=clock)
+
+    assert (result.settled, result.method, result.screenshot_b64) == (True, "frame_diff", "after")
+    # "after" first seen at 150 ms, then unchanged for the next 4 polls (>= 180 ms)
+    assert round(result.elapsed_ms) == 350
+
+
+def test_frame_diff_needs_repeated_polls_even_without_quiet_window():
+    clock = _Clock()
+    frames = iter(["before", "before", "after", "after", "after", "never"])
+
+    result = wait_for_stable_frame(lambda: next(frames), budget_ms=1000, quiet_ms=0,
+                                   sleep_fn=clock.sleep, clock=clock)
+
+    assert result.screenshot_b64 == "after" and round(result.elapsed_ms) == 200
+
+
+def test_frame_diff_gives_up_at_budget():
+    clock = _Clock()
+    counter = iter(range(1000))
+
+    result = wait_for_stable_frame(lambda: str(next(counter)), budget_ms=200, sleep_fn=clock.sleep, clock=clock)
+
+    assert not result.settled and 200 <= round(result.elapsed_ms) <= 250
+
+
+def test_drivers_without_settle_detection_get_a_fixed_wait():
+    sleeps = []
+    result = settle_after_action(Mock(), "scroll", sleep_fn=sleeps.append)
+
+    assert result.method == "fixed"
+    assert len(sleeps) == 1 and 0.7 < sleeps[0] <= 0.8
+
+
+class _FrameDiffBrowser:
+    def __init__(self):
+        self.captures = 0
+
+    def initialize(self, **kwargs):
+        pass
+
+    def navigate(self, url):
+        pass
+
+    def execute_action(self, action):
+        pass
+
+    def wait_for_settle(self, action_type, budget_ms):
+        return SettleResult(True, 120.0, "frame_diff", "c2V0dGxlZA==")
+
+    def capture_screenshot(self):
+        self.captures += 1
+        return "ZnJlc2g="
+
+    def get_current_url(self):
+        return None
+
+    def cleanup(self):
+        pass
+
+
+def test_runner_uses_settled_frame_instead_of_sleeping():
+    click = SimpleNamespace(type="computer_call", call_id="call_1", action={"type": "click", "x": 1, "y": 2},
+                            pending_safety_checks=[])
+    openai_client = Mock()
+    openai_client.make_api_call.side_effect = [
+        SimpleNamespace(id="resp_1", output=[click], output_text=""),
+        SimpleNamespace(id="resp_2", output=[], output_text="done"),
+    ]
+    image_handler = Mock()
+    image_handler.enqueue_image_upload.return_value = "https://cdn.example.com/s.png"
+    browser = _FrameDiffBrowser()
+    sleep_fn = Mock()
+    runner = CUALoopRunner(openai_client, browser, image_handler, time_provider=lambda: 0.0, sleep_fn=sleep_fn)
+
+    report, screenshots, _ = runner.run(CUALoopConfig(
+        model="computer-use-preview", instructions="", input_text="go", tools=[{"type": "computer_use_preview"}],
+        tool_choice="auto", params={"model": "computer-use-preview"}, max_iterations=3, max_duration_seconds=60,
+        tenant_id="t1", job_id="j1",
+        display_width=1024, display_height=768,
+    ))
+
+    assert report == "done" and screenshots == ["https://cdn.example.com/s.png"]
+    assert browser.captures == 0
+    sleep_fn.assert_not_called()
+    assert image_handler.enqueue_image_upload.call_args.args[0] == "c2V0dGxlZA=="
@@ -0,0 +1,68 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.cache_service import CacheService
+from services.data_loader_service import DataLoaderService
+
+
+def _db():
+    db = MagicMock()
+    db.get_job.return_value = {"job_id": "job_1", "workflow_id": "wf_1", "submission_id": "sub_1"}
+    db.get_workflow.return_value = {"workflow_id": "wf_1", "version": 3, "updated_at": "t1", "steps": []}
+    db.get_workflow_validator.return_value = {"version": 3, "updated_at": "t1"}
+    db.get_submission.return_value = {"submission_id": "sub_1", "form_id": "form_1"}
+    db.get_form.return_value = {"form_id": "form_1", "updated_at": "t1"}
+    db.get_form_validator.return_value = {"updated_at": "t1"}
+    return db
+
+
+def test_repeated_step_loads_read_workflow_once():
+    db = _db()
+    cache = CacheService()
+
+    for _ in range(10):
+        data = DataLoaderService(db, cache=cache, revalidate_seconds=3600).load_job_data("job_1")
+        data["workflow"]["steps"].append("mutated by caller")
+
+    assert db.get_job.call_count == 10
+    assert db.get_workflow.call_count == 1
+    assert db.get_submission.call_count == 1
+    assert db.get_form.call_count == 1
+    # Callers get private copies
+    assert data["workflow"]["steps"] == ["mutated by caller"]
+
+
+def test_stale_entry_is_revalidated_and_reloaded_on_change():
+    db = _db()
+    loader = DataLoaderService(db, cache=CacheService(), revalidate_seconds=0)
+
+    loader.get_workflow("wf_1")
+    loader.get_workflow("wf_1")
+    assert db.get_workflow.call_count == 1
+    assert db.get_workflow_validator.call_count == 1
+
+    db.get_workflow_validator.return_value = {"version": 4, "updated_at": "t2"}
+    db.get_workflow.return_value = {"workflow_id": "wf_1", "version": 4, "updated_at": "t2"}
+    assert loader.get_workflow("wf_1")["version"] == 4
+    assert db.get_workflow.call_count == 2
+
+
+def test_new_job_revalidates_within_the_ttl():
+    db = _db()
+    cache = CacheService()
+    DataLoaderService(db, cache=cache, revalidate_seconds=3600).load_job_data("job_1")
+
+    # Workflow edited right before the next job starts
+    db.get_workflow_validator.return_value = {"version": 4, "updated_at": "t2"}
+    db.get_workflow.return_value = {"workflow_id": "wf_1", "version": 4, "updated_at": "t2", "steps": []}
+    db.get_job.return_value = {"job_id": "job_2", "workflow_id": "wf_1", "submission_id": "sub_1"}
+    data = DataLoaderService(db, cache=cache, revalidate_seconds=3600).load_job_data("job_2")
+
+    assert data["workflow"]["version"] == 4
+    assert db.get_workflow_validator.call_count == 1
+    assert db.get_form_validator.call_count == 1
+
@@ -0,0 +1,125 @@
+"""
+Tests for the persistent docker exec session used by the Docker VM driver.
+
+A fake `docker` script runs the exec'd command locally, so the real framing protocol
+is exercised without Docker.
+"""
+
+import os
+import stat
+import subprocess
+import sys
+
+import pytest
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.cua.drivers.docker_exec_session import (  # noqa: E402
+    DockerExecSession,
+    DockerExecSessionTimeout,
+)
+from services.cua.drivers.docker_vm import DockerVMController  # noqa: E402
+
+FAKE_DOCKER = """#!/bin/sh
+echo "$@" >> "{log}"
+[ "$1" = exec ] || exit 0
+shift
+while [ "$1" != cua-test ]; do shift; done
+shift
+exec "$@"
+"""
+
+
+def test_session_returns_binary_output_and_exit_codes():
+    session = DockerExecSession(["sh", "-s"])
+    session.start()
+    try:
+        binary = session.run("printf 'a\\000\\377b'; echo oops >&2; exit 3")
+        chained = session.run("echo one && echo two")
+    finally:
+        session.close()
+
+    assert (binary.returncode, binary.stdout, binary.stderr) == (3, b"a\x00\xffb", b"oops\n")
+    assert chained.stdout == b"one\ntwo\n"
+    assert session.requests == 2
+
+
+def test_session_timeout_kills_the_shell():
+    session = DockerExecSession(["sh", "-s"])
+    session.start()
+
+    with pytest.raises(DockerExecSessionTimeout):
+        session.run("sleep 5", timeout=0.2)
+    assert not session.alive
+    session.close()
+
+
+def _controller(tmp_path, monkeypatch, persistent):
+    log = tmp_path / "docker_calls.log"
+    docker = tmp_path / "docker"
+    docker.write_text(FAKE_DOCKER.format(log=log))
+    docker.chmod(docker.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("CUA_DOCKER_BIN", str(docker))
+    monkeypatch.setenv("CUA_DOCKER_XDOTOOL_CMD", "true")
+    monkeypatch.setenv("CUA_DOCKER_SCREENSHOT_CMD", "printf '\\211PNG\\000'")
+    monkeypatch.setenv("CUA_DOCKER_PERSISTENT_EXEC", "true" if persistent else "false")
+    controller = DockerVMController(container_name="cua-test")
+    controller._is_initialized = True
+    return controller, log
+
+
+def _exec_count(log):
+    return sum(1 for line in log.read_bytes().splitlines() if line.startswith(b"exec"))
+
+
+def test_controller_reuses_one_exec_for_actions_and_screenshots(tmp_path, monkeypatch):
+    controller, log = _controller(tmp_path, monkeypatch, persistent=True)
+
+    controller.execute_action({"type": "navigate", "url": "https://example.com"})
+    controller.execute_action({"type": "click", "x": 10, "y": 20})
+    frame = controller.capture_screenshot_bytes()
+    controller.cleanup()
+
+    assert frame == b"\x89PNG\x00"
+    assert _exec_count(log) == 1
+
+
+def test_controller_without_session_execs_per_call(tmp_path, monkeypatch):
+    controller, log = _controller(tmp_path, monkeypatch, persistent=False)
+
+    controller.execute_action({"type": "navigate", "url": "https://example.com"})
+    controller.execute_action({"type": "click", "x": 10, "y": 20})
+    frame = controller.capture_screenshot_bytes()
+
+    assert frame == b"\x89PNG\x00"
+    assert _exec_count(log) == 3  # navigate's three xdotool calls are still batched
+
+
+def test_failed_command_raises_like_one_shot_exec(tmp_path, monkeypatch):
+    controller, _ = _controller(tmp_path, monkeypatch, persistent=True)
+    controller.xdotool_cmd = "false"
+
+    with pytest.raises(subprocess.CalledProcessError):
+        controller.execute_action({"type": "click", "x": 1, "y": 1})
+    controller.cleanup()
+
+
+def test_command_is_not_rerun_when_the_session_dies_after_sending_it(tmp_path, monkeypatch):
+    controller, log = _controller(tmp_path, monkeypatch, persistent=True)
+    controller.execute_action({"type": "click", "x": 1, "y": 1})
+    typed, xdotool = tmp_path / "typed", tmp_path / "xdotool"
+    # Runs, then kills the session shell before the response is written
+    xdotool.write_text(f"#!/bin/sh\necho x >> {typed}\nkill -9 {controller._session._process.pid}\n")
+    xdotool.chmod(xdotool.stat().st_mode | stat.S_IEXEC)
+    controller.xdotool_cmd = str(xdotool)
+
+    with pytest.raises(subprocess.SubprocessError):
+        controller.execute_action({"type": "type", "text": "hello"})
+    assert typed.read_text() == "x\n"
+
+    # The next command opens a new session
+    controller.xdotool_cmd = "true"
+    controller.execute_action({"type": "click", "x": 1, "y": 1})
+    controller.cleanup()
+    assert _exec_count(log) == 2
@@ -0,0 +1,133 @@
+"""
+Tests for incremental execution_steps storage (per-entry objects + manifest).
+"""
+
+import json
+import os
+import sys
+import uuid
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.execution_steps_store import ExecutionStepsStore  # noqa: E402
+
+
+class FakeS3:
+    """In-memory stand-in for the S3Service methods the store uses."""
+
+    def __init__(self):
+        self.objects = {}
+        self.puts = []
+        self.gets = []
+
+    def put_bytes(self, key, body, content_type="application/json"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.objects[key] = (body, f'"{uuid.uuid4().hex}"')
+        self.puts.append(key)
+        return self.objects[key][1]
+
+    def download_bytes(self, key):
+        self.gets.append(key)
+        entry = self.objects.get(key)
+        return entry[0] if entry else None
+
+    def get_etag(self, key):
+        entry = self.objects.get(key)
+        return entry[1] if entry else None
+
+    def head_object(self, key):
+        entry = self.objects.get(key)
+        return {"etag": entry[1], "size": len(entry[0])} if entry else None
+
+    def download_range(self, key, start, end=None):
+        self.gets.append(key)
+        body = self.objects[key][0]
+        return body[start:None if end is None else end + 1]
+
+    def upload_stream(self, key, content, content_type="application/octet-stream"):
+        body = b"".join(c.encode("utf-8") if isinstance(c, str) else bytes(c) for c in content)
+        return self.put_bytes(key, body, content_type), len(body)
+
+
+def _steps(count):
+    return [
+        {"step_name": f"Step {i}", "step_order": i, "step_type": "ai_generation", "output": "x" * 100}
+        for i in range(1, count + 1)
+    ]
+
+
+def test_write_uploads_only_changed_entries():
+    s3 = FakeS3()
+    store = ExecutionStepsStore(compact_interval_seconds=3600)
+
+    store.write(s3, "job_1", "tenant_1", _steps(3))
+    s3.puts.clear()
+
+    store.write(s3, "job_1", "tenant_1", _steps(4))
+
+    entry_puts = [k for k in s3.puts if "/execution_steps/0" in k]
+    assert entry_puts == ["tenant_1/jobs/job_1/execution_steps/00003-" + entry_puts[0].split("-", 1)[1]]
+    assert "tenant_1/jobs/job_1/execution_steps/manifest.json" in s3.puts
+    # Within the compaction interval the full blob is not rewritten
+    assert "tenant_1/jobs/job_1/execution_steps.json" not in s3.puts
+    assert store.stats["entries_unchanged"] == 3
+
+
+def test_flush_writes_legacy_compatible_blob():
+    s3 = FakeS3()
+    store = ExecutionStepsStore(compact_interval_seconds=3600)
+    store.write(s3, "job_1", "tenant_1", _steps(2))
+    store.write(s3, "job_1", "tenant_1", _steps(3))
+
+    assert store.flush("job_1") is True
+    blob = s3.objects["tenant_1/jobs/job_1/execution_steps.json"][0]
+    assert blob.decode("utf-8") == json.dumps(_steps(3), default=str)
+    assert store.flush("job_1") is False
+
+
+def test_read_loads_only_requested_step_orders():
+    s3 = FakeS3()
+    ExecutionStepsStore(compact_interval_seconds=0).write(s3, "job_1", "tenant_1", _steps(5))
+
+    # Fresh store (new process): nothing cached in memory
+    reader = ExecutionStepsStore()
+    s3.gets.clear()
+    steps = reader.read(s3, "tenant_1/jobs/job_1/execution_steps/manifest.json", step_orders=[2, 4])
+
+    assert [s["step_order"] for s in steps] == [2, 4]
+    entry_gets = [k for k in s3.gets if not k.endswith("manifest.json")]
+    assert len(entry_gets) == 2
+
+
+def test_read_defers_to_externally_edited_blob():
+    s3 = FakeS3()
+    store = ExecutionStepsStore(compact_interval_seconds=0)
+    store.write(s3, "job_1", "tenant_1", _steps(2))
+
+    # Simulate an API-side edit of the compacted blob
+    s3.put_bytes("tenant_1/jobs/job_1/execution_steps.json", json.dumps(_steps(1)))
+
+    assert store.read(s3, "tenant_1/jobs/job_1/execution_steps/manifest.json") is None
+
+
+def test_view_of_dependencies_merges_back_into_full_list():
+    s3 = FakeS3()
+    ExecutionStepsStore(compact_interval_seconds=0).write(s3, "job_1", "tenant_1", _steps(4))
+
+    # New process loads only the step it depends on, then appends its own result
+    store = ExecutionStepsStore(compact_interval_seconds=0)
+    s3.gets.clear()
+    view = store.read(s3, "tenant_1/jobs/job_1/execution_steps/manifest.json", step_orders=[2])
+    assert [s["step_order"] for s in view] == [2]
+    view.append({"step_name": "Step 5", "step_order": 5, "step_type": "ai_generation", "output": "new"})
+    store.write(s3, "job_1", "tenant_1", view, compact=True)
+
+    expected = _steps(4) + [{"step_name": "Step 5", "step_order": 5, "step_type": "ai_generation", "output": "new"}]
+    blob = s3.objects["tenant_1/jobs/job_1/execution_steps.json"][0]
+    assert blob.decode("utf-8") == json.dumps(expected, default=str)
+    # The compacted blob was spliced, not rebuilt from every earlier entry
+    entry_gets = [k for k in s3.gets if "/execution_steps/0" in k]
+    assert entry_gets == [k for k in entry_gets if k.split("/")[-1].startswith("00001-")]
+    assert ExecutionStepsStore().read(s3, "tenant_1/jobs/job_1/execution_steps/manifest.json") == expected
@@ -14,7 +14,7 @@ sys.path.insert(0, str(worker_dir))
 from services.steps.handlers.handoff import HandoffStepHandler
 
 
-@patch("services.steps.handlers.handoff.requests.post")
+@patch("services.steps.handlers.handoff.http_client.post")
 def test_handoff_step_triggers_destination_workflow(mock_post):
     db = Mock()
     s3 = Mock()
@@ -78,7 +78,7 @@ def test_handoff_step_triggers_destination_workflow(mock_post):
     assert called_json["submission_data"]["input"] == "previous output"
 
 
-@patch("services.steps.handlers.handoff.requests.post")
+@patch("services.steps.handlers.handoff.http_client.post")
 def test_handoff_step_uses_deliverable_output_mode(mock_post):
     db = Mock()
     s3 = Mock()
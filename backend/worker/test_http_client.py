@@ -0,0 +1,110 @@
+"""
+Tests for the pooled HTTP client used for webhooks, SMS and image downloads.
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.http_client import HttpSessionManager  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    statuses = []
+    retry_after = None
+    hits = 0
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        type(self).hits += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = b"ok"
+        self.send_response(status)
+        if status == 429 and self.retry_after:
+            self.send_header("Retry-After", self.retry_after)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=abc; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_repeat_requests_reuse_the_pooled_connection():
+    server, base_url = _serve()
+    try:
+        manager = HttpSessionManager(max_retries=0)
+        for _ in range(3):
+            assert manager.get(f"{base_url}/ping", timeout=5).status_code == 200
+        manager.post(f"{base_url}/hook", json={"a": 1}, timeout=5)
+
+        stats = manager.get_stats()[f"127.0.0.1:{server.server_address[1]}"]
+        assert stats["requests"] == 4
+        assert stats["new_connections"] == 1
+        assert stats["reused_connections"] == 3
+        # Cookies from one endpoint are never replayed to the next
+        assert len(manager.session.cookies) == 0
+    finally:
+        server.shutdown()
+
+
+def test_retryable_status_is_retried_for_get_but_not_post():
+    server, base_url = _serve()
+    try:
+        manager = HttpSessionManager(max_retries=2, backoff_factor=0)
+        _Handler.statuses = [503]
+        assert manager.get(f"{base_url}/image.png", timeout=5).status_code == 200
+
+        _Handler.statuses = [503]
+        assert manager.post(f"{base_url}/hook", json={}, timeout=5).status_code == 503
+    finally:
+        _Handler.statuses = []
+        server.shutdown()
+
+
+def test_single_attempt_requests_skip_transport_retries():
+    server, base_url = _serve()
+    try:
+        manager = HttpSessionManager(max_retries=2, backoff_factor=0)
+        _Handler.hits = 0
+        _Handler.statuses = [503, 503, 503]
+
+        assert manager.get(f"{base_url}/image.png", timeout=5, retries=False).status_code == 503
+        assert _Handler.hits == 1
+    finally:
+        _Handler.statuses = []
+        server.shutdown()
+
+
+def test_retry_after_sleep_is_capped():
+    server, base_url = _serve()
+    try:
+        manager = HttpSessionManager(max_retries=1, backoff_factor=0, max_retry_after=1)
+        _Handler.retry_after = "30"
+        _Handler.statuses = [429]
+
+        started = time.monotonic()
+        assert manager.get(f"{base_url}/image.png", timeout=5).status_code == 200
+        assert time.monotonic() - started < 5
+    finally:
+        _Handler.statuses = []
+        _Handler.retry_after = None
+        server.shutdown()
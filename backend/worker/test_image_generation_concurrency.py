@@ -0,0 +1,105 @@
+"""
+Tests for concurrent Images API generation and streamed image artifacts.
+"""
+
+import base64
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.ai.image_generator import (  # noqa: E402
+    ImageGenerationConfig,
+    ImagePlanItem,
+    ImagesApiRunner,
+    TenantConcurrencyLimiter,
+)
+from services.image_artifact_service import ImageArtifactService  # noqa: E402
+
+CONFIG = ImageGenerationConfig(size="auto", quality="auto", background=None, output_format=None, output_compression=None)
+
+
+class _SlowImagesClient:
+    def __init__(self, delays):
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate_images(self, *, prompt, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delays[prompt])
+        with self._lock:
+            self.in_flight -= 1
+        return SimpleNamespace(data=[SimpleNamespace(b64_json=base64.b64encode(prompt.encode()).decode())])
+
+
+def _runner(client, limit=6):
+    image_handler = Mock()
+    image_handler.upload_image_payload.side_effect = (
+        lambda payload, **kwargs: f"https://cdn.example.com/{payload.data.decode()}.png"
+    )
+    return ImagesApiRunner(client, image_handler, max_concurrency=6, tenant_limiter=TenantConcurrencyLimiter(limit))
+
+
+def _generate(runner, plan, **kwargs):
+    return runner.generate_images(
+        image_model="gpt-image-1.5",
+        plan=plan,
+        config=CONFIG,
+        tenant_id="tenant_1",
+        job_id="job_1",
+        full_context="",
+        step_name="Images",
+        step_instructions="",
+        **kwargs,
+    )
+
+
+def test_plan_takes_about_the_slowest_image_and_keeps_plan_order():
+    delays = {f"p{i}": 0.3 - i * 0.04 for i in range(6)}
+    plan = [ImagePlanItem(label=f"image {i}", prompt=f"p{i}") for i in range(6)]
+    client = _SlowImagesClient(delays)
+    streamed = []
+
+    started = time.perf_counter()
+    image_urls, images_output = _generate(_runner(client), plan, on_image=streamed.append)
+    elapsed = time.perf_counter() - started
+
+    expected = [f"https://cdn.example.com/p{i}.png" for i in range(6)]
+    assert elapsed < 0.6
+    assert image_urls == expected
+    assert streamed == expected
+    assert [item["label"] for item in images_output] == [f"image {i}" for i in range(6)]
+
+
+def test_tenant_limiter_bounds_in_flight_requests():
+    plan = [ImagePlanItem(label=f"image {i}", prompt=f"p{i}") for i in range(6)]
+    client = _SlowImagesClient({f"p{i}": 0.05 for i in range(6)})
+
+    image_urls, _ = _generate(_runner(client, limit=2), plan)
+
+    assert len(image_urls) == 6
+    assert client.max_in_flight == 2
+
+
+def test_artifact_stream_stores_each_image_once():
+    artifact_service = Mock()
+    artifact_service.store_image_artifact.side_effect = lambda image_url, **kwargs: f"art_{image_url[-6:-4]}"
+    stream = ImageArtifactService(artifact_service).open_stream(
+        tenant_id="tenant_1", job_id="job_1", step_index=0, step_name="Images"
+    )
+
+    stream.add("https://cdn.example.com/i1.png")
+    stream.add("https://cdn.example.com/i2.png")
+    ids = stream.finish(["https://cdn.example.com/i1.png", "https://cdn.example.com/i2.png", "https://cdn.example.com/i3.png"])
+
+    assert ids == ["art_i1", "art_i2", "art_i3"]
+    assert artifact_service.store_image_artifact.call_count == 3
@@ -0,0 +1,83 @@
+"""
+Tests for image optimization presets, fast paths and the worker process pool.
+"""
+
+import os
+import sys
+from io import BytesIO
+
+import pytest
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.images import processing  # noqa: E402
+from utils.images.processing import PIL_AVAILABLE, optimize_image  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not PIL_AVAILABLE, reason="Pillow not installed")
+
+
+def _image(fmt, width, height, noise=False, **save_kwargs):
+    from PIL import Image
+
+    if noise:
+        img = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    else:
+        img = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    output = BytesIO()
+    img.save(output, format=fmt, **save_kwargs)
+    return output.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def inline_optimizer(monkeypatch):
+    monkeypatch.setattr(processing, "IMAGE_OPTIMIZE_WORKERS", 0)
+
+
+def test_compressed_jpeg_within_limits_is_returned_untouched():
+    original = _image("JPEG", 800, 600, quality=80)
+    before = processing.get_optimization_stats()
+
+    data, content_type = optimize_image(original, "image/jpeg")
+
+    assert data is original and content_type == "image/jpeg"
+    assert processing.get_optimization_stats()["skipped"] == before["skipped"] + 1
+
+
+@pytest.mark.parametrize("preset", sorted(processing.OPTIMIZE_PRESETS))
+def test_wide_jpeg_is_downscaled_with_each_preset(preset):
+    from PIL import Image
+
+    original = _image("JPEG", 4096, 1024, quality=95)
+
+    data, content_type = optimize_image(original, "image/jpeg", preset=preset)
+
+    assert content_type == "image/jpeg"
+    assert Image.open(BytesIO(data)).size == (processing.MAX_IMAGE_WIDTH_PX, 512)
+    assert len(data) < len(original)
+
+
+def test_reencode_that_does_not_shrink_keeps_original():
+    original = _image("PNG", 512, 512, optimize=True)
+
+    data, content_type = optimize_image(original, "image/png", preset="small")
+
+    assert data is original and content_type == "image/png"
+
+
+def test_large_images_use_the_process_pool(monkeypatch):
+    monkeypatch.setattr(processing, "IMAGE_OPTIMIZE_WORKERS", 1)
+    monkeypatch.setattr(processing, "POOL_MIN_BYTES", 0)
+    before = processing.get_optimization_stats()
+    try:
+        data, content_type = optimize_image(_image("PNG", 3000, 200), "image/png")
+    finally:
+        if processing._pool is not None:
+            processing._pool.shutdown()
+            processing._pool = None
+
+    stats = processing.get_optimization_stats()
+    if processing._pool_disabled:
+        pytest.skip("multiprocessing unavailable in this environment")
+    assert stats["pooled"] == before["pooled"] + 1
+    assert content_type == "image/png" and data[:8] == b"\x89PNG\r\n\x1a\n"
@@ -0,0 +1,90 @@
+"""
+Tests for decoded image payloads on the generation -> naming -> S3 upload path.
+"""
+
+import base64
+import json
+import os
+import sys
+from io import BytesIO
+from unittest.mock import Mock
+
+import pytest
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.image_handler import ImageHandler  # noqa: E402
+from utils.images.payload import ImagePayload  # noqa: E402
+from utils.images.processing import PIL_AVAILABLE  # noqa: E402
+
+
+def _png(width=64, height=64):
+    from PIL import Image
+
+    output = BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 40)).save(output, format="PNG")
+    return output.getvalue()
+
+
+def test_from_base64_handles_data_urls_and_missing_padding():
+    raw = b"\x89PNG fake image bytes"
+    encoded = base64.b64encode(raw).decode()
+
+    payload = ImagePayload.from_base64(f"data:image/webp;base64,{encoded}")
+    assert payload.data == raw
+    assert (payload.content_type, payload.extension) == ("image/webp", "webp")
+    assert ImagePayload.from_base64(encoded.rstrip("=")).data == raw
+    assert bytes(payload.view) == raw
+
+
+@pytest.mark.skipif(not PIL_AVAILABLE, reason="Pillow not installed")
+def test_naming_data_url_is_a_small_thumbnail():
+    from PIL import Image
+
+    payload = ImagePayload(_png(1600, 900))
+    header, _, body = payload.naming_data_url().partition(",")
+
+    assert header == "data:image/jpeg;base64"
+    assert max(Image.open(BytesIO(base64.b64decode(body))).size) == 512
+
+
+def test_upload_decodes_once_and_uploads_same_bytes():
+    s3_service = Mock()
+    s3_service.upload_image.return_value = ("s3://bucket/key", "https://cdn.example.com/key.png")
+    handler = ImageHandler(s3_service)
+    payload = ImagePayload(b"image bytes", "image/png")
+
+    url = handler.upload_image_payload(payload, tenant_id="t1", job_id="j1", filename="hero.png")
+
+    assert url == "https://cdn.example.com/key.png"
+    kwargs = s3_service.upload_image.call_args.kwargs
+    assert kwargs["image_data"] is payload.data
+    assert kwargs["key"] == "t1/jobs/j1/hero.png"
+
+
+@pytest.mark.skipif(not PIL_AVAILABLE, reason="Pillow not installed")
+def test_response_base64_assets_are_optimized_before_upload():
+    from PIL import Image
+
+    from services.openai_response_service import OpenAIResponseService
+
+    output = BytesIO()
+    Image.frombytes("RGB", (1024, 1024), os.urandom(1024 * 1024 * 3)).save(output, format="PNG")
+    content = json.dumps({"assets": [{
+        "name": "cover.png",
+        "content_type": "image/png",
+        "encoding": "base64",
+        "data": base64.b64encode(output.getvalue()).decode("ascii"),
+    }]})
+    handler = Mock()
+    handler.upload_image_payload.return_value = "https://cdn.example.com/cover.jpg"
+
+    updated, urls = OpenAIResponseService._extract_and_convert_base64_images(content, handler, "t1", "j1")
+
+    # Large opaque PNGs are re-encoded as JPEG; the asset and filename follow
+    payload = handler.upload_image_payload.call_args.args[0]
+    assert payload.content_type == "image/jpeg" and payload.size < len(output.getvalue())
+    assert handler.upload_image_payload.call_args.kwargs["filename"] == "cover.jpg"
+    assert urls == ["https://cdn.example.com/cover.jpg"]
+    assert json.loads(updated)["assets"][0]["content_type"] == "image/jpeg"
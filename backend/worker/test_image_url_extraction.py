@@ -0,0 +1,60 @@
+"""
+Tests for the single-pass image URL scanner and its memo.
+"""
+
+import os
+import sys
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.images import extraction  # noqa: E402
+from utils.images.extraction import extract_image_urls, extract_image_urls_from_object  # noqa: E402
+
+
+def test_matches_are_cleaned_validated_and_deduplicated_in_order():
+    text = (
+        "Hero: https://cdn.example.com/hero.PNG?w=1200). "
+        "Again https://cdn.example.com/hero.PNG?w=1200, "
+        "doc https://example.com/report.pdf and ![x](https://example.com/a.webp))"
+    )
+    assert extract_image_urls(text) == [
+        "https://cdn.example.com/hero.PNG?w=1200",
+        "https://example.com/a.webp",
+    ]
+    assert extract_image_urls("no links here") == []
+
+
+def test_large_outputs_are_scanned_once(monkeypatch):
+    extraction._url_memo.clear()
+    scans = []
+    original_scan = extraction._scan_image_urls
+
+    def counting_scan(text):
+        scans.append(len(text))
+        return original_scan(text)
+
+    monkeypatch.setattr(extraction, "_scan_image_urls", counting_scan)
+    output = "# Report\n" + ("lorem ipsum " * 200) + "https://example.com/chart.png\n"
+
+    for _ in range(3):
+        assert extract_image_urls(output) == ["https://example.com/chart.png"]
+    # Equal text from a fresh object (e.g. reloaded from S3) also hits the memo
+    assert extract_image_urls("".join(list(output))) == ["https://example.com/chart.png"]
+
+    assert len(scans) == 1
+    # Callers get their own list
+    extract_image_urls(output).append("mutated")
+    assert extract_image_urls(output) == ["https://example.com/chart.png"]
+
+
+def test_object_walk_collects_nested_urls():
+    obj = {
+        "images": ["https://example.com/1.png", {"thumb": "https://example.com/2.jpg"}],
+        "text": "see https://example.com/1.png",
+        "count": 2,
+    }
+    assert sorted(extract_image_urls_from_object(obj)) == [
+        "https://example.com/1.png",
+        "https://example.com/2.jpg",
+    ]
@@ -148,7 +148,7 @@ def test_full_flow_simulation():
         
         # Step 1: Simulate base64 image conversion
         mock_image_handler = Mock()
-        mock_image_handler.upload_base64_image_to_s3 = Mock(side_effect=[
+        mock_image_handler.upload_image_payload = Mock(side_effect=[
             "https://cloudfront.example.com/tenant/job/img1.png",
             "https://cloudfront.example.com/tenant/job/img2.png"
         ])
@@ -185,7 +185,7 @@ def test_full_flow_simulation():
         )
         
         assert len(image_urls) == 2, f"Expected 2 URLs, got {len(image_urls)}"
-        assert mock_image_handler.upload_base64_image_to_s3.call_count == 2
+        assert mock_image_handler.upload_image_payload.call_count == 2
         
         # Step 2: Create execution step with converted URLs
         response_details = {
@@ -53,7 +53,7 @@ def test_generate_report_with_image_generation_uses_images_api_and_returns_urls(
     svc.openai_client.generate_images = Mock(
         return_value=SimpleNamespace(data=[SimpleNamespace(b64_json="dGVzdA==")])
     )
-    svc.image_handler.upload_base64_image_to_s3 = Mock(
+    svc.image_handler.upload_image_payload = Mock(
         side_effect=["https://cdn.example.com/img1.png", "https://cdn.example.com/img2.png"]
     )
 
@@ -90,7 +90,7 @@ def test_generate_report_with_image_generation_uses_images_api_and_returns_urls(
 
     # Ensure we actually used the Images API wrapper, not Responses tool image_generation
     assert svc.openai_client.generate_images.call_count == 2
-    assert svc.image_handler.upload_base64_image_to_s3.call_count == 2
+    assert svc.image_handler.upload_image_payload.call_count == 2
 
 
 def test_generate_report_with_empty_planner_images_falls_back_and_returns_urls():
@@ -117,7 +117,7 @@ def test_generate_report_with_empty_planner_images_falls_back_and_returns_urls()
         return SimpleNamespace(data=[SimpleNamespace(b64_json="dGVzdA==")])
 
     svc.openai_client.generate_images = Mock(side_effect=_fake_generate_images)
-    svc.image_handler.upload_base64_image_to_s3 = Mock(
+    svc.image_handler.upload_image_payload = Mock(
         return_value="https://cdn.example.com/fallback.png"
     )
 
@@ -175,7 +175,7 @@ def test_generate_report_with_image_generation_publishes_live_progress():
 
     image_response = SimpleNamespace(data=[SimpleNamespace(b64_json="dGVzdA==")])
     svc.openai_client.generate_images = Mock(side_effect=[image_response, image_response])
-    svc.image_handler.upload_base64_image_to_s3 = Mock(
+    svc.image_handler.upload_image_payload = Mock(
         side_effect=["https://cdn.example.com/img1.png", "https://cdn.example.com/img2.png"]
     )
 
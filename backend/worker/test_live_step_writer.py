@@ -0,0 +1,121 @@
+import os
+import sys
+import threading
+from unittest.mock import MagicMock
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.live_step_writer import LiveStepWriter
+
+
+def _live_step(text, status="streaming", step_order=1):
+    return {"step_order": step_order, "output_text": text, "status": status}
+
+
+def _written(*live_steps):
+    """update_job payload: the job's live steps, the last one submitted as live_step."""
+    return {
+        "live_step": live_steps[-1],
+        "live_steps": {str(step["step_order"]): step for step in live_steps},
+    }
+
+
+def test_streaming_snapshots_coalesce_into_latest_write():
+    db_service = MagicMock()
+    writer = LiveStepWriter(flush_interval_seconds=3600)
+
+    for i in range(1, 6):
+        writer.submit(db_service, "job_1", _live_step("x" * i))
+
+    db_service.update_job.assert_not_called()
+    writer.flush()
+
+    db_service.update_job.assert_called_once_with("job_1", _written(_live_step("xxxxx")))
+    stats = writer.get_stats()
+    assert stats["submitted"] == 5
+    assert stats["written"] == 1
+    assert stats["writes_saved"] == 4
+    assert stats["pending"] == 0
+
+
+def test_final_status_is_written_synchronously_and_replaces_pending():
+    db_service = MagicMock()
+    writer = LiveStepWriter(flush_interval_seconds=3600)
+
+    writer.submit(db_service, "job_1", _live_step("partial"))
+    writer.submit(db_service, "job_1", _live_step("complete", status="final"))
+
+    db_service.update_job.assert_called_once_with(
+        "job_1", _written(_live_step("complete", status="final"))
+    )
+    writer.flush()
+    assert db_service.update_job.call_count == 1
+
+
+def test_background_thread_flushes_pending_snapshot():
+    written = threading.Event()
+    db_service = MagicMock()
+    db_service.update_job.side_effect = lambda *args, **kwargs: written.set()
+    writer = LiveStepWriter(flush_interval_seconds=0.01)
+
+    writer.submit(db_service, "job_1", _live_step("hello"))
+
+    assert written.wait(timeout=5)
+    db_service.update_job.assert_called_once_with("job_1", _written(_live_step("hello")))
+
+
+def test_discard_drops_pending_snapshot():
+    db_service = MagicMock()
+    writer = LiveStepWriter(flush_interval_seconds=3600)
+
+    writer.submit(db_service, "job_1", _live_step("stale"))
+    writer.discard("job_1")
+    writer.flush()
+
+    db_service.update_job.assert_not_called()
+    # Nothing is kept for a finished job in a warm container
+    assert writer._write_locks == {} and writer._live == {}
+
+
+def test_parallel_steps_keep_their_own_live_state():
+    db_service = MagicMock()
+    writer = LiveStepWriter(flush_interval_seconds=3600)
+    step_two = _live_step("researching", step_order=2)
+
+    writer.submit(db_service, "job_1", _live_step("drafting", step_order=1))
+    writer.submit(db_service, "job_1", step_two)
+    # Step 1 finishes while step 2 is still streaming
+    writer.submit(db_service, "job_1", _live_step("done", status="final", step_order=1))
+
+    db_service.update_job.assert_called_once_with(
+        "job_1", _written(step_two, _live_step("done", status="final", step_order=1))
+    )
+
+    # Step 2's later snapshots keep step 1's final state
+    step_two = _live_step("researching more", step_order=2)
+    writer.submit(db_service, "job_1", step_two)
+    writer.flush()
+    assert db_service.update_job.call_args.args[1] == _written(
+        _live_step("done", status="final", step_order=1), step_two
+    )
+
+
+def test_concurrent_steps_both_end_in_their_final_state():
+    db_service = MagicMock()
+    writer = LiveStepWriter(flush_interval_seconds=0.001)
+
+    def _step(step_order):
+        for i in range(200):
+            writer.submit(db_service, "job_1", _live_step("x" * i, step_order=step_order))
+        writer.submit(db_service, "job_1", _live_step("done", status="final", step_order=step_order))
+
+    threads = [threading.Thread(target=_step, args=(order,)) for order in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.flush()
+
+    live_steps = db_service.update_job.call_args.args[1]["live_steps"]
+    assert {order: step["status"] for order, step in live_steps.items()} == {"1": "final", "2": "final"}
@@ -0,0 +1,134 @@
+"""
+Tests for the async OpenAI client path.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import openai
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.openai_client import OpenAIClient  # noqa: E402
+from services.tools.execution.shell_loop import ShellLoopService  # noqa: E402
+
+
+def _client(async_create=None):
+    client = OpenAIClient.__new__(OpenAIClient)
+    client.openai_api_key = "sk-test"
+    client.client = Mock()
+    client.image_retry_handler = Mock()
+    client._async_client = None
+    client._async_client_loop = None
+    client._async_client_lock = threading.Lock()
+    if async_create is not None:
+        fake = SimpleNamespace(responses=SimpleNamespace(create=async_create))
+        client.get_async_client = lambda: fake
+    return client
+
+
+def test_concurrent_calls_overlap_on_one_loop():
+    sent = []
+
+    async def create(**params):
+        sent.append(params)
+        await asyncio.sleep(0.2)
+        return SimpleNamespace(id=f"resp_{len(sent)}", output_text="ok")
+
+    client = _client(create)
+
+    async def run():
+        return await asyncio.gather(*[
+            client.amake_api_call({"model": "gpt-5.2", "input": f"item {i}", "job_id": "job_1", "tenant_id": "t1"})
+            for i in range(5)
+        ])
+
+    started = time.perf_counter()
+    responses = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert [r.output_text for r in responses] == ["ok"] * 5
+    assert elapsed < 0.6
+    # Internal tracking fields are stripped; tenant is sent as the end-user id
+    assert all("job_id" not in p and p["user"] == "t1" for p in sent)
+
+
+def test_errors_go_through_sync_recovery():
+    async def create(**params):
+        raise openai.BadRequestError(
+            message="Unsupported parameter: 'reasoning'",
+            response=Mock(status_code=400),
+            body={"error": {"param": "reasoning"}},
+        )
+
+    client = _client(create)
+    client._handle_capability_error = Mock(return_value="retried without reasoning")
+
+    assert asyncio.run(client.acreate_response(model="gpt-5.2", input="x")) == "retried without reasoning"
+
+
+def test_async_client_is_shared_per_event_loop():
+    client = _client()
+
+    async def get_twice():
+        return client.get_async_client(), client.get_async_client()
+
+    first, second = asyncio.run(get_twice())
+    assert first is second
+    third, _ = asyncio.run(get_twice())
+    assert third is not first
+
+
+def test_async_client_is_closed_when_released_or_replaced():
+    client = _client()
+
+    async def get():
+        return client.get_async_client()
+
+    async def get_and_release():
+        async_client = client.get_async_client()
+        await client.aclose_async_client()
+        return async_client
+
+    assert asyncio.run(get_and_release()).is_closed()
+
+    # Replaced by a client for a new loop while the old loop is still open
+    old_loop = asyncio.new_event_loop()
+    try:
+        old = old_loop.run_until_complete(get())
+        new = asyncio.run(get())
+        old_loop.run_until_complete(asyncio.sleep(0.05))
+        assert old.is_closed() and not new.is_closed()
+    finally:
+        old_loop.close()
+
+
+def test_shell_loop_stream_awaits_async_client():
+    openai_client = Mock()
+
+    async def amake_api_call(params):
+        return SimpleNamespace(id="resp_1", output=[], output_text="done")
+
+    openai_client.amake_api_call = amake_api_call
+    service = ShellLoopService(shell_executor_service=Mock())
+
+    async def collect():
+        return [event async for event in service.run_shell_loop_stream(
+            openai_client=openai_client,
+            model="gpt-5.2",
+            instructions="",
+            input_text="hi",
+            tools=[{"type": "shell"}],
+            tool_choice="auto",
+            params={"model": "gpt-5.2", "input": "hi"},
+        )]
+
+    events = asyncio.run(collect())
+    assert events[-1] == {"type": "complete"}
+    openai_client.make_api_call.assert_not_called()
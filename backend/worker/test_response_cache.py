@@ -0,0 +1,84 @@
+"""
+Tests for the opt-in response cache of deterministic AI steps.
+"""
+
+import os
+import sys
+from unittest.mock import Mock
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.response_cache import ResponseCache, fingerprint  # noqa: E402
+
+
+class _FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def put_bytes(self, key, body, content_type='application/json'):
+        self.objects[key] = body.encode('utf-8') if isinstance(body, str) else body
+        return '"etag"'
+
+    def download_bytes(self, key):
+        return self.objects.get(key)
+
+
+PARAMS = {
+    "model": "gpt-5.2",
+    "instructions": "Write a report",
+    "input": "name: Ada",
+    "tools": [{"type": "web_search"}],
+    "reasoning": {"effort": "high"},
+    "job_id": "job_1",
+    "tenant_id": "tenant_1",
+}
+
+
+def _result():
+    usage = {"model": "gpt-5.2", "input_tokens": 900, "output_tokens": 300, "total_tokens": 1200, "cost_usd": 0.02}
+    return "Report body", usage, {"model": "gpt-5.2"}, {"output_text": "Report body", "image_urls": []}
+
+
+def test_fingerprint_ignores_tracking_fields_and_key_order():
+    reordered = dict(reversed(list(PARAMS.items())))
+    assert fingerprint(reordered) == fingerprint(PARAMS)
+    assert fingerprint({**PARAMS, "job_id": "job_2", "service_tier": "flex"}) == fingerprint(PARAMS)
+    assert fingerprint({**PARAMS, "input": "name: Grace"}) != fingerprint(PARAMS)
+    assert fingerprint({**PARAMS, "reasoning": {"effort": "low"}}) != fingerprint(PARAMS)
+
+
+def test_hit_after_store_is_free_and_tenant_scoped():
+    s3 = _FakeS3()
+    cache = ResponseCache(ttl_seconds=60, bypass=False)
+    assert cache.get(s3, "tenant_1", PARAMS) is None
+    assert cache.put(s3, "tenant_1", PARAMS, _result())
+    assert list(s3.objects) == [f"tenant_1/response-cache/{fingerprint(PARAMS)}.json"]
+
+    # A fresh process reads the persisted entry
+    content, usage, _, details = ResponseCache(ttl_seconds=60, bypass=False).get(s3, "tenant_1", PARAMS)
+    assert content == "Report body"
+    assert usage["cost_usd"] == 0.0 and usage["total_tokens"] == 0 and usage["cache_hit"]
+    assert details["response_cache"]["original_usage"]["total_tokens"] == 1200
+
+    assert cache.get(s3, "tenant_2", PARAMS) is None
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (0, 2, 1)
+
+
+def test_expired_and_bypassed_lookups_miss(monkeypatch):
+    s3 = _FakeS3()
+    cache = ResponseCache(ttl_seconds=60, bypass=False)
+    cache.put(s3, "tenant_1", PARAMS, _result())
+    assert cache.get(s3, "tenant_1", PARAMS) is not None
+
+    monkeypatch.setattr("services.response_cache.time.time", lambda: 10**12)
+    assert cache.get(s3, "tenant_1", PARAMS) is None
+    assert cache.get_stats()["expired"] == 1
+
+    monkeypatch.setenv("RESPONSE_CACHE_BYPASS", "true")
+    bypassed = ResponseCache(ttl_seconds=60)
+    failing_s3 = Mock()
+    assert bypassed.get(failing_s3, "tenant_1", PARAMS) is None
+    failing_s3.download_bytes.assert_not_called()
+    assert bypassed.get_stats()["bypassed"] == 1
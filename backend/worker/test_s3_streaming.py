@@ -0,0 +1,78 @@
+import io
+import os
+import sys
+from unittest.mock import MagicMock
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from s3_service import S3Service, iter_content_chunks
+
+
+def _service():
+    service = S3Service.__new__(S3Service)
+    service.bucket_name = "bucket"
+    service.cloudfront_domain = "cdn.example.com"
+    service.s3_client = MagicMock()
+    service.s3_client.put_object.return_value = {"ETag": '"single"'}
+    service.s3_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    service.s3_client.upload_part.side_effect = lambda **kw: {"ETag": f'"part-{kw["PartNumber"]}"'}
+    service.s3_client.upload_part_copy.return_value = {"CopyPartResult": {"ETag": '"copied"'}}
+    service.s3_client.complete_multipart_upload.return_value = {"ETag": '"multi-2"'}
+    return service
+
+
+def test_small_content_uses_single_put():
+    service = _service()
+
+    etag, size = service.upload_stream("a.html", "héllo", content_type="text/html")
+
+    assert (etag, size) == ('"single"', len("héllo".encode("utf-8")))
+    assert service.s3_client.put_object.call_args.kwargs["Body"] == "héllo".encode("utf-8")
+    service.s3_client.create_multipart_upload.assert_not_called()
+
+
+def test_large_stream_is_uploaded_in_bounded_parts():
+    service = _service()
+    part_size = 5 * 1024 * 1024
+    content = io.BytesIO(b"x" * (part_size * 2 + 10))
+
+    etag, size = service.upload_stream("big.bin", content, part_size=part_size)
+
+    assert etag == '"multi-2"'
+    assert size == part_size * 2 + 10
+    part_sizes = [len(c.kwargs["Body"]) for c in service.s3_client.upload_part.call_args_list]
+    assert part_sizes == [part_size, part_size, 10]
+    service.s3_client.put_object.assert_not_called()
+
+
+def test_failed_multipart_upload_is_aborted():
+    service = _service()
+    service.s3_client.upload_part.side_effect = RuntimeError("network")
+
+    try:
+        service.upload_stream("big.bin", [b"x" * (9 * 1024 * 1024)])
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected RuntimeError")
+
+    service.s3_client.abort_multipart_upload.assert_called_once()
+
+
+def test_copied_prefix_is_copied_server_side():
+    service = _service()
+    prefix_length = 6 * 1024 * 1024
+
+    etag, size = service.upload_with_copied_prefix("steps.json", "steps.json", prefix_length, [", {}", "]"])
+
+    copy_kwargs = service.s3_client.upload_part_copy.call_args.kwargs
+    assert copy_kwargs["CopySourceRange"] == f"bytes=0-{prefix_length - 1}"
+    assert service.s3_client.upload_part.call_args.kwargs["Body"] == b", {}]"
+    assert size == prefix_length + 5
+
+
+def test_iter_content_chunks_handles_text_and_files():
+    assert b"".join(iter_content_chunks("abc", chunk_size=2)) == b"abc"
+    assert b"".join(iter_content_chunks(io.BytesIO(b"abc"), chunk_size=2)) == b"abc"
+    assert b"".join(iter_content_chunks(["a", b"b"])) == b"ab"
@@ -0,0 +1,80 @@
+"""
+Tests for the cached, refreshing secrets/settings provider.
+"""
+
+import os
+import sys
+import threading
+import time
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.secrets_provider import RefreshingCache  # noqa: E402
+
+
+def test_concurrent_misses_share_one_load():
+    cache = RefreshingCache(ttl_seconds=60)
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(timeout=5)
+        return "secret"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("k", loader))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == ["secret"] * 5
+    assert len(calls) == 1
+    assert cache.get("k", loader) == "secret"
+    assert len(calls) == 1
+
+
+def test_hit_near_expiry_refreshes_in_background():
+    cache = RefreshingCache(ttl_seconds=1.0)
+    values = iter(["v1", "v2"])
+    refreshed = threading.Event()
+
+    def loader():
+        value = next(values)
+        if value == "v2":
+            refreshed.set()
+        return value
+
+    assert cache.get("k", loader) == "v1"
+    time.sleep(0.85)
+    # Still valid: served from cache while the refresh runs
+    assert cache.get("k", loader) == "v1"
+    assert refreshed.wait(timeout=5)
+    time.sleep(0.01)
+    assert cache.get("k", loader) == "v2"
+    assert cache.get_stats()["refreshes"] == 1
+
+
+def test_failed_load_is_not_cached():
+    cache = RefreshingCache(ttl_seconds=60)
+    attempts = []
+
+    def flaky_loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("throttled")
+        return "secret"
+
+    try:
+        cache.get("k", flaky_loader)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected RuntimeError")
+
+    assert cache.get("k", flaky_loader) == "secret"
+    assert len(attempts) == 2
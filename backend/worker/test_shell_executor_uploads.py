@@ -0,0 +1,46 @@
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.shell import executor_handler
+
+
+def test_upload_files_runs_concurrently_and_keeps_entry_order(tmp_path):
+    entries = []
+    for i in range(40):
+        path = tmp_path / f"file_{i:02d}.csv"
+        path.write_text("a,b\n" * (i + 1))
+        entries.append((str(path), f"out/file_{i:02d}.csv"))
+    big = tmp_path / "site.zip"
+    big.write_bytes(b"x" * (executor_handler.UPLOAD_SMALL_FILE_BYTES + 1))
+    entries.append((str(big), "out/site.zip"))
+    entries.append((str(tmp_path / "missing.txt"), "out/missing.txt"))
+
+    s3 = MagicMock()
+    with patch.object(executor_handler, "_get_s3_client", return_value=s3):
+        uploads, errors = executor_handler._upload_files(
+            entries=entries, bucket="bucket", prefix="jobs/1/", max_bytes=0, concurrency=4
+        )
+
+    assert [u["key"] for u in uploads] == [f"jobs/1/out/file_{i:02d}.csv" for i in range(40)] + ["jobs/1/out/site.zip"]
+    assert all("duration_ms" in u for u in uploads)
+    assert s3.put_object.call_count == 40
+    s3.upload_file.assert_called_once()
+    assert s3.upload_file.call_args.kwargs["Config"] is executor_handler._TRANSFER_CONFIG
+    assert [e["path"] for e in errors] == [str(tmp_path / "missing.txt")]
+
+
+def test_upload_files_enforces_max_bytes(tmp_path):
+    path = tmp_path / "big.bin"
+    path.write_bytes(b"x" * 10)
+
+    with patch.object(executor_handler, "_get_s3_client", return_value=MagicMock()):
+        uploads, errors = executor_handler._upload_files(
+            entries=[(str(path), "big.bin")], bucket="bucket", prefix="", max_bytes=5
+        )
+
+    assert uploads == []
+    assert "file too large" in errors[0]["error"]
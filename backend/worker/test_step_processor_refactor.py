@@ -135,5 +135,33 @@ class TestStepProcessorRefactor(unittest.TestCase):
             execution_steps=execution_steps,
         )
 
+    def test_process_single_step_reloads_only_dependency_outputs(self):
+        steps = [
+            {'step_name': 'Research', 'step_order': 1, 'depends_on': []},
+            {'step_name': 'Outline', 'step_order': 2, 'depends_on': []},
+            {'step_name': 'Draft', 'step_order': 3, 'depends_on': [2]},
+        ]
+        mock_handler = MockStepHandler({})
+        mock_handler.execute = MagicMock(return_value=({'success': True}, []))
+        self.processor.registry.register('ai_generation', mock_handler)
+        self.mock_db_service.get_job.return_value = {'execution_steps': [
+            {'step_name': 'Outline', 'step_order': 2, 'step_type': 'ai_generation',
+             'output': 'outline', 'success': True},
+        ]}
+
+        self.processor.process_single_step(
+            step=steps[2],
+            step_index=2,
+            steps=steps,
+            job_id='job_123',
+            job={'tenant_id': 'tenant_123'},
+            initial_context='',
+            execution_steps=[],
+        )
+
+        self.assertEqual(self.mock_db_service.get_job.call_args.kwargs.get('step_orders'), [2])
+        step_outputs = mock_handler.execute.call_args.kwargs['step_outputs']
+        self.assertEqual([o['output'] for o in step_outputs], ['outline'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import threading
+import time
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.step_scheduler import ReadyQueueScheduler
+
+
+def test_step_starts_as_soon_as_its_own_dependencies_finish():
+    # 0 is slow; 1 -> 2 is a fast chain that must not wait for 0 to finish.
+    steps = [
+        {"step_name": "Slow research", "step_order": 1, "depends_on": []},
+        {"step_name": "Fast research", "step_order": 2, "depends_on": []},
+        {"step_name": "Fast summary", "step_order": 3, "depends_on": [2]},
+    ]
+    summary_started = threading.Event()
+
+    def execute_step(step_index, step, completed_results):
+        if step_index == 0:
+            assert summary_started.wait(timeout=5)
+        if step_index == 2:
+            assert sorted(completed_results) == [1]
+            summary_started.set()
+        return step["step_name"]
+
+    results, report = ReadyQueueScheduler(steps, max_workers=2).run(execute_step)
+
+    assert results == {0: "Slow research", 1: "Fast research", 2: "Fast summary"}
+    assert set(report.timings) == {0, 1, 2}
+
+
+def test_report_includes_critical_path_and_queue_wait():
+    steps = [
+        {"step_name": "A", "step_order": 1, "depends_on": []},
+        {"step_name": "B", "step_order": 2, "depends_on": []},
+        {"step_name": "C", "step_order": 3, "depends_on": [1, 2]},
+    ]
+    durations = {0: 0.01, 1: 0.05, 2: 0.01}
+
+    def execute_step(step_index, step, completed_results):
+        time.sleep(durations[step_index])
+        return step_index
+
+    # One worker forces B to queue behind A.
+    _, report = ReadyQueueScheduler(steps, max_workers=1).run(execute_step)
+
+    assert report.critical_path == [1, 2]
+    assert report.critical_path_ms >= 55
+    assert report.timings[1].queue_wait_ms >= 5
+    summary = report.to_dict()
+    assert summary["critical_path_length"] == 2
+    assert summary["serial_ms"] >= summary["critical_path_ms"]
+
+
+def test_failure_stops_dispatch_and_reraises_after_in_flight_steps():
+    steps = [
+        {"step_name": "A", "step_order": 1, "depends_on": []},
+        {"step_name": "B", "step_order": 2, "depends_on": []},
+        {"step_name": "C", "step_order": 3, "depends_on": [1, 2]},
+    ]
+    executed = []
+
+    def execute_step(step_index, step, completed_results):
+        executed.append(step_index)
+        if step_index == 0:
+            raise RuntimeError("boom")
+        time.sleep(0.01)
+        return step_index
+
+    try:
+        ReadyQueueScheduler(steps, max_workers=2).run(execute_step)
+    except RuntimeError as exc:
+        assert str(exc) == "boom"
+    else:
+        raise AssertionError("expected RuntimeError")
+
+    assert sorted(executed) == [0, 1]
@@ -0,0 +1,118 @@
+"""
+Tests for the per-job background upload queue.
+"""
+
+import base64
+import os
+import sys
+import threading
+from io import BytesIO
+
+from PIL import Image
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.image_handler import ImageHandler  # noqa: E402
+from services.upload_queue import JobUploadQueues  # noqa: E402
+
+
+class _FakeS3:
+    cloudfront_domain = "assets.example.com"
+
+    def __init__(self, release=None, fail_keys=()):
+        self.release = release
+        self.fail_keys = set(fail_keys)
+        self.uploaded = []
+
+    def get_image_urls(self, key, public=True):
+        return f"s3://bucket/{key}", f"https://{self.cloudfront_domain}/{key}"
+
+    def get_artifact_urls(self, key, public=False):
+        return self.get_image_urls(key, public)
+
+    def _upload(self, key):
+        if self.release is not None:
+            self.release.wait(5)
+        if key in self.fail_keys:
+            raise RuntimeError("SlowDown")
+        self.uploaded.append(key)
+
+    def upload_image(self, key, image_data, content_type="image/png", public=True):
+        self._upload(key)
+        return self.get_image_urls(key, public)
+
+    def upload_stream(self, key, content, content_type="application/octet-stream"):
+        self._upload(key)
+        return "etag", len(content)
+
+
+def test_url_is_known_before_the_upload_finishes():
+    release = threading.Event()
+    s3 = _FakeS3(release=release)
+    queues = JobUploadQueues(concurrency=2)
+
+    pending = queues.enqueue(s3, "t1", "j1", "logs.json", '{"ok": true}', "application/json", label="logs")
+
+    assert pending.public_url == "https://assets.example.com/t1/jobs/j1/logs.json"
+    assert not pending.future.done() and s3.uploaded == []
+
+    release.set()
+    report = queues.drain("j1")
+    assert (report["uploaded"], report["failed"], report["bytes"]) == (1, [], 12)
+    assert s3.uploaded == ["t1/jobs/j1/logs.json"]
+    assert queues.drain("j1") is None
+
+
+def test_drain_reports_failed_and_unfinished_uploads():
+    s3 = _FakeS3(fail_keys={"t1/jobs/j1/b.png"})
+    queues = JobUploadQueues(concurrency=2)
+    queues.enqueue(s3, "t1", "j1", "a.png", b"a", "image/png")
+    queues.enqueue(s3, "t1", "j1", "b.png", b"b", "image/png", label="cua/screenshot")
+
+    report = queues.drain("j1")
+
+    assert report["uploaded"] == 1
+    assert report["failed"] == [{
+        "key": "t1/jobs/j1/b.png",
+        "url": "https://assets.example.com/t1/jobs/j1/b.png",
+        "label": "cua/screenshot",
+        "error": "RuntimeError: SlowDown",
+    }]
+
+    stuck = threading.Event()
+    queues.enqueue(_FakeS3(release=stuck), "t1", "j1", "c.png", b"c", "image/png")
+    report = queues.drain("j1", timeout=0.05)
+    stuck.set()
+    assert "did not finish" in report["failed"][0]["error"]
+
+
+def test_parallel_steps_drain_only_their_own_uploads():
+    slow_step = threading.Event()
+    queues = JobUploadQueues(concurrency=2)
+    queues.enqueue(_FakeS3(fail_keys={"t1/jobs/j1/a.json"}), "t1", "j1", "a.json", "a", "application/json", step_index=0)
+    queues.enqueue(_FakeS3(release=slow_step), "t1", "j1", "b.json", "b", "application/json", step_index=1)
+
+    # Step 0 finishes first: it must not wait for (or report) step 1's upload
+    first = queues.drain("j1", 0, timeout=1)
+    slow_step.set()
+    second = queues.drain("j1", 1)
+
+    assert [f["key"] for f in first["failed"]] == ["t1/jobs/j1/a.json"] and first["uploaded"] == 0
+    assert (second["uploaded"], second["failed"]) == (1, [])
+
+
+def test_image_handler_keys_screenshots_by_content(monkeypatch):
+    s3 = _FakeS3()
+    queues = JobUploadQueues(concurrency=1)
+    monkeypatch.setattr("services.upload_queue._job_upload_queues", queues)
+    handler = ImageHandler(s3, use_ai_naming=False)
+    buffer = BytesIO()
+    Image.new("RGB", (4, 4)).save(buffer, format="PNG")
+    frame = base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    first = handler.enqueue_image_upload(frame, "image/png", tenant_id="t1", job_id="j1", name_prefix="cua/screenshot")
+    second = handler.enqueue_image_upload(frame, "image/png", tenant_id="t1", job_id="j1", name_prefix="cua/screenshot")
+
+    assert first == second and first.startswith("https://assets.example.com/t1/jobs/j1/cua/screenshot-")
+    assert queues.drain("j1")["uploaded"] == 2
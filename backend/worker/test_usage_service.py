@@ -0,0 +1,58 @@
+"""
+Tests for buffered usage record writes.
+"""
+
+import os
+import sys
+from decimal import Decimal
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.usage_service import UsageRecordBuffer, UsageService  # noqa: E402
+
+
+class FakeDb:
+    def __init__(self):
+        self.batches = []
+
+    def put_usage_records(self, usage_records):
+        self.batches.append(list(usage_records))
+
+
+def _usage(model, cost):
+    return {"model": model, "input_tokens": 10, "output_tokens": 5, "cost_usd": cost}
+
+
+def test_records_are_buffered_until_the_step_boundary():
+    db = FakeDb()
+    service = UsageService(db, buffer=UsageRecordBuffer(batch_size=25))
+
+    for _ in range(3):
+        service.store_usage_record("tenant_1", "job_1", _usage("gpt-5", 0.01))
+    assert db.batches == []
+
+    service.flush("job_1")
+    assert len(db.batches) == 1
+    assert [r["job_id"] for r in db.batches[0]] == ["job_1"] * 3
+    assert service.buffer.get_stats()["writes_saved"] == 2
+
+
+def test_batch_size_triggers_flush_and_close_job_returns_rollup():
+    db = FakeDb()
+    service = UsageService(db, buffer=UsageRecordBuffer(batch_size=2))
+
+    service.store_usage_record("tenant_1", "job_1", _usage("gpt-5", 0.01))
+    service.store_usage_record("tenant_1", "job_1", _usage("gpt-5", 0.02))
+    assert len(db.batches) == 1
+
+    service.store_usage_record("tenant_1", "job_1", _usage("gpt-image-1", 0.04))
+    rollup = service.close_job("job_1")
+
+    assert [len(batch) for batch in db.batches] == [2, 1]
+    assert rollup["gpt-5"]["calls"] == 2
+    assert rollup["gpt-5"]["input_tokens"] == 20
+    assert rollup["gpt-5"]["cost_usd"] == Decimal("0.03")
+    assert rollup["gpt-image-1"]["calls"] == 1
+    # Rollup is released once the job is closed
+    assert service.buffer.get_rollup("job_1") == {}
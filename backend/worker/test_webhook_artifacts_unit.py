@@ -134,7 +134,7 @@ def test_webhook_payload_structure():
     }
     
     # Send webhook with mocked requests
-    with patch('delivery_service.requests.post', side_effect=mock_post):
+    with patch('delivery_service.http_client.post', side_effect=mock_post):
         try:
             delivery_service.send_webhook_notification(
                 webhook_url=webhook_url,
@@ -318,7 +318,7 @@ def test_artifact_with_none_filename():
     job = {'job_id': job_id, 'workflow_id': 'wf_test_001'}
     
     # Send webhook with mocked requests - should not crash
-    with patch('delivery_service.requests.post', side_effect=mock_post):
+    with patch('delivery_service.http_client.post', side_effect=mock_post):
         try:
             delivery_service.send_webhook_notification(
                 webhook_url=webhook_url,
@@ -396,7 +396,7 @@ def test_empty_artifacts():
     job = {'job_id': job_id, 'workflow_id': 'wf_test_001'}
     
     # Send webhook with mocked requests
-    with patch('delivery_service.requests.post', side_effect=mock_post):
+    with patch('delivery_service.http_client.post', side_effect=mock_post):
         try:
             delivery_service.send_webhook_notification(
                 webhook_url=webhook_url,
@@ -171,7 +171,7 @@ def test_webhook_step_exclude_steps():
     return True
 
 
-@patch('services.webhooks.adapters.generic_http.requests.request')
+@patch('services.webhooks.adapters.generic_http.http_client.request')
 def test_webhook_step_execution_success(mock_request):
     """Test successful webhook step execution."""
     logger.info("Testing webhook step execution (success case)...")
@@ -228,7 +228,7 @@ def test_webhook_step_execution_success(mock_request):
     return True
 
 
-@patch('services.webhooks.adapters.generic_http.requests.request')
+@patch('services.webhooks.adapters.generic_http.http_client.request')
 def test_webhook_step_execution_failure(mock_request):
     """Test webhook step execution failure handling."""
     logger.info("Testing webhook step execution (failure case)...")
@@ -0,0 +1,160 @@
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.workflow_orchestrator import WorkflowOrchestrator
+
+
+def _research_workflow():
+    return {
+        "workflow_id": "wf_parallel",
+        "steps": [
+            {"step_name": "Research A", "step_order": 0, "depends_on": []},
+            {"step_name": "Research B", "step_order": 1, "depends_on": []},
+            {"step_name": "Research C", "step_order": 2, "depends_on": []},
+            {"step_name": "Report", "step_order": 3, "depends_on": [0, 1, 2]},
+        ],
+    }
+
+
+def _make_orchestrator(step_processor, max_parallel_steps=4):
+    db_service = MagicMock()
+    db_service.get_job.return_value = None
+    return WorkflowOrchestrator(
+        step_processor=step_processor,
+        ai_service=MagicMock(),
+        db_service=db_service,
+        s3_service=MagicMock(),
+        job_completion_service=MagicMock(),
+        max_parallel_steps=max_parallel_steps,
+    )
+
+
+class TestWorkflowOrchestratorParallel(unittest.TestCase):
+    def test_independent_steps_run_concurrently_with_deterministic_order(self):
+        # All three research steps must be in flight at once to pass the barrier.
+        barrier = threading.Barrier(3, timeout=5)
+        mock_step_processor = MagicMock()
+
+        def process_step_batch_mode(**kwargs):
+            step = kwargs["step"]
+            step_index = kwargs["step_index"]
+            if step_index < 3:
+                barrier.wait()
+                self.assertFalse(kwargs["reload_execution_steps"])
+                self.assertEqual(kwargs["step_outputs"], [])
+            else:
+                self.assertEqual(
+                    [o["step_name"] for o in kwargs["step_outputs"]],
+                    ["Research A", "Research B", "Research C"],
+                )
+            kwargs["execution_steps"].append(
+                {"step_name": step["step_name"], "step_order": step_index + 1}
+            )
+            return (
+                {
+                    "step_name": step["step_name"],
+                    "step_index": step_index,
+                    "output": step["step_name"],
+                    "artifact_id": f"art_{step_index}",
+                    "image_urls": [],
+                },
+                [f"img_{step_index}"],
+            )
+
+        mock_step_processor.process_step_batch_mode.side_effect = process_step_batch_mode
+        orchestrator = _make_orchestrator(mock_step_processor)
+
+        execution_steps = []
+        final_content, _, _, report_artifact_id, image_ids = orchestrator.execute_workflow(
+            job_id="job_123",
+            job={"tenant_id": "tenant_123"},
+            workflow=_research_workflow(),
+            submission={"submission_data": {}},
+            form=None,
+            execution_steps=execution_steps,
+        )
+
+        self.assertEqual(final_content, "Report")
+        self.assertEqual(report_artifact_id, "art_3")
+        self.assertEqual(image_ids, ["img_0", "img_1", "img_2", "img_3"])
+        self.assertEqual(
+            [s["step_order"] for s in execution_steps[:3]],
+            [1, 2, 3],
+        )
+
+    def test_failed_parallel_step_does_not_cancel_siblings(self):
+        completed = []
+        lock = threading.Lock()
+        mock_step_processor = MagicMock()
+
+        def process_step_batch_mode(**kwargs):
+            step_index = kwargs["step_index"]
+            if step_index == 1:
+                raise RuntimeError("research B exploded")
+            with lock:
+                completed.append(step_index)
+            return (
+                {
+                    "step_name": kwargs["step"]["step_name"],
+                    "step_index": step_index,
+                    "output": "ok",
+                    "image_urls": [],
+                },
+                [],
+            )
+
+        mock_step_processor.process_step_batch_mode.side_effect = process_step_batch_mode
+        orchestrator = _make_orchestrator(mock_step_processor)
+
+        with self.assertRaises(RuntimeError):
+            orchestrator.execute_workflow(
+                job_id="job_123",
+                job={"tenant_id": "tenant_123"},
+                workflow=_research_workflow(),
+                submission={"submission_data": {}},
+                form=None,
+                execution_steps=[],
+            )
+
+        self.assertEqual(sorted(completed), [0, 2])
+        orchestrator.db.update_job.assert_called()
+
+    def test_single_worker_runs_sequentially(self):
+        mock_step_processor = MagicMock()
+
+        def process_step_batch_mode(**kwargs):
+            self.assertNotIn("reload_execution_steps", kwargs)
+            return (
+                {
+                    "step_name": kwargs["step"]["step_name"],
+                    "step_index": kwargs["step_index"],
+                    "output": kwargs["step"]["step_name"],
+                    "image_urls": [],
+                },
+                [],
+            )
+
+        mock_step_processor.process_step_batch_mode.side_effect = process_step_batch_mode
+        orchestrator = _make_orchestrator(mock_step_processor, max_parallel_steps=1)
+
+        orchestrator.execute_workflow(
+            job_id="job_123",
+            job={"tenant_id": "tenant_123"},
+            workflow=_research_workflow(),
+            submission={"submission_data": {}},
+            form=None,
+            execution_steps=[],
+        )
+
+        calls = mock_step_processor.process_step_batch_mode.call_args_list
+        self.assertEqual([c.kwargs["step_index"] for c in calls], [0, 1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
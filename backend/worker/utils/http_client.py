@@ -0,0 +1,318 @@
+"""
+Shared HTTP client for outbound worker requests (webhooks, SMS, image downloads).
+
+One module-level requests.Session keeps connections alive across calls and warm
+Lambda invocations, so repeat requests to the same host skip DNS, TCP and TLS setup.
+Connection pools are bounded per host, transient failures are retried with backoff
+(a server's Retry-After is honoured up to HTTP_MAX_RETRY_AFTER_SECONDS), and
+connect/TLS/TTFB timings are recorded per host (see get_stats()).
+
+The call signatures mirror the requests module: request(method, url, **kwargs),
+get(url, **kwargs) and post(url, **kwargs). Callers that run their own retry loop
+pass retries=False so one logical request is not multiplied by the transport retries.
+"""
+
+import logging
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 32  # distinct hosts kept pooled
+DEFAULT_POOL_MAXSIZE = 10  # keep-alive connections per host
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF_FACTOR = 0.3
+DEFAULT_MAX_RETRY_AFTER_SECONDS = 10
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+
+def _read_int_env(name: str, default: int) -> int:
+    value = (os.environ.get(name) or "").strip()
+    if not value:
+        return default
+    try:
+        parsed = int(value)
+    except Exception:
+        return default
+    return parsed if parsed >= 0 else default
+
+
+# Per-thread timings of the request currently in flight; connections are opened on
+# the calling thread, so connect/TLS time can be attributed to that request.
+_local = threading.local()
+
+
+def _record_timing(name: str, ms: float) -> None:
+    timings = getattr(_local, "timings", None)
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + ms
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = super()._new_conn()
+        _record_timing("connect_ms", (time.perf_counter() - started) * 1000)
+        return sock
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = super()._new_conn()
+        connect_ms = (time.perf_counter() - started) * 1000
+        _record_timing("connect_ms", connect_ms)
+        self._last_connect_ms = connect_ms
+        return sock
+
+    def connect(self):
+        self._last_connect_ms = 0.0
+        started = time.perf_counter()
+        super().connect()
+        total_ms = (time.perf_counter() - started) * 1000
+        _record_timing("tls_ms", max(0.0, total_ms - self._last_connect_ms))
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools use connection classes that time connect and TLS setup."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class _CappedRetry(Retry):
+    """Retry that sleeps at most retry_after_cap seconds for a Retry-After header."""
+
+    def __init__(self, *args: Any, retry_after_cap: float = DEFAULT_MAX_RETRY_AFTER_SECONDS, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.retry_after_cap = retry_after_cap
+
+    def new(self, **kwargs: Any) -> "_CappedRetry":
+        kwargs.setdefault("retry_after_cap", self.retry_after_cap)
+        return super().new(**kwargs)
+
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.retry_after_cap)
+
+
+class HttpSessionManager:
+    """Owns the pooled session and aggregates per-host timing metrics."""
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        max_retry_after: Optional[int] = None
+    ):
+        """
+        Initialize session manager.
+
+        Args:
+            pool_connections: Number of per-host pools to keep (HTTP_POOL_CONNECTIONS)
+            pool_maxsize: Keep-alive connections per host (HTTP_POOL_MAXSIZE)
+            max_retries: Retries for connection errors and retryable statuses (HTTP_MAX_RETRIES)
+            backoff_factor: Exponential backoff factor between retries
+            max_retry_after: Longest Retry-After sleep in seconds (HTTP_MAX_RETRY_AFTER_SECONDS)
+        """
+        self.pool_connections = pool_connections or _read_int_env("HTTP_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS)
+        self.pool_maxsize = pool_maxsize or _read_int_env("HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)
+        if max_retries is None:
+            max_retries = _read_int_env("HTTP_MAX_RETRIES", DEFAULT_MAX_RETRIES)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        if max_retry_after is None:
+            max_retry_after = _read_int_env("HTTP_MAX_RETRY_AFTER_SECONDS", DEFAULT_MAX_RETRY_AFTER_SECONDS)
+        self.max_retry_after = max_retry_after
+        self._session: Optional[requests.Session] = None
+        self._single_attempt_session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._host_stats: Dict[str, Dict[str, float]] = {}
+
+    def _build_retry(self) -> Retry:
+        # Status/read retries only apply to idempotent methods (urllib3 default), so a
+        # webhook POST is never re-sent after the server may have processed it;
+        # connection failures (request never sent) are retried for every method.
+        return _CappedRetry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            raise_on_status=False,
+            respect_retry_after_header=True,
+            retry_after_cap=self.max_retry_after,
+        )
+
+    def _build_session(self, retry: Any) -> requests.Session:
+        adapter = _TimedHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        # Outbound calls go to many unrelated hosts; never carry cookies between them.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._build_session(self._build_retry())
+        return self._session
+
+    @property
+    def single_attempt_session(self) -> requests.Session:
+        """Pooled session without transport retries, for callers that retry themselves."""
+        if self._single_attempt_session is None:
+            with self._session_lock:
+                if self._single_attempt_session is None:
+                    self._single_attempt_session = self._build_session(Retry(0, read=False))
+        return self._single_attempt_session
+
+    def request(self, method: str, url: str, retries: bool = True, **kwargs: Any) -> requests.Response:
+        """
+        Send a request through the pooled session.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            retries: Retry connection errors and retryable statuses; pass False when
+                the caller has its own retry loop
+            **kwargs: Same keyword arguments as requests.request
+
+        Returns:
+            requests.Response
+        """
+        session = self.session if retries else self.single_attempt_session
+        _local.timings = {}
+        started = time.perf_counter()
+        try:
+            response = session.request(method=method, url=url, **kwargs)
+        except Exception:
+            self._record(url, _local.timings, (time.perf_counter() - started) * 1000, None, failed=True)
+            raise
+        finally:
+            timings = _local.timings
+            _local.timings = None
+        total_ms = (time.perf_counter() - started) * 1000
+        elapsed_ms = response.elapsed.total_seconds() * 1000 if response.elapsed else total_ms
+        setup_ms = timings.get("connect_ms", 0.0) + timings.get("tls_ms", 0.0)
+        timings["ttfb_ms"] = max(0.0, elapsed_ms - setup_ms)
+        self._record(url, timings, total_ms, response.status_code)
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def _record(
+        self,
+        url: str,
+        timings: Dict[str, float],
+        total_ms: float,
+        status_code: Optional[int],
+        failed: bool = False
+    ) -> None:
+        host = urlparse(url).netloc or "unknown"
+        new_connection = "connect_ms" in timings
+        with self._stats_lock:
+            stats = self._host_stats.setdefault(host, {
+                "requests": 0,
+                "failures": 0,
+                "new_connections": 0,
+                "connect_ms": 0.0,
+                "tls_ms": 0.0,
+                "ttfb_ms": 0.0,
+                "total_ms": 0.0,
+            })
+            stats["requests"] += 1
+            stats["failures"] += 1 if failed else 0
+            stats["new_connections"] += 1 if new_connection else 0
+            for name in ("connect_ms", "tls_ms", "ttfb_ms"):
+                stats[name] += timings.get(name, 0.0)
+            stats["total_ms"] += total_ms
+        logger.debug("[HttpClient] Request timing", extra={
+            "host": host,
+            "status_code": status_code,
+            "reused_connection": not new_connection,
+            "connect_ms": round(timings.get("connect_ms", 0.0), 1),
+            "tls_ms": round(timings.get("tls_ms", 0.0), 1),
+            "ttfb_ms": round(timings.get("ttfb_ms", 0.0), 1),
+            "total_ms": round(total_ms, 1),
+            "failed": failed,
+        })
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-host request metrics.
+
+        Returns:
+            Dict keyed by host with requests, failures, new_connections,
+            reused_connections and summed connect/tls/ttfb/total milliseconds
+        """
+        with self._stats_lock:
+            result = {}
+            for host, stats in self._host_stats.items():
+                host_stats = dict(stats)
+                host_stats["reused_connections"] = stats["requests"] - stats["new_connections"]
+                result[host] = host_stats
+            return result
+
+
+_manager = HttpSessionManager()
+
+
+def get_session_manager() -> HttpSessionManager:
+    """Get the process-wide pooled session manager."""
+    return _manager
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    return _manager.request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return _manager.get(url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return _manager.post(url, **kwargs)
+
+
+def get_stats() -> Dict[str, Dict[str, float]]:
+    return _manager.get_stats()
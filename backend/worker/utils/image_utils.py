@@ -19,7 +19,9 @@ from .images.processing import (
     validate_image_size,
     validate_image_format,
     optimize_image,
+    get_optimization_stats,
     add_overlay_to_screenshot,
+    OPTIMIZE_PRESETS,
     MAX_IMAGE_SIZE_BYTES,
     MAX_IMAGE_WIDTH_PX,
     PIL_AVAILABLE
@@ -35,6 +37,7 @@ from .images.download import (
     DEFAULT_USER_AGENT,
     MAX_DOWNLOAD_RETRIES
 )
+from .images.payload import ImagePayload
 
 logger = logging.getLogger(__name__)
 
@@ -49,12 +52,15 @@ __all__ = [
     'validate_image_size',
     'validate_image_format',
     'optimize_image',
+    'get_optimization_stats',
     'add_overlay_to_screenshot',
+    'ImagePayload',
     'get_image_cache',
     'get_url_hash',
     'retry_download_image',
     'download_images_concurrent',
     'download_image_and_convert_to_data_url',
+    'OPTIMIZE_PRESETS',
     'MAX_IMAGE_SIZE_BYTES',
     'MAX_IMAGE_WIDTH_PX',
     'IMAGE_CACHE_TTL_SECONDS',
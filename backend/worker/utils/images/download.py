@@ -7,6 +7,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import base64
 
 from services.cache_service import CacheService
+from utils import http_client
 from .processing import validate_image_size, validate_image_format, optimize_image
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,7 @@ logger = logging.getLogger(__name__)
 # Constants
 MAX_IMAGE_SIZE_BYTES = 10 * 1024 * 1024  # 10MB
 IMAGE_CACHE_TTL_SECONDS = 3600  # 1 hour
+IMAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64MB of cached data URLs
 MAX_CONCURRENT_DOWNLOADS = 5
 DEFAULT_USER_AGENT = "LeadMagnetAI/1.0 (Image Downloader)"
 MAX_DOWNLOAD_RETRIES = 3
@@ -25,7 +27,11 @@ def get_image_cache() -> CacheService:
     """Get or create the global image cache instance."""
     global _image_cache
     if _image_cache is None:
-        _image_cache = CacheService(max_size=256, ttl_seconds=IMAGE_CACHE_TTL_SECONDS)
+        _image_cache = CacheService(
+            max_size=256,
+            ttl_seconds=IMAGE_CACHE_TTL_SECONDS,
+            max_bytes=IMAGE_CACHE_MAX_BYTES,
+        )
     return _image_cache
 
 import hashlib
@@ -70,7 +76,8 @@ def retry_download_image(
     
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, timeout=timeout, stream=True, headers=headers)
+            # This loop owns retries; a transport retry per attempt would multiply requests
+            response = http_client.get(url, timeout=timeout, stream=True, headers=headers, retries=False)
             response.raise_for_status()
             return response
         except requests.Timeout as e:
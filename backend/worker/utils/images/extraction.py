@@ -1,10 +1,26 @@
 import re
-from typing import List, Any, Set, Optional
+from typing import List, Any, Optional, Tuple
 from urllib.parse import urlparse
 import logging
 
+from services.cache_service import CacheService
+
 logger = logging.getLogger(__name__)
 
+# Matches URLs ending with image extensions, optionally followed by query parameters.
+# Deliberately permissive about trailing characters; matches are cleaned afterwards.
+_IMAGE_URL_PATTERN = re.compile(
+    r'https?://[^\s<>"{}|\\^`\[\]]+\.(?:png|jpg|jpeg|gif|webp|svg|bmp|ico)(?:\?[^\s<>"{}|\\^`\[\]]*)?[^\s<>"{}|\\^`\[\]]*',
+    re.IGNORECASE,
+)
+_IMAGE_EXTENSION_PATTERN = re.compile(r'\.(png|jpg|jpeg|gif|webp|svg|bmp|ico)(\?.*)?$', re.IGNORECASE)
+
+# Step outputs are scanned again every time a later step builds its context; memoize
+# results for large texts so each output is scanned once per container.
+MEMO_MIN_TEXT_LENGTH = 1024
+_url_memo = CacheService(max_size=1024, ttl_seconds=3600, max_bytes=32 * 1024 * 1024)
+
+
 def clean_image_url(url: str) -> str:
     """
     Clean an image URL by removing trailing punctuation that shouldn't be part of the URL.
@@ -56,7 +72,25 @@ def is_image_url(url: str) -> bool:
     """
     if not url or not isinstance(url, str):
         return False
-    return bool(re.search(r'\.(png|jpg|jpeg|gif|webp|svg|bmp|ico)(\?.*)?$', url, re.IGNORECASE))
+    return bool(_IMAGE_EXTENSION_PATTERN.search(url))
+
+
+def _scan_image_urls(text: str) -> Tuple[str, ...]:
+    """Single pass over text: match, clean and validate each URL once, in first-seen order."""
+    if '://' not in text:
+        return ()
+    found = {}
+    seen_raw = set()
+    for match in _IMAGE_URL_PATTERN.finditer(text):
+        raw = match.group(0)
+        if raw in seen_raw:
+            continue
+        seen_raw.add(raw)
+        cleaned = clean_image_url(raw)
+        # Validate that the cleaned URL is still a valid image URL
+        if cleaned and _IMAGE_EXTENSION_PATTERN.search(cleaned):
+            found[cleaned] = None
+    return tuple(found)
 
 
 def extract_image_urls(text: str) -> List[str]:
@@ -74,26 +108,14 @@ def extract_image_urls(text: str) -> List[str]:
     if not text or not isinstance(text, str):
         return []
     
-    # Regex pattern to match image URLs
-    # Matches URLs ending with image extensions, optionally followed by query parameters
-    # Using non-capturing groups to get full URLs
-    # Updated to be more permissive to catch URLs with trailing punctuation
-    image_url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+\.(?:png|jpg|jpeg|gif|webp|svg|bmp|ico)(?:\?[^\s<>"{}|\\^`\[\]]*)?[^\s<>"{}|\\^`\[\]]*'
+    if len(text) < MEMO_MIN_TEXT_LENGTH:
+        return list(_scan_image_urls(text))
     
-    matches = re.findall(image_url_pattern, text, re.IGNORECASE)
-    if not matches:
-        return []
-    
-    # Clean each URL to remove trailing punctuation
-    cleaned_urls = []
-    for url in matches:
-        cleaned = clean_image_url(url)
-        # Validate that the cleaned URL is still a valid image URL
-        if cleaned and is_image_url(cleaned):
-            cleaned_urls.append(cleaned)
-    
-    # Remove duplicates and return
-    return list(set(cleaned_urls))
+    urls = _url_memo.get(text)
+    if urls is None:
+        urls = _scan_image_urls(text)
+        _url_memo.set(text, urls, size_bytes=len(text))
+    return list(urls)
 
 
 def extract_image_urls_from_object(obj: Any) -> List[str]:
@@ -109,18 +131,20 @@ def extract_image_urls_from_object(obj: Any) -> List[str]:
     if not obj:
         return []
     
-    urls: Set[str] = set()
-    
-    if isinstance(obj, str):
-        urls.update(extract_image_urls(obj))
-    elif isinstance(obj, list):
-        for item in obj:
-            urls.update(extract_image_urls_from_object(item))
-    elif isinstance(obj, dict):
-        for value in obj.values():
-            urls.update(extract_image_urls_from_object(value))
+    # Iterative walk: nested outputs are flattened without building a set per level
+    found = {}
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            for url in extract_image_urls(item):
+                found[url] = None
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, dict):
+            stack.extend(reversed(list(item.values())))
     
-    return list(urls)
+    return list(found)
 
 
 def is_problematic_url(url: str) -> bool:
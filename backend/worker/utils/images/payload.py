@@ -0,0 +1,118 @@
+"""
+Image payloads: decoded image bytes passed from response parsing to S3 upload.
+
+OpenAI returns generated images (and agents capture screenshots) as base64 strings.
+Decoding once into an ImagePayload keeps a single raw copy in memory (base64 is a
+third larger) instead of re-decoding or re-encoding the same image at every hop.
+Only the small thumbnail sent to the AI naming model is base64-encoded again.
+"""
+
+import base64
+import binascii
+import logging
+from io import BytesIO
+from typing import Optional, Union
+
+from .processing import PIL_AVAILABLE, optimize_image
+
+logger = logging.getLogger(__name__)
+
+if PIL_AVAILABLE:
+    from PIL import Image
+
+# Longest side of the thumbnail sent to the naming model (it only needs the gist).
+NAMING_THUMBNAIL_PX = 512
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+class ImagePayload:
+    """Raw image bytes plus content type."""
+
+    __slots__ = ("data", "content_type")
+
+    def __init__(self, data: BytesLike, content_type: str = "image/png"):
+        """
+        Initialize payload.
+
+        Args:
+            data: Raw image bytes (bytearray/memoryview are copied once into bytes)
+            content_type: MIME type of the image
+        """
+        self.data = data if isinstance(data, bytes) else bytes(data)
+        self.content_type = content_type
+
+    @classmethod
+    def from_base64(cls, value: Union[str, bytes], content_type: str = "image/png") -> "ImagePayload":
+        """
+        Decode a base64 string or data URL.
+
+        Args:
+            value: Base64 data, optionally as a data:<type>;base64,<data> URL
+            content_type: MIME type used when value is not a data URL
+
+        Returns:
+            ImagePayload holding the decoded bytes
+        """
+        if isinstance(value, str) and value.startswith("data:"):
+            header, _, value = value.partition(",")
+            declared = header[5:].split(";", 1)[0]
+            if declared:
+                content_type = declared
+        try:
+            data = binascii.a2b_base64(value)
+        except (binascii.Error, ValueError):
+            # Unpadded input: fall back to the lenient decoder
+            data = base64.b64decode(value + "=" * (-len(value) % 4))
+        return cls(data, content_type)
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def view(self) -> memoryview:
+        """Zero-copy view of the image bytes."""
+        return memoryview(self.data)
+
+    @property
+    def extension(self) -> str:
+        content_type = self.content_type.lower()
+        if "jpeg" in content_type or "jpg" in content_type:
+            return "jpg"
+        if "webp" in content_type:
+            return "webp"
+        return "png"
+
+    def optimized(self, job_id: Optional[str] = None, tenant_id: Optional[str] = None) -> "ImagePayload":
+        """Return the payload after optimize_image (self when nothing changed)."""
+        data, content_type = optimize_image(self.data, self.content_type, job_id=job_id, tenant_id=tenant_id)
+        if data is self.data and content_type == self.content_type:
+            return self
+        return ImagePayload(data, content_type)
+
+    def to_data_url(self) -> str:
+        return f"data:{self.content_type};base64,{base64.b64encode(self.data).decode('ascii')}"
+
+    def naming_data_url(self, max_px: int = NAMING_THUMBNAIL_PX) -> str:
+        """
+        Data URL of a small JPEG thumbnail for the naming model.
+
+        Falls back to the full image when Pillow is unavailable or cannot read it.
+        """
+        if not PIL_AVAILABLE:
+            return self.to_data_url()
+        try:
+            img = Image.open(BytesIO(self.data))
+            img.draft("RGB", (max_px, max_px))
+            img.thumbnail((max_px, max_px))
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            output = BytesIO()
+            img.save(output, format="JPEG", quality=80)
+            return f"data:image/jpeg;base64,{base64.b64encode(output.getbuffer()).decode('ascii')}"
+        except Exception as e:
+            logger.debug("[Image Utils] Thumbnail for naming failed; sending full image", extra={
+                'error': str(e),
+            })
+            return self.to_data_url()
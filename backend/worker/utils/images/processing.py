@@ -1,6 +1,12 @@
 import logging
 import base64
 import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Tuple, Optional, Any, Dict
 from io import BytesIO
 
@@ -98,15 +104,214 @@ def validate_image_format(image_bytes: bytes, job_id: Optional[str] = None, tena
         return False, None, error_msg
 
 
-def optimize_image(image_bytes: bytes, content_type: str, job_id: Optional[str] = None, tenant_id: Optional[str] = None) -> Tuple[bytes, str]:
+def _read_preset() -> str:
+    value = (os.environ.get("IMAGE_OPTIMIZE_PRESET") or "").strip().lower()
+    return value if value in OPTIMIZE_PRESETS else DEFAULT_OPTIMIZE_PRESET
+
+
+def _read_workers() -> int:
+    value = (os.environ.get("IMAGE_OPTIMIZE_WORKERS") or "").strip()
+    default = min(2, os.cpu_count() or 1)
+    if not value:
+        return default
+    try:
+        parsed = int(value)
+    except Exception:
+        return default
+    return parsed if parsed >= 0 else default
+
+
+# Encoder settings per preset. "small" is the original (slowest) configuration:
+# LANCZOS, JPEG optimize=True, WebP method=6 and PNG optimize=True.
+OPTIMIZE_PRESETS: Dict[str, Dict[str, Any]] = {
+    'fast': {
+        'resample': 'BILINEAR',
+        'reducing_gap': 2.0,
+        'jpeg': {'quality': 82},
+        'webp': {'quality': 80, 'method': 2},
+        'png': {'compress_level': 3},
+        'reencode_png': False,
+    },
+    'balanced': {
+        'resample': 'BICUBIC',
+        'reducing_gap': 3.0,
+        'jpeg': {'quality': 85},
+        'webp': {'quality': 85, 'method': 4},
+        'png': {'compress_level': 6},
+        'reencode_png': False,
+    },
+    'small': {
+        'resample': 'LANCZOS',
+        'reducing_gap': None,
+        'jpeg': {'quality': 85, 'optimize': True},
+        'webp': {'quality': 85, 'method': 6},
+        'png': {'optimize': True},
+        'reencode_png': True,
+    },
+}
+DEFAULT_OPTIMIZE_PRESET = 'balanced'
+IMAGE_OPTIMIZE_PRESET = _read_preset()
+# Worker processes for optimization (0 = optimize on the calling thread).
+IMAGE_OPTIMIZE_WORKERS = _read_workers()
+# Smaller images are optimized inline; pickling them to a worker costs more than it saves.
+POOL_MIN_BYTES = 256 * 1024
+POOL_TIMEOUT_SECONDS = 60
+# JPEG/WebP at or below this many bytes per pixel are treated as already compressed.
+ALREADY_OPTIMAL_BYTES_PER_PIXEL = 0.5
+LARGE_PNG_BYTES = 2 * 1024 * 1024
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_disabled = False
+_pool_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    'images': 0,
+    'skipped': 0,
+    'pooled': 0,
+    'bytes_in': 0,
+    'bytes_saved': 0,
+    'encode_ms': 0.0,
+}
+
+
+def _optimize_bytes(image_bytes: bytes, content_type: str, preset_name: str) -> Tuple[bytes, str, Dict[str, Any]]:
+    """
+    Decode, resize and re-encode one image (runs in a worker process or inline).
+
+    Returns:
+        Tuple of (bytes, content_type, metrics); the original bytes are returned when
+        the image is already optimal or re-encoding would not make it smaller.
+    """
+    started = time.perf_counter()
+    preset = OPTIMIZE_PRESETS[preset_name]
+    original_size = len(image_bytes)
+    metrics: Dict[str, Any] = {'preset': preset_name, 'original_size_bytes': original_size}
+
+    img = Image.open(BytesIO(image_bytes))
+    original_format = img.format
+    metrics['original_dimensions'] = img.size
+    needs_resize = img.width > MAX_IMAGE_WIDTH_PX
+    target = (MAX_IMAGE_WIDTH_PX, int(img.height * MAX_IMAGE_WIDTH_PX / img.width)) if needs_resize else img.size
+    convert_png = (
+        content_type == 'image/png'
+        and original_size > LARGE_PNG_BYTES
+        and img.mode not in ('RGBA', 'LA', 'P')
+    )
+
+    # Header-only check: the pixels are never decoded for images we keep as-is
+    skip_reason = None
+    if not needs_resize:
+        if content_type in ('image/jpeg', 'image/jpg', 'image/webp'):
+            if original_size <= img.width * img.height * ALREADY_OPTIMAL_BYTES_PER_PIXEL:
+                skip_reason = 'already_compressed'
+        elif content_type == 'image/png' and not convert_png and not preset['reencode_png']:
+            skip_reason = 'png_within_limits'
+    if skip_reason:
+        metrics.update({'skipped': skip_reason, 'encode_ms': (time.perf_counter() - started) * 1000})
+        return image_bytes, content_type, metrics
+
+    if needs_resize:
+        if original_format == 'JPEG':
+            # Let libjpeg decode at the smallest 1/2, 1/4 or 1/8 scale still >= target
+            img.draft('RGB', target)
+        resample = getattr(Image.Resampling, preset['resample'])
+        img = img.resize(target, resample, reducing_gap=preset['reducing_gap'])
+        metrics['new_dimensions'] = target
+
+    output = BytesIO()
+    if content_type in ('image/jpeg', 'image/jpg'):
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        img.save(output, format='JPEG', **preset['jpeg'])
+        new_content_type = 'image/jpeg'
+    elif content_type == 'image/webp':
+        img.save(output, format='WebP', **preset['webp'])
+        new_content_type = 'image/webp'
+    elif content_type == 'image/png':
+        if convert_png:
+            # Large non-transparent PNGs compress far better as JPEG
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            img.save(output, format='JPEG', **preset['jpeg'])
+            new_content_type = 'image/jpeg'
+            metrics['converted_png_to_jpeg'] = True
+        else:
+            img.save(output, format='PNG', **preset['png'])
+            new_content_type = 'image/png'
+    else:
+        # Keep original format
+        img.save(output, format=original_format or 'PNG')
+        new_content_type = content_type
+
+    optimized_bytes = output.getvalue()
+    metrics['encode_ms'] = (time.perf_counter() - started) * 1000
+    if len(optimized_bytes) >= original_size and not needs_resize:
+        metrics['skipped'] = 'not_smaller'
+        return image_bytes, content_type, metrics
+    metrics['optimized_size_bytes'] = len(optimized_bytes)
+    return optimized_bytes, new_content_type, metrics
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the shared optimization process pool (None when disabled or unavailable)."""
+    global _pool, _pool_disabled
+    if _pool is not None or _pool_disabled or IMAGE_OPTIMIZE_WORKERS <= 0:
+        return _pool
+    with _pool_lock:
+        if _pool is None and not _pool_disabled:
+            try:
+                # spawn: forking a process with live worker threads is unsafe
+                _pool = ProcessPoolExecutor(
+                    max_workers=IMAGE_OPTIMIZE_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            except Exception as e:
+                # e.g. no /dev/shm for multiprocessing semaphores (AWS Lambda)
+                _pool_disabled = True
+                logger.warning("[Image Utils] Optimization process pool unavailable; optimizing inline", extra={
+                    'error': str(e)
+                })
+    return _pool
+
+
+def _run_optimize(image_bytes: bytes, content_type: str, preset_name: str) -> Tuple[bytes, str, Dict[str, Any]]:
+    global _pool, _pool_disabled
+    pool = _get_pool() if len(image_bytes) >= POOL_MIN_BYTES else None
+    if pool is not None:
+        try:
+            result = pool.submit(_optimize_bytes, image_bytes, content_type, preset_name).result(timeout=POOL_TIMEOUT_SECONDS)
+            result[2]['pooled'] = True
+            return result
+        except BrokenProcessPool as e:
+            with _pool_lock:
+                _pool_disabled = True
+                _pool = None
+            logger.warning("[Image Utils] Optimization process pool broke; optimizing inline", extra={
+                'error': str(e)
+            })
+    return _optimize_bytes(image_bytes, content_type, preset_name)
+
+
+def optimize_image(
+    image_bytes: bytes,
+    content_type: str,
+    job_id: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+    preset: Optional[str] = None,
+) -> Tuple[bytes, str]:
     """
     Optimize image by resizing and compressing if needed.
     
+    Large images are handed to a process pool so decoding and encoding do not hold
+    the calling thread's GIL; images that are already compressed and within the size
+    limit are returned unchanged without decoding their pixels.
+    
     Args:
         image_bytes: Original image bytes
         content_type: MIME type of the image
         job_id: Optional job ID for logging
         tenant_id: Optional tenant ID for logging
+        preset: Encoder preset ('fast', 'balanced' or 'small'; defaults to IMAGE_OPTIMIZE_PRESET)
         
     Returns:
         Tuple of (optimized_bytes, new_content_type)
@@ -114,75 +319,9 @@ def optimize_image(image_bytes: bytes, content_type: str, job_id: Optional[str]
     if not PIL_AVAILABLE:
         return image_bytes, content_type
     
+    preset_name = preset if preset in OPTIMIZE_PRESETS else IMAGE_OPTIMIZE_PRESET
     try:
-        img = Image.open(BytesIO(image_bytes))
-        original_format = img.format
-        original_size = len(image_bytes)
-        original_width = img.width
-        original_height = img.height
-        
-        # Resize if width exceeds maximum
-        if img.width > MAX_IMAGE_WIDTH_PX:
-            ratio = MAX_IMAGE_WIDTH_PX / img.width
-            new_height = int(img.height * ratio)
-            img = img.resize((MAX_IMAGE_WIDTH_PX, new_height), Image.Resampling.LANCZOS)
-            logger.info("[Image Utils] Resized image", extra={
-                'job_id': job_id,
-                'tenant_id': tenant_id,
-                'original_size': (original_width, original_height),
-                'new_size': (MAX_IMAGE_WIDTH_PX, new_height)
-            })
-        
-        # Optimize based on format
-        output = BytesIO()
-        
-        if content_type in ('image/jpeg', 'image/jpg'):
-            # Compress JPEG
-            img.save(output, format='JPEG', quality=85, optimize=True)
-            new_content_type = 'image/jpeg'
-        elif content_type == 'image/webp':
-            # Compress WebP
-            img.save(output, format='WebP', quality=85, method=6)
-            new_content_type = 'image/webp'
-        elif content_type == 'image/png':
-            # For large PNGs, consider converting to JPEG if appropriate
-            if original_size > 2 * 1024 * 1024 and not img.mode in ('RGBA', 'LA', 'P'):
-                # Convert large non-transparent PNGs to JPEG
-                if img.mode == 'RGBA':
-                    # Create white background
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    background.paste(img, mask=img.split()[3] if img.mode == 'RGBA' else None)
-                    img = background
-                img.save(output, format='JPEG', quality=85, optimize=True)
-                new_content_type = 'image/jpeg'
-                logger.info("[Image Utils] Converted large PNG to JPEG", extra={
-                    'job_id': job_id,
-                    'tenant_id': tenant_id,
-                    'original_size_bytes': original_size
-                })
-            else:
-                # Optimize PNG
-                img.save(output, format='PNG', optimize=True)
-                new_content_type = 'image/png'
-        else:
-            # Keep original format
-            img.save(output, format=original_format or 'PNG')
-            new_content_type = content_type
-        
-        optimized_bytes = output.getvalue()
-        optimized_size = len(optimized_bytes)
-        
-        if optimized_size < original_size:
-            reduction_pct = (1 - optimized_size / original_size) * 100
-            logger.info("[Image Utils] Image optimized", extra={
-                'job_id': job_id,
-                'tenant_id': tenant_id,
-                'original_size_bytes': original_size,
-                'optimized_size_bytes': optimized_size,
-                'reduction_percent': reduction_pct
-            })
-        
-        return optimized_bytes, new_content_type
+        optimized_bytes, new_content_type, metrics = _run_optimize(image_bytes, content_type, preset_name)
     except Exception as e:
         logger.warning("[Image Utils] Failed to optimize image, using original", extra={
             'job_id': job_id,
@@ -190,6 +329,39 @@ def optimize_image(image_bytes: bytes, content_type: str, job_id: Optional[str]
             'error': str(e)
         })
         return image_bytes, content_type
+    
+    bytes_saved = len(image_bytes) - len(optimized_bytes)
+    with _stats_lock:
+        _stats['images'] += 1
+        _stats['skipped'] += 1 if metrics.get('skipped') else 0
+        _stats['pooled'] += 1 if metrics.get('pooled') else 0
+        _stats['bytes_in'] += len(image_bytes)
+        _stats['bytes_saved'] += bytes_saved
+        _stats['encode_ms'] += metrics['encode_ms']
+    
+    logger.info("[Image Utils] Image optimized" if not metrics.get('skipped') else "[Image Utils] Image optimization skipped", extra={
+        'job_id': job_id,
+        'tenant_id': tenant_id,
+        'mime_type': new_content_type,
+        'bytes_saved': bytes_saved,
+        'reduction_percent': (bytes_saved / len(image_bytes) * 100) if image_bytes else 0.0,
+        **metrics
+    })
+    return optimized_bytes, new_content_type
+
+
+def get_optimization_stats() -> Dict[str, Any]:
+    """
+    Get process-wide optimization counters.
+    
+    Returns:
+        Dict with image count, skipped/pooled counts, bytes in/saved and total encode time
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['preset'] = IMAGE_OPTIMIZE_PRESET
+    stats['workers'] = 0 if _pool_disabled else IMAGE_OPTIMIZE_WORKERS
+    return stats
 
 
 def add_overlay_to_screenshot(screenshot_b64: str, action: Dict[str, Any]) -> str:
@@ -49,6 +49,7 @@ export default function StepDetailClient() {
     loadingArtifacts,
     stepImageUrls,
     stepImageArtifacts,
+    liveStep,
     isLiveStep,
     liveOutputText,
     hasLiveOutput,
@@ -228,6 +229,7 @@ export default function StepDetailClient() {
           showLiveOutputPanel={Boolean(showLiveOutputPanel)}
           liveStatus={liveStatus}
           job={job}
+          liveStep={liveStep}
           liveUpdatedAtLabel={liveUpdatedAtLabel}
           hasLiveOutput={hasLiveOutput}
           liveOutputText={liveOutputText}
@@ -3,7 +3,7 @@ import { ClipboardDocumentIcon } from "@heroicons/react/24/outline";
 import { CollapsibleSectionCard } from "@/components/ui/CollapsibleSectionCard";
 import { LiveOutputPanel } from "@/components/jobs/detail/LiveOutputPanel";
 import { StepContent } from "@/components/jobs/StepContent";
-import type { Job } from "@/types/job";
+import type { Job, JobLiveStep } from "@/types/job";
 
 interface StepOutputProps {
   outputPreview: string | null;
@@ -11,6 +11,7 @@ interface StepOutputProps {
   showLiveOutputPanel: boolean;
   liveStatus: string | null;
   job: Job | null;
+  liveStep: JobLiveStep | null;
   liveUpdatedAtLabel: string | null;
   hasLiveOutput: boolean;
   liveOutputText: string;
@@ -25,6 +26,7 @@ export function StepOutput({
   showLiveOutputPanel,
   liveStatus,
   job,
+  liveStep,
   liveUpdatedAtLabel,
   hasLiveOutput,
   liveOutputText,
@@ -53,6 +55,7 @@ export function StepOutput({
         showLiveOutputPanel={Boolean(showLiveOutputPanel)}
         liveStatus={liveStatus}
         job={job}
+        liveStep={liveStep}
         liveUpdatedAtLabel={liveUpdatedAtLabel}
         hasLiveOutput={hasLiveOutput}
         liveOutputText={liveOutputText}
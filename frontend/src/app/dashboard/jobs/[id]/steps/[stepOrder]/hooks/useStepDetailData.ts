@@ -11,6 +11,7 @@ import {
   formatStepInput,
   formatStepOutput,
 } from "@/utils/jobFormatting";
+import { getJobLiveStep } from "@/utils/jobs/steps";
 import { getStepInput } from "@/utils/stepInput";
 import {
   coerceJsonContent,
@@ -121,18 +122,10 @@ export function useStepDetailData() {
     imageArtifactsByStep.get(step?.step_order ?? 0) || [];
   const hasImages = stepImageUrls.length > 0 || stepImageArtifacts.length > 0;
 
-  const liveOutput =
-    job?.live_step && step?.step_order === job.live_step.step_order
-      ? job.live_step.output_text
-      : undefined;
-  const liveUpdatedAt =
-    job?.live_step && step?.step_order === job.live_step.step_order
-      ? job.live_step.updated_at
-      : undefined;
-  const isLiveStep =
-    Boolean(job?.live_step) &&
-    step?.step_order !== undefined &&
-    job?.live_step?.step_order === step.step_order;
+  const liveStep = getJobLiveStep(job, step?.step_order);
+  const liveOutput = liveStep?.output_text;
+  const liveUpdatedAt = liveStep?.updated_at;
+  const isLiveStep = Boolean(liveStep);
   const liveOutputText = typeof liveOutput === "string" ? liveOutput : "";
   const hasLiveOutput = liveOutputText.length > 0;
   const outputIsEmpty =
@@ -142,10 +135,10 @@ export function useStepDetailData() {
     (job?.status === "processing" ||
       hasLiveOutput ||
       Boolean(liveUpdatedAt) ||
-      Boolean(job?.live_step?.error) ||
-      Boolean(job?.live_step?.status));
-  const liveStatus = job?.live_step?.status
-    ? job.live_step.status.replace(/_/g, " ")
+      Boolean(liveStep?.error) ||
+      Boolean(liveStep?.status));
+  const liveStatus = liveStep?.status
+    ? liveStep.status.replace(/_/g, " ")
     : null;
   const liveUpdatedAtLabel = liveUpdatedAt
     ? new Date(liveUpdatedAt).toLocaleTimeString([], {
@@ -391,6 +384,7 @@ export function useStepDetailData() {
     hasImages,
     liveOutput,
     liveUpdatedAt,
+    liveStep,
     isLiveStep,
     liveOutputText,
     hasLiveOutput,
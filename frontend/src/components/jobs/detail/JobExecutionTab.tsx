@@ -8,6 +8,7 @@ import { StepDetailPanel } from "@/components/jobs/detail/StepDetailPanel";
 import { ErrorState } from "@/components/ui/ErrorState";
 import { EmptyState } from "@/components/ui/EmptyState";
 import { getStepStatus } from "@/components/jobs/utils";
+import { getJobLiveStep } from "@/utils/jobs/steps";
 import type { Artifact } from "@/types/artifact";
 import type { FormSubmission } from "@/types/form";
 import type { ArtifactGalleryItem, Job, MergedStep } from "@/types/job";
@@ -94,14 +95,9 @@ export function JobExecutionTab({
     ? getStepStatus(selectedStep, sortedSteps, job.status)
     : "pending";
 
-  const selectedLiveOutput =
-    job.live_step && job.live_step.step_order === selectedStepOrder
-      ? job.live_step.output_text
-      : undefined;
-  const selectedLiveUpdatedAt =
-    job.live_step && job.live_step.step_order === selectedStepOrder
-      ? job.live_step.updated_at
-      : undefined;
+  const selectedLiveStep = getJobLiveStep(job, selectedStepOrder);
+  const selectedLiveOutput = selectedLiveStep?.output_text;
+  const selectedLiveUpdatedAt = selectedLiveStep?.updated_at;
 
   const emptyStatusCopy =
     job.status === "failed"
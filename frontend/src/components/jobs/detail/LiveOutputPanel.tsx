@@ -1,12 +1,13 @@
 "use client";
 
 import { LiveOutputConsole } from "@/components/jobs/LiveOutputConsole";
-import type { Job } from "@/types/job";
+import type { Job, JobLiveStep } from "@/types/job";
 
 interface LiveOutputPanelProps {
   showLiveOutputPanel: boolean;
   liveStatus: string | null;
   job: Job | null;
+  liveStep: JobLiveStep | null;
   liveUpdatedAtLabel: string | null;
   hasLiveOutput: boolean;
   liveOutputText: string;
@@ -16,6 +17,7 @@ export function LiveOutputPanel({
   showLiveOutputPanel,
   liveStatus,
   job,
+  liveStep,
   liveUpdatedAtLabel,
   hasLiveOutput,
   liveOutputText,
@@ -32,8 +34,8 @@ export function LiveOutputPanel({
         liveStatus === "streaming" ||
         liveStatus === "retrying"
       }
-      truncated={Boolean(job?.live_step?.truncated)}
-      error={job?.live_step?.error || null}
+      truncated={Boolean(liveStep?.truncated)}
+      error={liveStep?.error || null}
       emptyMessage="Waiting for the first streamed event. Search, tool activity, and model output will appear here as they arrive."
       className="mb-4"
       bodyHeightClassName="max-h-72"
@@ -639,6 +639,7 @@ export function useJobExecution({
               completed_at: data.completed_at ?? prevJob.completed_at,
               failed_at: data.failed_at ?? prevJob.failed_at,
               live_step: data.live_step ?? null,
+              live_steps: data.live_steps ?? null,
               execution_steps_s3_key:
                 data.execution_steps_s3_key ??
                 prevJob.execution_steps_s3_key ??
@@ -80,6 +80,7 @@ export interface JobStatusResponse {
   completed_at?: string | null;
   failed_at?: string | null;
   live_step?: JobLiveStep | null;
+  live_steps?: Record<string, JobLiveStep> | null;
   execution_steps_s3_key?: string | null;
 }
 
@@ -109,10 +110,14 @@ export interface Job extends BaseEntity {
   execution_steps?: ExecutionStep[];
   submission_preview?: JobSubmissionPreview;
   /**
-   * Best-effort live output preview for the currently running step.
-   * Populated by the worker while streaming output and cleared when the step completes.
+   * Best-effort live output preview for the most recently updated running step.
+   * Populated by the worker while streaming output and cleared when the job ends.
    */
   live_step?: JobLiveStep | null;
+  /**
+   * Live output preview per step, keyed by step_order (parallel steps stream at once).
+   */
+  live_steps?: Record<string, JobLiveStep> | null;
 }
 
 export interface JobListResponse {
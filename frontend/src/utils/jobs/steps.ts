@@ -1,4 +1,4 @@
-import type { JobStepSummary, MergedStep } from "@/types/job";
+import type { Job, JobLiveStep, JobStepSummary, MergedStep } from "@/types/job";
 
 export function summarizeStepProgress(
   steps?: MergedStep[] | null,
@@ -54,3 +54,17 @@ export function formatStepType(stepType?: string) {
     .replace(/_/g, " ")
     .replace(/\b\w/g, (char) => char.toUpperCase());
 }
+
+export function getJobLiveStep(
+  job: Pick<Job, "live_step" | "live_steps"> | null | undefined,
+  stepOrder?: number,
+): JobLiveStep | null {
+  if (!job || stepOrder === undefined) {
+    return null;
+  }
+  const liveStep = job.live_steps?.[String(stepOrder)];
+  if (liveStep) {
+    return liveStep;
+  }
+  return job.live_step?.step_order === stepOrder ? job.live_step : null;
+}
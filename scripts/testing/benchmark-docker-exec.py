@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Actions-per-second benchmark for the Docker VM CUA driver.
+
+Runs the same action mix (mouse move, click, scroll, screenshot) through
+DockerVMController with one `docker exec` per command (CUA_DOCKER_PERSISTENT_EXEC=false,
+the previous behaviour) and through the persistent exec session, and reports the rate
+of each.
+
+By default it drives the container named by CUA_DOCKER_CONTAINER_NAME (see
+docs/guides/CUA_DEPLOYMENT.md). With --local, a stand-in `docker` script runs the
+commands in a local shell instead (no xdotool/X needed); that isolates the per-exec
+process cost from Docker's own exec setup, so real containers gain more.
+
+Usage:
+    python3 scripts/testing/benchmark-docker-exec.py
+    python3 scripts/testing/benchmark-docker-exec.py --iterations 50 --window-id 0x400007
+    python3 scripts/testing/benchmark-docker-exec.py --local
+"""
+
+import argparse
+import os
+import stat
+import sys
+import tempfile
+import time
+
+# Add backend/worker to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend', 'worker'))
+
+from services.cua.drivers.docker_vm import DockerVMController  # noqa: E402
+
+LOCAL_CONTAINER = "cua-benchmark"
+LOCAL_DOCKER = """#!/bin/sh
+[ "$1" = exec ] || exit 0
+shift
+while [ "$1" != {container} ]; do shift; done
+shift
+exec "$@"
+"""
+
+ACTIONS = [
+    {"type": "move", "x": 200, "y": 200},
+    {"type": "click", "x": 220, "y": 240},
+    {"type": "scroll", "x": 300, "y": 300, "scroll_y": 240},
+]
+
+
+def setup_local(workdir):
+    docker = os.path.join(workdir, "docker")
+    with open(docker, "w") as handle:
+        handle.write(LOCAL_DOCKER.format(container=LOCAL_CONTAINER))
+    os.chmod(docker, os.stat(docker).st_mode | stat.S_IEXEC)
+    os.environ["CUA_DOCKER_BIN"] = docker
+    os.environ["CUA_DOCKER_XDOTOOL_CMD"] = "true"
+    # ~100 KB of output, like a compressed screenshot
+    os.environ["CUA_DOCKER_SCREENSHOT_CMD"] = "head -c 100000 /dev/zero"
+    return LOCAL_CONTAINER
+
+
+def run(persistent, iterations, container, local):
+    os.environ["CUA_DOCKER_PERSISTENT_EXEC"] = "true" if persistent else "false"
+    controller = DockerVMController(container_name=container)
+    if local:
+        controller._is_initialized = True
+    else:
+        controller.initialize()
+    try:
+        # Warm-up (opens the session when enabled)
+        controller.capture_screenshot_bytes()
+        operations = 0
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for action in ACTIONS:
+                controller.execute_action(action)
+                operations += 1
+            controller.capture_screenshot_bytes()
+            operations += 1
+        elapsed = time.perf_counter() - started
+    finally:
+        controller.cleanup()
+    return operations, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=30, help="Action rounds (3 actions + 1 screenshot each)")
+    parser.add_argument("--container", default=None, help="Container name (default: CUA_DOCKER_CONTAINER_NAME)")
+    parser.add_argument("--window-id", default=None, help="Set CUA_DOCKER_WINDOW_ID (adds a focus command per action)")
+    parser.add_argument("--local", action="store_true", help="Run commands in a local shell instead of Docker")
+    args = parser.parse_args()
+
+    if args.window_id:
+        os.environ["CUA_DOCKER_WINDOW_ID"] = args.window_id
+
+    with tempfile.TemporaryDirectory() as workdir:
+        container = setup_local(workdir) if args.local else args.container
+        results = {}
+        for label, persistent in (("one-shot docker exec", False), ("persistent exec session", True)):
+            operations, elapsed = run(persistent, args.iterations, container, args.local)
+            results[label] = operations / elapsed
+            print(f"{label:>24}: {operations} ops in {elapsed:6.2f}s -> {operations / elapsed:8.1f} ops/s "
+                  f"({elapsed / operations * 1000:6.2f} ms/op)")
+
+    before, after = results["one-shot docker exec"], results["persistent exec session"]
+    print(f"\nSpeedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
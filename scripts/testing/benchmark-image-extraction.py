@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for image URL extraction during context building.
+
+Every step of a workflow rebuilds its context from all previous step outputs, so
+image URL extraction runs over output k once for every later step. This script
+replays that pattern against the legacy per-call regex implementation and the
+current memoized single-pass scanner.
+
+Usage:
+    python3 scripts/testing/benchmark-image-extraction.py
+    python3 scripts/testing/benchmark-image-extraction.py --steps-file execution_steps.json
+    python3 scripts/testing/benchmark-image-extraction.py --steps 40 --output-kb 64
+
+--steps-file accepts a job's execution_steps.json (see scripts/jobs/get-job-output.py);
+each entry's `output` is used as a step output.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+# Add backend/worker to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend', 'worker'))
+
+from utils.images import extraction  # noqa: E402
+
+
+def legacy_extract_image_urls(text):
+    """Extraction as implemented before the single-pass scanner (pattern compiled per call)."""
+    if not text or not isinstance(text, str):
+        return []
+    pattern = r'https?://[^\s<>"{}|\\^`\[\]]+\.(?:png|jpg|jpeg|gif|webp|svg|bmp|ico)(?:\?[^\s<>"{}|\\^`\[\]]*)?[^\s<>"{}|\\^`\[\]]*'
+    matches = re.findall(pattern, text, re.IGNORECASE)
+    cleaned_urls = []
+    for url in matches:
+        cleaned = extraction.clean_image_url(url)
+        if cleaned and re.search(r'\.(png|jpg|jpeg|gif|webp|svg|bmp|ico)(\?.*)?$', cleaned, re.IGNORECASE):
+            cleaned_urls.append(cleaned)
+    return list(set(cleaned_urls))
+
+
+def synthetic_outputs(steps, output_kb, seed=7):
+    """Markdown research/report outputs with a sprinkling of image and non-image links."""
+    rng = random.Random(seed)
+    words = "lead magnet audience research market competitor pricing strategy insight funnel".split()
+    outputs = []
+    for step in range(steps):
+        parts = [f"# Step {step + 1} report\n"]
+        size = 0
+        while size < output_kb * 1024:
+            line = " ".join(rng.choice(words) for _ in range(14))
+            roll = rng.random()
+            if roll < 0.04:
+                line += f" ![chart](https://cdn.example.com/jobs/{step}/chart-{size}.png?w=1200))"
+            elif roll < 0.08:
+                line += f" (source: https://example.com/articles/{size}.html)."
+            parts.append(line + "\n")
+            size += len(line) + 1
+        outputs.append("".join(parts))
+    return outputs
+
+
+def load_outputs(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        steps = json.load(f)
+    outputs = []
+    for step in steps:
+        output = step.get('output')
+        if isinstance(output, (dict, list)):
+            output = json.dumps(output)
+        if isinstance(output, str) and output:
+            outputs.append(output)
+    return outputs
+
+
+def replay_context_building(outputs, extract):
+    """Step k scans outputs[0:k], as ContextBuilder does when building each step's context."""
+    started = time.perf_counter()
+    found = 0
+    for step in range(1, len(outputs) + 1):
+        for output in outputs[:step]:
+            found += len(extract(output))
+    return (time.perf_counter() - started) * 1000, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark image URL extraction during context building")
+    parser.add_argument('--steps-file', help="Path to a job's execution_steps.json")
+    parser.add_argument('--steps', type=int, default=25, help="Synthetic step count (default: 25)")
+    parser.add_argument('--output-kb', type=int, default=48, help="Synthetic output size per step in KB (default: 48)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per implementation; best time is reported")
+    args = parser.parse_args()
+
+    outputs = load_outputs(args.steps_file) if args.steps_file else synthetic_outputs(args.steps, args.output_kb)
+    total_kb = sum(len(o) for o in outputs) / 1024
+    print(f"Step outputs: {len(outputs)} ({total_kb:.0f} KB total)")
+
+    results = {}
+    for name, extract in (("legacy", legacy_extract_image_urls), ("memoized", extraction.extract_image_urls)):
+        best = None
+        for _ in range(args.repeat):
+            extraction._url_memo.clear()
+            elapsed_ms, found = replay_context_building(outputs, extract)
+            best = elapsed_ms if best is None else min(best, elapsed_ms)
+        results[name] = (best, found)
+        print(f"  {name:<9} {best:10.1f} ms   ({found} URL hits)")
+
+    if results["legacy"][1] != results["memoized"][1]:
+        print("❌ Implementations disagree on URL counts")
+        return 1
+    print(f"Speedup: {results['legacy'][0] / max(results['memoized'][0], 1e-6):.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
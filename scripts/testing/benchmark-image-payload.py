@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the generated-image upload path.
+
+An Images API response carries each image as base64. The legacy path kept that string
+alive through AI naming (which wrapped it in a full-size data URL) and only decoded it
+right before the S3 upload. The current path decodes once into an ImagePayload and sends
+the naming model a small thumbnail. This script replays both paths for a multi-image
+response with fake S3 and naming services and reports tracemalloc peaks (from the moment
+the base64 responses exist, excluding the uploaded bytes held by S3).
+
+Usage:
+    python3 scripts/testing/benchmark-image-payload.py
+    python3 scripts/testing/benchmark-image-payload.py --images 6 --size 1536
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+# Add backend/worker to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend', 'worker'))
+
+from utils.images.payload import ImagePayload  # noqa: E402
+from utils.images.processing import PIL_AVAILABLE  # noqa: E402
+
+
+def synthetic_pngs(images, size):
+    """PNGs of random noise (worst case for compression, like detailed renders)."""
+    from PIL import Image
+
+    pngs = []
+    for _ in range(images):
+        output = BytesIO()
+        Image.frombytes("RGB", (size, size), os.urandom(size * size * 3)).save(output, format="PNG", compress_level=1)
+        pngs.append(output.getvalue())
+    return pngs
+
+
+class FakeS3:
+    def __init__(self):
+        self.uploaded = 0
+
+    def upload_image(self, image_data):
+        self.uploaded += len(image_data)
+
+
+def fake_naming(data_url):
+    """Stand-in for the naming call: the request body holds the data URL."""
+    return f"image-{len(data_url)}.png"
+
+
+def legacy_path(responses, s3):
+    # Every response stays referenced until the whole plan is uploaded
+    for image_b64 in responses:
+        fake_naming(f"data:image/png;base64,{image_b64}")
+        s3.upload_image(base64.b64decode(image_b64))
+
+
+def payload_path(responses, s3):
+    # Each generation worker decodes its own response and drops the base64
+    payloads = []
+    for index in range(len(responses)):
+        payloads.append(ImagePayload.from_base64(responses[index]))
+        responses[index] = None
+    for payload in payloads:
+        fake_naming(payload.naming_data_url())
+        s3.upload_image(payload.data)
+
+
+def measure(path, pngs):
+    s3 = FakeS3()
+    tracemalloc.start()
+    started = time.perf_counter()
+    responses = [base64.b64encode(png).decode('ascii') for png in pngs]
+    response_mb = sum(len(r) for r in responses) / 1024 / 1024
+    path(responses, s3)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed_ms, response_mb, s3.uploaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory of the generated-image upload path")
+    parser.add_argument('--images', type=int, default=4, help="Images per response (default: 4)")
+    parser.add_argument('--size', type=int, default=1024, help="Image width/height in px (default: 1024)")
+    args = parser.parse_args()
+
+    if not PIL_AVAILABLE:
+        print("❌ Pillow is required for this benchmark")
+        return 1
+
+    pngs = synthetic_pngs(args.images, args.size)
+    results = {}
+    for name, path in (("legacy", legacy_path), ("payload", payload_path)):
+        peak_mb, elapsed_ms, response_mb, uploaded = measure(path, pngs)
+        results[name] = (peak_mb, uploaded)
+        print(f"  {name:<8} peak {peak_mb:7.1f} MB for {response_mb:.1f} MB of base64   {elapsed_ms:8.1f} ms")
+
+    if results["legacy"][1] != results["payload"][1]:
+        print("❌ Paths uploaded different byte counts")
+        return 1
+    print(f"Peak reduction: {100 * (1 - results['payload'][0] / max(results['legacy'][0], 1e-6)):.0f}%")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())